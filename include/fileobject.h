@@ -0,0 +1 @@
+#define Py_FileSystemDefaultEncoding   NULL
@@ -0,0 +1,8 @@
+#ifndef Py_PYTHREAD_H
+#define Py_PYTHREAD_H
+
+typedef void *PyThread_type_lock;
+#define WAIT_LOCK	1
+#define NOWAIT_LOCK	0
+
+#endif
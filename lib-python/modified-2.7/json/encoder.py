@@ -55,7 +55,14 @@ def encode_basestring_ascii(s):
         return str(ESCAPE_ASCII.sub(replace, s))
     return s
 py_encode_basestring_ascii = lambda s: '"' + encode_basestring_ascii(s) + '"'
-c_encode_basestring_ascii = None
+try:
+    from _json import encode_basestring_ascii as c_encode_basestring_ascii
+    from _json import encode_basestring as c_encode_basestring
+    from _json import make_encoder as c_make_encoder
+except ImportError:
+    c_encode_basestring_ascii = None
+    c_encode_basestring = None
+    c_make_encoder = None
 
 class JSONEncoder(object):
     """Extensible JSON <http://json.org> encoder for Python data structures.
@@ -188,6 +195,20 @@ class JSONEncoder(object):
             markers = {}
         else:
             markers = None
+        if c_make_encoder is not None:
+            # the quoting functions of _json are only equivalent to the
+            # default ones, not to the wrapper used for other encodings
+            if self.encoder is encode_basestring_ascii:
+                quoter = c_encode_basestring_ascii
+            elif self.encoder is encode_basestring:
+                quoter = c_encode_basestring
+            else:
+                quoter = None
+            if quoter is not None:
+                encoder = c_make_encoder(markers, self.default, quoter,
+                    self.indent, self.key_separator, self.item_separator,
+                    self.sort_keys, self.skipkeys, self.allow_nan)
+                return encoder(o, 0)[0]
         if self.ensure_ascii:
             builder = StringBuilder()
         else:
@@ -272,6 +272,24 @@ class _socketobject(object):
         return self._sock.getsockopt(level, optname, buflen)
     getsockopt.__doc__ = _realsocket.getsockopt.__doc__
 
+    if hasattr(_realsocket, 'sendmsg'):
+        def sendmsg(self, buffers, ancdata=(), flags=0, address=None):
+            return self._sock.sendmsg(buffers, ancdata, flags, address)
+        sendmsg.__doc__ = _realsocket.sendmsg.__doc__
+
+        def recvmsg(self, bufsize, ancbufsize=0, flags=0):
+            return self._sock.recvmsg(bufsize, ancbufsize, flags)
+        recvmsg.__doc__ = _realsocket.recvmsg.__doc__
+
+        def recvmsg_into(self, buffers, ancbufsize=0, flags=0):
+            return self._sock.recvmsg_into(buffers, ancbufsize, flags)
+        recvmsg_into.__doc__ = _realsocket.recvmsg_into.__doc__
+
+    if hasattr(_realsocket, 'sendfile'):
+        def sendfile(self, file, offset=0, count=0):
+            return self._sock.sendfile(file, offset, count)
+        sendfile.__doc__ = _realsocket.sendfile.__doc__
+
 socket = SocketType = _socketobject
 
 class _fileobject(object):
@@ -1100,6 +1100,14 @@ class Popen(object):
             if executable is None:
                 executable = args[0]
 
+            if preexec_fn is None and hasattr(os, 'posix_spawn'):
+                # PyPy: start the child without fork()ing the interpreter,
+                # which would copy the page tables of the whole heap
+                self._spawn_child(args, executable, close_fds, cwd, env,
+                                  p2cread, p2cwrite, c2pread, c2pwrite,
+                                  errread, errwrite)
+                return
+
             # For transferring possible exec failure from child to parent
             # The first char specifies the exception type: 0 means
             # OSError, 1 means some other error.
@@ -1206,6 +1214,76 @@ class Popen(object):
                 raise child_exception
 
 
+        def _spawn_child(self, args, executable, close_fds, cwd, env,
+                         p2cread, p2cwrite, c2pread, c2pwrite,
+                         errread, errwrite):
+            """Start the child with os.posix_spawn(), performing the same
+            steps as the child of os.fork() in _execute_child()"""
+            file_actions = []
+            # Close parent's pipe ends
+            for fd in (p2cwrite, c2pread, errread):
+                if fd is not None:
+                    file_actions.append((os.POSIX_SPAWN_CLOSE, fd))
+            # Dup fds for child
+            for fd, target in ((p2cread, 0), (c2pwrite, 1), (errwrite, 2)):
+                if fd is not None:
+                    file_actions.append((os.POSIX_SPAWN_DUP2, fd, target))
+            # Close pipe fds.  Make sure we don't close the same
+            # fd more than once, or standard fds.
+            if p2cread is not None and p2cread not in (0,):
+                file_actions.append((os.POSIX_SPAWN_CLOSE, p2cread))
+            if c2pwrite is not None and c2pwrite not in (p2cread, 1):
+                file_actions.append((os.POSIX_SPAWN_CLOSE, c2pwrite))
+            if errwrite is not None and errwrite not in (p2cread, c2pwrite, 2):
+                file_actions.append((os.POSIX_SPAWN_CLOSE, errwrite))
+
+            # Search the PATH like os.execvpe()
+            if os.path.dirname(executable):
+                candidates = [executable]
+            else:
+                if env is None:
+                    envpath = os.environ.get('PATH', os.defpath)
+                else:
+                    envpath = env.get('PATH', os.defpath)
+                candidates = [os.path.join(dir, executable)
+                              for dir in envpath.split(os.pathsep)]
+            saved_exc = None
+            for fullname in candidates:
+                try:
+                    self.pid = os.posix_spawn(fullname, args, env,
+                                              file_actions, cwd, close_fds)
+                except OSError, e:
+                    if cwd is not None and e.filename == cwd:
+                        # os.chdir() failed in the child
+                        e.child_traceback = "os.chdir(%r)\n" % (cwd,)
+                        saved_exc = e
+                        break
+                    e.child_traceback = "os.execve(%r)\n" % (fullname,)
+                    if (e.errno != errno.ENOENT and e.errno != errno.ENOTDIR
+                            and saved_exc is None):
+                        saved_exc = e
+                    last_exc = e
+                else:
+                    break
+            else:
+                if saved_exc is None:
+                    saved_exc = last_exc
+
+            if p2cread is not None and p2cwrite is not None:
+                os.close(p2cread)
+            if c2pwrite is not None and c2pread is not None:
+                os.close(c2pwrite)
+            if errwrite is not None and errread is not None:
+                os.close(errwrite)
+
+            if saved_exc is not None:
+                for fd in (p2cwrite, c2pread, errread):
+                    if fd is not None:
+                        os.close(fd)
+                raise saved_exc
+            self._child_created = True
+
+
         def _handle_exitstatus(self, sts, _WIFSIGNALED=os.WIFSIGNALED,
                 _WTERMSIG=os.WTERMSIG, _WIFEXITED=os.WIFEXITED,
                 _WEXITSTATUS=os.WEXITSTATUS):
@@ -31,6 +31,13 @@ import time
 import weakref
 from threading import _get_ident as thread_get_ident
 
+try:
+    # the interp-level helpers bind parameters and read whole rows without
+    # going through ctypes for every value
+    import _sqlite3_core as _core
+except ImportError:
+    _core = None
+
 names = "sqlite3.dll libsqlite3.so.0 libsqlite3.so libsqlite3.dylib".split()
 for name in names:
     try:
@@ -284,12 +291,12 @@ class StatementCache(object):
 
     def get(self, sql, cursor, row_factory):
         try:
-            stat = self.cache[sql]
+            stat = self.cache.pop(sql)
         except KeyError:
             stat = Statement(self.connection, sql)
-            self.cache[sql] = stat
-            if len(self.cache) > self.maxcount:
-                self.cache.popitem(0)
+            if len(self.cache) >= self.maxcount:
+                self.cache.popitem(0)      # the least recently used
+        self.cache[sql] = stat
         #
         if stat.in_use:
             stat = Statement(self.connection, sql)
@@ -707,6 +714,8 @@ class Connection(object):
 
 DML, DQL, DDL = range(3)
 
+EXECUTEMANY_BATCH_SIZE = 64
+
 class Cursor(object):
     def __init__(self, con):
         if not isinstance(con, Connection):
@@ -780,15 +789,38 @@ class Cursor(object):
             raise ProgrammingError, "executemany is only for DML statements"
 
         self.rowcount = 0
-        for params in many_params:
-            self.statement.set_params(params)
-            ret = sqlite.sqlite3_step(self.statement.statement)
-            if ret != SQLITE_DONE:
-                raise self.connection._get_exception(ret)
-            self.rowcount += sqlite.sqlite3_changes(self.connection.db)
+        if _core is None:
+            for params in many_params:
+                self.statement.set_params(params)
+                ret = sqlite.sqlite3_step(self.statement.statement)
+                if ret != SQLITE_DONE:
+                    raise self.connection._get_exception(ret)
+                self.rowcount += sqlite.sqlite3_changes(self.connection.db)
+        else:
+            # the parameters are adapted here, and then reset, bound and
+            # executed by batches
+            batch = []
+            for params in many_params:
+                batch.append(self.statement._adapt_params(params))
+                if len(batch) == EXECUTEMANY_BATCH_SIZE:
+                    self._execute_batch(batch)
+                    batch = []
+            if batch:
+                self._execute_batch(batch)
 
         return self
 
+    def _execute_batch(self, batch):
+        statement = self.statement
+        statement.mark_dirty()
+        ret, changes, count = _call_core(_core.execute_many,
+                                         self.connection.db.value,
+                                         statement.statement.value, batch,
+                                         statement._check_ascii())
+        self.rowcount += changes
+        if ret != SQLITE_DONE:
+            raise self.connection._get_exception(ret)
+
     def executescript(self, sql):
         self._description = None
         self.reset = False
@@ -856,19 +888,14 @@ class Cursor(object):
             return []
         if size is None:
             size = self.arraysize
-        lst = []
-        for row in self:
-            lst.append(row)
-            if len(lst) == size:
-                break
-        return lst
+        return self.statement.fetch_rows(self, size)
 
     def fetchall(self):
         self._check_closed()
         self._check_reset()
         if self.statement is None:
             return []
-        return list(self)
+        return self.statement.fetch_rows(self, -1)
 
     def _getdescription(self):
         if self._description is None:
@@ -934,12 +961,17 @@ class Statement(object):
                 next_char.value,)
         # sql_char should remain alive until here
 
+        self.param_count = sqlite.sqlite3_bind_parameter_count(self.statement)
+        self.param_names = None
         self._build_row_cast_map()
 
     def set_row_factory(self, row_factory):
         self.row_factory = row_factory
 
     def _build_row_cast_map(self):
+        if not self.con.detect_types:
+            self.row_cast_map = None
+            return
         self.row_cast_map = []
         for i in xrange(sqlite.sqlite3_column_count(self.statement)):
             converter = None
@@ -966,24 +998,24 @@ class Statement(object):
 
             self.row_cast_map.append(converter)
 
+    def _check_ascii(self):
+        return self.con.text_factory in (unicode, OptimizedUnicode,
+                                         unicode_text_factory)
+
     def _check_decodable(self, param):
-        if self.con.text_factory in (unicode, OptimizedUnicode, unicode_text_factory):
+        if self._check_ascii():
             for c in param:
                 if ord(c) & 0x80 != 0:
-                    raise self.con.ProgrammingError(
-                            "You must not use 8-bit bytestrings unless "
-                            "you use a text_factory that can interpret "
-                            "8-bit bytestrings (like text_factory = str). "
-                            "It is highly recommended that you instead "
-                            "just switch your application to Unicode strings.")
-
-    def set_param(self, idx, param):
+                    raise self.con.ProgrammingError(DECODABLE_ERROR)
+
+    def _adapt_param(self, param):
         cvt = converters.get(type(param))
         if cvt is not None:
             cvt = param = cvt(param)
 
-        param = adapt(param)
+        return adapt(param)
 
+    def _bind_param(self, idx, param):
         if param is None:
             sqlite.sqlite3_bind_null(self.statement, idx)
         elif type(param) in (bool, int, long):
@@ -1004,40 +1036,54 @@ class Statement(object):
         else:
             raise InterfaceError, "parameter type %s is not supported" % str(type(param))
 
-    def set_params(self, params):
-        ret = sqlite.sqlite3_reset(self.statement)
-        if ret != SQLITE_OK:
-            raise self.con._get_exception(ret)
-        self.mark_dirty()
+    def _get_param_names(self):
+        # the names of the parameters, without their ':' prefix
+        if self.param_names is None:
+            names = []
+            for idx in range(1, sqlite.sqlite3_bind_parameter_count(self.statement) + 1):
+                param_name = sqlite.sqlite3_bind_parameter_name(self.statement, idx)
+                if param_name is None:
+                    raise ProgrammingError, "need named parameters"
+                names.append(param_name[1:])
+            self.param_names = names
+        return self.param_names
 
+    def _adapt_params(self, params):
+        """Returns the list of the adapted parameters, in order."""
         if params is None:
-            if sqlite.sqlite3_bind_parameter_count(self.statement) != 0:
+            if self.param_count != 0:
                 raise ProgrammingError("wrong number of arguments")
-            return
+            return []
 
-        params_type = None
         if isinstance(params, dict):
-            params_type = dict
-        else:
-            params_type = list
-
-        if params_type == list:
-            if len(params) != sqlite.sqlite3_bind_parameter_count(self.statement):
-                raise ProgrammingError("wrong number of arguments")
-
-            for i in range(len(params)):
-                self.set_param(i+1, params[i])
-        else:
-            for idx in range(1, sqlite.sqlite3_bind_parameter_count(self.statement) + 1):
-                param_name = sqlite.sqlite3_bind_parameter_name(self.statement, idx)
-                if param_name is None:
-                    raise ProgrammingError, "need named parameters"
-                param_name = param_name[1:]
+            result = []
+            for param_name in self._get_param_names():
                 try:
                     param = params[param_name]
                 except KeyError, e:
                     raise ProgrammingError("missing parameter '%s'" %param)
-                self.set_param(idx, param)
+                result.append(self._adapt_param(param))
+            return result
+
+        if len(params) != self.param_count:
+            raise ProgrammingError("wrong number of arguments")
+        return [self._adapt_param(param) for param in params]
+
+    def set_params(self, params):
+        ret = sqlite.sqlite3_reset(self.statement)
+        if ret != SQLITE_OK:
+            raise self.con._get_exception(ret)
+        self.mark_dirty()
+
+        params = self._adapt_params(params)
+        if _core is None:
+            for i in range(len(params)):
+                self._bind_param(i+1, params[i])
+        else:
+            ret = _call_core(_core.bind_params, self.statement.value, params,
+                             self._check_ascii())
+            if ret != SQLITE_OK:
+                raise self.con._get_exception(ret)
 
     def next(self, cursor):
         self.con._check_closed()
@@ -1054,17 +1100,74 @@ class Statement(object):
             exc = self.con._get_exception(ret)
             sqlite.sqlite3_reset(self.statement)
             raise exc
-
-        self._readahead(cursor)
+        else:
+            self._readahead(cursor)
         return item
 
+    def fetch_rows(self, cursor, size):
+        """Returns a list of the next 'size' rows, or of all the remaining
+        rows if size is negative."""
+        self.con._check_closed()
+        self.con._check_thread()
+        if self.exhausted or size == 0:
+            return []
+        if _core is None:
+            rows = []
+            while size < 0 or len(rows) < size:
+                try:
+                    rows.append(self.next(cursor))
+                except StopIteration:
+                    break
+            return rows
+
+        # the current row is already read; this reads the following ones,
+        # plus one more row to stand on when 'size' is reached
+        rows = [self.item]
+        ret, more = _core.fetch_rows(self.statement.value, size,
+                                     self._text_factory(), self.row_cast_map)
+        if ret == SQLITE_ROW:
+            last = more.pop()
+            if self.row_factory is not None:
+                last = self.row_factory(cursor, last)
+            self.item = last
+        elif ret == SQLITE_DONE:
+            self.exhausted = True
+            self.item = None
+        else:
+            exc = self.con._get_exception(ret)
+            sqlite.sqlite3_reset(self.statement)
+            raise exc
+        if self.row_factory is not None:
+            row_factory = self.row_factory
+            more = [row_factory(cursor, row) for row in more]
+        rows.extend(more)
+        return rows
+
+    def _text_factory(self):
+        # the text factory argument of the _sqlite3_core functions
+        text_factory = self.con.text_factory
+        if text_factory is unicode_text_factory:
+            return None
+        return text_factory
+
     def _readahead(self, cursor):
+        if _core is not None:
+            row = _core.read_current_row(self.statement.value,
+                                         self._text_factory(),
+                                         self.row_cast_map)
+            if self.row_factory is not None:
+                row = self.row_factory(cursor, row)
+            self.item = row
+            return
+
         self.column_count = sqlite.sqlite3_column_count(self.statement)
         row = []
         for i in xrange(self.column_count):
             typ = sqlite.sqlite3_column_type(self.statement, i)
 
-            converter = self.row_cast_map[i]
+            converter = None
+            if self.row_cast_map is not None:
+                converter = self.row_cast_map[i]
             if converter is None:
                 if typ == SQLITE_INTEGER:
                     val = sqlite.sqlite3_column_int64(self.statement, i)
@@ -1199,6 +1302,21 @@ def _check_remaining_sql(s):
                 return 1
     return 0
 
+DECODABLE_ERROR = ("You must not use 8-bit bytestrings unless "
+                   "you use a text_factory that can interpret "
+                   "8-bit bytestrings (like text_factory = str). "
+                   "It is highly recommended that you instead "
+                   "just switch your application to Unicode strings.")
+
+def _call_core(func, *args):
+    # converts the errors of the _sqlite3_core binding functions
+    try:
+        return func(*args)
+    except TypeError, e:
+        raise InterfaceError(str(e))
+    except ValueError:
+        raise ProgrammingError(DECODABLE_ERROR)
+
 def _convert_params(con, nargs, params):
     _params  = []
     for i in range(nargs):
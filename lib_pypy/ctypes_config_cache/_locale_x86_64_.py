@@ -0,0 +1,71 @@
+import ctypes
+
+__all__ = ('ABDAY_1', 'ABDAY_2', 'ABDAY_3', 'ABDAY_4', 'ABDAY_5', 'ABDAY_6', 'ABDAY_7', 'ABMON_1', 'ABMON_10', 'ABMON_11', 'ABMON_12', 'ABMON_2', 'ABMON_3', 'ABMON_4', 'ABMON_5', 'ABMON_6', 'ABMON_7', 'ABMON_8', 'ABMON_9', 'ALL_CONSTANTS', 'ALT_DIGITS', 'AM_STR', 'CHAR_MAX', 'CODESET', 'CRNCYSTR', 'DAY_1', 'DAY_2', 'DAY_3', 'DAY_4', 'DAY_5', 'DAY_6', 'DAY_7', 'D_FMT', 'D_T_FMT', 'ERA', 'ERA_D_FMT', 'ERA_D_T_FMT', 'ERA_T_FMT', 'HAS_LANGINFO', 'LC_ALL', 'LC_COLLATE', 'LC_CTYPE', 'LC_MESSAGES', 'LC_MONETARY', 'LC_NUMERIC', 'LC_TIME', 'MON_1', 'MON_10', 'MON_11', 'MON_12', 'MON_2', 'MON_3', 'MON_4', 'MON_5', 'MON_6', 'MON_7', 'MON_8', 'MON_9', 'NOEXPR', 'PM_STR', 'RADIXCHAR', 'THOUSEP', 'T_FMT', 'T_FMT_AMPM', 'YESEXPR', '_DATE_FMT', 'nl_item')
+
+ABDAY_1 = 131072
+ABDAY_2 = 131073
+ABDAY_3 = 131074
+ABDAY_4 = 131075
+ABDAY_5 = 131076
+ABDAY_6 = 131077
+ABDAY_7 = 131078
+ABMON_1 = 131086
+ABMON_10 = 131095
+ABMON_11 = 131096
+ABMON_12 = 131097
+ABMON_2 = 131087
+ABMON_3 = 131088
+ABMON_4 = 131089
+ABMON_5 = 131090
+ABMON_6 = 131091
+ABMON_7 = 131092
+ABMON_8 = 131093
+ABMON_9 = 131094
+ALL_CONSTANTS = ('LC_CTYPE', 'LC_TIME', 'LC_COLLATE', 'LC_MONETARY', 'LC_MESSAGES', 'LC_NUMERIC', 'LC_ALL', 'CHAR_MAX', 'RADIXCHAR', 'THOUSEP', 'CRNCYSTR', 'D_T_FMT', 'D_FMT', 'T_FMT', 'AM_STR', 'PM_STR', 'CODESET', 'T_FMT_AMPM', 'ERA', 'ERA_D_FMT', 'ERA_D_T_FMT', 'ERA_T_FMT', 'ALT_DIGITS', 'YESEXPR', 'NOEXPR', '_DATE_FMT', 'DAY_1', 'ABDAY_1', 'DAY_2', 'ABDAY_2', 'DAY_3', 'ABDAY_3', 'DAY_4', 'ABDAY_4', 'DAY_5', 'ABDAY_5', 'DAY_6', 'ABDAY_6', 'DAY_7', 'ABDAY_7', 'MON_1', 'ABMON_1', 'MON_2', 'ABMON_2', 'MON_3', 'ABMON_3', 'MON_4', 'ABMON_4', 'MON_5', 'ABMON_5', 'MON_6', 'ABMON_6', 'MON_7', 'ABMON_7', 'MON_8', 'ABMON_8', 'MON_9', 'ABMON_9', 'MON_10', 'ABMON_10', 'MON_11', 'ABMON_11', 'MON_12', 'ABMON_12')
+ALT_DIGITS = 131119
+AM_STR = 131110
+CHAR_MAX = 127
+CODESET = 14
+CRNCYSTR = 262159
+DAY_1 = 131079
+DAY_2 = 131080
+DAY_3 = 131081
+DAY_4 = 131082
+DAY_5 = 131083
+DAY_6 = 131084
+DAY_7 = 131085
+D_FMT = 131113
+D_T_FMT = 131112
+ERA = 131116
+ERA_D_FMT = 131118
+ERA_D_T_FMT = 131120
+ERA_T_FMT = 131121
+HAS_LANGINFO = 1
+LC_ALL = 6
+LC_COLLATE = 3
+LC_CTYPE = 0
+LC_MESSAGES = 5
+LC_MONETARY = 4
+LC_NUMERIC = 1
+LC_TIME = 2
+MON_1 = 131098
+MON_10 = 131107
+MON_11 = 131108
+MON_12 = 131109
+MON_2 = 131099
+MON_3 = 131100
+MON_4 = 131101
+MON_5 = 131102
+MON_6 = 131103
+MON_7 = 131104
+MON_8 = 131105
+MON_9 = 131106
+NOEXPR = 327681
+PM_STR = 131111
+RADIXCHAR = 65536
+THOUSEP = 65537
+T_FMT = 131114
+T_FMT_AMPM = 131115
+YESEXPR = 327680
+_DATE_FMT = 131180
+nl_item = ctypes.c_int
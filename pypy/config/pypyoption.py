@@ -32,9 +32,10 @@ working_modules.update(dict.fromkeys(
      "crypt", "signal", "_rawffi", "termios", "zlib", "bz2",
      "struct", "_hashlib", "_md5", "_sha", "_minimal_curses", "cStringIO",
      "thread", "itertools", "pyexpat", "_ssl", "cpyext", "array",
-     "_bisect", "binascii", "_multiprocessing", '_warnings',
+     "_bisect", "_heapq", "binascii", "_multiprocessing", '_warnings',
      "_collections", "_multibytecodec", "micronumpy", "_ffi",
-     "_continuation"]
+     "_continuation", "greenlet", "_json", "cPickle", "_csv",
+     "datetime", "_sqlite3_core", "_elementtree"]
 ))
 
 translation_modules = default_modules.copy()
@@ -77,6 +78,7 @@ if sys.platform == "sunos5":
 
 
 module_dependencies = {
+    '_elementtree': [('objspace.usemodules.pyexpat', True)],
     '_multiprocessing': [('objspace.usemodules.rctime', True),
                          ('objspace.usemodules.thread', True)],
     }
@@ -99,6 +101,8 @@ module_import_dependencies = {
     "zlib"      : ["pypy.rlib.rzlib"],
     "bz2"       : ["pypy.module.bz2.interp_bz2"],
     "pyexpat"   : ["pypy.module.pyexpat.interp_pyexpat"],
+    "_elementtree": ["pypy.module.pyexpat.interp_pyexpat"],
+    "_sqlite3_core": ["pypy.module._sqlite3_core.interp_sqlite3"],
     "_ssl"      : ["pypy.module._ssl.interp_ssl"],
     "_hashlib"  : ["pypy.module._ssl.interp_ssl"],
     "_minimal_curses": ["pypy.module._minimal_curses.fficurses"],
@@ -170,6 +174,13 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
               cmdline="--ext",
               default=None),
 
+    StrOption("preimportmodules",
+              "Comma-separated list of pure-Python modules to import at "
+              "translation time, so that the translated interpreter "
+              "starts with them already imported",
+              cmdline="--preimport",
+              default=None),
+
     BoolOption("translationmodules",
           "use only those modules that are needed to run translate.py on pypy",
                default=False,
@@ -190,6 +201,10 @@ pypy_optiondescription = OptionDescription("objspace", "Object Space Options", [
                default=False,
                requires=[("objspace.usepycfiles", True)]),
 
+    BoolOption("lazycodeobjects",
+               "Unmarshal the functions of pyc files when they are first used",
+               default=False),
+
     StrOption("soabi",
               "Tag to differentiate extension modules built for different Python interpreters",
               cmdline="--soabi",
@@ -20,6 +20,7 @@ from pypy.interpreter.typedef import TypeDef
 from pypy.interpreter.gateway import interp2app, unwrap_spec
 from pypy.interpreter.error import OperationError
 from pypy.rlib.objectmodel import compute_hash
+from pypy.rpython.lltypesystem import rffi
 
 
 class Buffer(Wrappable):
@@ -43,6 +44,24 @@ class Buffer(Wrappable):
         # May be overridden.  No bounds checks.
         return ''.join([self.getitem(i) for i in range(start, stop, step)])
 
+    def get_raw_address(self):
+        """Returns a CCHARP to the content of the buffer, for buffers
+        whose data lives in non-moving raw memory.  Raises ValueError
+        for all other buffers."""
+        # May be overridden.
+        raise ValueError
+
+    def pin(self):
+        """Keeps the memory returned by get_raw_address() in place until
+        unpin() is called, e.g. while the GIL is released around a system
+        call using it.  Meanwhile the owner of the memory must raise
+        instead of moving or freeing it."""
+        # May be overridden.
+
+    def unpin(self):
+        # May be overridden.
+        pass
+
     # __________ app-level support __________
 
     def descr_len(self, space):
@@ -293,6 +312,15 @@ class SubBufferMixin(object):
                           # out of bounds
         return self.buffer.getslice(self.offset + start, self.offset + stop, step, size)
 
+    def get_raw_address(self):
+        return rffi.ptradd(self.buffer.get_raw_address(), self.offset)
+
+    def pin(self):
+        self.buffer.pin()
+
+    def unpin(self):
+        self.buffer.unpin()
+
 class SubBuffer(SubBufferMixin, Buffer):
     pass
 
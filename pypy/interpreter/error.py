@@ -15,10 +15,14 @@ class OperationError(Exception):
     w_type, _w_value and _application_traceback, which contain the wrapped
     type and value describing the exception, and a chained list of
     PyTraceback objects making the application-level traceback.
+    The most recently recorded traceback entry is only kept as the pair
+    _tb_frame, _tb_lasti until the traceback is really needed.
     """
 
     _w_value = None
     _application_traceback = None
+    _tb_frame = None
+    _tb_lasti = -1
 
     def __init__(self, w_type, w_value, tb=None):
         if not we_are_translated() and w_type is None:
@@ -38,6 +42,7 @@ class OperationError(Exception):
         self.w_type = space.w_None
         self._w_value = space.w_None
         self._application_traceback = None
+        self._tb_frame = None
         if not we_are_translated():
             del self.debug_excs[:]
 
@@ -103,7 +108,7 @@ class OperationError(Exception):
 
     def print_app_tb_only(self, file):
         "NOT_RPYTHON"
-        tb = self._application_traceback
+        tb = self.get_traceback()
         if tb:
             import linecache
             print >> file, "Traceback (application-level):"
@@ -263,11 +268,31 @@ class OperationError(Exception):
         got_exception=True.
         """
         from pypy.interpreter.pytraceback import PyTraceback
+        self._materialize_traceback()
         tb = self._application_traceback
         if tb is not None and isinstance(tb, PyTraceback):
             tb.frame.mark_as_escaped()
         return tb
 
+    def record_traceback_entry(self, frame, lasti):
+        """Record that the exception goes through 'frame' at 'lasti'.
+        No PyTraceback is built for this entry until the next one is
+        recorded or get_traceback() is called, so an exception caught in
+        the frame where it was raised never allocates a traceback.
+        """
+        self._materialize_traceback()
+        self._tb_frame = frame
+        self._tb_lasti = lasti
+
+    def _materialize_traceback(self):
+        frame = self._tb_frame
+        if frame is not None:
+            from pypy.interpreter.pytraceback import PyTraceback
+            self._application_traceback = PyTraceback(
+                frame.space, frame, self._tb_lasti,
+                self._application_traceback)
+            self._tb_frame = None
+
     def set_traceback(self, traceback):
         """Set the current traceback.  It should either be a traceback
         pointing to some already-escaped frame, or a traceback for the
@@ -277,6 +302,7 @@ class OperationError(Exception):
         executioncontext.leave() being called with got_exception=True.
         """
         self._application_traceback = traceback
+        self._tb_frame = None
 
 # ____________________________________________________________
 # optimization only: avoid the slowest operation -- the string
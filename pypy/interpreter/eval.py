@@ -10,7 +10,9 @@ from pypy.interpreter.baseobjspace import Wrappable
 class Code(Wrappable):
     """A code is a compiled version of some source code.
     Abstract base class."""
-    _immutable_ = True
+    # not _immutable_ = True, because of PyCode; the subclasses that are
+    # entirely immutable say so themselves
+    _immutable_fields_ = ["co_name", "hidden_applevel", "fast_natural_arity"]
     hidden_applevel = False
 
     # n >= 0 : arity
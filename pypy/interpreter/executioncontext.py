@@ -310,11 +310,12 @@ class AbstractActionFlag(object):
         self._nonperiodic_actions = []
         self.has_bytecode_counter = False
         self.fired_actions = None
-        # the default value is not 100, unlike CPython 2.7, but a much
-        # larger value, because we use a technique that not only allows
-        # but actually *forces* another thread to run whenever the counter
-        # reaches zero.
-        self.checkinterval_scaled = 10000 * TICK_COUNTER_STEP
+        # the default value is not 100, unlike CPython 2.7, but a larger
+        # value.  Thread switches are not done every checkinterval but
+        # only when another thread has been waiting for the GIL for more
+        # than the switch interval (see sys.setswitchinterval()); the
+        # counter only controls how often this is checked.
+        self.checkinterval_scaled = 1000 * TICK_COUNTER_STEP
         self._rebuild_action_dispatcher()
 
     def fire(self, action):
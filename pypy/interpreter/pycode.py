@@ -49,11 +49,34 @@ def cpython_code_signature(code):
         kwargname = None
     return Signature(argnames, varargname, kwargname)
 
+class LazyCodeBody(object):
+    """The co_code and co_consts of a code object which have not been
+    unmarshalled yet.  See pypy.objspace.std.marshal_impl."""
+    renamed_from = None
+    renamed_to = None
+
+    def load(self, code):
+        """Fill the co_code and co_consts_w of 'code'."""
+        raise NotImplementedError
+
+    def rename(self, oldname, newname):
+        # the nested code objects are not built yet: remember to rename
+        # them when they are (see importing.update_code_filenames())
+        if self.renamed_to is None:
+            self.renamed_from = oldname
+        self.renamed_to = newname
+
 class PyCode(eval.Code):
     "CPython-style code objects."
-    _immutable_ = True
-    _immutable_fields_ = ["co_consts_w[*]", "co_names_w[*]", "co_varnames[*]",
-                          "co_freevars[*]", "co_cellvars[*]"]
+    # not _immutable_ = True: 'lazy_body' is mutable, and the fields
+    # that it fills when the code object is first used are quasi-immutable
+    _immutable_fields_ = ["co_code?", "co_consts_w?[*]", "co_flags?",
+                          "co_filename?", "co_names_w[*]", "co_varnames[*]",
+                          "co_freevars[*]", "co_cellvars[*]",
+                          "co_argcount", "co_nlocals", "co_stacksize",
+                          "co_firstlineno", "co_lnotab", "magic", "space",
+                          "_signature", "_args_as_cellvars",
+                          "_mapdict_caches"]
 
     def __init__(self, space,  argcount, nlocals, stacksize, flags,
                      code, consts, names, varnames, filename,
@@ -80,6 +103,7 @@ class PyCode(eval.Code):
         self.co_lnotab = lnotab
         self.hidden_applevel = hidden_applevel
         self.magic = magic
+        self.lazy_body = None
         self._signature = cpython_code_signature(self)
         self._initialize()
 
@@ -121,7 +145,49 @@ class PyCode(eval.Code):
             from pypy.objspace.std.mapdict import init_mapdict_cache
             init_mapdict_cache(self)
 
+    def set_lazy_body(self, lazy_body):
+        """Called by the unmarshaller: co_code and co_consts_w are only
+        filled by 'lazy_body' the first time they are needed."""
+        assert not self.co_code and not self.co_consts_w
+        self.lazy_body = lazy_body
+
+    def ensure_loaded(self):
+        """Must be called before accessing co_code or co_consts_w, unless
+        the code object is known to run in a frame."""
+        if self.lazy_body is not None:
+            self._load_lazy_body()
+
+    @jit.dont_look_inside
+    def _load_lazy_body(self):
+        lazy_body = self.lazy_body
+        if lazy_body is None:
+            return
+        self.lazy_body = None
+        lazy_body.load(self)
+        self._init_flags()
+        if lazy_body.renamed_to is not None:
+            for w_const in self.co_consts_w:
+                const = self.space.interpclass_w(w_const)
+                if isinstance(const, PyCode):
+                    const.update_filename(lazy_body.renamed_to,
+                                          lazy_body.renamed_from)
+
+    def update_filename(self, pathname, oldname):
+        """Rename the code object and its nested code objects whose
+        filename is 'oldname'."""
+        if self.co_filename != oldname:
+            return
+        self.co_filename = pathname
+        if self.lazy_body is not None:
+            self.lazy_body.rename(oldname, pathname)
+            return
+        for w_const in self.co_consts_w:
+            const = self.space.interpclass_w(w_const)
+            if isinstance(const, PyCode):
+                const.update_filename(pathname, oldname)
+
     def _freeze_(self):
+        self.ensure_loaded()
         if (self.magic == cpython_magic and
             '__pypy__' not in sys.builtin_module_names):
             raise Exception("CPython host codes should not be rendered")
@@ -226,6 +292,7 @@ class PyCode(eval.Code):
         return self.co_varnames
 
     def getdocstring(self, space):
+        self.ensure_loaded()
         if self.co_consts_w:   # it is probably never empty
             w_first = self.co_consts_w[0]
             if space.is_true(space.isinstance(w_first, space.w_basestring)):
@@ -234,6 +301,7 @@ class PyCode(eval.Code):
 
     def _to_code(self):
         """For debugging only."""
+        self.ensure_loaded()
         consts = [None] * len(self.co_consts_w)
         num = 0
         for w in self.co_consts_w:
@@ -268,7 +336,16 @@ class PyCode(eval.Code):
         co = self._to_code()
         dis.dis(co)
 
+    def fget_co_code(self, space):
+        self.ensure_loaded()
+        return space.wrap(self.co_code)
+
+    def fget_co_flags(self, space):
+        self.ensure_loaded()     # for CO_CONTAINSGLOBALS
+        return space.wrap(self.co_flags)
+
     def fget_co_consts(self, space):
+        self.ensure_loaded()
         return space.newtuple(self.co_consts_w)
 
     def fget_co_names(self, space):
@@ -288,6 +365,8 @@ class PyCode(eval.Code):
         other = space.interpclass_w(w_other)
         if not isinstance(other, PyCode):
             return space.w_False
+        self.ensure_loaded()
+        other.ensure_loaded()
         areEqual = (self.co_name == other.co_name and
                     self.co_argcount == other.co_argcount and
                     self.co_nlocals == other.co_nlocals and
@@ -314,6 +393,7 @@ class PyCode(eval.Code):
 
     def descr_code__hash__(self):
         space = self.space
+        self.ensure_loaded()
         result =  compute_hash(self.co_name)
         result ^= self.co_argcount
         result ^= self.co_nlocals
@@ -372,6 +452,7 @@ class PyCode(eval.Code):
         mod      = space.interp_w(MixedModule, w_mod)
         new_inst = mod.get('code_new')
         w        = space.wrap
+        self.ensure_loaded()
         tup      = [
             w(self.co_argcount),
             w(self.co_nlocals),
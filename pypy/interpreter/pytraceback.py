@@ -51,9 +51,7 @@ class PyTraceback(baseobjspace.Wrappable):
 def record_application_traceback(space, operror, frame, last_instruction):
     if frame.pycode.hidden_applevel:
         return
-    tb = operror.get_traceback()
-    tb = PyTraceback(space, frame, last_instruction, tb)
-    operror.set_traceback(tb)
+    operror.record_traceback_entry(frame, last_instruction)
 
 def offset2lineno(c, stopat):
     tab = c.co_lnotab
@@ -97,3 +97,29 @@ def test_new_exception(space):
     assert operr.match(space, space.w_ValueError)
     assert operr.match(space, space.w_TypeError)
 
+
+def test_lazy_traceback(space):
+    from pypy.interpreter.pytraceback import PyTraceback
+    class FakeFrame:
+        escaped = False
+        def __init__(self):
+            self.space = space
+        def mark_as_escaped(self):
+            self.escaped = True
+    frame1 = FakeFrame()
+    frame2 = FakeFrame()
+    operr = OperationError(space.w_ValueError, space.wrap("message"))
+    operr.record_traceback_entry(frame1, 5)
+    assert operr._application_traceback is None
+    operr.record_traceback_entry(frame2, 7)
+    tb = operr._application_traceback
+    assert isinstance(tb, PyTraceback)
+    assert tb.frame is frame1 and tb.lasti == 5 and tb.next is None
+    assert not frame1.escaped
+    tb = operr.get_traceback()
+    assert tb.frame is frame2 and tb.lasti == 7
+    assert tb.next.frame is frame1
+    assert frame2.escaped
+    assert operr.get_traceback() is tb
+    operr.set_traceback(None)
+    assert operr.get_traceback() is None
@@ -280,3 +280,26 @@ class AppTestRaise:
             def __new__(cls, *args):
                 return object()
         raises(TypeError, "raise MyException")
+
+    def test_traceback_chain(self):
+        import sys
+        def f():
+            raise KeyError(5)
+        def g():
+            f()
+        try:
+            g()
+        except KeyError:
+            tb = sys.exc_info()[2]
+        assert tb.tb_frame.f_code.co_name == 'test_traceback_chain'
+        assert tb.tb_next.tb_frame.f_code.co_name == 'g'
+        assert tb.tb_next.tb_next.tb_frame.f_code.co_name == 'f'
+        assert tb.tb_next.tb_next.tb_next is None
+        assert sys.exc_info()[2] is tb
+        # an exception caught in the same frame
+        try:
+            raise ValueError
+        except ValueError:
+            tb = sys.exc_info()[2]
+        assert tb.tb_next is None
+        assert tb.tb_frame is sys._getframe()
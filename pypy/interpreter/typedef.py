@@ -685,8 +685,8 @@ PyCode.typedef = TypeDef('code',
     co_argcount = interp_attrproperty('co_argcount', cls=PyCode),
     co_nlocals = interp_attrproperty('co_nlocals', cls=PyCode),
     co_stacksize = interp_attrproperty('co_stacksize', cls=PyCode),
-    co_flags = interp_attrproperty('co_flags', cls=PyCode),
-    co_code = interp_attrproperty('co_code', cls=PyCode),
+    co_flags = GetSetProperty(PyCode.fget_co_flags),
+    co_code = GetSetProperty(PyCode.fget_co_code),
     co_consts = GetSetProperty(PyCode.fget_co_consts),
     co_names = GetSetProperty(PyCode.fget_co_names),
     co_varnames =  GetSetProperty(PyCode.fget_co_varnames),
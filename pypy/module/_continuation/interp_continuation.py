@@ -53,11 +53,14 @@ class W_Continulet(Wrappable):
         post_switch(sthread, h)
 
     def switch(self, w_to):
+        to = self.space.interp_w(W_Continulet, w_to, can_be_None=True)
+        return self.switch_to(to)
+
+    def switch_to(self, to):
         sthread = self.sthread
         if sthread is not None and sthread.is_empty_handle(self.h):
             global_state.clear()
             raise geterror(self.space, "continulet already finished")
-        to = self.space.interp_w(W_Continulet, w_to, can_be_None=True)
         if to is not None and to.sthread is None:
             to = None
         if sthread is None:      # if self is non-initialized:
@@ -0,0 +1,256 @@
+from pypy.interpreter.baseobjspace import Wrappable
+from pypy.interpreter.error import OperationError, operationerrfmt
+from pypy.interpreter.gateway import interp2app, NoneNotWrapped
+from pypy.interpreter.typedef import TypeDef, GetSetProperty
+from pypy.interpreter.typedef import interp_attrproperty
+
+
+QUOTE_MINIMAL, QUOTE_ALL, QUOTE_NONNUMERIC, QUOTE_NONE = range(4)
+
+
+class Cache:
+    def __init__(self, space):
+        self.w_error = space.getattr(space.getbuiltinmodule('_csv'),
+                                     space.wrap('Error'))
+        self.w_dialects = space.newdict()
+        self.field_limit = 128 * 1024     # max parsed field size
+
+def csv_error(space, msg):
+    w_error = space.fromcache(Cache).w_error
+    return OperationError(w_error, space.wrap(msg))
+
+# ____________________________________________________________
+
+class W_Dialect(Wrappable):
+    """CSV dialect
+
+The Dialect type records CSV parsing and generation options."""
+    # the optional characters 'escapechar' and 'quotechar' are '\0' if
+    # they are not set
+
+    def __init__(self, delimiter, doublequote, escapechar, lineterminator,
+                 quotechar, quoting, skipinitialspace, strict):
+        self.delimiter = delimiter
+        self.doublequote = doublequote
+        self.escapechar = escapechar
+        self.lineterminator = lineterminator
+        self.quotechar = quotechar
+        self.quoting = quoting
+        self.skipinitialspace = skipinitialspace
+        self.strict = strict
+
+
+def _get_bool(space, w_src, default):
+    if w_src is None:
+        return default
+    return space.is_true(w_src)
+
+def _get_char(space, name, w_src, default):
+    if w_src is None:
+        return default
+    if space.is_w(w_src, space.w_None):
+        return '\0'
+    if not space.isinstance_w(w_src, space.w_str):
+        raise operationerrfmt(space.w_TypeError,
+                              '"%s" must be string, not %s', name,
+                              space.type(w_src).getname(space))
+    src = space.str_w(w_src)
+    if len(src) > 1:
+        raise operationerrfmt(space.w_TypeError,
+                              '"%s" must be an 1-character string', name)
+    if len(src) == 0:
+        return '\0'
+    return src[0]
+
+def _get_str(space, name, w_src, default):
+    if w_src is None:
+        return default
+    if space.is_w(w_src, space.w_None):
+        return ''
+    if not space.isinstance_w(w_src, space.w_str):
+        raise operationerrfmt(space.w_TypeError, '"%s" must be a string',
+                              name)
+    return space.str_w(w_src)
+
+def _get_int(space, name, w_src, default):
+    if w_src is None:
+        return default
+    if not space.isinstance_w(w_src, space.w_int):
+        raise operationerrfmt(space.w_TypeError, '"%s" must be an integer',
+                              name)
+    return space.int_w(w_src)
+
+def W_Dialect___new__(space, w_subtype, w_dialect=NoneNotWrapped,
+                      w_delimiter=NoneNotWrapped,
+                      w_doublequote=NoneNotWrapped,
+                      w_escapechar=NoneNotWrapped,
+                      w_lineterminator=NoneNotWrapped,
+                      w_quotechar=NoneNotWrapped,
+                      w_quoting=NoneNotWrapped,
+                      w_skipinitialspace=NoneNotWrapped,
+                      w_strict=NoneNotWrapped):
+    if w_dialect is not None:
+        if space.isinstance_w(w_dialect, space.w_basestring):
+            w_dialect = get_dialect(space, w_dialect)
+        # Can we reuse this instance?
+        if (space.is_w(space.type(w_dialect),
+                       space.gettypeobject(W_Dialect.typedef)) and
+            w_delimiter is None and w_doublequote is None and
+            w_escapechar is None and w_lineterminator is None and
+            w_quotechar is None and w_quoting is None and
+            w_skipinitialspace is None and w_strict is None):
+            return w_dialect
+        if w_delimiter is None:
+            w_delimiter = space.findattr(w_dialect, space.wrap('delimiter'))
+        if w_doublequote is None:
+            w_doublequote = space.findattr(w_dialect,
+                                           space.wrap('doublequote'))
+        if w_escapechar is None:
+            w_escapechar = space.findattr(w_dialect, space.wrap('escapechar'))
+        if w_lineterminator is None:
+            w_lineterminator = space.findattr(w_dialect,
+                                              space.wrap('lineterminator'))
+        if w_quotechar is None:
+            w_quotechar = space.findattr(w_dialect, space.wrap('quotechar'))
+        if w_quoting is None:
+            w_quoting = space.findattr(w_dialect, space.wrap('quoting'))
+        if w_skipinitialspace is None:
+            w_skipinitialspace = space.findattr(w_dialect,
+                                                space.wrap('skipinitialspace'))
+        if w_strict is None:
+            w_strict = space.findattr(w_dialect, space.wrap('strict'))
+
+    delimiter = _get_char(space, 'delimiter', w_delimiter, ',')
+    doublequote = _get_bool(space, w_doublequote, True)
+    escapechar = _get_char(space, 'escapechar', w_escapechar, '\0')
+    lineterminator = _get_str(space, 'lineterminator', w_lineterminator,
+                              '\r\n')
+    quotechar = _get_char(space, 'quotechar', w_quotechar, '"')
+    quoting = _get_int(space, 'quoting', w_quoting, QUOTE_MINIMAL)
+    skipinitialspace = _get_bool(space, w_skipinitialspace, False)
+    strict = _get_bool(space, w_strict, False)
+
+    # validate options
+    if not (0 <= quoting < 4):
+        raise OperationError(space.w_TypeError,
+                             space.wrap('bad "quoting" value'))
+    if (w_quotechar is not None and space.is_w(w_quotechar, space.w_None)
+            and w_quoting is None):
+        quoting = QUOTE_NONE
+    if delimiter == '\0':
+        raise OperationError(space.w_TypeError,
+                             space.wrap("delimiter must be set"))
+    if quoting != QUOTE_NONE and quotechar == '\0':
+        raise OperationError(space.w_TypeError,
+                space.wrap("quotechar must be set if quoting enabled"))
+    if not lineterminator:
+        raise OperationError(space.w_TypeError,
+                             space.wrap("lineterminator must be set"))
+
+    w_result = space.allocate_instance(W_Dialect, w_subtype)
+    W_Dialect.__init__(w_result, delimiter, doublequote, escapechar,
+                       lineterminator, quotechar, quoting, skipinitialspace,
+                       strict)
+    return space.wrap(w_result)
+
+def _get_escapechar(space, dialect):
+    if dialect.escapechar == '\0':
+        return space.w_None
+    return space.wrap(dialect.escapechar)
+
+def _get_quotechar(space, dialect):
+    if dialect.quotechar == '\0':
+        return space.w_None
+    return space.wrap(dialect.quotechar)
+
+W_Dialect.typedef = TypeDef(
+    'Dialect',
+    __module__ = '_csv',
+    __doc__ = W_Dialect.__doc__,
+    __new__ = interp2app(W_Dialect___new__),
+    delimiter        = interp_attrproperty('delimiter', W_Dialect),
+    doublequote      = interp_attrproperty('doublequote', W_Dialect),
+    escapechar       = GetSetProperty(_get_escapechar, cls=W_Dialect),
+    lineterminator   = interp_attrproperty('lineterminator', W_Dialect),
+    quotechar        = GetSetProperty(_get_quotechar, cls=W_Dialect),
+    quoting          = interp_attrproperty('quoting', W_Dialect),
+    skipinitialspace = interp_attrproperty('skipinitialspace', W_Dialect),
+    strict           = interp_attrproperty('strict', W_Dialect),
+    )
+
+def call_dialect(space, __args__):
+    """Builds a Dialect from the optional dialect argument and the keyword
+    arguments given to reader(), writer() or register_dialect()."""
+    w_dialect_type = space.gettypeobject(W_Dialect.typedef)
+    w_dialect = space.call_args(w_dialect_type, __args__)
+    return space.interp_w(W_Dialect, w_dialect)
+
+def split_first_argument(space, funcname, __args__):
+    args_w = __args__.arguments_w
+    if len(args_w) == 0:
+        raise operationerrfmt(space.w_TypeError,
+                              "%s() expected at least 1 argument", funcname)
+    if len(args_w) > 2:
+        raise operationerrfmt(space.w_TypeError,
+                              "%s() expected at most 2 arguments, got %d",
+                              funcname, len(args_w))
+    return args_w[0], __args__.replace_arguments(args_w[1:])
+
+# ____________________________________________________________
+
+def register_dialect(space, __args__):
+    """Create a mapping from a string name to a dialect class.
+    dialect = csv.register_dialect(name, dialect)"""
+    w_name, __args__ = split_first_argument(space, 'register_dialect',
+                                            __args__)
+    if not space.isinstance_w(w_name, space.w_basestring):
+        raise OperationError(space.w_TypeError, space.wrap(
+            "dialect name must be a string or unicode"))
+    dialect = call_dialect(space, __args__)
+    space.setitem(space.fromcache(Cache).w_dialects, w_name,
+                  space.wrap(dialect))
+
+def unregister_dialect(space, w_name):
+    """Delete the name/dialect mapping associated with a string name.
+    csv.unregister_dialect(name)"""
+    w_dialects = space.fromcache(Cache).w_dialects
+    try:
+        space.delitem(w_dialects, w_name)
+    except OperationError, e:
+        if not e.match(space, space.w_KeyError):
+            raise
+        raise csv_error(space, "unknown dialect")
+
+def get_dialect(space, w_name):
+    """Return the dialect instance associated with name.
+    dialect = csv.get_dialect(name)"""
+    w_dialects = space.fromcache(Cache).w_dialects
+    w_dialect = space.finditem(w_dialects, w_name)
+    if w_dialect is None:
+        raise csv_error(space, "unknown dialect")
+    return w_dialect
+
+def list_dialects(space):
+    """Return a list of all know dialect names.
+    names = csv.list_dialects()"""
+    return space.call_method(space.fromcache(Cache).w_dialects, 'keys')
+
+def field_size_limit(space, args_w):
+    """Sets an upper limit on parsed fields.
+    csv.field_size_limit([limit])
+
+Returns old limit. If limit is not given, no new limit is set and
+the old limit is returned"""
+    if len(args_w) > 1:
+        raise operationerrfmt(space.w_TypeError,
+            "field_size_limit expected at most 1 arguments, got %d",
+            len(args_w))
+    cache = space.fromcache(Cache)
+    old_limit = cache.field_limit
+    if len(args_w) == 1:
+        w_limit = args_w[0]
+        if not space.isinstance_w(w_limit, space.w_int):
+            raise OperationError(space.w_TypeError,
+                                 space.wrap("limit must be an integer"))
+        cache.field_limit = space.int_w(w_limit)
+    return space.wrap(old_limit)
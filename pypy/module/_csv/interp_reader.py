@@ -0,0 +1,288 @@
+from pypy.interpreter.baseobjspace import Wrappable
+from pypy.interpreter.error import OperationError
+from pypy.interpreter.gateway import interp2app
+from pypy.interpreter.typedef import TypeDef
+from pypy.interpreter.typedef import interp_attrproperty_w, interp_attrproperty
+from pypy.rlib.rstring import StringBuilder
+from pypy.module._csv.interp_csv import Cache, csv_error, QUOTE_NONE
+from pypy.module._csv.interp_csv import QUOTE_NONNUMERIC
+from pypy.module._csv.interp_csv import call_dialect, split_first_argument
+
+
+(START_RECORD, START_FIELD, ESCAPED_CHAR, IN_FIELD,
+ IN_QUOTED_FIELD, ESCAPE_IN_QUOTED_FIELD, QUOTE_IN_QUOTED_FIELD,
+ EAT_CRNL) = range(8)
+
+
+class W_Reader(Wrappable):
+    """CSV reader
+
+Reader objects are responsible for reading and parsing tabular data
+in CSV format."""
+
+    def __init__(self, space, dialect, w_iter):
+        self.space = space
+        self.dialect = dialect
+        self.w_iter = w_iter
+        self.line_num = 0
+
+    def iter_w(self):
+        return self.space.wrap(self)
+
+    def error(self, msg):
+        return csv_error(self.space, msg)
+
+    def parse_reset(self):
+        self.fields_w = []
+        self.field = StringBuilder()
+        self.field_len = 0
+        self.numeric_field = False
+        self.state = START_RECORD
+        self.field_limit = self.space.fromcache(Cache).field_limit
+
+    def save_field(self):
+        space = self.space
+        field = self.field.build()
+        self.field = StringBuilder()
+        self.field_len = 0
+        if self.numeric_field:
+            self.numeric_field = False
+            w_obj = space.call_function(space.w_float, space.wrap(field))
+        else:
+            w_obj = space.wrap(field)
+        self.fields_w.append(w_obj)
+
+    def add_char(self, c):
+        if self.field_len >= self.field_limit:
+            raise self.error("field larger than field limit (%d)" %
+                             self.field_limit)
+        self.field.append(c)
+        self.field_len += 1
+
+    def add_slice(self, line, start, end):
+        # adds a whole run of ordinary characters at once
+        if self.field_len + (end - start) > self.field_limit:
+            raise self.error("field larger than field limit (%d)" %
+                             self.field_limit)
+        self.field.append_slice(line, start, end)
+        self.field_len += end - start
+
+    def next_w(self):
+        space = self.space
+        dialect = self.dialect
+        self.parse_reset()
+        while True:
+            try:
+                w_line = space.next(self.w_iter)
+            except OperationError, e:
+                if e.match(space, space.w_StopIteration):
+                    if self.field_len != 0 or self.state == IN_QUOTED_FIELD:
+                        if dialect.strict:
+                            raise self.error("unexpected end of data")
+                        self.save_field()
+                        break
+                raise
+            self.line_num += 1
+            if space.isinstance_w(w_line, space.w_str):
+                line = space.str_w(w_line)
+            elif space.isinstance_w(w_line, space.w_unicode):
+                line = space.str_w(space.str(w_line))
+            else:
+                raise self.error("expected string or Unicode object, %s found"
+                                 % space.type(w_line).getname(space))
+            if line.find('\0') >= 0:
+                raise self.error("line contains NULL byte")
+            self.process_line(line)
+            self.process_char('\0')    # end of the line
+            if self.state == START_RECORD:
+                break
+        fields_w = self.fields_w
+        self.fields_w = []
+        return space.newlist(fields_w)
+
+    def process_line(self, line):
+        # the states that would append many characters one by one scan
+        # the line directly for the next character that matters
+        dialect = self.dialect
+        end = len(line)
+        i = 0
+        while i < end:
+            state = self.state
+            if state == IN_FIELD:
+                j = i
+                while j < end:
+                    c = line[j]
+                    if (c == '\n' or c == '\r' or c == dialect.delimiter or
+                            c == dialect.escapechar):
+                        break
+                    j += 1
+                if j > i:
+                    self.add_slice(line, i, j)
+                    i = j
+                    continue
+            elif state == IN_QUOTED_FIELD:
+                quotechar = dialect.quotechar
+                if dialect.quoting == QUOTE_NONE:
+                    quotechar = '\0'
+                j = i
+                while j < end:
+                    c = line[j]
+                    if c == quotechar or c == dialect.escapechar:
+                        break
+                    j += 1
+                if j > i:
+                    self.add_slice(line, i, j)
+                    i = j
+                    continue
+            self.process_char(line[i])
+            i += 1
+
+    def process_char(self, c):
+        # '\0' stands for the end of the line, there is no NULL byte in
+        # the lines themselves
+        dialect = self.dialect
+        state = self.state
+        if state == START_RECORD:
+            if c == '\0':
+                # empty line - return []
+                return
+            elif c == '\n' or c == '\r':
+                self.state = EAT_CRNL
+                return
+            # normal character - handle as START_FIELD
+            self.state = state = START_FIELD
+        if state == START_FIELD:
+            if c == '\n' or c == '\r' or c == '\0':
+                # save empty field - return [fields]
+                self.save_field()
+                if c == '\0':
+                    self.state = START_RECORD
+                else:
+                    self.state = EAT_CRNL
+            elif c == dialect.quotechar and dialect.quoting != QUOTE_NONE:
+                # start quoted field
+                self.state = IN_QUOTED_FIELD
+            elif c == dialect.escapechar:
+                # possible escaped character
+                self.state = ESCAPED_CHAR
+            elif c == ' ' and dialect.skipinitialspace:
+                # ignore space at start of field
+                pass
+            elif c == dialect.delimiter:
+                # save empty field
+                self.save_field()
+            else:
+                # begin new unquoted field
+                if dialect.quoting == QUOTE_NONNUMERIC:
+                    self.numeric_field = True
+                self.add_char(c)
+                self.state = IN_FIELD
+        elif state == ESCAPED_CHAR:
+            if c == '\0':
+                c = '\n'
+            self.add_char(c)
+            self.state = IN_FIELD
+        elif state == IN_FIELD:
+            # in unquoted field
+            if c == '\n' or c == '\r' or c == '\0':
+                # end of line - return [fields]
+                self.save_field()
+                if c == '\0':
+                    self.state = START_RECORD
+                else:
+                    self.state = EAT_CRNL
+            elif c == dialect.escapechar:
+                # possible escaped character
+                self.state = ESCAPED_CHAR
+            elif c == dialect.delimiter:
+                # save field - wait for new field
+                self.save_field()
+                self.state = START_FIELD
+            else:
+                # normal character - save in field
+                self.add_char(c)
+        elif state == IN_QUOTED_FIELD:
+            # in quoted field
+            if c == '\0':
+                pass
+            elif c == dialect.escapechar:
+                # possible escape character
+                self.state = ESCAPE_IN_QUOTED_FIELD
+            elif c == dialect.quotechar and dialect.quoting != QUOTE_NONE:
+                if dialect.doublequote:
+                    # doublequote; " represented by ""
+                    self.state = QUOTE_IN_QUOTED_FIELD
+                else:
+                    # end of quote part of field
+                    self.state = IN_FIELD
+            else:
+                # normal character - save in field
+                self.add_char(c)
+        elif state == ESCAPE_IN_QUOTED_FIELD:
+            if c == '\0':
+                c = '\n'
+            self.add_char(c)
+            self.state = IN_QUOTED_FIELD
+        elif state == QUOTE_IN_QUOTED_FIELD:
+            # doublequote - seen a quote in a quoted field
+            if dialect.quoting != QUOTE_NONE and c == dialect.quotechar:
+                # save "" as "
+                self.add_char(c)
+                self.state = IN_QUOTED_FIELD
+            elif c == dialect.delimiter:
+                # save field - wait for new field
+                self.save_field()
+                self.state = START_FIELD
+            elif c == '\n' or c == '\r' or c == '\0':
+                # end of line - return [fields]
+                self.save_field()
+                if c == '\0':
+                    self.state = START_RECORD
+                else:
+                    self.state = EAT_CRNL
+            elif not dialect.strict:
+                self.add_char(c)
+                self.state = IN_FIELD
+            else:
+                # illegal
+                raise self.error("'%s' expected after '%s'" % (
+                    dialect.delimiter, dialect.quotechar))
+        elif state == EAT_CRNL:
+            if c == '\n' or c == '\r':
+                pass
+            elif c == '\0':
+                self.state = START_RECORD
+            else:
+                raise self.error("new-line character seen in unquoted field - "
+                                 "do you need to open the file in "
+                                 "universal-newline mode?")
+
+
+def csv_reader(space, __args__):
+    """    csv_reader = reader(iterable [, dialect='excel']
+                        [optional keyword args])
+    for row in csv_reader:
+        process(row)
+
+The "iterable" argument can be any object that returns a line
+of input for each iteration, such as a file object or a list.  The
+optional "dialect" parameter is discussed below.  The function
+also accepts optional keyword arguments which override settings
+provided by the dialect.
+
+The returned object is an iterator.  Each iteration returns a row
+of the CSV file (which can span multiple input lines).
+"""
+    w_iterator, __args__ = split_first_argument(space, 'reader', __args__)
+    dialect = call_dialect(space, __args__)
+    return W_Reader(space, dialect, space.iter(w_iterator))
+
+W_Reader.typedef = TypeDef(
+    '_csv.reader',
+    __doc__ = W_Reader.__doc__,
+    dialect = interp_attrproperty_w('dialect', W_Reader),
+    line_num = interp_attrproperty('line_num', W_Reader),
+    __iter__ = interp2app(W_Reader.iter_w),
+    next = interp2app(W_Reader.next_w),
+    )
+W_Reader.typedef.acceptable_as_base_class = False
@@ -0,0 +1,159 @@
+from pypy.interpreter.baseobjspace import Wrappable
+from pypy.interpreter.error import OperationError
+from pypy.interpreter.gateway import interp2app
+from pypy.interpreter.typedef import TypeDef, interp_attrproperty_w
+from pypy.rlib.rstring import StringBuilder
+from pypy.module._csv.interp_csv import csv_error, QUOTE_ALL
+from pypy.module._csv.interp_csv import QUOTE_NONNUMERIC, QUOTE_NONE
+from pypy.module._csv.interp_csv import call_dialect, split_first_argument
+
+
+class W_Writer(Wrappable):
+    """CSV writer
+
+Writer objects are responsible for generating tabular data
+in CSV format from sequence input."""
+
+    def __init__(self, space, dialect, w_writeline):
+        self.space = space
+        self.dialect = dialect
+        self.w_writeline = w_writeline
+
+    def is_special(self, c):
+        dialect = self.dialect
+        return (c == dialect.delimiter or c == dialect.escapechar or
+                c == dialect.quotechar or
+                dialect.lineterminator.find(c) >= 0)
+
+    def join_append(self, rec, field, quoted, quote_empty):
+        space = self.space
+        dialect = self.dialect
+        # like in CPython, the field stops at the first NULL byte
+        end = field.find('\0')
+        if end < 0:
+            end = len(field)
+        # first pass: check if the field must be quoted
+        has_special = False
+        for i in range(end):
+            c = field[i]
+            if self.is_special(c):
+                has_special = True
+                want_escape = False
+                if dialect.quoting == QUOTE_NONE:
+                    want_escape = True
+                elif c == dialect.quotechar and not dialect.doublequote:
+                    want_escape = True
+                else:
+                    quoted = True
+                if want_escape and dialect.escapechar == '\0':
+                    raise csv_error(space,
+                                    "need to escape, but no escapechar set")
+        # if the field is empty check if it needs to be quoted
+        if end == 0 and quote_empty:
+            if dialect.quoting == QUOTE_NONE:
+                raise csv_error(space,
+                                "single empty field record must be quoted")
+            quoted = True
+        # second pass: copy the field into the record
+        if quoted:
+            rec.append(dialect.quotechar)
+        if not has_special:
+            rec.append_slice(field, 0, end)
+        else:
+            for i in range(end):
+                c = field[i]
+                if self.is_special(c):
+                    if dialect.quoting == QUOTE_NONE:
+                        rec.append(dialect.escapechar)
+                    elif c == dialect.quotechar:
+                        if dialect.doublequote:
+                            rec.append(dialect.quotechar)
+                        else:
+                            rec.append(dialect.escapechar)
+                rec.append(c)
+        if quoted:
+            rec.append(dialect.quotechar)
+
+    def writerow(self, w_fields):
+        """writerow(sequence)
+
+Construct and write a CSV record from a sequence of fields.  Non-string
+elements will be converted to string."""
+        space = self.space
+        dialect = self.dialect
+        try:
+            fields_w = space.fixedview(w_fields)
+        except OperationError, e:
+            if not e.match(space, space.w_TypeError):
+                raise
+            raise csv_error(space, "sequence expected")
+        rec = StringBuilder()
+        quote_empty = len(fields_w) == 1
+        for i in range(len(fields_w)):
+            w_field = fields_w[i]
+            if dialect.quoting == QUOTE_NONNUMERIC:
+                quoted = not (space.lookup(w_field, '__int__') is not None or
+                              space.lookup(w_field, '__float__') is not None)
+            elif dialect.quoting == QUOTE_ALL:
+                quoted = True
+            else:
+                quoted = False
+            if i > 0:
+                rec.append(dialect.delimiter)
+            if space.isinstance_w(w_field, space.w_str):
+                field = space.str_w(w_field)
+            elif space.is_w(w_field, space.w_None):
+                field = ''
+            else:
+                field = space.str_w(space.str(w_field))
+            self.join_append(rec, field, quoted, quote_empty)
+        rec.append(dialect.lineterminator)
+        return space.call_function(self.w_writeline, space.wrap(rec.build()))
+
+    def writerows(self, w_seqseq):
+        """writerows(sequence of sequences)
+
+Construct and write a series of sequences to a csv file.  Non-string
+elements will be converted to string."""
+        space = self.space
+        w_iter = space.iter(w_seqseq)
+        while True:
+            try:
+                w_seq = space.next(w_iter)
+            except OperationError, e:
+                if not e.match(space, space.w_StopIteration):
+                    raise
+                break
+            self.writerow(w_seq)
+
+
+def csv_writer(space, __args__):
+    """    csv_writer = csv.writer(fileobj [, dialect='excel']
+                            [optional keyword args])
+    for row in sequence:
+        csv_writer.writerow(row)
+
+    [or]
+
+    csv_writer = csv.writer(fileobj [, dialect='excel']
+                            [optional keyword args])
+    csv_writer.writerows(rows)
+
+The "fileobj" argument can be any object that supports the file API.
+"""
+    w_fileobj, __args__ = split_first_argument(space, 'writer', __args__)
+    w_writeline = space.findattr(w_fileobj, space.wrap('write'))
+    if w_writeline is None or not space.is_true(space.callable(w_writeline)):
+        raise OperationError(space.w_TypeError, space.wrap(
+            'argument 1 must have a "write" method'))
+    dialect = call_dialect(space, __args__)
+    return W_Writer(space, dialect, w_writeline)
+
+W_Writer.typedef = TypeDef(
+    '_csv.writer',
+    __doc__ = W_Writer.__doc__,
+    dialect = interp_attrproperty_w('dialect', W_Writer),
+    writerow = interp2app(W_Writer.writerow),
+    writerows = interp2app(W_Writer.writerows),
+    )
+W_Writer.typedef.acceptable_as_base_class = False
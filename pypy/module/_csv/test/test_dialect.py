@@ -0,0 +1,97 @@
+from pypy.conftest import gettestobjspace
+
+
+class AppTestDialect(object):
+    def setup_class(cls):
+        cls.space = gettestobjspace(usemodules=['_csv'])
+
+    def test_register_dialect(self):
+        import _csv
+
+        attrs = [('delimiter', ','),
+                 ('doublequote', True),
+                 ('escapechar', None),
+                 ('lineterminator', '\r\n'),
+                 ('quotechar', '"'),
+                 ('quoting', _csv.QUOTE_MINIMAL),
+                 ('skipinitialspace', False),
+                 ('strict', False),
+                 ]
+
+        for changeattr, newvalue in [('delimiter', ':'),
+                                     ('doublequote', False),
+                                     ('escapechar', '/'),
+                                     ('lineterminator', '---\n'),
+                                     ('quotechar', '%'),
+                                     ('quoting', _csv.QUOTE_NONNUMERIC),
+                                     ('skipinitialspace', True),
+                                     ('strict', True)]:
+            kwargs = {changeattr: newvalue}
+            _csv.register_dialect('foo1', **kwargs)
+            d = _csv.get_dialect('foo1')
+            assert d.__class__.__name__ == 'Dialect'
+            for attr, default in attrs:
+                if attr == changeattr:
+                    expected = newvalue
+                else:
+                    expected = default
+                assert getattr(d, attr) == expected
+            raises(TypeError, setattr, d, 'delimiter', ':')
+        _csv.unregister_dialect('foo1')
+        raises(_csv.Error, _csv.get_dialect, 'foo1')
+        raises(_csv.Error, _csv.unregister_dialect, 'foo1')
+
+    def test_list_dialects(self):
+        import _csv
+        assert 'bar' not in _csv.list_dialects()
+        _csv.register_dialect('bar', delimiter=';')
+        try:
+            assert 'bar' in _csv.list_dialects()
+            d = _csv.Dialect('bar')
+            assert d is _csv.get_dialect('bar')
+            assert _csv.Dialect('bar', quotechar="'").delimiter == ';'
+        finally:
+            _csv.unregister_dialect('bar')
+
+    def test_dialect_from_class(self):
+        import _csv
+        class semicolon:
+            delimiter = ';'
+            quotechar = None
+            lineterminator = '\n'
+        d = _csv.Dialect(semicolon)
+        assert d.delimiter == ';'
+        assert d.quotechar is None
+        assert d.quoting == _csv.QUOTE_NONE
+        assert d.lineterminator == '\n'
+        assert d.doublequote is True
+
+    def test_bad_dialect(self):
+        import _csv
+        raises(TypeError, _csv.Dialect, delimiter='')
+        raises(TypeError, _csv.Dialect, delimiter='::')
+        raises(TypeError, _csv.Dialect, delimiter=1)
+        raises(TypeError, _csv.Dialect, quoting=42)
+        raises(TypeError, _csv.Dialect, quoting='1')
+        raises(TypeError, _csv.Dialect, lineterminator='')
+        raises(TypeError, _csv.Dialect, lineterminator=1)
+        raises(TypeError, _csv.Dialect, quotechar=None,
+               quoting=_csv.QUOTE_MINIMAL)
+        raises(TypeError, _csv.register_dialect, 42)
+        raises(TypeError, _csv.register_dialect)
+        raises(_csv.Error, _csv.Dialect, 'unknown')
+
+    def test_field_size_limit(self):
+        import _csv
+        old = _csv.field_size_limit()
+        assert old == 128 * 1024
+        assert _csv.field_size_limit(10) == old
+        try:
+            r = _csv.reader(['a' * 10 + ',' + 'b' * 11])
+            raises(_csv.Error, r.next)
+            r = _csv.reader(['"%s"' % ('a' * 11,)])
+            raises(_csv.Error, r.next)
+        finally:
+            _csv.field_size_limit(old)
+        raises(TypeError, _csv.field_size_limit, 'x')
+        raises(TypeError, _csv.field_size_limit, 1, 2)
@@ -0,0 +1,92 @@
+from pypy.conftest import gettestobjspace
+
+
+class AppTestReader(object):
+    def setup_class(cls):
+        cls.space = gettestobjspace(usemodules=['_csv'])
+
+        w__read_test = cls.space.appexec([], r"""():
+            import _csv
+            def _read_test(input, expect, **kwargs):
+                reader = _csv.reader(input, **kwargs)
+                if expect == 'Error':
+                    raises(_csv.Error, list, reader)
+                    return
+                result = list(reader)
+                assert result == expect, 'result: %r\nexpect: %r' % (
+                    result, expect)
+            return _read_test
+        """)
+        if type(w__read_test) is type(lambda:0):
+            w__read_test = staticmethod(w__read_test)
+        cls.w__read_test = w__read_test
+
+    def test_simple_reader(self):
+        self._read_test(['foo:bar\n'], [['foo', 'bar']], delimiter=':')
+        self._read_test(['a,b,c\r\n', '1,2,3\r\n'],
+                        [['a', 'b', 'c'], ['1', '2', '3']])
+        self._read_test(['', ',', 'a,'], [[], ['', ''], ['a', '']])
+        self._read_test([u'abc,def'], [['abc', 'def']])
+
+    def test_read_quoting(self):
+        import _csv
+        self._read_test(['"a,b",c'], [['a,b', 'c']])
+        self._read_test(['"a""b",c'], [['a"b', 'c']])
+        self._read_test(['"a\nb\n', 'c"\n'], [['a\nb\nc']])
+        self._read_test(['"ab"c'], [['abc']])
+        self._read_test(['"ab"c'], 'Error', strict=True)
+        self._read_test(['"ab'], [['ab']])
+        self._read_test(['"ab'], 'Error', strict=True)
+        self._read_test(['"a"b"'], [['ab"']], doublequote=False,
+                        escapechar=None, strict=False)
+        self._read_test(['"a,b"'], [['"a', 'b"']], quotechar=None)
+        self._read_test(['1,"2",3'], [[1.0, '2', 3.0]],
+                        quoting=2)
+        raises(ValueError, _csv.reader(['1,abc'], quoting=2).next)
+
+    def test_read_escape(self):
+        self._read_test(['a\\,b,c'], [['a,b', 'c']], escapechar='\\')
+        self._read_test(['"a\\"b",c'], [['a"b', 'c']], escapechar='\\')
+        self._read_test(['a\\'], [['a\n']], escapechar='\\')
+        self._read_test(['a,b\\,c'], [['a', 'b,c']], escapechar='\\',
+                        quoting=3)
+
+    def test_read_skipinitialspace(self):
+        self._read_test(['a, b,  c'], [['a', 'b', 'c']],
+                        skipinitialspace=True)
+        self._read_test(['a, b'], [['a', ' b']])
+
+    def test_read_eol(self):
+        self._read_test(['a,b\r'], [['a', 'b']])
+        self._read_test(['a,b\n'], [['a', 'b']])
+        self._read_test(['a,b\r\n'], [['a', 'b']])
+        self._read_test(['a,b\rc,d'], 'Error')
+        self._read_test(['a\0b'], 'Error')
+
+    def test_read_bigfield(self):
+        limit = 128 * 1024
+        field = 'x' * (limit - 1)
+        self._read_test([field + ',y'], [[field, 'y']])
+        self._read_test(['"%s",y' % field], [[field, 'y']])
+
+    def test_line_num(self):
+        import _csv
+        r = _csv.reader(['a,b\n', '"c\n', 'd"\n', 'e\n'])
+        assert r.line_num == 0
+        assert r.next() == ['a', 'b']
+        assert r.line_num == 1
+        assert r.next() == ['c\nd']
+        assert r.line_num == 3
+        assert r.dialect.delimiter == ','
+        assert iter(r) is r
+        raises(TypeError, _csv.reader)
+        raises(TypeError, _csv.reader, 42)
+        raises(_csv.Error, _csv.reader([42]).next)
+
+    def test_csv_module(self):
+        import csv
+        from StringIO import StringIO
+        f = StringIO('name,value\r\nx,"1,5"\r\n')
+        rows = list(csv.DictReader(f))
+        assert rows == [{'name': 'x', 'value': '1,5'}]
+        assert csv.reader is __import__('_csv').reader
@@ -0,0 +1,97 @@
+from pypy.conftest import gettestobjspace
+
+
+class AppTestWriter(object):
+    def setup_class(cls):
+        cls.space = gettestobjspace(usemodules=['_csv'])
+
+        w__write_test = cls.space.appexec([], r"""():
+            import _csv
+
+            class DummyFile(object):
+                def __init__(self):
+                    self._parts = []
+                    self.write = self._parts.append
+                def getvalue(self):
+                    return ''.join(self._parts)
+
+            def _write_test(fields, expect, **kwargs):
+                fileobj = DummyFile()
+                writer = _csv.writer(fileobj, **kwargs)
+                if len(fields) > 0 and type(fields[0]) is list:
+                    writer.writerows(fields)
+                else:
+                    writer.writerow(fields)
+                result = fileobj.getvalue()
+                expect += kwargs.get('lineterminator', '\r\n')
+                assert result == expect, 'result: %r\nexpect: %r' % (
+                    result, expect)
+            return _write_test
+        """)
+        if type(w__write_test) is type(lambda:0):
+            w__write_test = staticmethod(w__write_test)
+        cls.w__write_test = w__write_test
+
+    def test_write_arg_valid(self):
+        import _csv
+        class F(object):
+            def write(self, s):
+                pass
+        class G(object):
+            write = None
+        raises(TypeError, _csv.writer)
+        raises(TypeError, _csv.writer, None)
+        raises(TypeError, _csv.writer, G())
+        self._write_test((), '')
+        self._write_test([None], '""')
+        raises(_csv.Error, self._write_test,
+               [None], None, quoting=_csv.QUOTE_NONE)
+        raises(_csv.Error, _csv.writer(F()).writerow, 42)
+
+    def test_write_simple(self):
+        self._write_test(['a', 1, 2.5, None, u'x'], 'a,1,2.5,,x')
+        self._write_test(['a b', 'c'], 'a b,c')
+        self._write_test(['a,b', 'c'], '"a,b",c')
+        self._write_test(['a"b', 'c'], '"a""b",c')
+        self._write_test(['a\nb', 'c'], '"a\nb",c')
+        self._write_test(['a\0b'], 'a')
+        self._write_test(['a', 'b'], 'a;b', delimiter=';',
+                         lineterminator='\n')
+        self._write_test([['a', 'b'], ['c']], 'a,b\r\nc')
+
+    def test_write_quoting(self):
+        import _csv
+        self._write_test(['a', 1, 'p,q'], '"a","1","p,q"',
+                         quoting=_csv.QUOTE_ALL)
+        self._write_test(['a', 1, 2.5, 'p,q'], '"a",1,2.5,"p,q"',
+                         quoting=_csv.QUOTE_NONNUMERIC)
+        self._write_test(['a"b'], 'a\\"b', doublequote=False,
+                         escapechar='\\')
+        raises(_csv.Error, self._write_test, ['a"b'], '',
+               doublequote=False)
+
+    def test_write_escape(self):
+        import _csv
+        self._write_test(['a,b', 'c'], 'a\\,b,c', escapechar='\\',
+                         quoting=_csv.QUOTE_NONE)
+        self._write_test(['a\\b'], '"a\\b"', escapechar='\\')
+        raises(_csv.Error, self._write_test, ['a,b'], '',
+               quoting=_csv.QUOTE_NONE)
+
+    def test_writer_attributes(self):
+        import _csv
+        class F(object):
+            def write(self, s):
+                return len(s)
+        w = _csv.writer(F(), delimiter='|')
+        assert w.dialect.delimiter == '|'
+        assert w.writerow(['a', 'b']) == 5
+
+    def test_csv_module(self):
+        import csv
+        from StringIO import StringIO
+        f = StringIO()
+        w = csv.DictWriter(f, ['name', 'value'])
+        w.writeheader()
+        w.writerow({'name': 'x', 'value': '1,5'})
+        assert f.getvalue() == 'name,value\r\nx,"1,5"\r\n'
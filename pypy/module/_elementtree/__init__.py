@@ -0,0 +1,44 @@
+"""
+Mixed-module definition for the _elementtree module, used by
+xml.etree.cElementTree.
+Note that there is also a version in lib_pypy/_elementtree.py that simply
+re-exports xml.etree.ElementTree; the present mixed-module version takes
+precedence if it is enabled.
+"""
+
+from pypy.interpreter.mixedmodule import MixedModule
+
+
+class Module(MixedModule):
+    """Fast implementation of the ElementTree API: the elements are
+created directly from the callbacks of the expat parser."""
+
+    interpleveldefs = {
+        'Element':        'interp_elementtree.W_Element',
+        'SubElement':     'interp_elementtree.SubElement',
+        'TreeBuilder':    'interp_elementtree.W_TreeBuilder',
+        'XMLParser':      'interp_xmlparser.W_XMLParser',
+        'XMLTreeBuilder': 'interp_xmlparser.W_XMLParser',
+        }
+
+    appleveldefs = {
+        'Comment':                'app_elementtree.Comment',
+        'ElementPath':            'app_elementtree.ElementPath',
+        'ElementTree':            'app_elementtree.ElementTree',
+        'PI':                     'app_elementtree.PI',
+        'ParseError':             'app_elementtree.ParseError',
+        'ProcessingInstruction':  'app_elementtree.ProcessingInstruction',
+        'QName':                  'app_elementtree.QName',
+        'VERSION':                'app_elementtree.VERSION',
+        'XML':                    'app_elementtree.XML',
+        'XMLID':                  'app_elementtree.XMLID',
+        'dump':                   'app_elementtree.dump',
+        'fromstring':             'app_elementtree.fromstring',
+        'fromstringlist':         'app_elementtree.fromstringlist',
+        'iselement':              'app_elementtree.iselement',
+        'iterparse':              'app_elementtree.iterparse',
+        'parse':                  'app_elementtree.parse',
+        'register_namespace':     'app_elementtree.register_namespace',
+        'tostring':               'app_elementtree.tostring',
+        'tostringlist':           'app_elementtree.tostringlist',
+        }
@@ -0,0 +1,140 @@
+# NOT_RPYTHON
+
+from xml.etree import ElementTree as ET
+from xml.etree import ElementPath
+from xml.etree.ElementTree import (
+    ParseError, QName, VERSION, dump, iselement, register_namespace,
+    tostring, tostringlist)
+from _elementtree import Element, TreeBuilder, XMLParser
+
+
+# the elements made by Comment() and PI() have the tags of
+# xml.etree.ElementTree, so that its serializer recognizes them; the
+# proxies compare equal to these tags
+
+class CommentProxy:
+    def __call__(self, text=None):
+        element = Element(ET.Comment)
+        element.text = text
+        return element
+
+    def __cmp__(self, other):
+        return cmp(ET.Comment, other)
+
+Comment = CommentProxy()
+
+
+class PIProxy:
+    def __call__(self, target, text=None):
+        element = Element(ET.ProcessingInstruction)
+        element.text = target
+        if text:
+            element.text = element.text + " " + text
+        return element
+
+    def __cmp__(self, other):
+        return cmp(ET.ProcessingInstruction, other)
+
+PI = ProcessingInstruction = PIProxy()
+
+
+class ElementTree(ET.ElementTree):
+
+    def parse(self, source, parser=None):
+        close_source = False
+        if not hasattr(source, "read"):
+            source = open(source, "rb")
+            close_source = True
+        try:
+            if not parser:
+                parser = XMLParser(target=TreeBuilder())
+            while 1:
+                data = source.read(65536)
+                if not data:
+                    break
+                parser.feed(data)
+            self._root = parser.close()
+            return self._root
+        finally:
+            if close_source:
+                source.close()
+
+
+def parse(source, parser=None):
+    tree = ElementTree()
+    tree.parse(source, parser)
+    return tree
+
+
+class iterparse(object):
+    """iterparse(source, events=None, parser=None)
+Parses 'source' incrementally and returns an iterator of (event, element)
+pairs.  The elements that were already reported can be cleared to keep
+the memory usage low."""
+
+    root = None
+
+    def __init__(self, source, events=None, parser=None):
+        self._close_file = not hasattr(source, "read")
+        if self._close_file:
+            source = open(source, "rb")
+        self._file = source
+        self._events = []
+        self._index = 0
+        self.root = self._root = None
+        if not parser:
+            parser = XMLParser(target=TreeBuilder())
+        self._parser = parser
+        parser._setevents(self._events, events)
+
+    def next(self):
+        while 1:
+            try:
+                item = self._events[self._index]
+            except IndexError:
+                pass
+            else:
+                self._index += 1
+                return item
+            if self._parser is None:
+                self.root = self._root
+                if self._close_file:
+                    self._file.close()
+                raise StopIteration
+            # load event buffer
+            del self._events[:]
+            self._index = 0
+            data = self._file.read(16384)
+            if data:
+                self._parser.feed(data)
+            else:
+                self._root = self._parser.close()
+                self._parser = None
+
+    def __iter__(self):
+        return self
+
+
+def XML(text, parser=None):
+    if not parser:
+        parser = XMLParser(target=TreeBuilder())
+    parser.feed(text)
+    return parser.close()
+
+fromstring = XML
+
+def XMLID(text, parser=None):
+    tree = XML(text, parser)
+    ids = {}
+    for elem in tree.iter():
+        id = elem.get("id")
+        if id:
+            ids[id] = elem
+    return tree, ids
+
+def fromstringlist(sequence, parser=None):
+    if not parser:
+        parser = XMLParser(target=TreeBuilder())
+    for text in sequence:
+        parser.feed(text)
+    return parser.close()
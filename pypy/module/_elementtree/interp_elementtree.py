@@ -0,0 +1,619 @@
+from pypy.interpreter.baseobjspace import Wrappable
+from pypy.interpreter.error import OperationError, operationerrfmt
+from pypy.interpreter.gateway import interp2app, applevel
+from pypy.interpreter.gateway import NoneNotWrapped
+from pypy.interpreter.typedef import TypeDef, GetSetProperty
+
+
+def make_attrib(space, w_attrib, kwds_w):
+    """Return a copy of 'w_attrib' updated with the keyword arguments, or
+    None if the result would be empty."""
+    if w_attrib is None or not space.is_true(w_attrib):
+        if not kwds_w:
+            return None
+        w_attrib = space.newdict()
+    else:
+        w_attrib = space.call_method(w_attrib, "copy")
+    for key, w_value in kwds_w.items():
+        space.setitem(w_attrib, space.wrap(key), w_value)
+    return w_attrib
+
+def unpack_element_args(space, funcname, __args__, nfixed):
+    args_w, kwds_w = __args__.unpack()
+    if not nfixed <= len(args_w) <= nfixed + 1:
+        raise operationerrfmt(space.w_TypeError,
+                              "%s() takes %d or %d arguments (%d given)",
+                              funcname, nfixed, nfixed + 1, len(args_w))
+    if len(args_w) > nfixed:
+        w_attrib = args_w[nfixed]
+    else:
+        w_attrib = None
+    return args_w, make_attrib(space, w_attrib, kwds_w)
+
+# the ElementPath expressions that only name a child tag, possibly with a
+# {namespace} prefix, are looked up directly
+PATH_SPECIAL_CHARS = "/.*[]()@=: \t\n"
+
+def is_simple_path(path):
+    start = 0
+    if path.startswith('{'):
+        start = path.find('}') + 1
+        if start <= 2:
+            return False
+    if start == len(path):
+        return False
+    for i in range(start, len(path)):
+        if path[i] in PATH_SPECIAL_CHARS:
+            return False
+    return True
+
+# ____________________________________________________________
+
+class W_Element(Wrappable):
+    """An XML element.  The attribute dictionary and the list of children
+    are only allocated when they are not empty."""
+
+    def __init__(self, space, w_tag, w_attrib=None):
+        self.w_tag = w_tag
+        self.w_attrib = w_attrib      # a dict, or None
+        self.w_text = space.w_None
+        self.w_tail = space.w_None
+        self.children_w = None        # a list of W_Element, or None
+
+    def length(self):
+        if self.children_w is None:
+            return 0
+        return len(self.children_w)
+
+    def get_children(self):
+        if self.children_w is None:
+            self.children_w = []
+        return self.children_w
+
+    def append(self, child):
+        if self.children_w is None:
+            self.children_w = [child]
+        else:
+            self.children_w.append(child)
+
+    def tag_matches(self, space, w_tag):
+        return (space.is_w(self.w_tag, w_tag) or
+                space.eq_w(self.w_tag, w_tag))
+
+    def find_child(self, space, w_tag):
+        if self.children_w is not None:
+            for child in self.children_w:
+                if child.tag_matches(space, w_tag):
+                    return child
+        return None
+
+    def descr_init(self, space, __args__):
+        args_w, w_attrib = unpack_element_args(space, 'Element', __args__, 1)
+        W_Element.__init__(self, space, args_w[0], w_attrib)
+
+    def descr_repr(self, space):
+        return space.mod(space.wrap("<Element %s at 0x%x>"),
+                         space.newtuple([space.repr(self.w_tag),
+                                         space.id(space.wrap(self))]))
+
+    def descr_len(self, space):
+        return space.wrap(self.length())
+
+    def descr_iterchildren(self, space):
+        return space.wrap(W_ChildrenIter(self))
+
+    def descr_getitem(self, space, w_index):
+        children = self.get_children()
+        start, stop, step, length = space.decode_index4(w_index,
+                                                        len(children))
+        if step == 0:
+            return space.wrap(children[start])
+        return space.newlist([space.wrap(children[start + i * step])
+                              for i in range(length)])
+
+    def descr_setitem(self, space, w_index, w_value):
+        children = self.get_children()
+        start, stop, step, length = space.decode_index4(w_index,
+                                                        len(children))
+        if step == 0:
+            children[start] = space.interp_w(W_Element, w_value)
+            return
+        items = [space.interp_w(W_Element, w_item)
+                 for w_item in space.fixedview(w_value)]
+        if step == 1:
+            assert start >= 0 and length >= 0
+            stop = start + length
+            self.children_w = children[:start] + items + children[stop:]
+        else:
+            if len(items) != length:
+                raise operationerrfmt(space.w_ValueError,
+                    "attempt to assign sequence of size %d "
+                    "to extended slice of size %d", len(items), length)
+            for i in range(length):
+                children[start + i * step] = items[i]
+
+    def descr_delitem(self, space, w_index):
+        children = self.get_children()
+        start, stop, step, length = space.decode_index4(w_index,
+                                                        len(children))
+        if step == 0:
+            del children[start]
+        elif step == 1:
+            assert start >= 0 and length >= 0
+            del children[start:start + length]
+        else:
+            removed = {}
+            for i in range(length):
+                removed[start + i * step] = None
+            self.children_w = [children[i] for i in range(len(children))
+                               if i not in removed]
+
+    def descr_append(self, space, w_element):
+        self.append(space.interp_w(W_Element, w_element))
+
+    def descr_extend(self, space, w_elements):
+        for w_element in space.fixedview(w_elements):
+            self.append(space.interp_w(W_Element, w_element))
+
+    def descr_insert(self, space, w_index, w_element):
+        element = space.interp_w(W_Element, w_element)
+        children = self.get_children()
+        index = space.getindex_w(w_index, None)
+        if index < 0:
+            index += len(children)
+            if index < 0:
+                index = 0
+        if index > len(children):
+            index = len(children)
+        children.insert(index, element)
+
+    def descr_remove(self, space, w_element):
+        element = space.interp_w(W_Element, w_element)
+        if self.children_w is not None:
+            for i in range(len(self.children_w)):
+                if self.children_w[i] is element:
+                    del self.children_w[i]
+                    return
+        raise OperationError(space.w_ValueError,
+                             space.wrap("list.remove(x): x not in list"))
+
+    def descr_getchildren(self, space):
+        if self.children_w is None:
+            return space.newlist([])
+        return space.newlist([space.wrap(child) for child in self.children_w])
+
+    def descr_clear(self, space):
+        self.w_attrib = None
+        self.w_text = space.w_None
+        self.w_tail = space.w_None
+        self.children_w = None
+
+    def copy(self, space):
+        if self.w_attrib is None:
+            w_attrib = None
+        else:
+            w_attrib = space.call_method(self.w_attrib, "copy")
+        element = W_Element(space, self.w_tag, w_attrib)
+        element.w_text = self.w_text
+        element.w_tail = self.w_tail
+        if self.children_w is not None:
+            element.children_w = self.children_w[:]
+        return element
+
+    def descr_copy(self, space):
+        return space.wrap(self.copy(space))
+
+    def descr_deepcopy(self, space, w_memo):
+        return deepcopy(space, space.wrap(self), w_memo)
+
+    def descr_makeelement(self, space, w_tag, w_attrib):
+        return space.call_function(space.type(space.wrap(self)),
+                                   w_tag, w_attrib)
+
+    # attributes
+
+    def get_attrib(self, space):
+        if self.w_attrib is None:
+            self.w_attrib = space.newdict()
+        return self.w_attrib
+
+    def descr_get(self, space, w_key, w_default=None):
+        if self.w_attrib is not None:
+            w_value = space.finditem(self.w_attrib, w_key)
+            if w_value is not None:
+                return w_value
+        return w_default
+
+    def descr_set(self, space, w_key, w_value):
+        space.setitem(self.get_attrib(space), w_key, w_value)
+
+    def descr_keys(self, space):
+        if self.w_attrib is None:
+            return space.newlist([])
+        return space.call_method(self.w_attrib, "keys")
+
+    def descr_items(self, space):
+        if self.w_attrib is None:
+            return space.newlist([])
+        return space.call_method(self.w_attrib, "items")
+
+    # searching
+
+    def descr_find(self, space, w_path, w_namespaces=None):
+        if (space.is_w(w_namespaces, space.w_None) and
+                space.is_w(space.type(w_path), space.w_str) and
+                is_simple_path(space.str_w(w_path))):
+            child = self.find_child(space, w_path)
+            if child is None:
+                return space.w_None
+            return space.wrap(child)
+        return path_find(space, space.wrap(self), w_path, w_namespaces)
+
+    def descr_findtext(self, space, w_path, w_default=None,
+                       w_namespaces=None):
+        if (space.is_w(w_namespaces, space.w_None) and
+                space.is_w(space.type(w_path), space.w_str) and
+                is_simple_path(space.str_w(w_path))):
+            child = self.find_child(space, w_path)
+            if child is None:
+                return w_default
+            if space.is_w(child.w_text, space.w_None):
+                return space.wrap("")
+            return child.w_text
+        return path_findtext(space, space.wrap(self), w_path, w_default,
+                             w_namespaces)
+
+    def descr_findall(self, space, w_path, w_namespaces=None):
+        if (space.is_w(w_namespaces, space.w_None) and
+                space.is_w(space.type(w_path), space.w_str) and
+                is_simple_path(space.str_w(w_path))):
+            result_w = []
+            if self.children_w is not None:
+                for child in self.children_w:
+                    if child.tag_matches(space, w_path):
+                        result_w.append(space.wrap(child))
+            return space.newlist(result_w)
+        return path_findall(space, space.wrap(self), w_path, w_namespaces)
+
+    def descr_iterfind(self, space, w_path, w_namespaces=None):
+        return path_iterfind(space, space.wrap(self), w_path, w_namespaces)
+
+    def descr_iter(self, space, w_tag=None):
+        return space.wrap(W_ElementIter(space, self, w_tag))
+
+    def descr_getiterator(self, space, w_tag=None):
+        iterator = W_ElementIter(space, self, w_tag)
+        result_w = []
+        while True:
+            element = iterator.next_element(space)
+            if element is None:
+                break
+            result_w.append(space.wrap(element))
+        return space.newlist(result_w)
+
+    def descr_itertext(self, space):
+        return itertext(space, space.wrap(self))
+
+    # properties
+
+    def fget_tag(self, space):
+        return self.w_tag
+
+    def fset_tag(self, space, w_value):
+        self.w_tag = w_value
+
+    def fget_text(self, space):
+        return self.w_text
+
+    def fset_text(self, space, w_value):
+        self.w_text = w_value
+
+    def fget_tail(self, space):
+        return self.w_tail
+
+    def fset_tail(self, space, w_value):
+        self.w_tail = w_value
+
+    def fget_attrib(self, space):
+        return self.get_attrib(space)
+
+    def fset_attrib(self, space, w_value):
+        self.w_attrib = w_value
+
+
+def descr_new_element(space, w_subtype, __args__):
+    element = space.allocate_instance(W_Element, w_subtype)
+    W_Element.__init__(element, space, space.w_None)
+    return space.wrap(element)
+
+W_Element.typedef = TypeDef(
+    'Element',
+    __module__ = '_elementtree',
+    __doc__ = W_Element.__doc__,
+    __new__ = interp2app(descr_new_element),
+    __init__ = interp2app(W_Element.descr_init),
+    __repr__ = interp2app(W_Element.descr_repr),
+    __len__ = interp2app(W_Element.descr_len),
+    __iter__ = interp2app(W_Element.descr_iterchildren),
+    __getitem__ = interp2app(W_Element.descr_getitem),
+    __setitem__ = interp2app(W_Element.descr_setitem),
+    __delitem__ = interp2app(W_Element.descr_delitem),
+    __copy__ = interp2app(W_Element.descr_copy),
+    __deepcopy__ = interp2app(W_Element.descr_deepcopy),
+    tag = GetSetProperty(W_Element.fget_tag, W_Element.fset_tag,
+                         cls=W_Element),
+    text = GetSetProperty(W_Element.fget_text, W_Element.fset_text,
+                          cls=W_Element),
+    tail = GetSetProperty(W_Element.fget_tail, W_Element.fset_tail,
+                          cls=W_Element),
+    attrib = GetSetProperty(W_Element.fget_attrib, W_Element.fset_attrib,
+                            cls=W_Element),
+    append = interp2app(W_Element.descr_append),
+    extend = interp2app(W_Element.descr_extend),
+    insert = interp2app(W_Element.descr_insert),
+    remove = interp2app(W_Element.descr_remove),
+    getchildren = interp2app(W_Element.descr_getchildren),
+    clear = interp2app(W_Element.descr_clear),
+    copy = interp2app(W_Element.descr_copy),
+    makeelement = interp2app(W_Element.descr_makeelement),
+    get = interp2app(W_Element.descr_get),
+    set = interp2app(W_Element.descr_set),
+    keys = interp2app(W_Element.descr_keys),
+    items = interp2app(W_Element.descr_items),
+    find = interp2app(W_Element.descr_find),
+    findtext = interp2app(W_Element.descr_findtext),
+    findall = interp2app(W_Element.descr_findall),
+    iterfind = interp2app(W_Element.descr_iterfind),
+    iter = interp2app(W_Element.descr_iter),
+    getiterator = interp2app(W_Element.descr_getiterator),
+    itertext = interp2app(W_Element.descr_itertext),
+    )
+
+def SubElement(space, __args__):
+    """SubElement(parent, tag, attrib={}, **extra) -> element
+Create an element and append it to 'parent'."""
+    args_w, w_attrib = unpack_element_args(space, 'SubElement', __args__, 2)
+    parent = space.interp_w(W_Element, args_w[0])
+    element = W_Element(space, args_w[1], w_attrib)
+    parent.append(element)
+    return space.wrap(element)
+
+# ____________________________________________________________
+
+class W_ChildrenIter(Wrappable):
+    def __init__(self, element):
+        self.element = element
+        self.index = 0
+
+    def descr_iter(self, space):
+        return space.wrap(self)
+
+    def descr_next(self, space):
+        element = self.element
+        if element is None or self.index >= element.length():
+            self.element = None
+            raise OperationError(space.w_StopIteration, space.w_None)
+        child = element.children_w[self.index]
+        self.index += 1
+        return space.wrap(child)
+
+W_ChildrenIter.typedef = TypeDef(
+    '_elementtree.childreniterator',
+    __iter__ = interp2app(W_ChildrenIter.descr_iter),
+    next = interp2app(W_ChildrenIter.descr_next),
+    )
+W_ChildrenIter.typedef.acceptable_as_base_class = False
+
+
+class W_ElementIter(Wrappable):
+    """Iterates over an element and all its subelements, in document
+    order, keeping only the ones with the given tag."""
+
+    def __init__(self, space, root, w_tag):
+        if w_tag is not None and (space.is_w(w_tag, space.w_None) or
+                                  space.eq_w(w_tag, space.wrap("*"))):
+            w_tag = None
+        self.w_tag = w_tag
+        self.root = root
+        self.parents = []
+        self.indexes = []
+
+    def next_element(self, space):
+        while True:
+            if self.root is not None:
+                element = self.root
+                self.root = None
+            else:
+                if not self.parents:
+                    return None
+                parent = self.parents[-1]
+                index = self.indexes[-1]
+                if index >= parent.length():
+                    self.parents.pop()
+                    self.indexes.pop()
+                    continue
+                self.indexes[-1] = index + 1
+                element = parent.children_w[index]
+            if element.children_w:
+                self.parents.append(element)
+                self.indexes.append(0)
+            if self.w_tag is None or element.tag_matches(space, self.w_tag):
+                return element
+
+    def descr_iter(self, space):
+        return space.wrap(self)
+
+    def descr_next(self, space):
+        element = self.next_element(space)
+        if element is None:
+            raise OperationError(space.w_StopIteration, space.w_None)
+        return space.wrap(element)
+
+W_ElementIter.typedef = TypeDef(
+    '_elementtree.elementiterator',
+    __iter__ = interp2app(W_ElementIter.descr_iter),
+    next = interp2app(W_ElementIter.descr_next),
+    )
+W_ElementIter.typedef.acceptable_as_base_class = False
+
+# ____________________________________________________________
+
+class W_TreeBuilder(Wrappable):
+    """TreeBuilder(element_factory=None)
+Builds a tree of elements from a sequence of start, data and end calls."""
+
+    def __init__(self, w_element_factory):
+        self.w_element_factory = w_element_factory
+        self.stack = []
+        self.last = None
+        self.data_w = []
+        self.tail = False
+
+    def flush(self, space):
+        if not self.data_w:
+            return
+        if self.last is not None:
+            if len(self.data_w) == 1:
+                w_text = self.data_w[0]
+            else:
+                w_text = space.call_method(space.wrap(""), "join",
+                                           space.newlist(self.data_w))
+            if self.tail:
+                if not space.is_w(self.last.w_tail, space.w_None):
+                    raise OperationError(space.w_AssertionError,
+                                         space.wrap("internal error (tail)"))
+                self.last.w_tail = w_text
+            else:
+                if not space.is_w(self.last.w_text, space.w_None):
+                    raise OperationError(space.w_AssertionError,
+                                         space.wrap("internal error (text)"))
+                self.last.w_text = w_text
+        self.data_w = []
+
+    def handle_start(self, space, w_tag, w_attrib):
+        self.flush(space)
+        if self.w_element_factory is None:
+            element = W_Element(space, w_tag, w_attrib)
+        else:
+            if w_attrib is None:
+                w_attrib = space.newdict()
+            w_element = space.call_function(self.w_element_factory,
+                                            w_tag, w_attrib)
+            element = space.interp_w(W_Element, w_element)
+        if self.stack:
+            self.stack[-1].append(element)
+        self.stack.append(element)
+        self.last = element
+        self.tail = False
+        return element
+
+    def handle_data(self, space, w_data):
+        self.data_w.append(w_data)
+
+    def handle_end(self, space, w_tag):
+        self.flush(space)
+        if not self.stack:
+            raise OperationError(space.w_IndexError,
+                                 space.wrap("pop from empty stack"))
+        element = self.stack.pop()
+        if not element.tag_matches(space, w_tag):
+            raise operationerrfmt(space.w_AssertionError,
+                                  "end tag mismatch (expected %s, got %s)",
+                                  space.str_w(space.str(element.w_tag)),
+                                  space.str_w(space.str(w_tag)))
+        self.last = element
+        self.tail = True
+        return element
+
+    def handle_close(self, space):
+        if self.stack:
+            raise OperationError(space.w_AssertionError,
+                                 space.wrap("missing end tags"))
+        if self.last is None:
+            raise OperationError(space.w_AssertionError,
+                                 space.wrap("missing toplevel element"))
+        return self.last
+
+    def descr_start(self, space, w_tag, w_attrib):
+        if not space.is_true(w_attrib):
+            w_attrib = None
+        return space.wrap(self.handle_start(space, w_tag, w_attrib))
+
+    def descr_data(self, space, w_data):
+        self.handle_data(space, w_data)
+
+    def descr_end(self, space, w_tag):
+        return space.wrap(self.handle_end(space, w_tag))
+
+    def descr_close(self, space):
+        return space.wrap(self.handle_close(space))
+
+
+def descr_new_treebuilder(space, w_subtype, w_element_factory=None):
+    if space.is_w(w_element_factory, space.w_None):
+        w_element_factory = None
+    builder = space.allocate_instance(W_TreeBuilder, w_subtype)
+    W_TreeBuilder.__init__(builder, w_element_factory)
+    return space.wrap(builder)
+
+W_TreeBuilder.typedef = TypeDef(
+    'TreeBuilder',
+    __module__ = '_elementtree',
+    __doc__ = W_TreeBuilder.__doc__,
+    __new__ = interp2app(descr_new_treebuilder),
+    start = interp2app(W_TreeBuilder.descr_start),
+    data = interp2app(W_TreeBuilder.descr_data),
+    end = interp2app(W_TreeBuilder.descr_end),
+    close = interp2app(W_TreeBuilder.descr_close),
+    )
+
+# ____________________________________________________________
+# The less common operations are written at app-level
+
+app = applevel(r'''
+    def path_find(elem, path, namespaces):
+        from xml.etree import ElementPath
+        return ElementPath.find(elem, path, namespaces)
+
+    def path_findtext(elem, path, default, namespaces):
+        from xml.etree import ElementPath
+        return ElementPath.findtext(elem, path, default, namespaces)
+
+    def path_findall(elem, path, namespaces):
+        from xml.etree import ElementPath
+        return ElementPath.findall(elem, path, namespaces)
+
+    def path_iterfind(elem, path, namespaces):
+        from xml.etree import ElementPath
+        return ElementPath.iterfind(elem, path, namespaces)
+
+    def itertext(elem):
+        tag = elem.tag
+        if not isinstance(tag, basestring) and tag is not None:
+            return
+        if elem.text:
+            yield elem.text
+        for e in elem:
+            for s in e.itertext():
+                yield s
+            if e.tail:
+                yield e.tail
+
+    def deepcopy(elem, memo):
+        from copy import deepcopy
+        new = elem.makeelement(deepcopy(elem.tag, memo),
+                               deepcopy(elem.attrib, memo))
+        new.text = deepcopy(elem.text, memo)
+        new.tail = deepcopy(elem.tail, memo)
+        for child in elem:
+            new.append(deepcopy(child, memo))
+        memo[id(elem)] = new
+        return new
+''', filename=__file__)
+
+path_find = app.interphook('path_find')
+path_findtext = app.interphook('path_findtext')
+path_findall = app.interphook('path_findall')
+path_iterfind = app.interphook('path_iterfind')
+itertext = app.interphook('itertext')
+deepcopy = app.interphook('deepcopy')
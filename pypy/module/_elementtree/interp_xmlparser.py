@@ -0,0 +1,436 @@
+from pypy.interpreter.baseobjspace import Wrappable
+from pypy.interpreter.error import OperationError, operationerrfmt
+from pypy.interpreter.gateway import interp2app, unwrap_spec, applevel
+from pypy.interpreter.typedef import TypeDef, GetSetProperty
+from pypy.interpreter.typedef import interp_attrproperty_w
+from pypy.interpreter.unicodehelper import PyUnicode_DecodeUTF8
+from pypy.rpython.lltypesystem import rffi, lltype
+from pypy.module.pyexpat.interp_pyexpat import (
+    SETTERS, XML_ParserCreateNS, XML_ParserFree, XML_SetUserData, XML_Parse,
+    XML_StopParser, XML_GetErrorCode, XML_ErrorString,
+    XML_GetCurrentLineNumber, XML_GetCurrentColumnNumber, XML_FALSE,
+    XML_ERROR_UNDEFINED_ENTITY, XML_MAJOR_VERSION, XML_MINOR_VERSION,
+    XML_MICRO_VERSION, XML_SetUnknownEncodingHandler, fill_encoding_map)
+from pypy.module._elementtree.interp_elementtree import W_TreeBuilder
+
+import weakref
+
+XML_SetStartElementHandler = SETTERS['StartElementHandler'][1]
+XML_SetEndElementHandler = SETTERS['EndElementHandler'][1]
+XML_SetCharacterDataHandler = SETTERS['CharacterDataHandler'][1]
+XML_SetDefaultHandlerExpand = SETTERS['DefaultHandlerExpand'][1]
+XML_SetCommentHandler = SETTERS['CommentHandler'][1]
+XML_SetProcessingInstructionHandler = (
+    SETTERS['ProcessingInstructionHandler'][1])
+XML_SetStartNamespaceDeclHandler = SETTERS['StartNamespaceDeclHandler'][1]
+XML_SetEndNamespaceDeclHandler = SETTERS['EndNamespaceDeclHandler'][1]
+
+EXPAT_VERSION = "Expat %d.%d.%d" % (XML_MAJOR_VERSION, XML_MINOR_VERSION,
+                                    XML_MICRO_VERSION)
+
+
+class Storage:
+    "Maps the expat user data to the parsers, without keeping them alive"
+    def __init__(self):
+        self.next_id = 0
+        self.parsers = {}
+
+    def register(self, parser):
+        id = self.next_id
+        self.next_id += 1
+        self.parsers[id] = weakref.ref(parser)
+        return id
+
+    def get(self, ll_userdata):
+        return self.parsers[rffi.cast(lltype.Signed, ll_userdata)]()
+
+    def free(self, id):
+        del self.parsers[id]
+
+global_storage = Storage()
+
+def fixtext(space, s):
+    "Return the utf-8 string 's' as a str if it is ascii, else as a unicode."
+    for c in s:
+        if ord(c) >= 0x80:
+            return space.wrap(PyUnicode_DecodeUTF8(space, s))
+    return space.wrap(s)
+
+# ____________________________________________________________
+# The expat callbacks.  An exception stops the parser and is re-raised
+# by feed() or close().
+
+def start_element_callback(ll_userdata, name, attrs):
+    parser = global_storage.get(ll_userdata)
+    try:
+        parser.handle_start(name, attrs)
+    except OperationError, e:
+        parser.stop(e)
+
+def end_element_callback(ll_userdata, name):
+    parser = global_storage.get(ll_userdata)
+    try:
+        parser.handle_end(name)
+    except OperationError, e:
+        parser.stop(e)
+
+def character_data_callback(ll_userdata, data, length):
+    # the character data is collected here and only converted once the
+    # next tag is seen
+    parser = global_storage.get(ll_userdata)
+    parser.data.append(rffi.charpsize2str(data,
+                                          rffi.cast(lltype.Signed, length)))
+
+def default_callback(ll_userdata, data, length):
+    parser = global_storage.get(ll_userdata)
+    try:
+        parser.handle_default(rffi.charpsize2str(
+            data, rffi.cast(lltype.Signed, length)))
+    except OperationError, e:
+        parser.stop(e)
+
+def comment_callback(ll_userdata, data):
+    parser = global_storage.get(ll_userdata)
+    try:
+        parser.handle_comment(data)
+    except OperationError, e:
+        parser.stop(e)
+
+def pi_callback(ll_userdata, target, data):
+    parser = global_storage.get(ll_userdata)
+    try:
+        parser.handle_pi(target, data)
+    except OperationError, e:
+        parser.stop(e)
+
+def unknown_encoding_callback(ll_userdata, name, info):
+    parser = global_storage.get(ll_userdata)
+    try:
+        fill_encoding_map(parser.space, rffi.charp2str(name), info)
+    except OperationError, e:
+        parser.stop(e)
+        return rffi.cast(rffi.INT, 0)
+    return rffi.cast(rffi.INT, 1)
+
+def start_ns_callback(ll_userdata, prefix, uri):
+    parser = global_storage.get(ll_userdata)
+    try:
+        parser.handle_start_ns(prefix, uri)
+    except OperationError, e:
+        parser.stop(e)
+
+def end_ns_callback(ll_userdata, prefix):
+    parser = global_storage.get(ll_userdata)
+    try:
+        parser.handle_end_ns()
+    except OperationError, e:
+        parser.stop(e)
+
+# ____________________________________________________________
+
+class W_XMLParser(Wrappable):
+    """XMLParser(target=None, encoding=None)
+Element structure builder for XML source data, based on the expat parser.
+Without a target, or with a TreeBuilder, the elements are created directly
+from the expat callbacks."""
+
+    def __init__(self, space, xmlparser, w_target):
+        self.space = space
+        self.itself = xmlparser
+        self.w_target = w_target
+        self.w_entity = space.newdict()
+        self.names_w = {}
+        self.data = []
+        self._exc_info = None
+
+        if space.is_w(space.type(w_target),
+                      space.gettypeobject(W_TreeBuilder.typedef)):
+            self.builder = space.interp_w(W_TreeBuilder, w_target)
+            self.w_handle_start = None
+            self.w_handle_data = None
+            self.w_handle_end = None
+            self.w_handle_comment = None
+            self.w_handle_pi = None
+            self.w_handle_close = None
+        else:
+            self.builder = None
+            self.w_handle_start = space.findattr(w_target,
+                                                 space.wrap("start"))
+            self.w_handle_data = space.findattr(w_target, space.wrap("data"))
+            self.w_handle_end = space.findattr(w_target, space.wrap("end"))
+            self.w_handle_comment = space.findattr(w_target,
+                                                   space.wrap("comment"))
+            self.w_handle_pi = space.findattr(w_target, space.wrap("pi"))
+            self.w_handle_close = space.findattr(w_target,
+                                                 space.wrap("close"))
+
+        self.w_events = None
+        self.w_start_event = None
+        self.w_end_event = None
+        self.w_start_ns_event = None
+        self.w_end_ns_event = None
+
+        self.id = global_storage.register(self)
+        XML_SetUserData(self.itself, rffi.cast(rffi.VOIDP, self.id))
+        XML_SetStartElementHandler(self.itself, start_element_callback)
+        XML_SetEndElementHandler(self.itself, end_element_callback)
+        XML_SetCharacterDataHandler(self.itself, character_data_callback)
+        XML_SetDefaultHandlerExpand(self.itself, default_callback)
+        XML_SetUnknownEncodingHandler(self.itself, unknown_encoding_callback,
+                                      rffi.cast(rffi.VOIDP, self.id))
+        if self.w_handle_comment is not None:
+            XML_SetCommentHandler(self.itself, comment_callback)
+        if self.w_handle_pi is not None:
+            XML_SetProcessingInstructionHandler(self.itself, pi_callback)
+
+    def __del__(self):
+        if XML_ParserFree: # careful with CPython interpreter shutdown
+            XML_ParserFree(self.itself)
+        if global_storage:
+            global_storage.free(self.id)
+
+    def stop(self, e):
+        self._exc_info = e
+        XML_StopParser(self.itself, XML_FALSE)
+
+    def fixname(self, ll_name):
+        "Expand the 'uri}local' names of expat into '{uri}local'."
+        name = rffi.charp2str(ll_name)
+        try:
+            return self.names_w[name]
+        except KeyError:
+            pass
+        if '}' in name:
+            w_name = fixtext(self.space, '{' + name)
+        else:
+            w_name = fixtext(self.space, name)
+        self.names_w[name] = w_name
+        return w_name
+
+    def flush_data(self):
+        if not self.data:
+            return
+        if len(self.data) == 1:
+            text = self.data[0]
+        else:
+            text = ''.join(self.data)
+        self.data = []
+        self.send_data(fixtext(self.space, text))
+
+    def send_data(self, w_data):
+        if self.builder is not None:
+            self.builder.handle_data(self.space, w_data)
+        elif self.w_handle_data is not None:
+            self.space.call_function(self.w_handle_data, w_data)
+
+    def append_event(self, w_event, w_obj):
+        space = self.space
+        space.call_method(self.w_events, "append",
+                          space.newtuple([w_event, w_obj]))
+
+    def handle_start(self, ll_name, ll_attrs):
+        space = self.space
+        self.flush_data()
+        w_tag = self.fixname(ll_name)
+        w_attrib = None
+        if ll_attrs[0]:
+            w_attrib = space.newdict()
+            i = 0
+            while ll_attrs[i]:
+                space.setitem(w_attrib, self.fixname(ll_attrs[i]),
+                              fixtext(space, rffi.charp2str(ll_attrs[i + 1])))
+                i += 2
+        if self.builder is not None:
+            w_element = space.wrap(self.builder.handle_start(space, w_tag,
+                                                             w_attrib))
+        elif self.w_handle_start is not None:
+            if w_attrib is None:
+                w_attrib = space.newdict()
+            w_element = space.call_function(self.w_handle_start,
+                                            w_tag, w_attrib)
+        else:
+            w_element = space.w_None
+        if self.w_start_event is not None:
+            self.append_event(self.w_start_event, w_element)
+
+    def handle_end(self, ll_name):
+        space = self.space
+        self.flush_data()
+        w_tag = self.fixname(ll_name)
+        if self.builder is not None:
+            w_element = space.wrap(self.builder.handle_end(space, w_tag))
+        elif self.w_handle_end is not None:
+            w_element = space.call_function(self.w_handle_end, w_tag)
+        else:
+            w_element = space.w_None
+        if self.w_end_event is not None:
+            self.append_event(self.w_end_event, w_element)
+
+    def handle_default(self, text):
+        # deal with the entities that expat does not know about
+        if len(text) < 2 or text[0] != '&':
+            return
+        space = self.space
+        self.flush_data()
+        stop = len(text) - 1
+        assert stop > 0
+        w_value = space.finditem(self.w_entity, space.wrap(text[1:stop]))
+        if w_value is None:
+            raise self.parse_error(
+                "undefined entity %s: line %d, column %d" % (
+                    text, self.get_line_number(), self.get_column_number()),
+                XML_ERROR_UNDEFINED_ENTITY)
+        self.send_data(w_value)
+
+    def handle_comment(self, ll_data):
+        self.flush_data()
+        self.space.call_function(self.w_handle_comment,
+                                 fixtext(self.space, rffi.charp2str(ll_data)))
+
+    def handle_pi(self, ll_target, ll_data):
+        space = self.space
+        self.flush_data()
+        space.call_function(self.w_handle_pi,
+                            fixtext(space, rffi.charp2str(ll_target)),
+                            fixtext(space, rffi.charp2str(ll_data)))
+
+    def handle_start_ns(self, ll_prefix, ll_uri):
+        space = self.space
+        if self.w_start_ns_event is None:
+            return
+        if ll_prefix:
+            w_prefix = fixtext(space, rffi.charp2str(ll_prefix))
+        else:
+            w_prefix = space.wrap("")
+        if ll_uri:
+            w_uri = fixtext(space, rffi.charp2str(ll_uri))
+        else:
+            w_uri = space.wrap("")
+        self.append_event(self.w_start_ns_event,
+                          space.newtuple([w_prefix, w_uri]))
+
+    def handle_end_ns(self):
+        if self.w_end_ns_event is None:
+            return
+        self.append_event(self.w_end_ns_event, self.space.w_None)
+
+    # Error management
+
+    def get_line_number(self):
+        return rffi.cast(lltype.Signed, XML_GetCurrentLineNumber(self.itself))
+
+    def get_column_number(self):
+        return rffi.cast(lltype.Signed,
+                         XML_GetCurrentColumnNumber(self.itself))
+
+    def parse_error(self, message, code):
+        space = self.space
+        w_error = make_parse_error(space, space.wrap(message),
+                                   space.wrap(code),
+                                   space.wrap(self.get_line_number()),
+                                   space.wrap(self.get_column_number()))
+        return OperationError(space.type(w_error), w_error)
+
+    def parse(self, space, data, isfinal):
+        res = XML_Parse(self.itself, data, len(data), isfinal)
+        if self._exc_info:
+            e = self._exc_info
+            self._exc_info = None
+            raise e
+        elif rffi.cast(lltype.Signed, res) == 0:
+            code = rffi.cast(lltype.Signed, XML_GetErrorCode(self.itself))
+            err = rffi.charp2strn(XML_ErrorString(code), 200)
+            raise self.parse_error("%s: line %d, column %d" % (
+                err, self.get_line_number(), self.get_column_number()), code)
+
+    @unwrap_spec(data=str)
+    def descr_feed(self, space, data):
+        """feed(data)
+Feeds data to the parser."""
+        self.parse(space, data, False)
+
+    def descr_close(self, space):
+        """close() -> element
+Finishes feeding data to the parser, and returns the result of the
+target's close() method."""
+        self.parse(space, "", True)
+        self.flush_data()
+        if self.builder is not None:
+            return space.wrap(self.builder.handle_close(space))
+        elif self.w_handle_close is not None:
+            return space.call_function(self.w_handle_close)
+        return space.w_None
+
+    def descr_setevents(self, space, w_events_list, w_events=None):
+        """_setevents(events_list, events=("end",))
+Appends an (event, element) pair to 'events_list' for each of the events
+to report.  Used by iterparse()."""
+        self.w_events = w_events_list
+        self.w_start_event = None
+        self.w_end_event = None
+        self.w_start_ns_event = None
+        self.w_end_ns_event = None
+        if space.is_w(w_events, space.w_None):
+            self.w_end_event = space.wrap("end")
+            return
+        for w_event in space.fixedview(w_events):
+            event = space.str_w(w_event)
+            if event == "start":
+                self.w_start_event = w_event
+            elif event == "end":
+                self.w_end_event = w_event
+            elif event == "start-ns":
+                self.w_start_ns_event = w_event
+                XML_SetStartNamespaceDeclHandler(self.itself,
+                                                 start_ns_callback)
+            elif event == "end-ns":
+                self.w_end_ns_event = w_event
+                XML_SetEndNamespaceDeclHandler(self.itself, end_ns_callback)
+            else:
+                raise operationerrfmt(space.w_ValueError,
+                                      "unknown event '%s'", event)
+
+    def descr_version(self, space):
+        return space.wrap(EXPAT_VERSION)
+
+
+def descr_new_xmlparser(space, w_subtype, w_target=None, w_encoding=None):
+    if space.is_w(w_target, space.w_None):
+        w_target = space.wrap(W_TreeBuilder(None))
+    if space.is_w(w_encoding, space.w_None):
+        encoding = None
+    else:
+        encoding = space.str_w(w_encoding)
+    xmlparser = XML_ParserCreateNS(encoding, rffi.cast(rffi.CHAR, '}'))
+    if not xmlparser:
+        raise OperationError(space.w_RuntimeError,
+                             space.wrap('XML_ParserCreate failed'))
+    parser = space.allocate_instance(W_XMLParser, w_subtype)
+    W_XMLParser.__init__(parser, space, xmlparser, w_target)
+    return space.wrap(parser)
+
+W_XMLParser.typedef = TypeDef(
+    'XMLParser',
+    __module__ = '_elementtree',
+    __doc__ = W_XMLParser.__doc__,
+    __new__ = interp2app(descr_new_xmlparser),
+    feed = interp2app(W_XMLParser.descr_feed),
+    close = interp2app(W_XMLParser.descr_close),
+    _setevents = interp2app(W_XMLParser.descr_setevents),
+    entity = interp_attrproperty_w('w_entity', W_XMLParser),
+    target = interp_attrproperty_w('w_target', W_XMLParser),
+    version = GetSetProperty(W_XMLParser.descr_version),
+    )
+
+# ____________________________________________________________
+
+app = applevel(r'''
+    def make_parse_error(message, code, lineno, offset):
+        from xml.etree.ElementTree import ParseError
+        err = ParseError(message)
+        err.code = code
+        err.position = lineno, offset
+        return err
+''', filename=__file__)
+
+make_parse_error = app.interphook('make_parse_error')
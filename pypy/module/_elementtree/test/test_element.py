@@ -0,0 +1,163 @@
+from pypy.conftest import gettestobjspace
+
+
+class AppTestElement:
+    def setup_class(cls):
+        cls.space = gettestobjspace(usemodules=['_elementtree', 'pyexpat'])
+
+    def test_basic(self):
+        from _elementtree import Element
+        e = Element('a')
+        assert e.tag == 'a'
+        assert e.text is None and e.tail is None
+        assert e.attrib == {}
+        assert len(e) == 0
+        assert repr(e).startswith("<Element 'a' at 0x")
+        e.text = 'x'
+        e.tag = 'b'
+        assert (e.tag, e.text) == ('b', 'x')
+
+    def test_attrib(self):
+        from _elementtree import Element
+        attrib = {'x': '1'}
+        e = Element('a', attrib, y='2')
+        assert e.attrib == {'x': '1', 'y': '2'}
+        assert attrib == {'x': '1'}
+        assert e.get('x') == '1'
+        assert e.get('z') is None
+        assert e.get('z', 3) == 3
+        e.set('z', '3')
+        assert sorted(e.keys()) == ['x', 'y', 'z']
+        assert sorted(e.items()) == [('x', '1'), ('y', '2'), ('z', '3')]
+        e = Element('a')
+        assert e.keys() == [] and e.items() == []
+        e.attrib['k'] = 'v'
+        assert e.get('k') == 'v'
+        e.attrib = {'j': 'w'}
+        assert e.keys() == ['j']
+
+    def test_children(self):
+        from _elementtree import Element, SubElement
+        root = Element('root')
+        a = SubElement(root, 'a', {'x': '1'}, y='2')
+        b = Element('b')
+        root.append(b)
+        c, d = Element('c'), Element('d')
+        root.extend([c, d])
+        assert len(root) == 4
+        assert list(root) == [a, b, c, d]
+        assert root.getchildren() == [a, b, c, d]
+        assert a.attrib == {'x': '1', 'y': '2'}
+        assert root[0] is a and root[-1] is d
+        assert root[1:3] == [b, c]
+        assert root[::2] == [a, c]
+        raises(IndexError, "root[4]")
+        root.insert(1, Element('i'))
+        root.insert(-100, Element('first'))
+        assert [e.tag for e in root] == ['first', 'a', 'i', 'b', 'c', 'd']
+        root.remove(a)
+        raises(ValueError, root.remove, a)
+        del root[0]
+        del root[::2]
+        assert [e.tag for e in root] == ['b', 'd']
+        root[0] = a
+        root[1:] = [b, c]
+        assert [e.tag for e in root] == ['a', 'b', 'c']
+        raises(ValueError, "root[::2] = [d]")
+        raises(TypeError, root.append, 'x')
+        root.clear()
+        assert len(root) == 0 and root.attrib == {}
+
+    def test_find(self):
+        from _elementtree import Element, SubElement
+        root = Element('root')
+        a = SubElement(root, 'a')
+        a.text = 'A'
+        b = SubElement(root, 'b')
+        a2 = SubElement(root, 'a')
+        ns = SubElement(root, '{http://ns}c')
+        sub = SubElement(b, 'a')
+        assert root.find('a') is a
+        assert root.find('x') is None
+        assert root.findall('a') == [a, a2]
+        assert root.findtext('a') == 'A'
+        assert root.findtext('b') == ''
+        assert root.findtext('x', 'default') == 'default'
+        assert root.find('{http://ns}c') is ns
+        # these go through ElementPath
+        assert root.findall('.//a') == [a, sub, a2]
+        assert root.find('b/a') is sub
+        assert root.findall('*') == [a, b, a2, ns]
+        assert list(root.iterfind('b/a')) == [sub]
+        assert root.find('p:c', {'p': 'http://ns'}) is ns
+
+    def test_iter(self):
+        from _elementtree import Element, SubElement
+        root = Element('root')
+        a = SubElement(root, 'a')
+        b = SubElement(a, 'b')
+        c = SubElement(root, 'c')
+        a2 = SubElement(c, 'a')
+        assert list(root.iter()) == [root, a, b, c, a2]
+        assert list(root.iter('*')) == [root, a, b, c, a2]
+        assert list(root.iter('a')) == [a, a2]
+        assert root.getiterator('a') == [a, a2]
+        root.text = '1'
+        a.tail = '2'
+        b.text = '3'
+        a2.text = u'4'
+        assert ''.join(root.itertext()) == u'1324'
+
+    def test_copy(self):
+        import copy
+        from _elementtree import Element, SubElement
+        root = Element('root', x='1')
+        root.text = 'text'
+        child = SubElement(root, 'child')
+        shallow = copy.copy(root)
+        assert shallow is not root
+        assert shallow.attrib == {'x': '1'}
+        assert shallow.attrib is not root.attrib
+        assert shallow[0] is child and shallow.text == 'text'
+        deep = copy.deepcopy(root)
+        assert deep[0] is not child and deep[0].tag == 'child'
+        assert deep.attrib == {'x': '1'} and deep.text == 'text'
+
+    def test_subclass(self):
+        from _elementtree import Element
+        class MyElement(Element):
+            def __init__(self, tag, attrib={}, **extra):
+                Element.__init__(self, tag.upper(), attrib, **extra)
+        e = MyElement('a', z='1')
+        assert e.tag == 'A' and e.attrib == {'z': '1'}
+        new = e.makeelement('b', {})
+        assert type(new) is MyElement and new.tag == 'B'
+
+    def test_treebuilder(self):
+        from _elementtree import TreeBuilder, Element
+        import exceptions
+        b = TreeBuilder()
+        root = b.start('root', {})
+        b.data('a')
+        b.data('b')
+        child = b.start('child', {'x': '1'})
+        b.end('child')
+        b.data('tail')
+        assert b.end('root') is root
+        assert b.close() is root
+        assert root.text == 'ab'
+        assert child.tail == 'tail' and child.attrib == {'x': '1'}
+        b = TreeBuilder()
+        b.start('root', {})
+        # AssertionError is replaced by the one of the test framework
+        raises(exceptions.AssertionError, b.end, 'other')
+        raises(exceptions.AssertionError, TreeBuilder().close)
+        created = []
+        def factory(tag, attrib):
+            created.append(tag)
+            return Element(tag, attrib)
+        b = TreeBuilder(factory)
+        b.start('x', {})
+        b.end('x')
+        assert b.close().tag == 'x'
+        assert created == ['x']
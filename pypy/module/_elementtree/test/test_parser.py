@@ -0,0 +1,142 @@
+from pypy.conftest import gettestobjspace
+from pypy.tool.udir import udir
+
+
+class AppTestXMLParser:
+    def setup_class(cls):
+        cls.space = gettestobjspace(usemodules=['_elementtree', 'pyexpat'])
+        filename = udir.join('test_elementtree.xml')
+        filename.write('<root>' +
+                       ''.join(['<item n="%d">text</item>' % i
+                                for i in range(100)]) +
+                       '</root>')
+        cls.w_filename = cls.space.wrap(str(filename))
+
+    def test_fromstring(self):
+        import _elementtree as ET
+        root = ET.fromstring('<root a="1"><b>text</b>tail<c/></root>')
+        assert isinstance(root, ET.Element)
+        assert root.tag == 'root' and root.attrib == {'a': '1'}
+        assert root.text is None
+        b, c = root
+        assert b.text == 'text' and b.tail == 'tail'
+        assert type(b.text) is str
+        assert c.text is None and c.tail is None
+        assert ET.tostring(root) == (
+            '<root a="1"><b>text</b>tail<c /></root>')
+
+    def test_unicode_and_namespaces(self):
+        import _elementtree as ET
+        root = ET.fromstring('<?xml version="1.0" encoding="utf-8"?>'
+                             '<x:a xmlns:x="http://ns" x:b="v">'
+                             '\xc3\xa9t\xc3\xa9</x:a>')
+        assert root.tag == '{http://ns}a'
+        assert root.attrib == {'{http://ns}b': 'v'}
+        assert root.text == u'\xe9t\xe9'
+        root = ET.fromstring('<a>\xe9</a>', ET.XMLParser(encoding='latin-1'))
+        assert root.text == u'\xe9'
+
+    def test_feed(self):
+        import _elementtree as ET
+        parser = ET.XMLParser()
+        for data in ['<ro', 'ot>te', 'xt<ch', 'ild/>', '</root>']:
+            parser.feed(data)
+        root = parser.close()
+        assert root.text == 'text' and root[0].tag == 'child'
+        assert parser.version.startswith('Expat ')
+
+    def test_errors(self):
+        import _elementtree as ET
+        from xml.etree.ElementTree import ParseError
+        assert ET.ParseError is ParseError
+        e = raises(ET.ParseError, ET.fromstring, '<a></b>')
+        assert e.value.code == 7 # XML_ERROR_TAG_MISMATCH
+        assert e.value.position == (1, 5)
+        e = raises(ET.ParseError, ET.fromstring, '<a>&foo;</a>')
+        assert e.value.code == 11 # XML_ERROR_UNDEFINED_ENTITY
+
+    def test_entity(self):
+        import _elementtree as ET
+        parser = ET.XMLParser()
+        parser.entity['foo'] = 'bar'
+        parser.feed('<!DOCTYPE a SYSTEM "a.dtd"><a>x&foo;y</a>')
+        assert parser.close().text == 'xbary'
+
+    def test_custom_target(self):
+        import _elementtree as ET
+        class Target(object):
+            def __init__(self):
+                self.calls = []
+            def start(self, tag, attrib):
+                self.calls.append(('start', tag, attrib))
+            def end(self, tag):
+                self.calls.append(('end', tag))
+            def data(self, data):
+                self.calls.append(('data', data))
+            def comment(self, text):
+                self.calls.append(('comment', text))
+            def close(self):
+                return self.calls
+        parser = ET.XMLParser(target=Target())
+        parser.feed('<a x="1">t<!--c--><b/></a>')
+        assert parser.close() == [('start', 'a', {'x': '1'}), ('data', 't'),
+                                  ('comment', 'c'), ('start', 'b', {}),
+                                  ('end', 'b'), ('end', 'a')]
+        class BadTarget(object):
+            def start(self, tag, attrib):
+                raise KeyError(tag)
+        parser = ET.XMLParser(target=BadTarget())
+        raises(KeyError, parser.feed, '<a/>')
+
+    def test_parse(self):
+        import _elementtree as ET
+        tree = ET.parse(self.filename)
+        assert isinstance(tree, ET.ElementTree)
+        root = tree.getroot()
+        assert len(root) == 100
+        assert root[99].get('n') == '99'
+        assert tree.find('item').text == 'text'
+        assert [e.tag for e in root.iter('item')] == ['item'] * 100
+
+    def test_iterparse(self):
+        import _elementtree as ET
+        seen = 0
+        it = ET.iterparse(self.filename)
+        for event, elem in it:
+            assert event == 'end'
+            if elem.tag == 'item':
+                assert elem.text == 'text'
+                seen += 1
+                elem.clear()
+        assert seen == 100
+        assert it.root.tag == 'root'
+        assert len(it.root) == 100 and it.root[0].text is None
+
+    def test_iterparse_events(self):
+        import _elementtree as ET
+        from StringIO import StringIO
+        source = StringIO('<a xmlns:p="http://ns"><p:b/></a>')
+        events = [(event, getattr(obj, 'tag', obj)) for event, obj in
+                  ET.iterparse(source, ['start', 'end', 'start-ns',
+                                        'end-ns'])]
+        assert events == [('start-ns', ('p', 'http://ns')), ('start', 'a'),
+                          ('start', '{http://ns}b'), ('end', '{http://ns}b'),
+                          ('end', 'a'), ('end-ns', None)]
+        raises(ValueError, ET.iterparse, source, ['bogus'])
+        it = ET.iterparse(StringIO('<a><b/><c>'))
+        assert it.next()[1].tag == 'b'
+        raises(ET.ParseError, it.next)
+
+    def test_celementtree(self):
+        from xml.etree import cElementTree
+        import _elementtree
+        assert cElementTree.Element is _elementtree.Element
+        root = cElementTree.XML('<a><b/></a>')
+        assert cElementTree.tostring(cElementTree.Comment('c')) == (
+            '<!--c-->')
+        assert cElementTree.tostring(root) == '<a><b /></a>'
+        root.append(cElementTree.PI('target', 'data'))
+        assert root[1].tag == cElementTree.PI
+        assert list(root.iter(cElementTree.PI)) == [root[1]]
+        assert cElementTree.tostring(root) == (
+            '<a><b /><?target data?></a>')
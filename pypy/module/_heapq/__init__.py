@@ -0,0 +1,29 @@
+"""
+Mixed-module definition for the _heapq module.
+This is an optional module; if not present, heapq.py uses the
+pure Python version of these functions.
+"""
+
+from pypy.interpreter.mixedmodule import MixedModule
+
+
+class Module(MixedModule):
+    """\
+Heap queues
+
+Heaps are arrays for which a[k] <= a[2*k+1] and a[k] <= a[2*k+2] for
+all k, counting elements from zero.  For the sake of comparison,
+non-existing elements are considered to be infinite.  The interesting
+property of a heap is that a[0] is always its smallest element."""
+
+    appleveldefs = {}
+
+    interpleveldefs = {
+        'heappush':      'interp_heapq.heappush',
+        'heappop':       'interp_heapq.heappop',
+        'heapreplace':   'interp_heapq.heapreplace',
+        'heappushpop':   'interp_heapq.heappushpop',
+        'heapify':       'interp_heapq.heapify',
+        'nlargest':      'interp_heapq.nlargest',
+        'nsmallest':     'interp_heapq.nsmallest',
+        }
@@ -0,0 +1,262 @@
+from pypy.interpreter.error import OperationError
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.objspace.std.listobject import W_ListObject
+from pypy.objspace.std.tupleobject import W_TupleObject
+from pypy.objspace.std.intobject import W_IntObject
+from pypy.objspace.std.floatobject import W_FloatObject
+from pypy.objspace.std.stringobject import W_StringObject
+from pypy.tool.sourcetools import func_with_new_name
+
+
+# The comparisons are done directly on the unwrapped values when both
+# items are exact ints, floats or strs, and element by element when they
+# are both exact tuples or lists, like the (priority, counter, item)
+# entries that heapq.py builds for nlargest(), nsmallest() and merge().
+
+def _eq(space, w_a, w_b):
+    if type(w_a) is W_IntObject and type(w_b) is W_IntObject:
+        return w_a.intval == w_b.intval
+    if type(w_a) is W_FloatObject and type(w_b) is W_FloatObject:
+        return w_a.floatval == w_b.floatval
+    if type(w_a) is W_StringObject and type(w_b) is W_StringObject:
+        return w_a._value == w_b._value
+    return space.eq_w(w_a, w_b)
+
+def _items_lt(space, items1_w, items2_w):
+    # needs to be safe against _eq() mutating the lists behind our back
+    i = 0
+    while i < len(items1_w) and i < len(items2_w):
+        w_item1 = items1_w[i]
+        w_item2 = items2_w[i]
+        if not _eq(space, w_item1, w_item2):
+            return lt(space, w_item1, w_item2)
+        i += 1
+    return len(items1_w) < len(items2_w)
+
+# a copy for the fixed-size lists of tuples, which cannot be annotated
+# together with the resizable lists of lists
+_tuple_items_lt = func_with_new_name(_items_lt, '_tuple_items_lt')
+
+def lt(space, w_a, w_b):
+    "Return w_a < w_b as an interp-level bool."
+    if type(w_a) is W_IntObject and type(w_b) is W_IntObject:
+        return w_a.intval < w_b.intval
+    if type(w_a) is W_FloatObject and type(w_b) is W_FloatObject:
+        return w_a.floatval < w_b.floatval
+    if type(w_a) is W_StringObject and type(w_b) is W_StringObject:
+        return w_a._value < w_b._value
+    if type(w_a) is W_TupleObject and type(w_b) is W_TupleObject:
+        return _tuple_items_lt(space, w_a.wrappeditems, w_b.wrappeditems)
+    if type(w_a) is W_ListObject and type(w_b) is W_ListObject:
+        return _items_lt(space, w_a.wrappeditems, w_b.wrappeditems)
+    return space.is_true(space.lt(w_a, w_b))
+
+def _cmp_lt(space, w_a, w_b, ismax):
+    if ismax:
+        return lt(space, w_b, w_a)
+    return lt(space, w_a, w_b)
+
+# ____________________________________________________________
+
+def _get_list(space, w_heap):
+    if not isinstance(w_heap, W_ListObject):
+        raise OperationError(space.w_TypeError,
+                             space.wrap("heap argument must be a list"))
+    return w_heap
+
+def _get_items(space, w_heap, size):
+    # the comparisons can call app-level code that modifies the heap
+    items = w_heap.wrappeditems
+    if len(items) != size:
+        raise OperationError(space.w_RuntimeError,
+                             space.wrap("list changed size during iteration"))
+    return items
+
+def _siftdown(space, w_heap, startpos, pos, ismax):
+    # 'heap' is a heap at all indices >= startpos, except possibly for pos.
+    # pos is the index of a leaf with a possibly out-of-order value.
+    # Restore the heap invariant.
+    size = len(w_heap.wrappeditems)
+    w_newitem = w_heap.wrappeditems[pos]
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        w_parent = w_heap.wrappeditems[parentpos]
+        is_lt = _cmp_lt(space, w_newitem, w_parent, ismax)
+        items = _get_items(space, w_heap, size)
+        if not is_lt:
+            break
+        items[pos] = w_parent
+        pos = parentpos
+    w_heap.wrappeditems[pos] = w_newitem
+
+def _siftup(space, w_heap, pos, ismax):
+    # Bubble up the smaller child of pos until hitting a leaf, then sift
+    # the item originally at pos back down into place; see heapq.py for
+    # why this is cheaper than stopping as soon as possible.
+    endpos = len(w_heap.wrappeditems)
+    startpos = pos
+    w_newitem = w_heap.wrappeditems[pos]
+    childpos = 2 * pos + 1
+    while childpos < endpos:
+        rightpos = childpos + 1
+        if rightpos < endpos:
+            items = w_heap.wrappeditems
+            is_lt = _cmp_lt(space, items[childpos], items[rightpos], ismax)
+            _get_items(space, w_heap, endpos)
+            if not is_lt:
+                childpos = rightpos
+        items = w_heap.wrappeditems
+        items[pos] = items[childpos]
+        pos = childpos
+        childpos = 2 * pos + 1
+    w_heap.wrappeditems[pos] = w_newitem
+    _siftdown(space, w_heap, startpos, pos, ismax)
+
+def _heapify(space, w_heap, ismax):
+    n = len(w_heap.wrappeditems)
+    # Transform bottom-up.  The largest index there's any point to looking
+    # at is the largest with a child index in-range, which is n//2 - 1.
+    i = n // 2 - 1
+    while i >= 0:
+        _siftup(space, w_heap, i, ismax)
+        i -= 1
+
+# ____________________________________________________________
+
+def heappush(space, w_heap, w_item):
+    "Push item onto heap, maintaining the heap invariant."
+    w_heap = _get_list(space, w_heap)
+    w_heap.wrappeditems.append(w_item)
+    _siftdown(space, w_heap, 0, len(w_heap.wrappeditems) - 1, False)
+
+def heappop(space, w_heap):
+    """Pop the smallest item off the heap, maintaining the heap invariant."""
+    w_heap = _get_list(space, w_heap)
+    items = w_heap.wrappeditems
+    if not items:
+        raise OperationError(space.w_IndexError,
+                             space.wrap("index out of range"))
+    w_lastelt = items.pop()
+    if not items:
+        return w_lastelt
+    w_returnitem = items[0]
+    items[0] = w_lastelt
+    _siftup(space, w_heap, 0, False)
+    return w_returnitem
+
+def heapreplace(space, w_heap, w_item):
+    """Pop and return the current smallest value, and add the new item.
+
+This is more efficient than heappop() followed by heappush(), and can be
+more appropriate when using a fixed-size heap.  Note that the value
+returned may be larger than item!  That constrains reasonable uses of
+this routine unless written as part of a conditional replacement:
+
+        if item > heap[0]:
+            item = heapreplace(heap, item)
+"""
+    w_heap = _get_list(space, w_heap)
+    items = w_heap.wrappeditems
+    if not items:
+        raise OperationError(space.w_IndexError,
+                             space.wrap("index out of range"))
+    w_returnitem = items[0]
+    items[0] = w_item
+    _siftup(space, w_heap, 0, False)
+    return w_returnitem
+
+def heappushpop(space, w_heap, w_item):
+    """Push item on the heap, then pop and return the smallest item
+from the heap. The combined action runs more efficiently than
+heappush() followed by a separate call to heappop()."""
+    w_heap = _get_list(space, w_heap)
+    if not w_heap.wrappeditems:
+        return w_item
+    w_top = w_heap.wrappeditems[0]
+    if not lt(space, w_top, w_item):
+        return w_item
+    items = w_heap.wrappeditems
+    if not items:
+        raise OperationError(space.w_IndexError,
+                             space.wrap("index out of range"))
+    w_returnitem = items[0]
+    items[0] = w_item
+    _siftup(space, w_heap, 0, False)
+    return w_returnitem
+
+def heapify(space, w_heap):
+    "Transform list into a heap, in-place, in O(len(heap)) time."
+    w_heap = _get_list(space, w_heap)
+    _heapify(space, w_heap, False)
+
+# ____________________________________________________________
+
+def _collect(space, n, w_iterator):
+    # the first n items of the iterator, in a new list
+    items_w = []
+    while len(items_w) < n:
+        try:
+            w_item = space.next(w_iterator)
+        except OperationError, e:
+            if not e.match(space, space.w_StopIteration):
+                raise
+            break
+        items_w.append(w_item)
+    return items_w
+
+@unwrap_spec(n=int)
+def nlargest(space, n, w_iterable):
+    """Find the n largest elements in a dataset.
+
+Equivalent to:  sorted(iterable, reverse=True)[:n]
+"""
+    w_iterator = space.iter(w_iterable)
+    w_heap = W_ListObject(_collect(space, n, w_iterator))
+    size = len(w_heap.wrappeditems)
+    if size == 0:
+        return w_heap
+    _heapify(space, w_heap, False)
+    while True:
+        try:
+            w_item = space.next(w_iterator)
+        except OperationError, e:
+            if not e.match(space, space.w_StopIteration):
+                raise
+            break
+        # the heap is a min-heap of the n largest items seen so far
+        if not lt(space, w_heap.wrappeditems[0], w_item):
+            continue
+        items = _get_items(space, w_heap, size)
+        items[0] = w_item
+        _siftup(space, w_heap, 0, False)
+    space.call_method(w_heap, 'sort')
+    space.call_method(w_heap, 'reverse')
+    return w_heap
+
+@unwrap_spec(n=int)
+def nsmallest(space, n, w_iterable):
+    """Find the n smallest elements in a dataset.
+
+Equivalent to:  sorted(iterable)[:n]
+"""
+    w_iterator = space.iter(w_iterable)
+    w_heap = W_ListObject(_collect(space, n, w_iterator))
+    size = len(w_heap.wrappeditems)
+    if size == 0:
+        return w_heap
+    _heapify(space, w_heap, True)
+    while True:
+        try:
+            w_item = space.next(w_iterator)
+        except OperationError, e:
+            if not e.match(space, space.w_StopIteration):
+                raise
+            break
+        # the heap is a max-heap of the n smallest items seen so far
+        if not lt(space, w_item, w_heap.wrappeditems[0]):
+            continue
+        items = _get_items(space, w_heap, size)
+        items[0] = w_item
+        _siftup(space, w_heap, 0, True)
+    space.call_method(w_heap, 'sort')
+    return w_heap
@@ -0,0 +1,114 @@
+from pypy.conftest import gettestobjspace
+
+
+class AppTestHeapq:
+
+    def setup_class(cls):
+        cls.space = gettestobjspace(usemodules=['_heapq', 'itertools'])
+
+    def test_push_pop(self):
+        import _heapq, random
+        def check_invariant(heap):
+            for pos, item in enumerate(heap):
+                if pos:
+                    assert heap[(pos - 1) >> 1] <= item
+        for data in [[random.random() for i in range(64)],
+                     [random.randrange(1000) for i in range(64)],
+                     [str(random.randrange(1000)) for i in range(64)],
+                     [(random.randrange(10), i) for i in range(64)],
+                     [[random.randrange(10), i] for i in range(64)],
+                     [random.randrange(10) * 0.5 for i in range(32)] +
+                     [random.randrange(10) for i in range(32)]]:
+            heap = []
+            for item in data:
+                _heapq.heappush(heap, item)
+                check_invariant(heap)
+            results = []
+            while heap:
+                results.append(_heapq.heappop(heap))
+                check_invariant(heap)
+            assert results == sorted(data)
+
+    def test_heapify(self):
+        import _heapq, random
+        def check_invariant(heap):
+            for pos, item in enumerate(heap):
+                if pos:
+                    assert heap[(pos - 1) >> 1] <= item
+        for size in range(30):
+            heap = [random.random() for dummy in range(size)]
+            _heapq.heapify(heap)
+            check_invariant(heap)
+        raises(TypeError, _heapq.heapify, None)
+        raises(TypeError, _heapq.heapify, (1, 2))
+
+    def test_empty(self):
+        import _heapq
+        raises(IndexError, _heapq.heappop, [])
+        raises(IndexError, _heapq.heapreplace, [], None)
+        assert _heapq.heappushpop([], 'x') == 'x'
+
+    def test_heapreplace(self):
+        import _heapq
+        heap = [1, 3, 2]
+        assert _heapq.heapreplace(heap, 5) == 1
+        assert heap == [2, 3, 5]
+        assert _heapq.heapreplace(heap, 0) == 2
+        assert heap == [0, 3, 5]
+
+    def test_heappushpop(self):
+        import _heapq
+        heap = [1, 3, 2]
+        assert _heapq.heappushpop(heap, 0) == 0
+        assert heap == [1, 3, 2]
+        assert _heapq.heappushpop(heap, 1) == 1
+        assert _heapq.heappushpop(heap, 10.5) == 1
+        assert heap == [2, 3, 10.5]
+
+    def test_nlargest_nsmallest(self):
+        import _heapq, random
+        data = [random.randrange(100) for i in range(50)]
+        for n in (-1, 0, 1, 2, 10, 49, 50, 1000):
+            assert _heapq.nsmallest(n, data) == sorted(data)[:max(n, 0)]
+            assert _heapq.nlargest(n, iter(data)) == (
+                sorted(data, reverse=True)[:max(n, 0)])
+
+    def test_custom_lt(self):
+        import _heapq
+        class X(object):
+            def __init__(self, x):
+                self.x = x
+            def __lt__(self, other):
+                return self.x > other.x
+        heap = []
+        for i in [5, 1, 7, 3]:
+            _heapq.heappush(heap, X(i))
+        assert [_heapq.heappop(heap).x for i in range(4)] == [7, 5, 3, 1]
+
+    def test_int_subclass(self):
+        import _heapq
+        class myint(int):
+            def __lt__(self, other):
+                return int(self) > int(other)
+        heap = []
+        for i in [5, 1, 7, 3]:
+            _heapq.heappush(heap, myint(i))
+        assert _heapq.heappop(heap) == 7
+
+    def test_heap_modified(self):
+        import _heapq
+        class X(object):
+            def __lt__(self, other):
+                del heap[:]
+                return True
+        heap = [X(), X(), X()]
+        raises(RuntimeError, _heapq.heapify, heap)
+        heap = [X()]
+        raises(RuntimeError, _heapq.heappush, heap, X())
+
+    def test_heapq_module(self):
+        import heapq, _heapq
+        assert heapq.heappush is _heapq.heappush
+        assert heapq.nsmallest(3, [5, 2, 8, 1, 9]) == [1, 2, 5]
+        assert heapq.nlargest(2, [5, 2, 8, 1, 9], key=lambda x: -x) == [1, 2]
+        assert list(heapq.merge([1, 4, 7], [2, 5, 8], [3, 6])) == range(1, 9)
@@ -0,0 +1,22 @@
+"""
+Mixed-module definition for the _json module.
+This is an optional module; if not present, the json package uses the
+pure Python scanner and encoder.
+"""
+
+from pypy.interpreter.mixedmodule import MixedModule
+
+
+class Module(MixedModule):
+    """json speedups
+"""
+
+    appleveldefs = {}
+
+    interpleveldefs = {
+        'scanstring':              'interp_decoder.scanstring',
+        'make_scanner':            'interp_decoder.W_Scanner',
+        'make_encoder':            'interp_encoder.W_Encoder',
+        'encode_basestring_ascii': 'interp_encoder.encode_basestring_ascii',
+        'encode_basestring':       'interp_encoder.encode_basestring',
+        }
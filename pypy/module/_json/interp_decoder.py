@@ -0,0 +1,500 @@
+import sys
+from pypy.interpreter.baseobjspace import Wrappable
+from pypy.interpreter.error import OperationError, operationerrfmt
+from pypy.interpreter.gateway import interp2app, unwrap_spec, applevel
+from pypy.interpreter.typedef import TypeDef
+from pypy.rlib.rstring import UnicodeBuilder
+from pypy.rlib.rfloat import rstring_to_float
+from pypy.rlib.runicode import MAXUNICODE, UNICHR
+
+
+app = applevel(r'''
+    def errmsg(msg, doc, pos):
+        from json.decoder import errmsg
+        return errmsg(msg, doc, pos)
+''', filename=__file__)
+
+errmsg = app.interphook('errmsg')
+
+def raise_errmsg(space, msg, w_s, pos):
+    w_msg = errmsg(space, space.wrap(msg), w_s, space.wrap(pos))
+    raise OperationError(space.w_ValueError, w_msg)
+
+# a JSON integer with at most this many digits is computed directly
+# instead of calling int() on it, because it cannot overflow
+MAX_FAST_INT_DIGITS = len(str(sys.maxint)) - 1
+
+
+class ScannerContext(object):
+    """The options read from the JSONDecoder passed to make_scanner()."""
+
+    def __init__(self, space, w_context):
+        self.space = space
+        self.strict = space.is_true(space.getattr(w_context,
+                                                  space.wrap('strict')))
+        self.w_object_hook = space.getattr(w_context,
+                                           space.wrap('object_hook'))
+        self.w_object_pairs_hook = space.getattr(
+            w_context, space.wrap('object_pairs_hook'))
+        self.w_parse_float = space.getattr(w_context,
+                                           space.wrap('parse_float'))
+        self.w_parse_int = space.getattr(w_context, space.wrap('parse_int'))
+        self.w_parse_constant = space.getattr(w_context,
+                                              space.wrap('parse_constant'))
+        self.encoding = decode_encoding(space, space.getattr(
+            w_context, space.wrap('encoding')))
+        if space.is_w(self.w_object_hook, space.w_None):
+            self.w_object_hook = None
+        if space.is_w(self.w_object_pairs_hook, space.w_None):
+            self.w_object_pairs_hook = None
+        self.fast_float = space.is_w(self.w_parse_float, space.w_float)
+        self.fast_int = space.is_w(self.w_parse_int, space.w_int)
+
+def decode_encoding(space, w_encoding):
+    if space.is_w(w_encoding, space.w_None):
+        return 'utf-8'
+    if space.isinstance_w(w_encoding, space.w_unicode):
+        w_encoding = space.call_method(w_encoding, 'encode',
+                                       space.wrap('ascii'))
+    if not space.isinstance_w(w_encoding, space.w_str):
+        raise OperationError(space.w_TypeError,
+                             space.wrap("encoding must be a string"))
+    return space.str_w(w_encoding)
+
+
+def make_decoder_class(do_unicode):
+    """The decoder works directly on the unwrapped str or unicode that is
+    being parsed; the two versions only differ in how the contents of the
+    JSON strings are turned into unicode."""
+    if do_unicode:
+        const = unicode
+    else:
+        const = str
+
+    class Decoder(object):
+
+        def __init__(self, space, ctx, w_s, s):
+            self.space = space
+            self.ctx = ctx
+            self.w_s = w_s
+            self.s = s
+            self.memo = {}      # shared unicode keys for the dicts
+            self.pos = 0
+
+        def skip_whitespace(self, i):
+            s = self.s
+            while i < len(s):
+                c = s[i]
+                if (c != const(' ') and c != const('\t') and
+                    c != const('\n') and c != const('\r')):
+                    break
+                i += 1
+            return i
+
+        def startswith(self, i, word):
+            s = self.s
+            if i + len(word) > len(s):
+                return False
+            for j in range(len(word)):
+                if ord(s[i + j]) != ord(word[j]):
+                    return False
+            return True
+
+        def check_string_start(self, end):
+            if end < 0 or end > len(self.s):
+                raise OperationError(self.space.w_ValueError,
+                                     self.space.wrap("end is out of bounds"))
+
+        def error(self, msg, pos):
+            raise_errmsg(self.space, msg, self.w_s, pos)
+
+        def scan_once(self, i):
+            """Decode the value starting at position i and return it,
+            setting self.pos to the position after it.  Returns None if
+            no value starts at position i."""
+            space = self.space
+            s = self.s
+            if i < 0 or i >= len(s):
+                return None
+            c = s[i]
+            if c == const('"'):
+                return self.decode_string(i + 1)
+            elif c == const('{'):
+                return self.decode_object(i + 1)
+            elif c == const('['):
+                return self.decode_array(i + 1)
+            elif c == const('n') and self.startswith(i, 'null'):
+                self.pos = i + 4
+                return space.w_None
+            elif c == const('t') and self.startswith(i, 'true'):
+                self.pos = i + 4
+                return space.w_True
+            elif c == const('f') and self.startswith(i, 'false'):
+                self.pos = i + 5
+                return space.w_False
+            elif c == const('N') and self.startswith(i, 'NaN'):
+                return self.decode_constant(i, 'NaN')
+            elif c == const('I') and self.startswith(i, 'Infinity'):
+                return self.decode_constant(i, 'Infinity')
+            elif c == const('-') and self.startswith(i, '-Infinity'):
+                return self.decode_constant(i, '-Infinity')
+            return self.decode_number(i)
+
+        def scan_value(self, i):
+            w_value = self.scan_once(i)
+            if w_value is None:
+                self.error("Expecting object", i)
+            return w_value
+
+        def decode_constant(self, i, name):
+            self.pos = i + len(name)
+            return self.space.call_function(self.ctx.w_parse_constant,
+                                            self.space.wrap(name))
+
+        def decode_number(self, start):
+            space = self.space
+            s = self.s
+            i = start
+            if i < len(s) and s[i] == const('-'):
+                i += 1
+            if i < len(s) and const('1') <= s[i] <= const('9'):
+                i += 1
+                while i < len(s) and const('0') <= s[i] <= const('9'):
+                    i += 1
+            elif i < len(s) and s[i] == const('0'):
+                i += 1
+            else:
+                return None
+            intend = i
+            is_float = False
+            if (i + 1 < len(s) and s[i] == const('.') and
+                const('0') <= s[i + 1] <= const('9')):
+                is_float = True
+                i += 2
+                while i < len(s) and const('0') <= s[i] <= const('9'):
+                    i += 1
+            if i < len(s) and (s[i] == const('e') or s[i] == const('E')):
+                e_start = i
+                i += 1
+                if i < len(s) and (s[i] == const('-') or s[i] == const('+')):
+                    i += 1
+                digits_start = i
+                while i < len(s) and const('0') <= s[i] <= const('9'):
+                    i += 1
+                if i > digits_start:
+                    is_float = True
+                else:
+                    i = e_start
+            self.pos = i
+            if is_float:
+                if self.ctx.fast_float:
+                    return space.wrap(rstring_to_float(self.ascii_slice(start,
+                                                                        i)))
+                assert start >= 0
+                return space.call_function(self.ctx.w_parse_float,
+                                           space.wrap(s[start:i]))
+            assert intend == i
+            if self.ctx.fast_int and intend - start <= MAX_FAST_INT_DIGITS:
+                return space.wrap(self.decode_small_int(start, intend))
+            assert start >= 0
+            return space.call_function(self.ctx.w_parse_int,
+                                       space.wrap(s[start:i]))
+
+        def decode_small_int(self, start, end):
+            s = self.s
+            negative = s[start] == const('-')
+            if negative:
+                start += 1
+            value = 0
+            for i in range(start, end):
+                value = value * 10 + (ord(s[i]) - ord('0'))
+            if negative:
+                value = -value
+            return value
+
+        def ascii_slice(self, start, end):
+            # only called on the characters of a number, which are ascii
+            s = self.s
+            chars = ['\x00'] * (end - start)
+            for i in range(start, end):
+                chars[i - start] = chr(ord(s[i]))
+            return ''.join(chars)
+
+        def decode_array(self, i):
+            space = self.space
+            s = self.s
+            items_w = []
+            i = self.skip_whitespace(i)
+            if i < len(s) and s[i] == const(']'):
+                self.pos = i + 1
+                return space.newlist(items_w)
+            while True:
+                items_w.append(self.scan_value(i))
+                i = self.skip_whitespace(self.pos)
+                if i < len(s) and s[i] == const(']'):
+                    break
+                if i >= len(s) or s[i] != const(','):
+                    self.error("Expecting , delimiter", i)
+                i = self.skip_whitespace(i + 1)
+            self.pos = i + 1
+            return space.newlist(items_w)
+
+        def decode_object(self, i):
+            space = self.space
+            s = self.s
+            ctx = self.ctx
+            if ctx.w_object_pairs_hook is not None:
+                pairs_w = []
+                w_dict = None
+            else:
+                pairs_w = None
+                w_dict = space.newdict()
+            i = self.skip_whitespace(i)
+            if i >= len(s) or s[i] != const('}'):
+                while True:
+                    if i >= len(s) or s[i] != const('"'):
+                        self.error("Expecting property name", i)
+                    w_key = self.decode_key(i + 1)
+                    i = self.skip_whitespace(self.pos)
+                    if i >= len(s) or s[i] != const(':'):
+                        self.error("Expecting : delimiter", i)
+                    i = self.skip_whitespace(i + 1)
+                    w_value = self.scan_value(i)
+                    if pairs_w is not None:
+                        pairs_w.append(space.newtuple([w_key, w_value]))
+                    else:
+                        space.setitem(w_dict, w_key, w_value)
+                    i = self.skip_whitespace(self.pos)
+                    if i < len(s) and s[i] == const('}'):
+                        break
+                    if i >= len(s) or s[i] != const(','):
+                        self.error("Expecting , delimiter", i)
+                    i = self.skip_whitespace(i + 1)
+            self.pos = i + 1
+            if pairs_w is not None:
+                return space.call_function(ctx.w_object_pairs_hook,
+                                           space.newlist(pairs_w))
+            if ctx.w_object_hook is not None:
+                return space.call_function(ctx.w_object_hook, w_dict)
+            return w_dict
+
+        def decode_key(self, i):
+            key = self.decode_unicode(i)
+            try:
+                return self.memo[key]
+            except KeyError:
+                w_key = self.space.wrap(key)
+                self.memo[key] = w_key
+                return w_key
+
+        def decode_string(self, i):
+            return self.space.wrap(self.decode_unicode(i))
+
+        def decode_unicode(self, end):
+            """Decode the JSON string whose opening quote is just before
+            position 'end', setting self.pos after the closing quote."""
+            s = self.s
+            begin = end - 1
+            builder = None
+            while True:
+                # find the end of the unescaped chunk
+                c = const('\x00')
+                nextpos = end
+                while nextpos < len(s):
+                    c = s[nextpos]
+                    if c == const('"') or c == const('\\'):
+                        break
+                    if self.ctx.strict and ord(c) <= 0x1f:
+                        self.error("Invalid control character at", nextpos)
+                    nextpos += 1
+                else:
+                    self.error("Unterminated string starting at", begin)
+                if c == const('"') and builder is None:
+                    # common case: no escape in the whole string
+                    self.pos = nextpos + 1
+                    return self.chunk_to_unicode(end, nextpos)
+                if builder is None:
+                    builder = UnicodeBuilder(nextpos - end + 16)
+                if nextpos > end:
+                    builder.append(self.chunk_to_unicode(end, nextpos))
+                nextpos += 1
+                if c == const('"'):
+                    end = nextpos
+                    break
+                if nextpos == len(s):
+                    self.error("Unterminated string starting at", begin)
+                c = s[nextpos]
+                if c != const('u'):
+                    end = nextpos + 1
+                    if c == const('"') or c == const('\\') or c == const('/'):
+                        ch = unichr(ord(c))
+                    elif c == const('b'):
+                        ch = u'\b'
+                    elif c == const('f'):
+                        ch = u'\f'
+                    elif c == const('n'):
+                        ch = u'\n'
+                    elif c == const('r'):
+                        ch = u'\r'
+                    elif c == const('t'):
+                        ch = u'\t'
+                    else:
+                        self.error("Invalid \\escape", end - 2)
+                        assert False
+                    builder.append(ch)
+                    continue
+                # \uXXXX escape
+                end = nextpos + 5
+                if end > len(s):
+                    self.error("Invalid \\uXXXX escape", nextpos - 1)
+                uni = self.decode_hex(nextpos + 1)
+                if MAXUNICODE > 0xffff and (uni & 0xfc00) == 0xd800:
+                    msg = "Invalid \\uXXXX\\uXXXX surrogate pair"
+                    if (end + 6 > len(s) or s[end] != const('\\') or
+                        s[end + 1] != const('u')):
+                        self.error(msg, end - 5)
+                    uni2 = self.decode_hex(end + 2)
+                    if (uni2 & 0xfc00) != 0xdc00:
+                        self.error("Unpaired high surrogate", end - 5)
+                    uni = 0x10000 + (((uni - 0xd800) << 10) |
+                                     (uni2 - 0xdc00))
+                    end += 6
+                elif MAXUNICODE > 0xffff and (uni & 0xfc00) == 0xdc00:
+                    self.error("Unpaired low surrogate", end - 5)
+                builder.append(UNICHR(uni))
+            self.pos = end
+            return builder.build()
+
+        def decode_hex(self, i):
+            s = self.s
+            uni = 0
+            for j in range(i, i + 4):
+                c = s[j]
+                if const('0') <= c <= const('9'):
+                    digit = ord(c) - ord('0')
+                elif const('a') <= c <= const('f'):
+                    digit = ord(c) - ord('a') + 10
+                elif const('A') <= c <= const('F'):
+                    digit = ord(c) - ord('A') + 10
+                else:
+                    self.error("Invalid \\uXXXX escape", i - 2)
+                    assert False
+                uni = (uni << 4) | digit
+            return uni
+
+        if do_unicode:
+            def chunk_to_unicode(self, start, end):
+                assert start >= 0 and end >= start
+                return self.s[start:end]
+        else:
+            def chunk_to_unicode(self, start, end):
+                assert start >= 0 and end >= start
+                s = self.s
+                for i in range(start, end):
+                    if ord(s[i]) >= 0x80:
+                        break
+                else:
+                    return unicode_from_ascii(s, start, end)
+                space = self.space
+                w_chunk = space.call_method(space.wrap(s[start:end]),
+                                            'decode',
+                                            space.wrap(self.ctx.encoding))
+                return space.unicode_w(w_chunk)
+
+    return Decoder
+
+def unicode_from_ascii(s, start, end):
+    chars = [u'\x00'] * (end - start)
+    for i in range(start, end):
+        chars[i - start] = unichr(ord(s[i]))
+    return u''.join(chars)
+
+StrDecoder = make_decoder_class(do_unicode=False)
+UnicodeDecoder = make_decoder_class(do_unicode=True)
+StrDecoder.__name__ = 'StrDecoder'
+UnicodeDecoder.__name__ = 'UnicodeDecoder'
+
+
+def decode(space, ctx, w_s, idx, string_only):
+    """Decode the value (or only the string, if 'string_only') starting
+    at position idx of w_s.  Returns the value, or None if there is none,
+    and the position after it."""
+    if space.isinstance_w(w_s, space.w_unicode):
+        udecoder = UnicodeDecoder(space, ctx, w_s, space.unicode_w(w_s))
+        if string_only:
+            udecoder.check_string_start(idx)
+            return udecoder.decode_string(idx), udecoder.pos
+        return udecoder.scan_once(idx), udecoder.pos
+    elif space.isinstance_w(w_s, space.w_str):
+        sdecoder = StrDecoder(space, ctx, w_s, space.str_w(w_s))
+        if string_only:
+            sdecoder.check_string_start(idx)
+            return sdecoder.decode_string(idx), sdecoder.pos
+        return sdecoder.scan_once(idx), sdecoder.pos
+    raise operationerrfmt(space.w_TypeError,
+                          "first argument must be a string, not %s",
+                          space.type(w_s).getname(space))
+
+# ____________________________________________________________
+
+class W_Scanner(Wrappable):
+    """JSON scanner object"""
+
+    def __init__(self, space, ctx):
+        self.space = space
+        self.ctx = ctx
+
+    @unwrap_spec(idx=int)
+    def descr_call(self, space, w_string, idx):
+        w_value, end = decode(space, self.ctx, w_string, idx, False)
+        if w_value is None:
+            raise OperationError(space.w_StopIteration, space.wrap(idx))
+        return space.newtuple([w_value, space.wrap(end)])
+
+
+def W_Scanner___new__(space, w_subtype, w_context):
+    ctx = ScannerContext(space, w_context)
+    w_scanner = space.allocate_instance(W_Scanner, w_subtype)
+    W_Scanner.__init__(w_scanner, space, ctx)
+    return space.wrap(w_scanner)
+
+W_Scanner.typedef = TypeDef(
+    'Scanner',
+    __module__ = '_json',
+    __doc__ = W_Scanner.__doc__,
+    __new__ = interp2app(W_Scanner___new__),
+    __call__ = interp2app(W_Scanner.descr_call),
+    )
+
+
+class StringContext(ScannerContext):
+    "The context used by scanstring(), which only decodes strings."
+
+    def __init__(self, space, encoding, strict):
+        self.space = space
+        self.strict = strict
+        self.w_object_hook = None
+        self.w_object_pairs_hook = None
+        self.w_parse_float = None
+        self.w_parse_int = None
+        self.w_parse_constant = None
+        self.encoding = encoding
+        self.fast_float = False
+        self.fast_int = False
+
+
+@unwrap_spec(end=int, strict=bool)
+def scanstring(space, w_string, end, w_encoding=None, strict=True):
+    """scanstring(basestring, end, encoding, strict=True) -> (str, end)
+
+Scan the string s for a JSON string. End is the index of the
+character in s after the quote that started the JSON string.
+Unescapes all valid JSON string escape sequences and raises ValueError
+on attempt to decode an invalid string. If strict is False then literal
+control characters are allowed in the string.
+
+Returns a tuple of the decoded string and the index of the character in s
+after the end quote."""
+    ctx = StringContext(space, decode_encoding(space, w_encoding), strict)
+    w_result, end = decode(space, ctx, w_string, end, True)
+    return space.newtuple([w_result, space.wrap(end)])
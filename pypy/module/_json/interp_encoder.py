@@ -0,0 +1,468 @@
+from pypy.interpreter.baseobjspace import Wrappable
+from pypy.interpreter.error import OperationError, operationerrfmt
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.interpreter.typedef import TypeDef
+from pypy.objspace.std.intobject import W_IntObject
+from pypy.objspace.std.floatobject import W_FloatObject, float2string
+from pypy.objspace.std.stringobject import W_StringObject
+from pypy.objspace.std.unicodeobject import W_UnicodeObject
+from pypy.objspace.std.dictmultiobject import W_DictMultiObject
+from pypy.rlib.rfloat import isnan, isinf
+from pypy.rlib.rstring import StringBuilder, UnicodeBuilder
+from pypy.rlib.runicode import MAXUNICODE
+
+
+HEXDIGITS = '0123456789abcdef'
+
+def _escape_char(c):
+    # the escape sequence of the characters that always need one, or None
+    if c == '"':
+        return '\\"'
+    elif c == '\\':
+        return '\\\\'
+    elif c == '\b':
+        return '\\b'
+    elif c == '\f':
+        return '\\f'
+    elif c == '\n':
+        return '\\n'
+    elif c == '\r':
+        return '\\r'
+    elif c == '\t':
+        return '\\t'
+    return None
+
+def _append_uescape(builder, n):
+    builder.append('\\u')
+    builder.append(HEXDIGITS[(n >> 12) & 0xf])
+    builder.append(HEXDIGITS[(n >> 8) & 0xf])
+    builder.append(HEXDIGITS[(n >> 4) & 0xf])
+    builder.append(HEXDIGITS[n & 0xf])
+
+def escape_ascii_str(builder, s):
+    # 's' must contain only ascii characters
+    start = 0
+    for i in range(len(s)):
+        c = s[i]
+        if ' ' <= c <= '~' and c != '"' and c != '\\':
+            continue
+        builder.append_slice(s, start, i)
+        start = i + 1
+        esc = _escape_char(c)
+        if esc is not None:
+            builder.append(esc)
+        else:
+            _append_uescape(builder, ord(c))
+    builder.append_slice(s, start, len(s))
+
+def escape_ascii_unicode(builder, u):
+    # writes only ascii characters to the StringBuilder
+    for i in range(len(u)):
+        n = ord(u[i])
+        if 0x20 <= n <= 0x7e:
+            c = chr(n)
+            if c == '"' or c == '\\':
+                builder.append('\\')
+            builder.append(c)
+            continue
+        if n < 0x80:
+            esc = _escape_char(chr(n))
+            if esc is not None:
+                builder.append(esc)
+                continue
+        if MAXUNICODE > 0xffff and n >= 0x10000:
+            # surrogate pair
+            n -= 0x10000
+            _append_uescape(builder, 0xd800 | ((n >> 10) & 0x3ff))
+            _append_uescape(builder, 0xdc00 | (n & 0x3ff))
+        else:
+            _append_uescape(builder, n)
+
+def escape_unicode(builder, u):
+    # only escapes the control characters, '"' and '\\'
+    start = 0
+    for i in range(len(u)):
+        n = ord(u[i])
+        if n >= 0x20 and n != ord('"') and n != ord('\\'):
+            continue
+        builder.append_slice(u, start, i)
+        start = i + 1
+        esc = _escape_char(chr(n))
+        if esc is not None:
+            builder.append(unicode(esc))
+        else:
+            builder.append(u'\\u00')
+            builder.append(unicode(HEXDIGITS[n >> 4]))
+            builder.append(unicode(HEXDIGITS[n & 0xf]))
+    builder.append_slice(u, start, len(u))
+
+def _is_ascii(s):
+    for c in s:
+        if ord(c) >= 0x80:
+            return False
+    return True
+
+def _decode_utf8(space, w_s):
+    return space.unicode_w(space.call_method(w_s, 'decode',
+                                             space.wrap('utf-8')))
+
+def _append_ascii_escaped(space, builder, w_s):
+    if space.isinstance_w(w_s, space.w_unicode):
+        escape_ascii_unicode(builder, space.unicode_w(w_s))
+        return
+    s = space.str_w(w_s)
+    if _is_ascii(s):
+        escape_ascii_str(builder, s)
+    else:
+        escape_ascii_unicode(builder, _decode_utf8(space, w_s))
+
+def _append_escaped(space, builder, w_s):
+    if space.isinstance_w(w_s, space.w_unicode):
+        escape_unicode(builder, space.unicode_w(w_s))
+    else:
+        escape_unicode(builder, _decode_utf8(space, w_s))
+
+def encode_basestring_ascii(space, w_s):
+    """encode_basestring_ascii(basestring) -> str
+
+Return an ASCII-only JSON representation of a Python string"""
+    if not (space.isinstance_w(w_s, space.w_str) or
+            space.isinstance_w(w_s, space.w_unicode)):
+        raise operationerrfmt(space.w_TypeError,
+                              "first argument must be a string, not %s",
+                              space.type(w_s).getname(space))
+    builder = StringBuilder()
+    builder.append('"')
+    _append_ascii_escaped(space, builder, w_s)
+    builder.append('"')
+    return space.wrap(builder.build())
+
+def encode_basestring(space, w_s):
+    """encode_basestring(basestring) -> unicode
+
+Return a JSON representation of a Python string"""
+    if not (space.isinstance_w(w_s, space.w_str) or
+            space.isinstance_w(w_s, space.w_unicode)):
+        raise operationerrfmt(space.w_TypeError,
+                              "first argument must be a string, not %s",
+                              space.type(w_s).getname(space))
+    builder = UnicodeBuilder()
+    builder.append(u'"')
+    _append_escaped(space, builder, w_s)
+    builder.append(u'"')
+    return space.wrap(builder.build())
+
+# ____________________________________________________________
+
+# how the strings are encoded: by calling the 'encoder' function given to
+# make_encoder(), or directly if it is one of the two functions above
+ENCODE_CALL = 0
+ENCODE_ASCII = 1
+ENCODE_UNICODE = 2
+
+
+def make_encoder_class(do_unicode):
+    """The whole output is written into a single builder: a StringBuilder
+    if the strings are encoded by encode_basestring_ascii(), and a
+    UnicodeBuilder otherwise."""
+    if do_unicode:
+        const = unicode
+    else:
+        const = str
+
+    class Encoder(object):
+
+        def __init__(self, space, w_encoder):
+            self.space = space
+            self.config = w_encoder
+            if do_unicode:
+                self.builder = UnicodeBuilder()
+            else:
+                self.builder = StringBuilder()
+
+        def append_w(self, w_s):
+            space = self.space
+            if do_unicode:
+                if not space.isinstance_w(w_s, space.w_unicode):
+                    w_s = space.call_function(space.w_unicode, w_s)
+                self.builder.append(space.unicode_w(w_s))
+            else:
+                if space.isinstance_w(w_s, space.w_unicode):
+                    w_s = space.call_method(w_s, 'encode',
+                                            space.wrap('ascii'))
+                self.builder.append(space.str_w(w_s))
+
+        def append_string(self, w_s):
+            space = self.space
+            mode = self.config.encode_mode
+            if not do_unicode:
+                assert mode == ENCODE_ASCII
+                self.builder.append('"')
+                _append_ascii_escaped(space, self.builder, w_s)
+                self.builder.append('"')
+            elif mode == ENCODE_UNICODE:
+                self.builder.append(u'"')
+                _append_escaped(space, self.builder, w_s)
+                self.builder.append(u'"')
+            else:
+                self.append_w(space.call_function(self.config.w_encoder,
+                                                  w_s))
+
+        def floatstr(self, w_obj):
+            space = self.space
+            x = space.float_w(w_obj)
+            if isnan(x):
+                s = 'NaN'
+            elif isinf(x):
+                if x > 0:
+                    s = 'Infinity'
+                else:
+                    s = '-Infinity'
+            elif type(w_obj) is W_FloatObject:
+                return space.wrap(float2string(x, 'r', 0))
+            else:
+                return space.repr(w_obj)
+            if not self.config.allow_nan:
+                raise OperationError(space.w_ValueError, space.wrap(
+                    "Out of range float values are not JSON compliant: " +
+                    space.str_w(space.repr(w_obj))))
+            return space.wrap(s)
+
+        def mark(self, w_obj):
+            space = self.space
+            w_markers = self.config.w_markers
+            if w_markers is None:
+                return None
+            w_id = space.id(w_obj)
+            if space.is_true(space.contains(w_markers, w_id)):
+                raise OperationError(space.w_ValueError,
+                                     space.wrap("Circular reference detected"))
+            space.setitem(w_markers, w_id, w_obj)
+            return w_id
+
+        def unmark(self, w_id):
+            if w_id is not None:
+                self.space.delitem(self.config.w_markers, w_id)
+
+        def indent(self, level):
+            # returns the separator to use between the items
+            indent = self.config.indent
+            w_separator = self.config.w_item_separator
+            if indent < 0:
+                return w_separator
+            newline_indent = '\n' + ' ' * (indent * level)
+            self.builder.append(const(newline_indent))
+            return self.space.add(w_separator,
+                                  self.space.wrap(newline_indent))
+
+        def unindent(self, level):
+            indent = self.config.indent
+            if indent >= 0:
+                self.builder.append(const('\n' + ' ' * (indent * (level - 1))))
+
+        def encode(self, w_obj, level):
+            space = self.space
+            if space.is_w(w_obj, space.w_None):
+                self.builder.append(const('null'))
+            elif space.is_w(w_obj, space.w_True):
+                self.builder.append(const('true'))
+            elif space.is_w(w_obj, space.w_False):
+                self.builder.append(const('false'))
+            elif (type(w_obj) is W_StringObject or
+                  type(w_obj) is W_UnicodeObject or
+                  space.isinstance_w(w_obj, space.w_basestring)):
+                self.append_string(w_obj)
+            elif type(w_obj) is W_IntObject:
+                self.builder.append(const(str(w_obj.intval)))
+            elif (space.isinstance_w(w_obj, space.w_int) or
+                  space.isinstance_w(w_obj, space.w_long)):
+                self.append_w(space.str(w_obj))
+            elif space.isinstance_w(w_obj, space.w_float):
+                self.append_w(self.floatstr(w_obj))
+            elif (space.isinstance_w(w_obj, space.w_list) or
+                  space.isinstance_w(w_obj, space.w_tuple)):
+                self.encode_list(w_obj, level)
+            elif space.isinstance_w(w_obj, space.w_dict):
+                self.encode_dict(w_obj, level)
+            else:
+                w_id = self.mark(w_obj)
+                w_newobj = space.call_function(self.config.w_default, w_obj)
+                self.encode(w_newobj, level)
+                self.unmark(w_id)
+
+        def encode_list(self, w_seq, level):
+            items_w = self.space.fixedview(w_seq)
+            if not items_w:
+                self.builder.append(const('[]'))
+                return
+            w_id = self.mark(w_seq)
+            self.builder.append(const('['))
+            level += 1
+            w_separator = self.indent(level)
+            for i in range(len(items_w)):
+                if i > 0:
+                    self.append_w(w_separator)
+                self.encode(items_w[i], level)
+            self.unindent(level)
+            self.builder.append(const(']'))
+            self.unmark(w_id)
+
+        def encode_dict(self, w_dict, level):
+            space = self.space
+            if space.len_w(w_dict) == 0:
+                self.builder.append(const('{}'))
+                return
+            w_id = self.mark(w_dict)
+            self.builder.append(const('{'))
+            level += 1
+            w_separator = self.indent(level)
+            first = True
+            if self.config.sort_keys:
+                w_keys = space.call_method(w_dict, 'keys')
+                space.call_method(w_keys, 'sort')
+                for w_key in space.fixedview(w_keys):
+                    w_value = space.getitem(w_dict, w_key)
+                    if self.encode_item(w_key, w_value, w_separator, first,
+                                        level):
+                        first = False
+            elif type(w_dict) is W_DictMultiObject:
+                iterator = w_dict.iter()
+                while True:
+                    w_key, w_value = iterator.next()
+                    if w_key is None:
+                        break
+                    if self.encode_item(w_key, w_value, w_separator, first,
+                                        level):
+                        first = False
+            else:
+                w_iter = space.iter(space.call_method(w_dict, 'iteritems'))
+                while True:
+                    try:
+                        w_item = space.next(w_iter)
+                    except OperationError, e:
+                        if not e.match(space, space.w_StopIteration):
+                            raise
+                        break
+                    w_key, w_value = space.fixedview(w_item, 2)
+                    if self.encode_item(w_key, w_value, w_separator, first,
+                                        level):
+                        first = False
+            self.unindent(level)
+            self.builder.append(const('}'))
+            self.unmark(w_id)
+
+        def encode_item(self, w_key, w_value, w_separator, first, level):
+            # returns False if the item was skipped
+            space = self.space
+            if (space.isinstance_w(w_key, space.w_str) or
+                space.isinstance_w(w_key, space.w_unicode)):
+                pass
+            elif space.isinstance_w(w_key, space.w_float):
+                w_key = self.floatstr(w_key)
+            elif space.is_w(w_key, space.w_True):
+                w_key = space.wrap('true')
+            elif space.is_w(w_key, space.w_False):
+                w_key = space.wrap('false')
+            elif space.is_w(w_key, space.w_None):
+                w_key = space.wrap('null')
+            elif (space.isinstance_w(w_key, space.w_int) or
+                  space.isinstance_w(w_key, space.w_long)):
+                w_key = space.str(w_key)
+            elif self.config.skipkeys:
+                return False
+            else:
+                raise OperationError(space.w_TypeError, space.wrap(
+                    "key " + space.str_w(space.repr(w_key)) +
+                    " is not a string"))
+            if not first:
+                self.append_w(w_separator)
+            self.append_string(w_key)
+            self.append_w(self.config.w_key_separator)
+            self.encode(w_value, level)
+            return True
+
+    return Encoder
+
+StrEncoder = make_encoder_class(do_unicode=False)
+UnicodeEncoder = make_encoder_class(do_unicode=True)
+StrEncoder.__name__ = 'StrEncoder'
+UnicodeEncoder.__name__ = 'UnicodeEncoder'
+
+# ____________________________________________________________
+
+class State:
+    def __init__(self, space):
+        w_module = space.getbuiltinmodule('_json')
+        self.w_encode_basestring_ascii = space.getattr(
+            w_module, space.wrap('encode_basestring_ascii'))
+        self.w_encode_basestring = space.getattr(
+            w_module, space.wrap('encode_basestring'))
+
+
+class W_Encoder(Wrappable):
+    """_iterencode(obj, _current_indent_level) -> iterable"""
+
+    def __init__(self, space, w_markers, w_default, w_encoder, indent,
+                 w_key_separator, w_item_separator, sort_keys, skipkeys,
+                 allow_nan):
+        self.space = space
+        if space.is_w(w_markers, space.w_None):
+            w_markers = None
+        self.w_markers = w_markers
+        self.w_default = w_default
+        self.w_encoder = w_encoder
+        self.indent = indent
+        self.w_key_separator = w_key_separator
+        self.w_item_separator = w_item_separator
+        self.sort_keys = sort_keys
+        self.skipkeys = skipkeys
+        self.allow_nan = allow_nan
+        cs = space.fromcache(State)
+        if space.is_w(w_encoder, cs.w_encode_basestring_ascii):
+            self.encode_mode = ENCODE_ASCII
+        elif space.is_w(w_encoder, cs.w_encode_basestring):
+            self.encode_mode = ENCODE_UNICODE
+        else:
+            self.encode_mode = ENCODE_CALL
+
+    @unwrap_spec(level=int)
+    def descr_call(self, space, w_obj, level):
+        # returns the whole encoded string as the only item of a list
+        if self.encode_mode == ENCODE_ASCII:
+            sencoder = StrEncoder(space, self)
+            sencoder.encode(w_obj, level)
+            w_result = space.wrap(sencoder.builder.build())
+        else:
+            uencoder = UnicodeEncoder(space, self)
+            uencoder.encode(w_obj, level)
+            w_result = space.wrap(uencoder.builder.build())
+        return space.newlist([w_result])
+
+
+def W_Encoder___new__(space, w_subtype, w_markers, w_default, w_encoder,
+                      w_indent, w_key_separator, w_item_separator,
+                      w_sort_keys, w_skipkeys, w_allow_nan):
+    if not (space.is_w(w_markers, space.w_None) or
+            space.isinstance_w(w_markers, space.w_dict)):
+        raise OperationError(space.w_TypeError, space.wrap(
+            "make_encoder() argument 1 must be dict or None"))
+    if space.is_w(w_indent, space.w_None):
+        indent = -1
+    else:
+        indent = space.int_w(w_indent)
+        if indent < 0:
+            indent = 0
+    w_result = space.allocate_instance(W_Encoder, w_subtype)
+    W_Encoder.__init__(w_result, space, w_markers, w_default, w_encoder,
+                       indent, w_key_separator, w_item_separator,
+                       space.is_true(w_sort_keys), space.is_true(w_skipkeys),
+                       space.is_true(w_allow_nan))
+    return space.wrap(w_result)
+
+W_Encoder.typedef = TypeDef(
+    'Encoder',
+    __module__ = '_json',
+    __doc__ = W_Encoder.__doc__,
+    __new__ = interp2app(W_Encoder___new__),
+    __call__ = interp2app(W_Encoder.descr_call),
+    )
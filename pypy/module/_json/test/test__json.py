@@ -0,0 +1,144 @@
+from pypy.conftest import gettestobjspace
+
+
+class AppTestJson:
+    def setup_class(cls):
+        cls.space = gettestobjspace(usemodules=['_json'])
+
+    def test_is_builtin(self):
+        import _json
+        assert 'built-in' in repr(_json.scanstring)
+        import json.decoder, json.scanner, json.encoder
+        assert json.decoder.scanstring is _json.scanstring
+        assert json.scanner.make_scanner is _json.make_scanner
+        assert json.encoder.c_make_encoder is _json.make_encoder
+
+    def test_scanstring(self):
+        import _json
+        assert _json.scanstring('"abc" x', 1) == (u'abc', 5)
+        assert _json.scanstring(u'"a\\u00e9\\n"', 1) == (u'a\xe9\n', 11)
+        assert _json.scanstring('"\xc3\xa9"', 1) == (u'\xe9', 4)
+        assert _json.scanstring('"\xe9"', 1, 'latin-1') == (u'\xe9', 3)
+        s, end = _json.scanstring('"\\ud834\\udd20"', 1)
+        assert end == 14
+        assert s == u'\U0001d120'
+        raises(ValueError, _json.scanstring, '"abc', 1)
+        raises(ValueError, _json.scanstring, '"a\tb"', 1)
+        assert _json.scanstring('"a\tb"', 1, None, False) == (u'a\tb', 5)
+        raises(ValueError, _json.scanstring, '"\\x"', 1)
+        raises(TypeError, _json.scanstring, 42, 1)
+
+    def test_loads(self):
+        import json
+        assert json.loads('[1, 2.5, -3, 1e3, "x", true, false, null]') == [
+            1, 2.5, -3, 1000.0, u'x', True, False, None]
+        assert json.loads(u' {"a": [], "b": {}, "c": {"d": 12345678901234567890}} ') == {
+            u'a': [], u'b': {}, u'c': {u'd': 12345678901234567890}}
+        assert json.loads('"\\u20ac"') == u'\u20ac'
+        res = json.loads('[NaN, Infinity, -Infinity]')
+        assert res[0] != res[0]
+        assert res[1] == float('inf')
+        assert res[2] == float('-inf')
+        for input in ['[1,', '{"a" 1}', '{"a": 1,}', '[1 2]', 'nul', '-',
+                      '{1: 2}', '[1]x', '']:
+            raises(ValueError, json.loads, input)
+
+    def test_error_message(self):
+        import json
+        try:
+            json.loads('[1, 2')
+        except ValueError, e:
+            assert 'Expecting , delimiter' in str(e)
+            assert '(char 5)' in str(e)
+        else:
+            assert False, "should have raised"
+
+    def test_hooks(self):
+        import json
+        from decimal import Decimal
+        res = json.loads('{"a": 1, "b": 2}', object_pairs_hook=list)
+        assert res == [(u'a', 1), (u'b', 2)]
+        res = json.loads('{"a": 1}', object_hook=lambda d: d.keys())
+        assert res == [u'a']
+        res = json.loads('[1.5, 2]', parse_float=Decimal, parse_int=str)
+        assert res == [Decimal('1.5'), '2']
+        res = json.loads('[NaN]', parse_constant=lambda s: s.lower())
+        assert res == ['nan']
+
+    def test_scanner_stopiteration(self):
+        import json.decoder
+        scan_once = json.decoder.JSONDecoder().scan_once
+        assert scan_once('[1]', 0) == ([1], 3)
+        exc = raises(StopIteration, scan_once, '[1]', 3)
+        assert exc.value.args == (3,)
+
+    def test_encode_basestring(self):
+        import _json
+        assert _json.encode_basestring_ascii('a"b\\c\n') == '"a\\"b\\\\c\\n"'
+        assert _json.encode_basestring_ascii(u'\xe9\x7f') == '"\\u00e9\\u007f"'
+        assert _json.encode_basestring_ascii('\xc3\xa9') == '"\\u00e9"'
+        res = _json.encode_basestring_ascii(u'\U0001d120')
+        assert res == '"\\ud834\\udd20"'
+        assert type(_json.encode_basestring_ascii(u'x')) is str
+        assert _json.encode_basestring(u'\xe9\x01"') == u'"\xe9\\u0001\\""'
+        raises(TypeError, _json.encode_basestring_ascii, 42)
+
+    def test_dumps(self):
+        import json
+        assert json.dumps([1, 2.5, u'\xe9', None, True, False, (3,)]) == (
+            '[1, 2.5, "\\u00e9", null, true, false, [3]]')
+        assert json.dumps({'a': 1}) == '{"a": 1}'
+        assert json.dumps({2: 3, 1.5: 4, None: 5, True: 6},
+                          sort_keys=True) == (
+            '{"null": 5, "true": 6, "1.5": 4, "2": 3}')
+        res = json.dumps({'a': [1, 2], 'b': 3}, sort_keys=True, indent=2,
+                         separators=(',', ': '))
+        assert res == '{\n  "a": [\n    1,\n    2\n  ],\n  "b": 3\n}'
+        assert json.dumps([[], {}]) == '[[], {}]'
+        assert json.dumps(12345678901234567890) == '12345678901234567890'
+        assert json.dumps(0.1) == '0.1'
+
+    def test_dumps_unicode(self):
+        import json
+        res = json.dumps([u'\xe9', 'x'], ensure_ascii=False)
+        assert res == u'["\xe9", "x"]'
+        assert type(res) is unicode
+        res = json.dumps(['\xe9'], ensure_ascii=False, encoding='latin-1')
+        assert res == u'["\xe9"]'
+
+    def test_dumps_errors(self):
+        import json
+        l = []
+        l.append(l)
+        raises(ValueError, json.dumps, l)
+        d = {}
+        d['x'] = d
+        raises(ValueError, json.dumps, d)
+        raises(ValueError, json.dumps, [float('nan')], allow_nan=False)
+        assert json.dumps([float('nan')]) == '[NaN]'
+        raises(TypeError, json.dumps, {(1, 2): 3})
+        assert json.dumps({(1, 2): 3, 'a': 4}, skipkeys=True) == '{"a": 4}'
+        raises(TypeError, json.dumps, object())
+
+    def test_dumps_default(self):
+        import json
+        class Point(object):
+            def __init__(self, x, y):
+                self.x, self.y = x, y
+        def default(o):
+            return [o.x, o.y]
+        res = json.dumps({'p': Point(1, 2)}, default=default)
+        assert res == '{"p": [1, 2]}'
+
+    def test_dumps_subclasses(self):
+        import json
+        from collections import OrderedDict
+        class MyList(list):
+            pass
+        class MyFloat(float):
+            def __repr__(self):
+                return '42.0'
+        d = OrderedDict([('z', 1), ('a', 2)])
+        assert json.dumps(d) == '{"z": 1, "a": 2}'
+        assert json.dumps(MyList([1, 2])) == '[1, 2]'
+        assert json.dumps(MyFloat(1.5)) == '42.0'
@@ -7,6 +7,7 @@ from pypy.interpreter.error import (
 from pypy.rpython.lltypesystem import rffi, lltype
 from pypy.rlib.rarithmetic import intmask
 from pypy.rlib import rpoll
+from pypy.rlib.rstring import StringBuilder
 import sys
 
 READABLE = 1
@@ -22,6 +23,17 @@ def BufferTooShort(space, w_data):
     w_BufferTooShort = space.getattr(w_module, space.wrap("BufferTooShort"))
     return OperationError(w_BufferTooShort, w_data)
 
+def pack_int(builder, value):
+    # 4-byte little-endian, as used by the framing of batches
+    for i in range(4):
+        builder.append(chr((value >> (8 * i)) & 0xFF))
+
+def unpack_int(data, pos):
+    value = 0
+    for i in range(4):
+        value |= ord(data[pos + i]) << (8 * i)
+    return value
+
 def w_handle(space, handle):
     return space.wrap(rffi.cast(rffi.INTPTR_T, handle))
 
@@ -134,7 +146,7 @@ class W_BaseConnection(Wrappable):
 
         w_builtins = space.getbuiltinmodule('__builtin__')
         w_picklemodule = space.call_method(
-            w_builtins, '__import__', space.wrap("pickle"))
+            w_builtins, '__import__', space.wrap("cPickle"))
         w_protocol = space.getattr(
             w_picklemodule, space.wrap("HIGHEST_PROTOCOL"))
         w_pickled = space.call_method(
@@ -160,12 +172,104 @@ class W_BaseConnection(Wrappable):
 
         w_builtins = space.getbuiltinmodule('__builtin__')
         w_picklemodule = space.call_method(
-            w_builtins, '__import__', space.wrap("pickle"))
+            w_builtins, '__import__', space.wrap("cPickle"))
         w_unpickled = space.call_method(
             w_picklemodule, "loads", w_received)
 
         return w_unpickled
 
+    def _recv_string(self, space):
+        res, newbuf = self.do_recv_string(
+            space, self.BUFFER_SIZE, PY_SSIZE_T_MAX)
+        res = intmask(res)
+        try:
+            if newbuf:
+                return rffi.charpsize2str(newbuf, res)
+            else:
+                return rffi.charpsize2str(self.buffer, res)
+        finally:
+            if newbuf:
+                rffi.free_charp(newbuf)
+
+    def send_shared(self, space, w_obj):
+        """Send the content of a buffer-like object through a shared
+        memory segment; only its handle is written to the connection."""
+        from pypy.module._multiprocessing import interp_sharedmem
+        self._check_writable(space)
+        buffer = space.buffer_w(w_obj)
+        handle = interp_sharedmem.export_buffer(space, buffer)
+        try:
+            self.do_send_string(space, handle, 0, len(handle))
+        except OperationError:
+            start = handle.find(':') + 1
+            assert start > 0
+            interp_sharedmem.unlink_shared_file(handle[start:])
+            raise
+
+    def recv_shared(self, space):
+        """Receive an object sent with send_shared(), as a read-write
+        buffer mapping the shared memory directly."""
+        from pypy.module._multiprocessing import interp_sharedmem
+        self._check_readable(space)
+        handle = self._recv_string(space)
+        return space.wrap(interp_sharedmem.import_buffer(space, handle))
+
+    @unwrap_spec(offset='index')
+    def recv_shared_into(self, space, w_buffer, offset=0):
+        """Receive an object sent with send_shared() into a writable
+        buffer, and return the number of bytes received."""
+        from pypy.module._multiprocessing import interp_sharedmem
+        self._check_readable(space)
+        rwbuffer = space.rwbuffer_w(w_buffer)
+        length = rwbuffer.getlength()
+        handle = self._recv_string(space)
+        shared = interp_sharedmem.import_buffer(space, handle)
+        size = shared.getlength()
+        if offset < 0 or offset + size > length:
+            raise BufferTooShort(space, space.wrap(shared))
+        if size > 0:
+            assert isinstance(shared, interp_sharedmem.SharedMemoryBuffer)
+            interp_sharedmem.copy_to_rwbuffer(rwbuffer, offset,
+                                              shared.mmap.data, size)
+        return space.wrap(size)
+
+    def send_batch(self, space, w_messages):
+        """Send a sequence of strings as a single message."""
+        self._check_writable(space)
+        messages_w = space.listview(w_messages)
+        builder = StringBuilder()
+        pack_int(builder, len(messages_w))
+        for w_message in messages_w:
+            message = space.bufferstr_w(w_message)
+            pack_int(builder, len(message))
+            builder.append(message)
+        data = builder.build()
+        self.do_send_string(space, data, 0, len(data))
+
+    def recv_batch(self, space):
+        """Receive a list of strings sent with send_batch()."""
+        self._check_readable(space)
+        data = self._recv_string(space)
+        end = len(data)
+        if end < 4:
+            raise OperationError(space.w_IOError,
+                                 space.wrap("bad batch message"))
+        count = unpack_int(data, 0)
+        pos = 4
+        result_w = []
+        for i in range(count):
+            if pos + 4 > end:
+                raise OperationError(space.w_IOError,
+                                     space.wrap("bad batch message"))
+            size = unpack_int(data, pos)
+            pos += 4
+            if size < 0 or size > end - pos:
+                raise OperationError(space.w_IOError,
+                                     space.wrap("bad batch message"))
+            result_w.append(space.wrap(data[pos:pos + size]))
+            pos += size
+        return space.newlist(result_w)
+
     def poll(self, space, w_timeout=0.0):
         self._check_readable(space)
         if space.is_w(w_timeout, space.w_None):
@@ -188,6 +292,8 @@ W_BaseConnection.typedef = TypeDef(
     send = interp2app(W_BaseConnection.send),
     recv = interp2app(W_BaseConnection.recv),
     poll = interp2app(W_BaseConnection.poll),
+    send_batch = interp2app(W_BaseConnection.send_batch),
+    recv_batch = interp2app(W_BaseConnection.recv_batch),
     close = interp2app(W_BaseConnection.close),
     )
 
@@ -339,6 +445,12 @@ W_FileConnection.typedef = TypeDef(
     __module__ = '_multiprocessing',
     fileno = interp2app(W_FileConnection.fileno),
 )
+if sys.platform != 'win32':
+    W_FileConnection.typedef.rawdict.update(
+        send_shared = interp2app(W_BaseConnection.send_shared),
+        recv_shared = interp2app(W_BaseConnection.recv_shared),
+        recv_shared_into = interp2app(W_BaseConnection.recv_shared_into),
+        )
 
 class W_PipeConnection(W_BaseConnection):
     if sys.platform == 'win32':
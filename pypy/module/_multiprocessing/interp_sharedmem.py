@@ -0,0 +1,191 @@
+"""
+Transport of large buffers through shared memory: the data is copied
+into a file mapped with rmmap, and only the name of the file goes over
+the connection.  The receiver maps the same file and unlinks it.
+
+The receiver only accepts the names that create_shared_file() can
+produce, i.e. a 'pypy-mp-' file directly in /dev/shm or in the temporary
+directory, and does not follow symlinks: otherwise the peer could make
+it map and delete any file it has the right to write.
+"""
+
+import os, stat
+from pypy.interpreter.buffer import RWBuffer, StringBuffer
+from pypy.interpreter.error import OperationError, wrap_oserror
+from pypy.interpreter.gateway import applevel
+from pypy.rpython.lltypesystem import rffi
+from pypy.rlib import rmmap
+from pypy.objspace.std.strutil import string_to_int, ParseStringError
+from pypy.objspace.std.strutil import ParseStringOverflowError
+
+
+class SharedMemoryBuffer(RWBuffer):
+    """A read-write buffer on a shared memory mapping, which stays
+    mapped as long as the buffer is alive."""
+
+    def __init__(self, mmap):
+        self.mmap = mmap
+
+    def __del__(self):
+        try:
+            self.mmap.close()
+        except OSError:
+            pass
+
+    def getlength(self):
+        return self.mmap.size
+
+    def getitem(self, index):
+        return self.mmap.data[index]
+
+    def getslice(self, start, stop, step, size):
+        if step == 1:
+            return rffi.charpsize2str(rffi.ptradd(self.mmap.data, start),
+                                      stop - start)
+        return RWBuffer.getslice(self, start, stop, step, size)
+
+    def setitem(self, index, char):
+        self.mmap.data[index] = char
+
+    def get_raw_address(self):
+        return self.mmap.data
+
+
+def copy_from_buffer(dest, buffer, size):
+    # copy 'size' bytes from the Buffer instance to the CCHARP 'dest'
+    try:
+        src = buffer.get_raw_address()
+    except ValueError:
+        data = buffer.as_str()
+        src = rffi.get_nonmovingbuffer(data)
+        try:
+            rffi.c_memcpy(rffi.cast(rffi.VOIDP, dest),
+                          rffi.cast(rffi.VOIDP, src), size)
+        finally:
+            rffi.free_nonmovingbuffer(data, src)
+    else:
+        rffi.c_memcpy(rffi.cast(rffi.VOIDP, dest),
+                      rffi.cast(rffi.VOIDP, src), size)
+
+def copy_to_rwbuffer(rwbuffer, offset, src, size):
+    # copy 'size' bytes from the CCHARP 'src' into the RWBuffer instance
+    try:
+        dest = rwbuffer.get_raw_address()
+    except ValueError:
+        rwbuffer.setslice(offset, rffi.charpsize2str(src, size))
+    else:
+        rffi.c_memcpy(rffi.cast(rffi.VOIDP, rffi.ptradd(dest, offset)),
+                      rffi.cast(rffi.VOIDP, src), size)
+
+
+app = applevel(r'''
+def create_shared_file():
+    import os, tempfile
+    if os.path.isdir('/dev/shm'):
+        dir = '/dev/shm'
+    else:
+        dir = None
+    return tempfile.mkstemp(prefix='pypy-mp-', dir=dir)
+''', filename=__file__)
+
+create_shared_file = app.interphook('create_shared_file')
+
+app_dirs = applevel(r'''
+def shared_file_dirs():
+    import tempfile
+    return ['/dev/shm', tempfile.gettempdir()]
+''', filename=__file__)
+
+shared_file_dirs = app_dirs.interphook('shared_file_dirs')
+
+SHARED_FILE_PREFIX = 'pypy-mp-'
+O_NOFOLLOW = getattr(os, 'O_NOFOLLOW', 0)
+
+
+def export_buffer(space, buffer):
+    """Copy the content of the Buffer instance into a new shared memory
+    file, and return the handle to send to the other process."""
+    size = buffer.getlength()
+    if size == 0:
+        return "0:"
+    w_fd, w_path = space.fixedview(create_shared_file(space), 2)
+    fd = space.int_w(w_fd)
+    path = space.str_w(w_path)
+    try:
+        try:
+            os.ftruncate(fd, size)
+            mmap = rmmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+    except OSError, e:
+        unlink_shared_file(path)
+        raise wrap_oserror(space, e)
+    try:
+        copy_from_buffer(mmap.data, buffer, size)
+    finally:
+        mmap.close()
+    return "%d:%s" % (size, path)
+
+def bad_message(space):
+    return OperationError(space.w_IOError, space.wrap(
+        "bad shared memory message"))
+
+def check_shared_file_path(space, path):
+    """Check that 'path' is a name that create_shared_file() could have
+    returned."""
+    slash = path.rfind('/')
+    if slash <= 0:
+        raise bad_message(space)
+    dirname = path[:slash]
+    basename = path[slash + 1:]
+    if (not basename.startswith(SHARED_FILE_PREFIX) or
+            '..' in basename):
+        raise bad_message(space)
+    for w_dir in space.listview(shared_file_dirs(space)):
+        if space.str_w(w_dir) == dirname:
+            return
+    raise bad_message(space)
+
+def import_buffer(space, handle):
+    """Map the shared memory file described by 'handle', and return a
+    SharedMemoryBuffer on it.  The file is unlinked as soon as it is
+    mapped."""
+    colon = handle.find(':')
+    if colon <= 0:
+        raise bad_message(space)
+    try:
+        size = string_to_int(handle[:colon])
+    except (ParseStringError, ParseStringOverflowError):
+        raise bad_message(space)
+    if size < 0:
+        raise bad_message(space)
+    path = handle[colon + 1:]
+    if size == 0:
+        return StringBuffer("")
+    check_shared_file_path(space, path)
+    try:
+        fd = os.open(path, os.O_RDWR | O_NOFOLLOW, 0)
+    except OSError, e:
+        raise wrap_oserror(space, e, path, exception_name='w_IOError')
+    try:
+        try:
+            st = os.fstat(fd)
+            if not stat.S_ISREG(st.st_mode):
+                raise bad_message(space)
+            unlink_shared_file(path)
+            mmap = rmmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+    except OSError, e:
+        raise wrap_oserror(space, e)
+    except rmmap.RValueError, e:
+        raise OperationError(space.w_IOError, space.wrap(e.message))
+    except rmmap.RTypeError, e:
+        raise OperationError(space.w_IOError, space.wrap(e.message))
+    return SharedMemoryBuffer(mmap)
+
+def unlink_shared_file(path):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -2,6 +2,7 @@ import py
 import sys
 from pypy.conftest import gettestobjspace, option
 from pypy.interpreter.gateway import interp2app, W_Root
+from pypy.tool.udir import udir
 
 class TestImport:
     def test_simple(self):
@@ -65,6 +66,18 @@ class BaseConnectionTest(object):
         raises(multiprocessing.BufferTooShort, rhandle.recv_bytes_into, buffer)
         assert rhandle.readable
 
+    def test_batch(self):
+        rhandle, whandle = self.make_pair()
+
+        whandle.send_batch(["a", "", "hello" * 1000, buffer("xyz")])
+        whandle.send_batch([])
+        assert rhandle.recv_batch() == ["a", "", "hello" * 1000, "xyz"]
+        assert rhandle.recv_batch() == []
+        whandle.send_bytes("xy")
+        raises(IOError, rhandle.recv_batch)
+        whandle.send_bytes("\x01\x00\x00\x00\xff\xff\xff\xff")
+        raises(IOError, rhandle.recv_batch)
+
 class AppTestWinpipeConnection(BaseConnectionTest):
     def setup_class(cls):
         if sys.platform != "win32":
@@ -92,6 +105,7 @@ class AppTestSocketConnection(BaseConnectionTest):
         space = gettestobjspace(usemodules=('_multiprocessing', 'thread', 'signal'))
         cls.space = space
         cls.w_connections = space.newlist([])
+        cls.w_udir = space.wrap(str(udir))
 
         def socketpair(space):
             "A socket.socketpair() that works on Windows"
@@ -150,4 +164,64 @@ class AppTestSocketConnection(BaseConnectionTest):
         import _multiprocessing
 
         raises(IOError, _multiprocessing.Connection, -1)
-        raises(IOError, _multiprocessing.Connection, -15)
\ No newline at end of file
+        raises(IOError, _multiprocessing.Connection, -15)
+
+    def test_shared(self):
+        rhandle, whandle = self.make_pair()
+
+        data = "".join([chr(i % 256) for i in range(100000)])
+        whandle.send_shared(data)
+        whandle.send_shared(bytearray("abc"))
+        whandle.send_shared("")
+        shared = rhandle.recv_shared()
+        assert len(shared) == 100000
+        assert str(shared) == data
+        assert shared[5:10] == data[5:10]
+        shared[0] = "X"
+        assert shared[0] == "X"
+        assert str(rhandle.recv_shared()) == "abc"
+        assert str(rhandle.recv_shared()) == ""
+        raises(IOError, rhandle.send_shared, "abc")
+        raises(IOError, whandle.recv_shared)
+
+    def test_shared_bad_handle(self):
+        import os, tempfile
+        rhandle, whandle = self.make_pair()
+
+        fd, victim = tempfile.mkstemp(prefix='victim-')
+        os.write(fd, 'hello')
+        os.close(fd)
+        fd, other = tempfile.mkstemp(prefix='pypy-mp-', dir=self.udir)
+        os.write(fd, 'hello')
+        os.close(fd)
+        dir = os.path.dirname(victim)
+        link = os.path.join(dir, 'pypy-mp-link%d' % os.getpid())
+        os.symlink(victim, link)
+        try:
+            for path in [victim, other, link, dir + '/../' + victim,
+                         dir + '/pypy-mp-../' + os.path.basename(victim),
+                         'pypy-mp-relative']:
+                whandle.send_bytes('5:' + path)
+                raises(IOError, rhandle.recv_shared)
+                whandle.send_bytes('5:' + path)
+                raises(IOError, rhandle.recv_shared_into, bytearray(10))
+            assert open(victim).read() == 'hello'
+            assert open(other).read() == 'hello'
+            assert os.path.islink(link)
+        finally:
+            os.unlink(link)
+            os.unlink(other)
+            os.unlink(victim)
+
+    def test_shared_into(self):
+        import multiprocessing
+        rhandle, whandle = self.make_pair()
+
+        whandle.send_shared("hello world")
+        buf = bytearray(20)
+        assert rhandle.recv_shared_into(buf, 3) == 11
+        assert buf[3:14] == "hello world"
+        whandle.send_shared("hello world")
+        e = raises(multiprocessing.BufferTooShort,
+                   rhandle.recv_shared_into, bytearray(5))
+        assert str(e.value.args[0]) == "hello world"
@@ -1,3 +1,4 @@
+from pypy.rpython.lltypesystem import rffi
 from pypy.interpreter.buffer import RWBuffer
 
 # XXX not the most efficient implementation
@@ -18,3 +19,6 @@ class RawFFIBuffer(RWBuffer):
     def setitem(self, index, char):
         ll_buffer = self.datainstance.ll_buffer
         ll_buffer[index] = char
+
+    def get_raw_address(self):
+        return rffi.cast(rffi.CCHARP, self.datainstance.ll_buffer)
@@ -2,7 +2,9 @@ from pypy.interpreter.baseobjspace import Wrappable
 from pypy.interpreter.typedef import TypeDef, make_weakref_descr,\
      interp_attrproperty
 from pypy.interpreter.gateway import NoneNotWrapped, interp2app, unwrap_spec
-from pypy.rlib.rarithmetic import intmask
+from pypy.rlib.rarithmetic import intmask, r_longlong
+from pypy.rlib.objectmodel import keepalive_until_here
+from pypy.rpython.lltypesystem import rffi
 from pypy.rlib import rsocket
 from pypy.rlib.rsocket import RSocket, AF_INET, SOCK_STREAM
 from pypy.rlib.rsocket import SocketError, SocketErrorWithErrno
@@ -214,8 +216,8 @@ class W_RSocket(Wrappable, RSocket):
             raise converted_error(space, e)
         return space.wrap(count)
 
-    @unwrap_spec(data='bufferstr', flags=int)
-    def sendall_w(self, space, data, flags=0):
+    @unwrap_spec(flags=int)
+    def sendall_w(self, space, w_data, flags=0):
         """sendall(data[, flags])
 
         Send a data string to the socket.  For the optional flags
@@ -223,10 +225,95 @@ class W_RSocket(Wrappable, RSocket):
         until all data is sent.  If an error occurs, it's impossible
         to tell how much data has been sent.
         """
+        buffer = get_raw_buffer(space, w_data)
+        try:
+            if buffer is not None:
+                # signal handlers run while the GIL is released: pin the
+                # buffer so that they cannot resize it under send()
+                buffer.pin()
+                try:
+                    self.sendall_raw(buffer.get_raw_address(),
+                                     buffer.getlength(), flags,
+                                     SignalChecker(space))
+                finally:
+                    buffer.unpin()
+            else:
+                self.sendall(space.bufferstr_w(w_data), flags,
+                             SignalChecker(space))
+        except SocketError, e:
+            raise converted_error(space, e)
+        keepalive_until_here(w_data)
+
+    @unwrap_spec(flags=int)
+    def sendmsg_w(self, space, w_buffers, w_ancdata=NoneNotWrapped, flags=0,
+                  w_address=NoneNotWrapped):
+        """sendmsg(buffers[, ancdata[, flags[, address]]]) -> count
+
+        Send the data of the sequence of buffers as a single message,
+        without joining them first.  Ancillary data is not supported, so
+        ancdata must be empty.  For the optional flags argument, see the
+        Unix manual.  If address is given, send the message to it.  Return
+        the number of bytes sent.
+        """
+        if w_ancdata is not None and space.unpackiterable(w_ancdata):
+            raise OperationError(space.w_NotImplementedError,
+                                 space.wrap("ancillary data not supported"))
+        # buffers in raw memory are passed directly, and pinned while
+        # the GIL is released; the others are converted to strings
+        dataptrs = []
+        lengths = []
+        pinned = []
+        strings = []
+        stringptrs = []
+        try:
+            for w_buffer in space.unpackiterable(w_buffers):
+                buffer = get_raw_buffer(space, w_buffer)
+                if buffer is not None:
+                    buffer.pin()
+                    pinned.append(buffer)
+                    dataptrs.append(buffer.get_raw_address())
+                    lengths.append(buffer.getlength())
+                else:
+                    data = space.bufferstr_w(w_buffer)
+                    dataptr = rffi.get_nonmovingbuffer(data)
+                    strings.append(data)
+                    stringptrs.append(dataptr)
+                    dataptrs.append(dataptr)
+                    lengths.append(len(data))
+            try:
+                if w_address is None or space.is_w(w_address, space.w_None):
+                    address = None
+                else:
+                    address = self.addr_from_object(space, w_address)
+                count = self.sendmsg_raw(dataptrs, lengths, flags, address)
+            except SocketError, e:
+                raise converted_error(space, e)
+        finally:
+            for buffer in pinned:
+                buffer.unpin()
+            for i in range(len(strings)):
+                rffi.free_nonmovingbuffer(strings[i], stringptrs[i])
+        return space.wrap(count)
+
+    @unwrap_spec(offset=r_longlong, count='nonnegint')
+    def sendfile_w(self, space, w_file, offset=0, count=0):
+        """sendfile(file[, offset[, count]]) -> count
+
+        Send count bytes of the file, or all of it up to its end if count
+        is 0, starting at offset.  The file is a file object or a file
+        descriptor.  The data is copied by the kernel without going through
+        strings, and the file position is not changed.  Return the number
+        of bytes sent.
+        """
+        fd = space.c_filedescriptor_w(w_file)
+        if offset < 0:
+            raise OperationError(space.w_ValueError,
+                                 space.wrap("negative offset"))
         try:
-            count = self.sendall(data, flags, SignalChecker(space))
+            total = self.sendfile(fd, offset, count, SignalChecker(space))
         except SocketError, e:
             raise converted_error(space, e)
+        return space.wrap(total)
 
     @unwrap_spec(data='bufferstr')
     def sendto_w(self, space, data, w_param2, w_param3=NoneNotWrapped):
@@ -325,6 +412,53 @@ class W_RSocket(Wrappable, RSocket):
         except SocketError, e:
             raise converted_error(space, e)        
 
+    @unwrap_spec(bufsize='nonnegint', ancbufsize=int, flags=int)
+    def recvmsg_w(self, space, bufsize, ancbufsize=0, flags=0):
+        """recvmsg(bufsize[, ancbufsize[, flags]]) -> (data, ancdata, msg_flags, address)
+
+        Receive up to bufsize bytes of a single message.  Ancillary data is
+        not supported, so ancbufsize must be 0 and ancdata is always an
+        empty list.  The address is None if it is not known.
+        """
+        return self._recvmsg(space, [bufsize], ancbufsize, flags, None)
+
+    @unwrap_spec(ancbufsize=int, flags=int)
+    def recvmsg_into_w(self, space, w_buffers, ancbufsize=0, flags=0):
+        """recvmsg_into(buffers[, ancbufsize[, flags]]) -> (nbytes, ancdata, msg_flags, address)
+
+        Like recvmsg(), but scatter the data of the message into the
+        sequence of writable buffers, filling each one in turn.  Return
+        the total number of bytes received instead of the data.
+        """
+        rwbuffers = [space.rwbuffer_w(w_buffer)
+                     for w_buffer in space.unpackiterable(w_buffers)]
+        return self._recvmsg(space, [rwbuffer.getlength()
+                                     for rwbuffer in rwbuffers],
+                             ancbufsize, flags, rwbuffers)
+
+    def _recvmsg(self, space, sizes, ancbufsize, flags, rwbuffers):
+        if ancbufsize != 0:
+            raise OperationError(space.w_NotImplementedError,
+                                 space.wrap("ancillary data not supported"))
+        try:
+            strings, msg_flags, addr = self.recvmsg(sizes, flags)
+        except SocketError, e:
+            raise converted_error(space, e)
+        if addr:
+            w_addr = addr.as_object(self.fd, space)
+        else:
+            w_addr = space.w_None
+        if rwbuffers is None:
+            w_data = space.wrap(strings[0])
+        else:
+            nbytes = 0
+            for i in range(len(rwbuffers)):
+                rwbuffers[i].setslice(0, strings[i])
+                nbytes += len(strings[i])
+            w_data = space.wrap(nbytes)
+        return space.newtuple([w_data, space.newlist([]),
+                               space.wrap(msg_flags), w_addr])
+
     @unwrap_spec(cmd=int)
     def ioctl_w(self, space, cmd, w_option):
         from pypy.rpython.lltypesystem import rffi, lltype
@@ -429,6 +563,20 @@ def newsocket(space, w_subtype, family=AF_INET,
     return space.wrap(sock)
 descr_socket_new = interp2app(newsocket)
 
+def get_raw_buffer(space, w_obj):
+    """Return the Buffer of w_obj if its content can be passed to the
+    system directly from raw memory, or None if it must be converted
+    to a string.  The Buffer must be pinned while the memory is used."""
+    if (space.isinstance_w(w_obj, space.w_str) or
+            space.isinstance_w(w_obj, space.w_unicode)):
+        return None
+    buffer = space.buffer_w(w_obj)
+    try:
+        buffer.get_raw_address()
+    except ValueError:
+        return None
+    return buffer
+
 # ____________________________________________________________
 # Error handling
 
@@ -479,6 +627,10 @@ for name in ('dup',):
         socketmethodnames.remove(name)
 if hasattr(rsocket._c, 'WSAIoctl'):
     socketmethodnames.append('ioctl')
+if hasattr(RSocket, 'sendmsg'):
+    socketmethodnames.extend(['sendmsg', 'recvmsg', 'recvmsg_into'])
+if hasattr(RSocket, 'sendfile'):
+    socketmethodnames.append('sendfile')
 
 socketmethods = {}
 for methodname in socketmethodnames:
@@ -514,8 +666,12 @@ listen(n) -- start listening for incoming connections
 makefile([mode, [bufsize]]) -- return a file object for the socket [*]
 recv(buflen[, flags]) -- receive data
 recvfrom(buflen[, flags]) -- receive data and sender's address
+recvmsg(buflen[, ancbuflen[, flags]]) -- receive a message [*]
+recvmsg_into(buffers[, ancbuflen[, flags]]) -- scatter a message [*]
 sendall(data[, flags]) -- send all data
 send(data[, flags]) -- send data, may not send all of it
+sendfile(file[, offset[, count]]) -- send the content of a file [*]
+sendmsg(buffers[, ancdata[, flags[, addr]]]) -- gather and send data [*]
 sendto(data[, flags], addr) -- send data to a given address
 setblocking(0 | 1) -- set or clear the blocking I/O flag
 setsockopt(level, optname, value) -- set socket options
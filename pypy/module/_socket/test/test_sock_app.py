@@ -554,6 +554,9 @@ class AppTestSocket:
 class AppTestSocketTCP:
     def setup_class(cls):
         cls.space = space
+        sendfile_path = udir.join('app_test_sendfile')
+        sendfile_path.write('0123456789' * 100)
+        cls.w_sendfile_path = space.wrap(str(sendfile_path))
 
     HOST = 'localhost'
         
@@ -648,6 +651,103 @@ class AppTestSocketTCP:
         msg = buf.tostring()[:len(MSG)]
         assert msg == MSG
 
+    def test_sendall_buffer(self):
+        import _socket, array
+        cli = _socket.socket(_socket.AF_INET, _socket.SOCK_STREAM)
+        cli.connect(self.serv.getsockname())
+        conn, addr = self.serv.accept()
+        cli.sendall(array.array('c', 'from an array'))
+        cli.sendall(buffer(array.array('c', 'xxsliced'), 2))
+        cli.sendall(bytearray('bytearray'))
+        cli.close()
+        data = ''
+        while True:
+            s = conn.recv(100)
+            if not s:
+                break
+            data += s
+        assert data == 'from an arrayslicedbytearray'
+        conn.close()
+
+    def test_sendmsg_recvmsg(self):
+        import _socket, array
+        if not hasattr(_socket.socket, 'sendmsg'):
+            skip('no sendmsg() on this platform')
+        cli = _socket.socket(_socket.AF_INET, _socket.SOCK_STREAM)
+        cli.connect(self.serv.getsockname())
+        conn, addr = self.serv.accept()
+        assert cli.sendmsg(['abc', buffer('def'), u'g']) == 7
+        assert cli.sendmsg([], []) == 0
+        raises(NotImplementedError, cli.sendmsg, ['x'], [(0, 0, 'data')])
+        data, ancdata, msg_flags, address = conn.recvmsg(2)
+        assert (data, ancdata, msg_flags) == ('ab', [], 0)
+        buf1 = array.array('c', ' ' * 2)
+        buf2 = bytearray(10)
+        nbytes, ancdata, msg_flags, address = conn.recvmsg_into([buf1, buf2])
+        assert nbytes == 5
+        assert buf1.tostring() == 'cd' and str(buf2[:3]) == 'efg'
+        raises(NotImplementedError, conn.recvmsg, 10, 10)
+        cli.close()
+        conn.close()
+
+    def test_sendmsg_pins_arrays(self):
+        import _socket, array
+        if not hasattr(_socket.socket, 'sendmsg'):
+            skip('no sendmsg() on this platform')
+        cli = _socket.socket(_socket.AF_INET, _socket.SOCK_STREAM)
+        cli.connect(self.serv.getsockname())
+        conn, addr = self.serv.accept()
+        a = array.array('c', 'abc')
+        class Resizer(object):
+            def __buffer__(self):
+                # 'a' is passed to sendmsg() in place: it cannot move
+                a.append('d')
+        raises(BufferError, cli.sendmsg, [a, Resizer()])
+        assert a.tostring() == 'abc'
+        a.append('d')
+        assert cli.sendmsg([a]) == 4
+        assert conn.recv(10) == 'abcd'
+        cli.close()
+        conn.close()
+
+    def test_sendmsg_recvmsg_udp(self):
+        import _socket
+        if not hasattr(_socket.socket, 'sendmsg'):
+            skip('no sendmsg() on this platform')
+        s1 = _socket.socket(_socket.AF_INET, _socket.SOCK_DGRAM)
+        s2 = _socket.socket(_socket.AF_INET, _socket.SOCK_DGRAM)
+        s2.bind(('127.0.0.1', 0))
+        s1.bind(('127.0.0.1', 0))
+        s1.sendmsg(['da', 'ta'], [], 0, s2.getsockname())
+        data, ancdata, msg_flags, address = s2.recvmsg(100)
+        assert data == 'data'
+        assert address == s1.getsockname()
+        s1.close()
+        s2.close()
+
+    def test_sendfile(self):
+        import socket
+        if not hasattr(socket.socket, 'sendfile'):
+            skip('no sendfile() on this platform')
+        cli = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        cli.connect(self.serv.getsockname())
+        conn, addr = self.serv.accept()
+        f = open(self.sendfile_path, 'rb')
+        assert cli.sendfile(f, 5, 10) == 10
+        assert cli.sendfile(f.fileno()) == 1000
+        assert f.tell() == 0
+        raises(ValueError, cli.sendfile, f, -1)
+        f.close()
+        cli.close()
+        data = ''
+        while True:
+            s = conn.recv(4096)
+            if not s:
+                break
+            data += s
+        assert data == '5678901234' + '0123456789' * 100
+        conn.close()
+
     def test_family(self):
         import socket
         cli = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
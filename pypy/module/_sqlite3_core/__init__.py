@@ -0,0 +1,16 @@
+from pypy.interpreter.mixedmodule import MixedModule
+
+
+class Module(MixedModule):
+    """Low-level helpers for lib_pypy/_sqlite3.py: binding parameters and
+reading rows of prepared statements without going through ctypes."""
+
+    interpleveldefs = {
+        'bind_params':      'interp_sqlite3.bind_params',
+        'execute_many':     'interp_sqlite3.execute_many',
+        'read_current_row': 'interp_sqlite3.read_current_row',
+        'fetch_rows':       'interp_sqlite3.fetch_rows',
+        }
+
+    appleveldefs = {
+        }
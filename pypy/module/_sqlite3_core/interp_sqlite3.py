@@ -0,0 +1,289 @@
+from pypy.interpreter.buffer import Buffer, StringBuffer
+from pypy.interpreter.error import OperationError
+from pypy.interpreter.gateway import unwrap_spec
+from pypy.rpython.lltypesystem import rffi, lltype
+from pypy.rpython.tool import rffi_platform as platform
+from pypy.translator.tool.cbuild import ExternalCompilationInfo
+from pypy.rlib.rarithmetic import r_uint, r_longlong, intmask
+import sys
+
+
+eci = ExternalCompilationInfo(
+    includes = ['sqlite3.h'],
+    libraries = ['sqlite3'],
+    )
+eci = platform.configure_external_library(
+    'sqlite3', eci,
+    [dict(prefix='sqlite-')])
+if not eci:
+    raise ImportError("Could not find the sqlite3 library")
+
+# SQLITE_TRANSIENT is a cast of -1 to a function pointer, which is more
+# easily written in C
+eci = eci.merge(ExternalCompilationInfo(
+    post_include_bits = ['''
+        int pypy_sqlite3_bind_text(sqlite3_stmt *, int, const char *, int);
+        int pypy_sqlite3_bind_blob(sqlite3_stmt *, int, const char *, int);
+    '''],
+    separate_module_sources = ['''
+        #include <sqlite3.h>
+
+        int pypy_sqlite3_bind_text(sqlite3_stmt *st, int i, const char *s,
+                                   int n)
+        {
+            return sqlite3_bind_text(st, i, s, n, SQLITE_TRANSIENT);
+        }
+
+        int pypy_sqlite3_bind_blob(sqlite3_stmt *st, int i, const char *s,
+                                   int n)
+        {
+            return sqlite3_bind_blob(st, i, s, n, SQLITE_TRANSIENT);
+        }
+    '''],
+    export_symbols = ['pypy_sqlite3_bind_text', 'pypy_sqlite3_bind_blob'],
+    ))
+
+class CConfig:
+    _compilation_info_ = eci
+
+    SQLITE_OK = platform.ConstantInteger('SQLITE_OK')
+    SQLITE_ROW = platform.ConstantInteger('SQLITE_ROW')
+    SQLITE_DONE = platform.ConstantInteger('SQLITE_DONE')
+    SQLITE_INTEGER = platform.ConstantInteger('SQLITE_INTEGER')
+    SQLITE_FLOAT = platform.ConstantInteger('SQLITE_FLOAT')
+    SQLITE_BLOB = platform.ConstantInteger('SQLITE_BLOB')
+    SQLITE_NULL = platform.ConstantInteger('SQLITE_NULL')
+    SQLITE_TEXT = platform.ConstantInteger('SQLITE_TEXT')
+
+config = platform.configure(CConfig)
+SQLITE_OK = config['SQLITE_OK']
+SQLITE_ROW = config['SQLITE_ROW']
+SQLITE_DONE = config['SQLITE_DONE']
+SQLITE_INTEGER = config['SQLITE_INTEGER']
+SQLITE_FLOAT = config['SQLITE_FLOAT']
+SQLITE_BLOB = config['SQLITE_BLOB']
+SQLITE_NULL = config['SQLITE_NULL']
+SQLITE_TEXT = config['SQLITE_TEXT']
+
+def external(name, args, result, **kwds):
+    return rffi.llexternal(name, args, result, compilation_info=eci, **kwds)
+
+# sqlite3_step() may wait on a lock or do I/O: it releases the GIL.  The
+# other functions only look at the statement in memory.
+sqlite3_step = external('sqlite3_step', [rffi.VOIDP], rffi.INT)
+sqlite3_reset = external('sqlite3_reset', [rffi.VOIDP], rffi.INT,
+                         threadsafe=False)
+sqlite3_changes = external('sqlite3_changes', [rffi.VOIDP], rffi.INT,
+                           threadsafe=False)
+sqlite3_column_count = external('sqlite3_column_count', [rffi.VOIDP],
+                                rffi.INT, threadsafe=False)
+sqlite3_column_type = external('sqlite3_column_type', [rffi.VOIDP, rffi.INT],
+                               rffi.INT, threadsafe=False)
+sqlite3_column_int64 = external('sqlite3_column_int64',
+                                [rffi.VOIDP, rffi.INT], rffi.LONGLONG,
+                                threadsafe=False)
+sqlite3_column_double = external('sqlite3_column_double',
+                                 [rffi.VOIDP, rffi.INT], rffi.DOUBLE,
+                                 threadsafe=False)
+sqlite3_column_blob = external('sqlite3_column_blob', [rffi.VOIDP, rffi.INT],
+                               rffi.VOIDP, threadsafe=False)
+sqlite3_column_bytes = external('sqlite3_column_bytes',
+                                [rffi.VOIDP, rffi.INT], rffi.INT,
+                                threadsafe=False)
+sqlite3_bind_null = external('sqlite3_bind_null', [rffi.VOIDP, rffi.INT],
+                             rffi.INT, threadsafe=False)
+sqlite3_bind_int64 = external('sqlite3_bind_int64',
+                              [rffi.VOIDP, rffi.INT, rffi.LONGLONG],
+                              rffi.INT, threadsafe=False)
+sqlite3_bind_double = external('sqlite3_bind_double',
+                               [rffi.VOIDP, rffi.INT, rffi.DOUBLE],
+                               rffi.INT, threadsafe=False)
+pypy_sqlite3_bind_text = external('pypy_sqlite3_bind_text',
+                                  [rffi.VOIDP, rffi.INT, rffi.CCHARP,
+                                   rffi.INT], rffi.INT, threadsafe=False)
+pypy_sqlite3_bind_blob = external('pypy_sqlite3_bind_blob',
+                                  [rffi.VOIDP, rffi.INT, rffi.CCHARP,
+                                   rffi.INT], rffi.INT, threadsafe=False)
+
+MININT = r_longlong(-sys.maxint - 1)
+MAXINT = r_longlong(sys.maxint)
+
+def as_pointer(address):
+    return rffi.cast(rffi.VOIDP, address)
+
+# ____________________________________________________________
+# Binding parameters
+
+def is_ascii(s):
+    for c in s:
+        if ord(c) >= 0x80:
+            return False
+    return True
+
+def bind_param(space, stmt, idx, w_param, check_ascii):
+    if space.is_w(w_param, space.w_None):
+        return sqlite3_bind_null(stmt, idx)
+    w_type = space.type(w_param)
+    if space.is_w(w_type, space.w_int) or space.is_w(w_type, space.w_bool):
+        return sqlite3_bind_int64(stmt, idx,
+                                  rffi.cast(rffi.LONGLONG,
+                                            space.int_w(w_param)))
+    if space.is_w(w_type, space.w_long):
+        return sqlite3_bind_int64(stmt, idx, space.r_longlong_w(w_param))
+    if space.is_w(w_type, space.w_float):
+        return sqlite3_bind_double(stmt, idx, space.float_w(w_param))
+    if space.isinstance_w(w_param, space.w_str):
+        s = space.str_w(w_param)
+        if check_ascii and not is_ascii(s):
+            raise OperationError(space.w_ValueError, space.wrap(
+                "8-bit bytestring with a unicode text_factory"))
+        return pypy_sqlite3_bind_text(stmt, idx, s, len(s))
+    if space.isinstance_w(w_param, space.w_unicode):
+        s = space.str_w(space.call_method(w_param, 'encode',
+                                          space.wrap('utf-8')))
+        return pypy_sqlite3_bind_text(stmt, idx, s, len(s))
+    if isinstance(space.interpclass_w(w_param), Buffer):
+        s = space.bufferstr_w(w_param)
+        return pypy_sqlite3_bind_blob(stmt, idx, s, len(s))
+    raise OperationError(space.w_TypeError, space.wrap(
+        "parameter type %s is not supported" % space.str_w(space.str(w_type))))
+
+def bind_all(space, stmt, w_params, check_ascii):
+    params_w = space.fixedview(w_params)
+    for i in range(len(params_w)):
+        rc = rffi.cast(lltype.Signed, bind_param(space, stmt, i + 1,
+                                                 params_w[i], check_ascii))
+        if rc != SQLITE_OK:
+            return rc
+    return SQLITE_OK
+
+@unwrap_spec(stmt=r_uint, check_ascii=bool)
+def bind_params(space, stmt, w_params, check_ascii):
+    """bind_params(stmt, params, check_ascii) -> sqlite result code
+
+Binds the already adapted parameters, which must be None, int, long,
+float, str, unicode or buffer.  With check_ascii, raises ValueError for
+non-ASCII str."""
+    return space.wrap(bind_all(space, as_pointer(stmt), w_params,
+                               check_ascii))
+
+@unwrap_spec(db=r_uint, stmt=r_uint, check_ascii=bool)
+def execute_many(space, db, stmt, w_params_list, check_ascii):
+    """execute_many(db, stmt, params_list, check_ascii) -> (rc, changes, n)
+
+Resets, binds and steps the statement once for each list of adapted
+parameters.  Stops at the first result code that is not SQLITE_DONE and
+returns it, with the total number of changes and the number of complete
+executions."""
+    c_db = as_pointer(db)
+    c_stmt = as_pointer(stmt)
+    rc = SQLITE_DONE
+    changes = 0
+    n = 0
+    for w_params in space.fixedview(w_params_list):
+        rc = rffi.cast(lltype.Signed, sqlite3_reset(c_stmt))
+        if rc != SQLITE_OK:
+            break
+        rc = bind_all(space, c_stmt, w_params, check_ascii)
+        if rc != SQLITE_OK:
+            break
+        rc = rffi.cast(lltype.Signed, sqlite3_step(c_stmt))
+        if rc != SQLITE_DONE:
+            break
+        changes += rffi.cast(lltype.Signed, sqlite3_changes(c_db))
+        n += 1
+    return space.newtuple([space.wrap(rc), space.wrap(changes),
+                           space.wrap(n)])
+
+# ____________________________________________________________
+# Reading rows
+
+def column_string(stmt, i):
+    # sqlite3_column_blob() returns the bytes of TEXT values too; it
+    # must be called before sqlite3_column_bytes()
+    blob = sqlite3_column_blob(stmt, i)
+    if not blob:
+        return None
+    size = rffi.cast(lltype.Signed, sqlite3_column_bytes(stmt, i))
+    return rffi.charpsize2str(rffi.cast(rffi.CCHARP, blob), size)
+
+def column_value(space, stmt, i, w_text_factory):
+    typ = rffi.cast(lltype.Signed, sqlite3_column_type(stmt, i))
+    if typ == SQLITE_INTEGER:
+        value = sqlite3_column_int64(stmt, i)
+        if MININT <= value <= MAXINT:
+            return space.wrap(intmask(value))
+        return space.wrap(value)
+    elif typ == SQLITE_FLOAT:
+        return space.wrap(float(sqlite3_column_double(stmt, i)))
+    elif typ == SQLITE_BLOB:
+        s = column_string(stmt, i)
+        if s is None:
+            s = ''
+        return space.wrap(StringBuffer(s))
+    elif typ == SQLITE_TEXT:
+        s = column_string(stmt, i)
+        if s is None:
+            s = ''
+        w_s = space.wrap(s)
+        if space.is_w(w_text_factory, space.w_None):
+            return space.call_method(w_s, 'decode', space.wrap('utf-8'))
+        if space.is_w(w_text_factory, space.w_str):
+            return w_s
+        return space.call_function(w_text_factory, w_s)
+    else:
+        return space.w_None
+
+def read_row(space, stmt, w_text_factory, converters_w):
+    ncolumns = rffi.cast(lltype.Signed, sqlite3_column_count(stmt))
+    items_w = [None] * ncolumns
+    for i in range(ncolumns):
+        w_converter = None
+        if converters_w is not None and i < len(converters_w):
+            w_converter = converters_w[i]
+            if space.is_w(w_converter, space.w_None):
+                w_converter = None
+        if w_converter is None:
+            items_w[i] = column_value(space, stmt, i, w_text_factory)
+        else:
+            s = column_string(stmt, i)
+            if s is None:
+                items_w[i] = space.w_None
+            else:
+                items_w[i] = space.call_function(w_converter, space.wrap(s))
+    return space.newtuple(items_w)
+
+def unpack_converters(space, w_converters):
+    if space.is_w(w_converters, space.w_None):
+        return None
+    return space.fixedview(w_converters)
+
+@unwrap_spec(stmt=r_uint)
+def read_current_row(space, stmt, w_text_factory, w_converters):
+    """read_current_row(stmt, text_factory, converters) -> tuple
+
+Returns the columns of the row on which the statement stands.  A
+text_factory of None decodes TEXT values from UTF-8, str keeps them as
+they are.  converters is None, or a list giving for each column None or
+a function called with the raw bytes."""
+    return read_row(space, as_pointer(stmt), w_text_factory,
+                    unpack_converters(space, w_converters))
+
+@unwrap_spec(stmt=r_uint, maxrows=int)
+def fetch_rows(space, stmt, maxrows, w_text_factory, w_converters):
+    """fetch_rows(stmt, maxrows, text_factory, converters) -> (rc, rows)
+
+Steps the statement up to maxrows times, or until the end of the results
+if maxrows is negative, and returns the rows read as tuples, with the
+result code of the last step: SQLITE_ROW if the limit was reached,
+SQLITE_DONE at the end of the results, or an error."""
+    c_stmt = as_pointer(stmt)
+    converters_w = unpack_converters(space, w_converters)
+    rows_w = []
+    rc = SQLITE_ROW
+    while maxrows < 0 or len(rows_w) < maxrows:
+        rc = rffi.cast(lltype.Signed, sqlite3_step(c_stmt))
+        if rc != SQLITE_ROW:
+            break
+        rows_w.append(read_row(space, c_stmt, w_text_factory, converters_w))
+    return space.newtuple([space.wrap(rc), space.newlist(rows_w)])
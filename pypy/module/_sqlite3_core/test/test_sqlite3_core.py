@@ -0,0 +1,128 @@
+from pypy.conftest import gettestobjspace
+
+
+class AppTestSqlite3Core:
+    def setup_class(cls):
+        # lib_pypy/_sqlite3.py opens the database and prepares the
+        # statements with ctypes
+        cls.space = gettestobjspace(usemodules=['_sqlite3_core', '_rawffi',
+                                                '_ffi', 'struct', 'itertools',
+                                                '_weakref', 'thread',
+                                                '_collections', 'rctime'])
+        cls.w_connect = cls.space.appexec([], """():
+            import _sqlite3
+            def connect():
+                con = _sqlite3.connect(':memory:')
+                con.execute('create table t (a, b)')
+                return con
+            return connect
+        """)
+
+    def test_uses_core(self):
+        import _sqlite3, _sqlite3_core
+        assert _sqlite3._core is _sqlite3_core
+
+    def test_types(self):
+        con = self.connect()
+        values = [None, 0, -5, 2**40, 2**62, -2**63, 1.5, 'abc', u'\xe9t\xe9',
+                  buffer('a\x00b'), True]
+        for value in values:
+            con.execute('insert into t values (?, 1)', (value,))
+        result = [row[0] for row in con.execute('select a from t')]
+        assert result[:6] == values[:6]
+        assert type(result[1]) is int
+        assert result[6] == 1.5
+        assert result[7] == u'abc' and type(result[7]) is unicode
+        assert result[8] == u'\xe9t\xe9'
+        assert type(result[9]) is buffer and str(result[9]) == 'a\x00b'
+        assert result[10] == 1
+        raises(OverflowError, con.execute, 'insert into t values (?, 1)',
+               (2**64,))
+
+    def test_bind_errors(self):
+        import _sqlite3
+        con = self.connect()
+        raises(_sqlite3.InterfaceError, con.execute,
+               'insert into t values (?, 1)', (object(),))
+        raises(_sqlite3.ProgrammingError, con.execute,
+               'insert into t values (?, 1)', ('\xe9',))
+        raises(_sqlite3.ProgrammingError, con.execute,
+               'insert into t values (?, ?)', (1,))
+        con.text_factory = str
+        con.execute('insert into t values (?, 1)', ('\xe9',))
+        assert con.execute('select a from t').fetchone() == ('\xe9',)
+
+    def test_named_params(self):
+        import _sqlite3
+        con = self.connect()
+        for i in range(3):
+            con.execute('insert into t values (:x, :y)', {'x': i, 'y': -i})
+        assert con.execute('select * from t').fetchall() == [
+            (0, 0), (1, -1), (2, -2)]
+        raises(_sqlite3.ProgrammingError, con.execute,
+               'insert into t values (:x, :y)', {'x': 1})
+
+    def test_executemany(self):
+        import _sqlite3
+        con = self.connect()
+        cur = con.cursor()
+        cur.executemany('insert into t values (?, ?)',
+                        ((i, str(i)) for i in range(200)))
+        assert cur.rowcount == 200
+        assert con.execute('select count(*), sum(a) from t').fetchone() == (
+            200, 19900)
+        con.execute('create unique index i on t (a)')
+        raises(_sqlite3.IntegrityError, cur.executemany,
+               'insert into t values (?, ?)', [(1000, ''), (1000, '')])
+
+    def test_fetch(self):
+        con = self.connect()
+        con.executemany('insert into t values (?, ?)',
+                        [(i, 'x' * i) for i in range(10)])
+        cur = con.execute('select a from t order by a')
+        assert cur.fetchone() == (0,)
+        assert cur.fetchmany(3) == [(1,), (2,), (3,)]
+        assert cur.fetchmany() == [(4,)]
+        assert cur.fetchall() == [(i,) for i in range(5, 10)]
+        assert cur.fetchall() == []
+        assert cur.fetchmany(2) == []
+        assert cur.fetchone() is None
+        cur = con.execute('select a from t where a < 2')
+        assert cur.fetchmany(2) == [(0,), (1,)]
+        assert cur.fetchone() is None
+        assert list(con.execute('select a from t where a < 3')) == [
+            (0,), (1,), (2,)]
+
+    def test_row_factory_and_converters(self):
+        import _sqlite3
+        con = _sqlite3.connect(':memory:',
+                               detect_types=_sqlite3.PARSE_DECLTYPES)
+        con.execute('create table t (a integer, b double)')
+        con.row_factory = _sqlite3.Row
+        _sqlite3.register_converter('double', lambda s: ('conv', s))
+        con.executemany('insert into t values (?, ?)',
+                        [(i, i * 2) for i in range(5)])
+        cur = con.execute('select a, b from t order by a')
+        first = cur.fetchone()
+        assert first['a'] == 0
+        rows = cur.fetchmany(2)
+        assert [row['a'] for row in rows] == [1, 2]
+        rows = cur.fetchall()
+        assert [row['a'] for row in rows] == [3, 4]
+        assert rows[0]['b'] == ('conv', '6.0')
+
+    def test_statement_cache(self):
+        import _sqlite3
+        con = _sqlite3.connect(':memory:', cached_statements=2)
+        cache = con.statement_cache
+        con.execute('select 1')
+        con.execute('select 2')
+        con.execute('select 1')
+        con.execute('select 3')
+        assert list(cache.cache.keys()) == ['select 1', 'select 3']
+
+# the ctypes buffers of the connections and statements are only freed when
+# their reference cycles are collected
+for name in dir(AppTestSqlite3Core):
+    if name.startswith('test_'):
+        getattr(AppTestSqlite3Core, name).im_func.dont_track_allocations = True
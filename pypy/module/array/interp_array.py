@@ -84,6 +84,8 @@ def descr_typecode(space, self):
 
 
 class W_ArrayBase(W_Object):
+    exports = 0      # number of pinned ArrayBuffers, see setlen()
+
     @staticmethod
     def register(typeorder):
         typeorder[W_ArrayBase] = []
@@ -144,7 +146,8 @@ for k, v in types.items():
 unroll_typecodes = unrolling_iterable(types.keys())
 
 class ArrayBuffer(RWBuffer):
-    def __init__(self, data, bytes):
+    def __init__(self, array, data, bytes):
+        self.array = array
         self.data = data
         self.len = bytes
 
@@ -157,6 +160,15 @@ class ArrayBuffer(RWBuffer):
     def setitem(self, index, char):
         self.data[index] = char
 
+    def get_raw_address(self):
+        return self.data
+
+    def pin(self):
+        self.array.exports += 1
+
+    def unpin(self):
+        self.array.exports -= 1
+
 
 def make_array(mytype):
     class W_Array(W_ArrayBase):
@@ -212,9 +224,16 @@ def make_array(mytype):
 
         def __del__(self):
             self.clear_all_weakrefs()
-            self.setlen(0)
+            if self.buffer:
+                lltype.free(self.buffer, flavor='raw')
 
         def setlen(self, size):
+            if self.exports > 0 and size != self.len:
+                # the raw memory is in use, e.g. by a sendall() that
+                # released the GIL: it must not be reallocated or freed
+                msg = 'cannot resize an array that is exporting buffers'
+                raise OperationError(self.space.w_BufferError,
+                                     self.space.wrap(msg))
             if size > 0:
                 if size > self.allocated or size < self.allocated / 2:
                     if size < 9:
@@ -592,7 +611,7 @@ def make_array(mytype):
     # Misc methods
 
     def buffer__Array(space, self):
-        b = ArrayBuffer(self.charbuf(), self.len * mytype.bytes)
+        b = ArrayBuffer(self, self.charbuf(), self.len * mytype.bytes)
         return space.wrap(b)
 
     def array_buffer_info__Array(space, self):
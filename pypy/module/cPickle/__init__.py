@@ -0,0 +1,34 @@
+"""
+Mixed-module definition for the cPickle module.
+Note that there is also a pure Python implementation in lib_pypy/cPickle.py;
+the present mixed-module version of cPickle takes precedence if it is enabled.
+"""
+
+from pypy.interpreter.mixedmodule import MixedModule
+
+
+class Module(MixedModule):
+    """Fast implementation of the pickle module's dumps(), dump(), loads()
+and load() functions.  The Pickler and Unpickler classes are the ones of
+the pickle module, slightly adapted."""
+
+    interpleveldefs = {
+        'dumps':            'interp_pickle.dumps',
+        'dump':             'interp_pickle.dump',
+        'loads':            'interp_pickle.loads',
+        'load':             'interp_pickle.load',
+        'HIGHEST_PROTOCOL': 'space.wrap(interp_pickle.HIGHEST_PROTOCOL)',
+        'BadPickleGet':     'space.w_KeyError',
+        }
+
+    appleveldefs = {
+        'Pickler':            'app_pickle.Pickler',
+        'Unpickler':          'app_pickle.Unpickler',
+        'PickleError':        'app_pickle.PickleError',
+        'PicklingError':      'app_pickle.PicklingError',
+        'UnpicklingError':    'app_pickle.UnpicklingError',
+        'UnpickleableError':  'app_pickle.UnpickleableError',
+        'format_version':     'app_pickle.format_version',
+        'compatible_formats': 'app_pickle.compatible_formats',
+        '__version__':        'app_pickle.__version__',
+        }
@@ -0,0 +1,25 @@
+# NOT_RPYTHON
+
+from pickle import Pickler as PythonPickler, Unpickler
+from pickle import PickleError, PicklingError, UnpicklingError
+from pickle import format_version, compatible_formats, __version__
+from pickle import StringIO
+
+UnpickleableError = PicklingError
+
+
+class Pickler(PythonPickler):
+    def __init__(self, *args, **kw):
+        self.__f = None
+        if len(args) == 1 and isinstance(args[0], int):
+            self.__f = StringIO()
+            PythonPickler.__init__(self, self.__f, args[0], **kw)
+        else:
+            PythonPickler.__init__(self, *args, **kw)
+
+    def memoize(self, obj):
+        self.memo[id(None)] = None   # cPickle starts counting at one
+        return PythonPickler.memoize(self, obj)
+
+    def getvalue(self):
+        return self.__f and self.__f.getvalue()
@@ -0,0 +1,1086 @@
+from pypy.interpreter.error import OperationError, operationerrfmt
+from pypy.interpreter.gateway import unwrap_spec, applevel
+from pypy.interpreter.unicodehelper import PyUnicode_DecodeUTF8
+from pypy.interpreter.unicodehelper import PyUnicode_EncodeUTF8
+from pypy.objspace.std.listobject import W_ListObject
+from pypy.objspace.std.dictmultiobject import W_DictMultiObject
+from pypy.objspace.std.strutil import string_to_int, ParseStringError
+from pypy.rlib.debug import mark_dict_non_null
+from pypy.rlib.rbigint import rbigint
+from pypy.rlib.rstring import StringBuilder
+from pypy.rlib.rstruct.ieee import pack_float, unpack_float
+
+
+HIGHEST_PROTOCOL = 2
+
+# opcodes, see pickle.py and pickletools.py for their meaning
+MARK            = '('
+STOP            = '.'
+POP             = '0'
+POP_MARK        = '1'
+DUP             = '2'
+FLOAT           = 'F'
+INT             = 'I'
+BININT          = 'J'
+BININT1         = 'K'
+LONG            = 'L'
+BININT2         = 'M'
+NONE            = 'N'
+PERSID          = 'P'
+BINPERSID       = 'Q'
+REDUCE          = 'R'
+STRING          = 'S'
+BINSTRING       = 'T'
+SHORT_BINSTRING = 'U'
+UNICODE         = 'V'
+BINUNICODE      = 'X'
+APPEND          = 'a'
+BUILD           = 'b'
+GLOBAL          = 'c'
+DICT            = 'd'
+EMPTY_DICT      = '}'
+APPENDS         = 'e'
+GET             = 'g'
+BINGET          = 'h'
+INST            = 'i'
+LONG_BINGET     = 'j'
+LIST            = 'l'
+EMPTY_LIST      = ']'
+OBJ             = 'o'
+PUT             = 'p'
+BINPUT          = 'q'
+LONG_BINPUT     = 'r'
+SETITEM         = 's'
+TUPLE           = 't'
+EMPTY_TUPLE     = ')'
+SETITEMS        = 'u'
+BINFLOAT        = 'G'
+PROTO           = '\x80'
+NEWOBJ          = '\x81'
+EXT1            = '\x82'
+EXT2            = '\x83'
+EXT4            = '\x84'
+TUPLE1          = '\x85'
+TUPLE2          = '\x86'
+TUPLE3          = '\x87'
+NEWTRUE         = '\x88'
+NEWFALSE        = '\x89'
+LONG1           = '\x8a'
+LONG4           = '\x8b'
+
+TUPLESIZE2CODE = [EMPTY_TUPLE, TUPLE1, TUPLE2, TUPLE3]
+
+# number of items written between two APPENDS or SETITEMS opcodes
+BATCHSIZE = 1000
+
+
+app = applevel(r'''
+    def state():
+        import pickle, copy_reg, types
+        return (pickle.PicklingError, pickle.UnpicklingError,
+                copy_reg.dispatch_table, copy_reg._extension_registry,
+                types.FunctionType, types.BuiltinFunctionType,
+                types.ClassType, types.InstanceType)
+
+    def lookup_global(obj, name):
+        import sys
+        from pickle import PicklingError, whichmodule
+        if name is None:
+            name = obj.__name__
+        module = getattr(obj, "__module__", None)
+        if module is None:
+            module = whichmodule(obj, name)
+        try:
+            __import__(module)
+            mod = sys.modules[module]
+            klass = getattr(mod, name)
+        except (ImportError, KeyError, AttributeError):
+            raise PicklingError(
+                "Can't pickle %r: it's not found as %s.%s" %
+                (obj, module, name))
+        else:
+            if klass is not obj:
+                raise PicklingError(
+                    "Can't pickle %r: it's not the same object as %s.%s" %
+                    (obj, module, name))
+        return module, name
+
+    def find_class(module, name):
+        import sys
+        __import__(module)
+        mod = sys.modules[module]
+        return getattr(mod, name)
+
+    def get_extension(code):
+        from copy_reg import _extension_cache, _inverted_registry
+        nil = []
+        obj = _extension_cache.get(code, nil)
+        if obj is not nil:
+            return obj
+        key = _inverted_registry.get(code)
+        if not key:
+            raise ValueError("unregistered extension code %d" % code)
+        obj = find_class(*key)
+        _extension_cache[code] = obj
+        return obj
+
+    def instantiate(klass, args):
+        import sys
+        from types import ClassType
+        if (not args and type(klass) is ClassType and
+                not hasattr(klass, "__getinitargs__")):
+            class _EmptyClass:
+                pass
+            value = _EmptyClass()
+            value.__class__ = klass
+            return value
+        try:
+            return klass(*args)
+        except TypeError, err:
+            raise TypeError, "in constructor for %s: %s" % (
+                klass.__name__, str(err)), sys.exc_info()[2]
+
+    def build(inst, state):
+        setstate = getattr(inst, "__setstate__", None)
+        if setstate:
+            setstate(state)
+            return
+        slotstate = None
+        if isinstance(state, tuple) and len(state) == 2:
+            state, slotstate = state
+        if state:
+            d = inst.__dict__
+            try:
+                for k, v in state.iteritems():
+                    d[intern(k)] = v
+            except TypeError:
+                d.update(state)
+        if slotstate:
+            for k, v in slotstate.items():
+                setattr(inst, k, v)
+''', filename=__file__)
+
+lookup_global = app.interphook('lookup_global')
+find_class = app.interphook('find_class')
+get_extension = app.interphook('get_extension')
+instantiate = app.interphook('instantiate')
+build = app.interphook('build')
+
+
+class State:
+    def __init__(self, space):
+        w_state = app.interphook('state')(space)
+        (self.w_PicklingError, self.w_UnpicklingError,
+         self.w_dispatch_table, self.w_extension_registry,
+         self.w_FunctionType, self.w_BuiltinFunctionType,
+         self.w_ClassType, self.w_InstanceType) = space.fixedview(w_state, 8)
+
+def pickling_error(space, msg):
+    return OperationError(space.fromcache(State).w_PicklingError,
+                          space.wrap(msg))
+
+def unpickling_error(space, msg):
+    return OperationError(space.fromcache(State).w_UnpicklingError,
+                          space.wrap(msg))
+
+# ____________________________________________________________
+
+def pack_int32(builder, n):
+    builder.append(chr(n & 0xff))
+    builder.append(chr((n >> 8) & 0xff))
+    builder.append(chr((n >> 16) & 0xff))
+    builder.append(chr((n >> 24) & 0xff))
+
+def encode_long(x):
+    """The little-endian two's complement representation of the rbigint x,
+    with as few bytes as possible, as in pickle.encode_long()."""
+    if x.sign == 0:
+        return ''
+    mask = rbigint.fromint(0xff)
+    minus_one = rbigint.fromint(-1)
+    builder = StringBuilder()
+    while True:
+        byte = x.and_(mask).toint()
+        builder.append(chr(byte))
+        x = x.rshift(8)
+        if x.sign == 0 and byte < 0x80:
+            break
+        if x.eq(minus_one) and byte >= 0x80:
+            break
+    return builder.build()
+
+def decode_long(data):
+    "The inverse of encode_long()."
+    result = rbigint.fromint(0)
+    for i in range(len(data) - 1, -1, -1):
+        result = result.lshift(8).or_(rbigint.fromint(ord(data[i])))
+    if len(data) > 0 and ord(data[len(data) - 1]) >= 0x80:
+        result = result.sub(rbigint.fromint(1).lshift(8 * len(data)))
+    return result
+
+
+class ItemsIterator(object):
+    "Iterates over the (key, value) pairs given to SETITEMS."
+    def next(self):
+        "Returns (None, None) at the end."
+        raise NotImplementedError
+
+class DictItemsIterator(ItemsIterator):
+    def __init__(self, w_dict):
+        self.iterator = w_dict.iter()
+
+    def next(self):
+        return self.iterator.next()
+
+class AppLevelItemsIterator(ItemsIterator):
+    def __init__(self, space, w_iterator):
+        self.space = space
+        self.w_iterator = w_iterator
+
+    def next(self):
+        space = self.space
+        try:
+            w_item = space.next(self.w_iterator)
+        except OperationError, e:
+            if not e.match(space, space.w_StopIteration):
+                raise
+            return None, None
+        w_key, w_value = space.fixedview(w_item, 2)
+        return w_key, w_value
+
+
+class Pickler(object):
+    """Writes the pickle of one object into a StringBuilder.  The memo is
+    a plain RPython dict keyed by the objects themselves, which compares
+    them by identity like the storage of the identity dict strategy, and
+    keeps them alive for as long as the pickler exists."""
+
+    def __init__(self, space, proto):
+        self.space = space
+        self.proto = proto
+        self.bin = proto >= 1
+        self.builder = StringBuilder()
+        self.memo = {}
+        mark_dict_non_null(self.memo)
+        self.state = space.fromcache(State)
+
+    def write(self, s):
+        self.builder.append(s)
+
+    def dump(self, w_obj):
+        if self.proto >= 2:
+            self.write(PROTO)
+            self.write(chr(self.proto))
+        self.save(w_obj)
+        self.write(STOP)
+        return self.builder.build()
+
+    def memoize(self, w_obj):
+        # like cPickle, start counting at one
+        index = len(self.memo) + 1
+        self.memo[w_obj] = index
+        if not self.bin:
+            self.write(PUT + str(index) + '\n')
+        elif index < 256:
+            self.write(BINPUT)
+            self.write(chr(index))
+        else:
+            self.write(LONG_BINPUT)
+            pack_int32(self.builder, index)
+
+    def write_get(self, index):
+        if not self.bin:
+            self.write(GET + str(index) + '\n')
+        elif index < 256:
+            self.write(BINGET)
+            self.write(chr(index))
+        else:
+            self.write(LONG_BINGET)
+            pack_int32(self.builder, index)
+
+    def save(self, w_obj):
+        space = self.space
+        index = self.memo.get(w_obj, 0)
+        if index > 0:
+            self.write_get(index)
+            return
+        w_type = space.type(w_obj)
+        if space.is_w(w_obj, space.w_None):
+            self.write(NONE)
+        elif space.is_w(w_type, space.w_bool):
+            self.save_bool(space.is_true(w_obj))
+        elif space.is_w(w_type, space.w_int):
+            self.save_int(space.int_w(w_obj))
+        elif space.is_w(w_type, space.w_long):
+            self.save_long(w_obj)
+        elif space.is_w(w_type, space.w_float):
+            self.save_float(w_obj)
+        elif space.is_w(w_type, space.w_str):
+            self.save_string(w_obj)
+        elif space.is_w(w_type, space.w_unicode):
+            self.save_unicode(w_obj)
+        elif space.is_w(w_type, space.w_tuple):
+            self.save_tuple(w_obj)
+        elif space.is_w(w_type, space.w_list):
+            self.save_list(w_obj)
+        elif space.is_w(w_type, space.w_dict):
+            self.save_dict(w_obj)
+        elif space.is_w(w_type, self.state.w_InstanceType):
+            self.save_inst(w_obj)
+        elif (space.is_w(w_type, self.state.w_ClassType) or
+              space.is_w(w_type, self.state.w_FunctionType) or
+              space.is_w(w_type, self.state.w_BuiltinFunctionType) or
+              space.is_true(space.issubtype(w_type, space.w_type))):
+            self.save_global(w_obj, space.w_None)
+        else:
+            self.save_other(w_obj, w_type)
+
+    def save_bool(self, value):
+        if self.proto >= 2:
+            if value:
+                self.write(NEWTRUE)
+            else:
+                self.write(NEWFALSE)
+        elif value:
+            self.write(INT + '01\n')
+        else:
+            self.write(INT + '00\n')
+
+    def save_int(self, value):
+        if self.bin:
+            if 0 <= value <= 0xff:
+                self.write(BININT1)
+                self.write(chr(value))
+                return
+            if 0 <= value <= 0xffff:
+                self.write(BININT2)
+                self.write(chr(value & 0xff))
+                self.write(chr(value >> 8))
+                return
+            high_bits = value >> 31
+            if high_bits == 0 or high_bits == -1:
+                self.write(BININT)
+                pack_int32(self.builder, value)
+                return
+        self.write(INT + str(value) + '\n')
+
+    def save_long(self, w_obj):
+        space = self.space
+        if self.proto >= 2:
+            data = encode_long(space.bigint_w(w_obj))
+            if len(data) < 256:
+                self.write(LONG1)
+                self.write(chr(len(data)))
+            else:
+                self.write(LONG4)
+                pack_int32(self.builder, len(data))
+            self.write(data)
+        else:
+            self.write(LONG + space.str_w(space.repr(w_obj)) + '\n')
+
+    def save_float(self, w_obj):
+        space = self.space
+        if self.bin:
+            result = []
+            pack_float(result, space.float_w(w_obj), 8, True)
+            self.write(BINFLOAT)
+            self.write(''.join(result))
+        else:
+            self.write(FLOAT + space.str_w(space.repr(w_obj)) + '\n')
+
+    def save_string(self, w_obj):
+        space = self.space
+        if self.bin:
+            s = space.str_w(w_obj)
+            if len(s) < 256:
+                self.write(SHORT_BINSTRING)
+                self.write(chr(len(s)))
+            else:
+                self.write(BINSTRING)
+                pack_int32(self.builder, len(s))
+            self.write(s)
+        else:
+            self.write(STRING + space.str_w(space.repr(w_obj)) + '\n')
+        self.memoize(w_obj)
+
+    def save_unicode(self, w_obj):
+        space = self.space
+        if self.bin:
+            encoded = PyUnicode_EncodeUTF8(space, space.unicode_w(w_obj))
+            self.write(BINUNICODE)
+            pack_int32(self.builder, len(encoded))
+            self.write(encoded)
+        else:
+            w_obj2 = space.call_method(w_obj, 'replace', space.wrap(u'\\'),
+                                       space.wrap(u'\\u005c'))
+            w_obj2 = space.call_method(w_obj2, 'replace', space.wrap(u'\n'),
+                                       space.wrap(u'\\u000a'))
+            w_encoded = space.call_method(w_obj2, 'encode',
+                                          space.wrap('raw-unicode-escape'))
+            self.write(UNICODE + space.str_w(w_encoded) + '\n')
+        self.memoize(w_obj)
+
+    def save_tuple(self, w_obj):
+        items_w = self.space.fixedview(w_obj)
+        n = len(items_w)
+        if n == 0:
+            if self.bin:
+                self.write(EMPTY_TUPLE)
+            else:
+                self.write(MARK + TUPLE)
+            return
+        if n <= 3 and self.proto >= 2:
+            for w_item in items_w:
+                self.save(w_item)
+            # a recursive tuple is already memoized at this point
+            index = self.memo.get(w_obj, 0)
+            if index > 0:
+                self.write(POP * n)
+                self.write_get(index)
+            else:
+                self.write(TUPLESIZE2CODE[n])
+                self.memoize(w_obj)
+            return
+        self.write(MARK)
+        for w_item in items_w:
+            self.save(w_item)
+        index = self.memo.get(w_obj, 0)
+        if index > 0:
+            if self.bin:
+                self.write(POP_MARK)
+            else:
+                self.write(POP * (n + 1))
+            self.write_get(index)
+            return
+        self.write(TUPLE)
+        self.memoize(w_obj)
+
+    def save_list(self, w_obj):
+        if self.bin:
+            self.write(EMPTY_LIST)
+        else:
+            self.write(MARK + LIST)
+        self.memoize(w_obj)
+        self.batch_appends(self.space.iter(w_obj))
+
+    def save_dict(self, w_obj):
+        if self.bin:
+            self.write(EMPTY_DICT)
+        else:
+            self.write(MARK + DICT)
+        self.memoize(w_obj)
+        if type(w_obj) is W_DictMultiObject:
+            self.batch_setitems(DictItemsIterator(w_obj))
+        else:
+            w_iterator = self.space.call_method(w_obj, 'iteritems')
+            self.batch_setitems(AppLevelItemsIterator(self.space,
+                                                      w_iterator))
+
+    def batch_appends(self, w_iterator):
+        space = self.space
+        if not self.bin:
+            while True:
+                try:
+                    w_item = space.next(w_iterator)
+                except OperationError, e:
+                    if not e.match(space, space.w_StopIteration):
+                        raise
+                    break
+                self.save(w_item)
+                self.write(APPEND)
+            return
+        while True:
+            items_w = []
+            while len(items_w) < BATCHSIZE:
+                try:
+                    w_item = space.next(w_iterator)
+                except OperationError, e:
+                    if not e.match(space, space.w_StopIteration):
+                        raise
+                    break
+                items_w.append(w_item)
+            if len(items_w) > 1:
+                self.write(MARK)
+                for w_item in items_w:
+                    self.save(w_item)
+                self.write(APPENDS)
+            elif len(items_w) == 1:
+                self.save(items_w[0])
+                self.write(APPEND)
+            if len(items_w) < BATCHSIZE:
+                return
+
+    def batch_setitems(self, iterator):
+        if not self.bin:
+            while True:
+                w_key, w_value = iterator.next()
+                if w_key is None:
+                    break
+                self.save(w_key)
+                self.save(w_value)
+                self.write(SETITEM)
+            return
+        while True:
+            keys_w = []
+            values_w = []
+            while len(keys_w) < BATCHSIZE:
+                w_key, w_value = iterator.next()
+                if w_key is None:
+                    break
+                keys_w.append(w_key)
+                values_w.append(w_value)
+            if len(keys_w) > 1:
+                self.write(MARK)
+                for i in range(len(keys_w)):
+                    self.save(keys_w[i])
+                    self.save(values_w[i])
+                self.write(SETITEMS)
+            elif len(keys_w) == 1:
+                self.save(keys_w[0])
+                self.save(values_w[0])
+                self.write(SETITEM)
+            if len(keys_w) < BATCHSIZE:
+                return
+
+    def save_inst(self, w_obj):
+        space = self.space
+        w_cls = space.getattr(w_obj, space.wrap('__class__'))
+        w_getinitargs = space.findattr(w_obj, space.wrap('__getinitargs__'))
+        if w_getinitargs is not None:
+            args_w = space.fixedview(space.call_function(w_getinitargs))
+        else:
+            args_w = []
+        self.write(MARK)
+        if self.bin:
+            self.save(w_cls)
+            for w_arg in args_w:
+                self.save(w_arg)
+            self.write(OBJ)
+        else:
+            for w_arg in args_w:
+                self.save(w_arg)
+            w_module = space.getattr(w_cls, space.wrap('__module__'))
+            w_name = space.getattr(w_cls, space.wrap('__name__'))
+            self.write(INST + space.str_w(w_module) + '\n' +
+                       space.str_w(w_name) + '\n')
+        self.memoize(w_obj)
+        w_getstate = space.findattr(w_obj, space.wrap('__getstate__'))
+        if w_getstate is not None:
+            w_state = space.call_function(w_getstate)
+        else:
+            w_state = space.getattr(w_obj, space.wrap('__dict__'))
+        self.save(w_state)
+        self.write(BUILD)
+
+    def save_global(self, w_obj, w_name):
+        space = self.space
+        w_module, w_name = space.fixedview(lookup_global(space, w_obj,
+                                                         w_name), 2)
+        if self.proto >= 2:
+            w_code = space.finditem(self.state.w_extension_registry,
+                                    space.newtuple([w_module, w_name]))
+            if w_code is not None and space.is_true(w_code):
+                code = space.int_w(w_code)
+                if code <= 0xff:
+                    self.write(EXT1)
+                    self.write(chr(code))
+                elif code <= 0xffff:
+                    self.write(EXT2)
+                    self.write(chr(code & 0xff))
+                    self.write(chr(code >> 8))
+                else:
+                    self.write(EXT4)
+                    pack_int32(self.builder, code)
+                return
+        self.write(GLOBAL + space.str_w(w_module) + '\n' +
+                   space.str_w(w_name) + '\n')
+        self.memoize(w_obj)
+
+    def save_other(self, w_obj, w_type):
+        space = self.space
+        w_reduce = space.finditem(self.state.w_dispatch_table, w_type)
+        if w_reduce is not None:
+            w_rv = space.call_function(w_reduce, w_obj)
+        else:
+            w_reduce = space.findattr(w_obj, space.wrap('__reduce_ex__'))
+            if w_reduce is not None:
+                w_rv = space.call_function(w_reduce, space.wrap(self.proto))
+            else:
+                w_reduce = space.findattr(w_obj, space.wrap('__reduce__'))
+                if w_reduce is None:
+                    raise pickling_error(space,
+                        "Can't pickle %s object: %s" % (
+                            space.str_w(space.repr(space.wrap(
+                                w_type.getname(space)))),
+                            space.str_w(space.repr(w_obj))))
+                w_rv = space.call_function(w_reduce)
+        if space.isinstance_w(w_rv, space.w_str):
+            self.save_global(w_obj, w_rv)
+            return
+        if not space.isinstance_w(w_rv, space.w_tuple):
+            raise pickling_error(space, "%s must return string or tuple" %
+                                 space.str_w(space.str(w_reduce)))
+        rv_w = space.fixedview(w_rv)
+        if not 2 <= len(rv_w) <= 5:
+            raise pickling_error(space,
+                "Tuple returned by %s must have two to five elements" %
+                space.str_w(space.str(w_reduce)))
+        optional_w = [space.w_None] * 3
+        for i in range(2, len(rv_w)):
+            optional_w[i - 2] = rv_w[i]
+        self.save_reduce(w_obj, rv_w[0], rv_w[1], optional_w[0],
+                         optional_w[1], optional_w[2])
+
+    def save_reduce(self, w_obj, w_func, w_args, w_state, w_listitems,
+                    w_dictitems):
+        space = self.space
+        if not space.isinstance_w(w_args, space.w_tuple):
+            raise pickling_error(space, "args from reduce() should be a tuple")
+        if not space.is_true(space.callable(w_func)):
+            raise pickling_error(space, "func from reduce should be callable")
+        w_funcname = space.findattr(w_func, space.wrap('__name__'))
+        if (self.proto >= 2 and w_funcname is not None and
+                space.eq_w(w_funcname, space.wrap('__newobj__'))):
+            args_w = space.fixedview(w_args)
+            if len(args_w) == 0:
+                raise pickling_error(space, "__newobj__ arglist is empty")
+            w_cls = args_w[0]
+            if space.findattr(w_cls, space.wrap('__new__')) is None:
+                raise pickling_error(space,
+                    "args[0] from __newobj__ args has no __new__")
+            w_class = space.getattr(w_obj, space.wrap('__class__'))
+            if not space.is_w(w_cls, w_class):
+                raise pickling_error(space,
+                    "args[0] from __newobj__ args has the wrong class")
+            self.save(w_cls)
+            self.save(space.newtuple(args_w[1:]))
+            self.write(NEWOBJ)
+        else:
+            self.save(w_func)
+            self.save(w_args)
+            self.write(REDUCE)
+        self.memoize(w_obj)
+        if not space.is_w(w_listitems, space.w_None):
+            self.batch_appends(w_listitems)
+        if not space.is_w(w_dictitems, space.w_None):
+            self.batch_setitems(AppLevelItemsIterator(space, w_dictitems))
+        if not space.is_w(w_state, space.w_None):
+            self.save(w_state)
+            self.write(BUILD)
+
+# ____________________________________________________________
+
+class EndOfData(Exception):
+    "Raised by the readers when the pickle is truncated."
+
+
+class Reader(object):
+    def read(self, n):
+        "Returns the next n bytes."
+        raise NotImplementedError
+
+    def readline(self):
+        "Returns the next line, without the final newline."
+        raise NotImplementedError
+
+    def read_byte(self):
+        return ord(self.read(1)[0])
+
+    def read_uint16(self):
+        s = self.read(2)
+        return ord(s[0]) | (ord(s[1]) << 8)
+
+    def read_int32(self):
+        s = self.read(4)
+        n = (ord(s[0]) | (ord(s[1]) << 8) | (ord(s[2]) << 16) |
+             (ord(s[3]) << 24))
+        if n >= 0x80000000:
+            n -= 0x100000000
+        return n
+
+
+class StringReader(Reader):
+    """Reads directly from the pickled string; the opcodes and the numbers
+    are decoded in place, and only the string payloads are sliced out."""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def read(self, n):
+        start = self.pos
+        end = start + n
+        if n < 0 or end > len(self.data):
+            raise EndOfData
+        self.pos = end
+        assert start >= 0
+        return self.data[start:end]
+
+    def readline(self):
+        start = self.pos
+        end = self.data.find('\n', start)
+        if end < 0:
+            raise EndOfData
+        self.pos = end + 1
+        assert start >= 0
+        return self.data[start:end]
+
+    def read_byte(self):
+        pos = self.pos
+        if pos >= len(self.data):
+            raise EndOfData
+        self.pos = pos + 1
+        return ord(self.data[pos])
+
+
+class FileReader(Reader):
+    "Reads from a file-like object, without reading past the pickle."
+
+    def __init__(self, space, w_file):
+        self.space = space
+        self.w_read = space.getattr(w_file, space.wrap('read'))
+        self.w_readline = space.getattr(w_file, space.wrap('readline'))
+
+    def read(self, n):
+        if n < 0:
+            raise EndOfData
+        space = self.space
+        s = space.str_w(space.call_function(self.w_read, space.wrap(n)))
+        if len(s) < n:
+            raise EndOfData
+        return s
+
+    def readline(self):
+        space = self.space
+        s = space.str_w(space.call_function(self.w_readline))
+        if not s.endswith('\n'):
+            raise EndOfData
+        end = len(s) - 1
+        assert end >= 0
+        return s[:end]
+
+
+class Unpickler(object):
+    """Decodes one pickle.  The marks are kept as positions in a separate
+    list instead of as objects on the stack."""
+
+    def __init__(self, space, reader):
+        self.space = space
+        self.reader = reader
+        self.stack_w = []
+        self.marks = []
+        self.memo = {}
+
+    def error(self, msg):
+        return unpickling_error(self.space, msg)
+
+    def push(self, w_obj):
+        self.stack_w.append(w_obj)
+
+    def pop(self):
+        if len(self.stack_w) <= self.top_mark():
+            raise self.error("unpickling stack underflow")
+        return self.stack_w.pop()
+
+    def top(self):
+        if len(self.stack_w) <= self.top_mark():
+            raise self.error("unpickling stack underflow")
+        return self.stack_w[-1]
+
+    def top_mark(self):
+        if self.marks:
+            return self.marks[-1]
+        return 0
+
+    def marker(self):
+        if not self.marks:
+            raise self.error("could not find MARK")
+        return self.marks.pop()
+
+    def pop_marked(self):
+        "Removes and returns the items above the topmost mark."
+        k = self.marker()
+        items_w = self.stack_w[k:]
+        del self.stack_w[k:]
+        return items_w
+
+    def pop_marked_tuple(self):
+        """Removes the items above the topmost mark and returns them as a
+        tuple.  The list of items cannot be shared with pop_marked(), whose
+        results may be resized."""
+        k = self.marker()
+        items_w = self.stack_w[k:]
+        del self.stack_w[k:]
+        return self.space.newtuple(items_w)
+
+    def memo_get(self, index, w_key):
+        try:
+            return self.memo[index]
+        except KeyError:
+            raise OperationError(self.space.w_KeyError, w_key)
+
+    def memo_put(self, index):
+        if index < 0:
+            raise OperationError(self.space.w_ValueError,
+                                 self.space.wrap("negative PUT argument"))
+        self.memo[index] = self.top()
+
+    def parse_index(self, line):
+        try:
+            return string_to_int(line)
+        except ParseStringError:
+            raise self.error("invalid memo index %s" % (line,))
+
+    def load(self):
+        try:
+            return self._load()
+        except EndOfData:
+            raise OperationError(self.space.w_EOFError, self.space.w_None)
+
+    def _load(self):
+        space = self.space
+        reader = self.reader
+        while True:
+            key = chr(reader.read_byte())
+            if key == STOP:
+                return self.pop()
+            elif key == MARK:
+                self.marks.append(len(self.stack_w))
+            elif key == POP:
+                if len(self.stack_w) > self.top_mark():
+                    self.stack_w.pop()
+                elif self.marks:
+                    self.marks.pop()
+                else:
+                    raise self.error("unpickling stack underflow")
+            elif key == POP_MARK:
+                k = self.marker()
+                del self.stack_w[k:]
+            elif key == DUP:
+                self.push(self.top())
+            elif key == NONE:
+                self.push(space.w_None)
+            elif key == NEWTRUE:
+                self.push(space.w_True)
+            elif key == NEWFALSE:
+                self.push(space.w_False)
+            elif key == INT:
+                line = reader.readline()
+                if line == '00':
+                    self.push(space.w_False)
+                elif line == '01':
+                    self.push(space.w_True)
+                else:
+                    self.push(space.call_function(space.w_int,
+                                                  space.wrap(line)))
+            elif key == BININT:
+                self.push(space.wrap(reader.read_int32()))
+            elif key == BININT1:
+                self.push(space.wrap(reader.read_byte()))
+            elif key == BININT2:
+                self.push(space.wrap(reader.read_uint16()))
+            elif key == LONG:
+                self.push(space.call_function(space.w_long,
+                                              space.wrap(reader.readline()),
+                                              space.wrap(0)))
+            elif key == LONG1 or key == LONG4:
+                if key == LONG1:
+                    n = reader.read_byte()
+                else:
+                    n = reader.read_int32()
+                    if n < 0:
+                        raise self.error("LONG pickle has negative byte count")
+                data = reader.read(n)
+                self.push(space.newlong_from_rbigint(decode_long(data)))
+            elif key == FLOAT:
+                self.push(space.call_function(space.w_float,
+                                              space.wrap(reader.readline())))
+            elif key == BINFLOAT:
+                self.push(space.wrap(unpack_float(reader.read(8), True)))
+            elif key == STRING:
+                self.load_string(reader.readline())
+            elif key == BINSTRING:
+                n = reader.read_int32()
+                if n < 0:
+                    raise self.error("BINSTRING pickle has negative byte count")
+                self.push(space.wrap(reader.read(n)))
+            elif key == SHORT_BINSTRING:
+                self.push(space.wrap(reader.read(reader.read_byte())))
+            elif key == UNICODE:
+                self.push(space.call_method(space.wrap(reader.readline()),
+                                            'decode',
+                                            space.wrap('raw-unicode-escape')))
+            elif key == BINUNICODE:
+                n = reader.read_int32()
+                if n < 0:
+                    raise self.error("BINUNICODE pickle has negative "
+                                     "byte count")
+                data = reader.read(n)
+                self.push(space.wrap(PyUnicode_DecodeUTF8(space, data)))
+            elif key == EMPTY_TUPLE:
+                self.push(space.newtuple([]))
+            elif key == TUPLE1 or key == TUPLE2 or key == TUPLE3:
+                n = ord(key) - ord(TUPLE1) + 1
+                items_w = [None] * n
+                for i in range(n - 1, -1, -1):
+                    items_w[i] = self.pop()
+                self.push(space.newtuple(items_w))
+            elif key == TUPLE:
+                self.push(self.pop_marked_tuple())
+            elif key == EMPTY_LIST:
+                self.push(space.newlist([]))
+            elif key == LIST:
+                self.push(space.newlist(self.pop_marked()))
+            elif key == EMPTY_DICT:
+                self.push(space.newdict())
+            elif key == DICT:
+                items_w = self.pop_marked()
+                w_dict = space.newdict()
+                for i in range(0, len(items_w) - 1, 2):
+                    space.setitem(w_dict, items_w[i], items_w[i + 1])
+                self.push(w_dict)
+            elif key == APPEND:
+                w_value = self.pop()
+                w_list = self.top()
+                if type(w_list) is W_ListObject:
+                    w_list.wrappeditems.append(w_value)
+                else:
+                    space.call_method(w_list, 'append', w_value)
+            elif key == APPENDS:
+                items_w = self.pop_marked()
+                w_list = self.top()
+                if type(w_list) is W_ListObject:
+                    w_list.wrappeditems.extend(items_w)
+                else:
+                    space.call_method(w_list, 'extend', space.newlist(items_w))
+            elif key == SETITEM:
+                w_value = self.pop()
+                w_key = self.pop()
+                space.setitem(self.top(), w_key, w_value)
+            elif key == SETITEMS:
+                items_w = self.pop_marked()
+                w_dict = self.top()
+                for i in range(0, len(items_w) - 1, 2):
+                    space.setitem(w_dict, items_w[i], items_w[i + 1])
+            elif key == GET:
+                line = reader.readline()
+                self.push(self.memo_get(self.parse_index(line),
+                                        space.wrap(line)))
+            elif key == BINGET:
+                index = reader.read_byte()
+                self.push(self.memo_get(index, space.wrap(index)))
+            elif key == LONG_BINGET:
+                index = reader.read_int32()
+                self.push(self.memo_get(index, space.wrap(index)))
+            elif key == PUT:
+                self.memo_put(self.parse_index(reader.readline()))
+            elif key == BINPUT:
+                self.memo_put(reader.read_byte())
+            elif key == LONG_BINPUT:
+                self.memo_put(reader.read_int32())
+            elif key == GLOBAL:
+                module = reader.readline()
+                name = reader.readline()
+                self.push(find_class(space, space.wrap(module),
+                                     space.wrap(name)))
+            elif key == EXT1 or key == EXT2 or key == EXT4:
+                if key == EXT1:
+                    code = reader.read_byte()
+                elif key == EXT2:
+                    code = reader.read_uint16()
+                else:
+                    code = reader.read_int32()
+                self.push(get_extension(space, space.wrap(code)))
+            elif key == INST:
+                module = reader.readline()
+                name = reader.readline()
+                w_klass = find_class(space, space.wrap(module),
+                                     space.wrap(name))
+                w_args = self.pop_marked_tuple()
+                self.push(instantiate(space, w_klass, w_args))
+            elif key == OBJ:
+                items_w = self.pop_marked()
+                if not items_w:
+                    raise self.error("unpickling stack underflow")
+                w_args = space.newtuple(items_w[1:])
+                self.push(instantiate(space, items_w[0], w_args))
+            elif key == NEWOBJ:
+                w_args = self.pop()
+                w_cls = self.pop()
+                args_w = [w_cls] + space.fixedview(w_args)
+                w_new = space.getattr(w_cls, space.wrap('__new__'))
+                self.push(space.call(w_new, space.newtuple(args_w)))
+            elif key == REDUCE:
+                w_args = self.pop()
+                w_func = self.pop()
+                self.push(space.call(w_func, w_args))
+            elif key == BUILD:
+                w_state = self.pop()
+                build(space, self.top(), w_state)
+            elif key == PROTO:
+                proto = reader.read_byte()
+                if proto > HIGHEST_PROTOCOL:
+                    raise operationerrfmt(space.w_ValueError,
+                                          "unsupported pickle protocol: %d",
+                                          proto)
+            elif key == PERSID or key == BINPERSID:
+                raise self.error("A load persistent id instruction was "
+                                 "encountered,\nbut no persistent_load "
+                                 "function was specified.")
+            else:
+                raise self.error("invalid load key, '%s'." % (key,))
+
+    def load_string(self, rep):
+        space = self.space
+        for q in '"\'':
+            if rep.startswith(q):
+                if len(rep) < 2 or not rep.endswith(q):
+                    break
+                end = len(rep) - 1
+                assert end >= 1
+                w_rep = space.wrap(rep[1:end])
+                self.push(space.call_method(w_rep, 'decode',
+                                            space.wrap('string-escape')))
+                return
+        raise OperationError(space.w_ValueError,
+                             space.wrap("insecure string pickle"))
+
+# ____________________________________________________________
+
+def get_protocol(space, w_protocol):
+    if space.is_w(w_protocol, space.w_None):
+        return 0
+    proto = space.int_w(w_protocol)
+    if proto < 0:
+        return HIGHEST_PROTOCOL
+    if proto > HIGHEST_PROTOCOL:
+        raise operationerrfmt(space.w_ValueError,
+                              "pickle protocol must be <= %d",
+                              HIGHEST_PROTOCOL)
+    return proto
+
+def dumps(space, w_obj, w_protocol=None):
+    """dumps(obj, protocol=0) -- Return a string containing an object in
+pickle format.
+
+See the Pickler docstring for the meaning of optional argument proto."""
+    pickler = Pickler(space, get_protocol(space, w_protocol))
+    return space.wrap(pickler.dump(w_obj))
+
+def dump(space, w_obj, w_file, w_protocol=None):
+    """dump(obj, file, protocol=0) -- Write an object in pickle format to
+the given file.
+
+See the Pickler docstring for the meaning of optional argument proto."""
+    pickler = Pickler(space, get_protocol(space, w_protocol))
+    data = pickler.dump(w_obj)
+    space.call_method(w_file, 'write', space.wrap(data))
+
+@unwrap_spec(data=str)
+def loads(space, data):
+    """loads(string) -- Load a pickle from the given string"""
+    return Unpickler(space, StringReader(data)).load()
+
+def load(space, w_file):
+    """load(file) -- Load a pickle from the given file"""
+    return Unpickler(space, FileReader(space, w_file)).load()
@@ -0,0 +1,182 @@
+from pypy.conftest import gettestobjspace
+from pypy.tool.udir import udir
+
+
+class AppTestPickle:
+    def setup_class(cls):
+        cls.space = gettestobjspace(usemodules=['cPickle', 'struct'])
+        # the classes of pickled instances must be importable
+        tmpdir = udir.ensure('test_cPickle', dir=1)
+        tmpdir.join('test_pickle_helper.py').write('''if 1:
+            class New(object):
+                pass
+            class Old:
+                pass
+            class Slots(object):
+                __slots__ = ['x', 'y']
+            class InitArgs:
+                def __init__(self, *args):
+                    self.args = args
+                def __getinitargs__(self):
+                    return self.args
+            class State(object):
+                def __getstate__(self):
+                    return 'saved'
+                def __setstate__(self, state):
+                    assert state == 'saved'
+                    self.state = 'restored'
+        ''')
+        cls.w_tmpdir = cls.space.wrap(str(tmpdir))
+
+    def test_is_builtin(self):
+        import cPickle
+        assert 'built-in' in repr(cPickle.dumps)
+        assert cPickle.HIGHEST_PROTOCOL == 2
+        import pickle
+        assert cPickle.PicklingError is pickle.PicklingError
+        assert cPickle.BadPickleGet is KeyError
+
+    def test_roundtrip(self):
+        import cPickle
+        data = [None, True, False, 0, 1, 255, 256, 65535, 65536, -1,
+                2**31 - 1, -2**31, 2**31, -2**31 - 1, 2**62, 2**100,
+                -2**100, 0L, 255L, -128L, 1.5, -0.0, 1e300,
+                '', 'abc', 'x' * 300, '\x00\n\'"\\', u'', u'\xe9\u20ac\n\\',
+                (), (1,), (1, 2), (1, 2, 3), (1, 2, 3, 4), [], [1, [2]],
+                {}, {'a': 1, 2: 'b', (3,): [4]}, range(2500),
+                dict.fromkeys(range(2500))]
+        for proto in range(3):
+            for obj in data:
+                s = cPickle.dumps(obj, proto)
+                res = cPickle.loads(s)
+                assert res == obj
+                assert type(res) is type(obj)
+        assert cPickle.loads(cPickle.dumps(float('nan'), 2)) != 0.0
+
+    def test_compatible_with_pickle(self):
+        import cPickle, pickle
+        obj = {'a': [1, 2.5, u'x', ('y', None)], 'b': 2**70}
+        for proto in range(3):
+            assert pickle.loads(cPickle.dumps(obj, proto)) == obj
+            assert cPickle.loads(pickle.dumps(obj, proto)) == obj
+
+    def test_protocol_output(self):
+        import cPickle
+        assert cPickle.dumps(1) == 'I1\n.'
+        assert cPickle.dumps(1, 1) == 'K\x01.'
+        assert cPickle.dumps(True, 2) == '\x80\x02\x88.'
+        assert cPickle.dumps((), 1) == ').'
+        assert cPickle.dumps('ab', 2) == '\x80\x02U\x02abq\x01.'
+        assert cPickle.dumps(-1, -1) == '\x80\x02J\xff\xff\xff\xff.'
+        raises(ValueError, cPickle.dumps, 1, 3)
+
+    def test_shared_and_recursive(self):
+        import cPickle
+        for proto in range(3):
+            l = [1]
+            obj = [l, l]
+            res = cPickle.loads(cPickle.dumps(obj, proto))
+            assert res == obj
+            assert res[0] is res[1]
+            l = []
+            l.append(l)
+            res = cPickle.loads(cPickle.dumps(l, proto))
+            assert res[0] is res
+            d = {}
+            t = (d,)
+            d[1] = t
+            res = cPickle.loads(cPickle.dumps(t, proto))
+            assert res[0][1] is res
+
+    def test_instances(self):
+        import sys, cPickle
+        sys.path.insert(0, self.tmpdir)
+        try:
+            import test_pickle_helper as h
+        finally:
+            sys.path.pop(0)
+        for proto in range(3):
+            classes = [h.New, h.Old]
+            if proto >= 2:
+                classes.append(h.Slots)
+            for cls in classes:
+                obj = cls()
+                obj.x = 42
+                obj.y = [obj]
+                res = cPickle.loads(cPickle.dumps(obj, proto))
+                assert res.__class__ is cls
+                assert res.x == 42
+                assert res.y[0] is res
+            res = cPickle.loads(cPickle.dumps(h.InitArgs(5), proto))
+            assert res.args == (5,)
+            res = cPickle.loads(cPickle.dumps(h.State(), proto))
+            assert res.state == 'restored'
+
+    def test_globals(self):
+        import cPickle, copy_reg, os
+        for proto in range(3):
+            for obj in [len, os.path.join, int, copy_reg.pickle,
+                        ValueError]:
+                assert cPickle.loads(cPickle.dumps(obj, proto)) is obj
+        def local():
+            pass
+        raises(cPickle.PicklingError, cPickle.dumps, local)
+        module = os.path.join.__module__
+        copy_reg.add_extension(module, 'join', 240)
+        try:
+            s = cPickle.dumps(os.path.join, 2)
+            assert s == '\x80\x02\x82\xf0.'
+            assert cPickle.loads(s) is os.path.join
+        finally:
+            copy_reg.remove_extension(module, 'join', 240)
+
+    def test_reduce_errors(self):
+        import cPickle
+        class A(object):
+            def __reduce__(self):
+                return 42
+        raises(cPickle.PicklingError, cPickle.dumps, A())
+        class B(object):
+            def __reduce__(self):
+                return (B,)
+        raises(cPickle.PicklingError, cPickle.dumps, B())
+        class C(object):
+            def __reduce__(self):
+                return (C, [])
+        raises(cPickle.PicklingError, cPickle.dumps, C())
+
+    def test_load_errors(self):
+        import cPickle
+        raises(EOFError, cPickle.loads, '')
+        raises(EOFError, cPickle.loads, 'I1\n')
+        raises(EOFError, cPickle.loads, 'S"abc')
+        raises(cPickle.UnpicklingError, cPickle.loads, 'z.')
+        raises(cPickle.UnpicklingError, cPickle.loads, '.')
+        raises(cPickle.UnpicklingError, cPickle.loads, 't.')
+        raises(cPickle.UnpicklingError, cPickle.loads, 'Pfoo\n.')
+        raises(KeyError, cPickle.loads, 'g5\n.')
+        raises(ValueError, cPickle.loads, 'Sabc\n.')
+        raises(ValueError, cPickle.loads, '\x80\x03N.')
+
+    def test_file(self):
+        import cPickle
+        from StringIO import StringIO
+        f = StringIO()
+        cPickle.dump([1, 2], f, 2)
+        cPickle.dump(u'abc', f)
+        cPickle.dump({'x': 'y'}, f, 1)
+        f.seek(0)
+        assert cPickle.load(f) == [1, 2]
+        assert cPickle.load(f) == u'abc'
+        assert cPickle.load(f) == {'x': 'y'}
+        raises(EOFError, cPickle.load, f)
+
+    def test_pickler_class(self):
+        import cPickle
+        from StringIO import StringIO
+        f = StringIO()
+        p = cPickle.Pickler(f, 2)
+        p.dump([1, 'a'])
+        assert cPickle.loads(f.getvalue()) == [1, 'a']
+        f.seek(0)
+        assert cPickle.Unpickler(f).load() == [1, 'a']
@@ -410,10 +410,12 @@ PyTypeObject = lltype.ForwardReference()
 PyTypeObjectPtr = lltype.Ptr(PyTypeObject)
 # It is important that these PyObjects are allocated in a raw fashion
 # Thus we cannot save a forward pointer to the wrapped object
-# So we need a forward and backward mapping in our State instance
+# Instead ob_pypy_link is an index in the RefcountState, which
+# also keeps the mapping from wrapped objects to PyObjects
 PyObjectStruct = lltype.ForwardReference()
 PyObject = lltype.Ptr(PyObjectStruct)
-PyObjectFields = (("ob_refcnt", lltype.Signed), ("ob_type", PyTypeObjectPtr))
+PyObjectFields = (("ob_refcnt", lltype.Signed), ("ob_type", PyTypeObjectPtr),
+                  ("ob_pypy_link", lltype.Signed))
 PyVarObjectFields = PyObjectFields + (("ob_size", Py_ssize_t), )
 cpython_struct('PyObject', PyObjectFields, PyObjectStruct)
 PyVarObjectStruct = cpython_struct("PyVarObject", PyVarObjectFields)
@@ -1051,7 +1053,6 @@ def make_generic_cpy_call(FT, decref_args, expect_null):
     @specialize.ll()
     def generic_cpy_call(space, func, *args):
         boxed_args = ()
-        to_decref = []
         assert len(args) == len(FT.ARGS)
         for i, ARG in unrolling_arg_types:
             arg = args[i]
@@ -1061,8 +1062,6 @@ def make_generic_cpy_call(FT, decref_args, expect_null):
                 elif isinstance(arg, W_Root):
                     ref = make_ref(space, arg)
                     boxed_args += (ref,)
-                    if decref_args:
-                        to_decref.append(ref)
                 else:
                     boxed_args += (arg,)
             else:
@@ -1109,7 +1108,10 @@ def make_generic_cpy_call(FT, decref_args, expect_null):
             return result
         finally:
             if decref_args:
-                for ref in to_decref:
-                    Py_DecRef(space, ref)
+                # release the references made above, without keeping
+                # them in a list
+                for i, ARG in unrolling_arg_types:
+                    if is_PyObject(ARG) and isinstance(args[i], W_Root):
+                        Py_DecRef(space, boxed_args[i])
     return generic_cpy_call
 
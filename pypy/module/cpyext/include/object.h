@@ -18,14 +18,15 @@ we have it for compatibility with CPython.
 
 #define PyObject_HEAD  \
     long ob_refcnt;       \
-    struct _typeobject *ob_type;
+    struct _typeobject *ob_type; \
+    long ob_pypy_link;
 
 #define PyObject_VAR_HEAD		\
 	PyObject_HEAD			\
 	Py_ssize_t ob_size; /* Number of items in variable part */
 
 #define PyObject_HEAD_INIT(type)	\
-	1, type,
+	1, type, 0,
 
 #define PyVarObject_HEAD_INIT(type, size)	\
 	PyObject_HEAD_INIT(type) size,
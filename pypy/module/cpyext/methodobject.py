@@ -56,9 +56,16 @@ def cfunction_dealloc(space, py_obj):
     from pypy.module.cpyext.object import PyObject_dealloc
     PyObject_dealloc(space, py_obj)
 
+def get_call_flags(ml):
+    flags = rffi.cast(lltype.Signed, ml.c_ml_flags)
+    return flags & ~(METH_CLASS | METH_STATIC | METH_COEXIST)
+
 class W_PyCFunctionObject(Wrappable):
+    _immutable_fields_ = ['ml', 'flags']
+
     def __init__(self, space, ml, w_self, w_module=None):
         self.ml = ml
+        self.flags = get_call_flags(ml)
         self.w_self = w_self
         self.w_module = w_module
 
@@ -66,8 +73,7 @@ class W_PyCFunctionObject(Wrappable):
         # Call the C function
         if w_self is None:
             w_self = self.w_self
-        flags = rffi.cast(lltype.Signed, self.ml.c_ml_flags)
-        flags &= ~(METH_CLASS | METH_STATIC | METH_COEXIST)
+        flags = self.flags
         if space.is_true(w_kw) and not flags & METH_KEYWORDS:
             raise OperationError(space.w_TypeError, space.wrap(
                 rffi.charp2str(self.ml.c_ml_name) + "() takes no keyword arguments"))
@@ -102,6 +108,36 @@ class W_PyCFunctionObject(Wrappable):
                 w_arg = w_args
             return generic_cpy_call(space, func, w_self, w_arg)
 
+    def call_positional(self, space, w_self, args_w, start):
+        """Call with the positional arguments args_w[start:] and no
+        keywords.  METH_NOARGS and METH_O functions get their argument
+        directly: no tuple is built."""
+        if w_self is None:
+            w_self = self.w_self
+        flags = self.flags
+        length = len(args_w) - start
+        if flags & METH_KEYWORDS:
+            pass
+        elif flags & METH_NOARGS:
+            if length != 0:
+                raise OperationError(space.w_TypeError, space.wrap(
+                    rffi.charp2str(self.ml.c_ml_name) +
+                    "() takes no arguments"))
+            func = rffi.cast(PyCFunction, self.ml.c_ml_meth)
+            return generic_cpy_call(space, func, w_self, None)
+        elif flags & METH_O:
+            if length != 1:
+                raise OperationError(space.w_TypeError,
+                        space.wrap("%s() takes exactly one argument (%d given)" %  (
+                        rffi.charp2str(self.ml.c_ml_name),
+                        length)))
+            func = rffi.cast(PyCFunction, self.ml.c_ml_meth)
+            return generic_cpy_call(space, func, w_self, args_w[start])
+        if start > 0:
+            args_w = args_w[start:]
+        return self.call(space, w_self, space.newtuple(args_w),
+                         space.newdict())
+
     def get_doc(self, space):
         doc = self.ml.c_ml_doc
         if doc:
@@ -115,6 +151,7 @@ class W_PyCMethodObject(W_PyCFunctionObject):
     def __init__(self, space, ml, w_type):
         self.space = space
         self.ml = ml
+        self.flags = get_call_flags(ml)
         self.name = rffi.charp2str(ml.c_ml_name)
         self.w_objclass = w_type
 
@@ -166,6 +203,8 @@ def cwrapper_descr_call(space, w_self, __args__):
 
 def cfunction_descr_call(space, w_self, __args__):
     self = space.interp_w(W_PyCFunctionObject, w_self)
+    if not __args__.keywords:
+        return self.call_positional(space, None, __args__.arguments_w, 0)
     args_w, kw_w = __args__.unpack()
     w_args = space.newtuple(args_w)
     w_kw = space.newdict()
@@ -176,6 +215,10 @@ def cfunction_descr_call(space, w_self, __args__):
 
 def cmethod_descr_call(space, w_self, __args__):
     self = space.interp_w(W_PyCFunctionObject, w_self)
+    if not __args__.keywords:
+        args_w = __args__.arguments_w
+        w_instance = args_w[0] # XXX typecheck missing
+        return self.call_positional(space, w_instance, args_w, 1)
     args_w, kw_w = __args__.unpack()
     w_instance = args_w[0] # XXX typecheck missing
     w_args = space.newtuple(args_w[1:])
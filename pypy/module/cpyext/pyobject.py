@@ -133,7 +133,13 @@ class RefcountState:
     def __init__(self, space):
         self.space = space
         self.py_objects_w2r = {} # { w_obj -> raw PyObject }
-        self.py_objects_r2w = {} # { addr of raw PyObject -> w_obj }
+
+        # the reverse mapping: a tracked PyObject stores in ob_pypy_link
+        # its index in these lists, plus one (zero means "not tracked").
+        # Freed slots are reused.
+        self.linked_objects_w = []
+        self.linked_objects_r = []
+        self.free_links = []
 
         self.lifeline_dict = RWeakKeyDictionary(W_Root, PyOLifeline)
 
@@ -147,14 +153,35 @@ class RefcountState:
 
     def _freeze_(self):
         assert self.borrow_mapping == {None: {}}
-        self.py_objects_r2w.clear() # is not valid anymore after translation
         return False
 
-    def init_r2w_from_w2r(self):
-        """Rebuilds the dict py_objects_r2w on startup"""
-        for w_obj, obj in self.py_objects_w2r.items():
-            ptr = rffi.cast(ADDR, obj)
-            self.py_objects_r2w[ptr] = w_obj
+    def link(self, py_obj, w_obj):
+        """Store in py_obj a back-pointer to w_obj"""
+        if self.free_links:
+            index = self.free_links.pop()
+            self.linked_objects_w[index] = w_obj
+            self.linked_objects_r[index] = py_obj
+        else:
+            index = len(self.linked_objects_w)
+            self.linked_objects_w.append(w_obj)
+            self.linked_objects_r.append(py_obj)
+        py_obj.c_ob_pypy_link = index + 1
+
+    def unlink(self, py_obj):
+        index = py_obj.c_ob_pypy_link - 1
+        py_obj.c_ob_pypy_link = 0
+        self.linked_objects_w[index] = None
+        self.linked_objects_r[index] = lltype.nullptr(PyObject.TO)
+        self.free_links.append(index)
+
+    def get_linked(self, py_obj):
+        """Returns the interpreter object tied to py_obj, or None."""
+        index = py_obj.c_ob_pypy_link - 1
+        # objects allocated by C code may contain garbage in ob_pypy_link
+        if 0 <= index < len(self.linked_objects_r):
+            if self.linked_objects_r[index] == py_obj:
+                return self.linked_objects_w[index]
+        return None
 
     def print_refcounts(self):
         print "REFCOUNTS"
@@ -210,11 +237,19 @@ class RefcountState:
         """switch the current default contained with the given one."""
         if container is None:
             old_container = self.borrow_mapping[None]
-            self.borrow_mapping[None] = {}
+            if old_container:
+                self.borrow_mapping[None] = {}
+            # else: keep using the empty container, this saves a
+            # dictionary for each call
             return old_container
         else:
             old_container = self.borrow_mapping[None]
-            self.borrow_mapping[None] = container
+            if old_container is container:
+                if not old_container:
+                    return
+                self.borrow_mapping[None] = {}
+            else:
+                self.borrow_mapping[None] = container
             for w_containee in old_container:
                 self.forget_borrowee(w_containee)
 
@@ -267,16 +302,16 @@ def track_reference(space, py_obj, w_obj, replace=False):
     Ties together a PyObject and an interpreter object.
     """
     # XXX looks like a PyObject_GC_TRACK
-    ptr = rffi.cast(ADDR, py_obj)
     state = space.fromcache(RefcountState)
     if DEBUG_REFCOUNT:
         debug_refcount("MAKREF", py_obj, w_obj)
         if not replace:
             assert w_obj not in state.py_objects_w2r
-        assert ptr not in state.py_objects_r2w
+        if py_obj:
+            assert state.get_linked(py_obj) is None
     state.py_objects_w2r[w_obj] = py_obj
-    if ptr: # init_typeobject() bootstraps with NULL references
-        state.py_objects_r2w[ptr] = w_obj
+    if py_obj: # init_typeobject() bootstraps with NULL references
+        state.link(py_obj, w_obj)
 
 def make_ref(space, w_obj):
     """
@@ -305,12 +340,9 @@ def from_ref(space, ref):
     if not ref:
         return None
     state = space.fromcache(RefcountState)
-    ptr = rffi.cast(ADDR, ref)
-
-    try:
-        return state.py_objects_r2w[ptr]
-    except KeyError:
-        pass
+    w_obj = state.get_linked(ref)
+    if w_obj is not None:
+        return w_obj
 
     # This reference is not yet a real interpreter object.
     # Realize it.
@@ -334,14 +366,13 @@ def Py_DecRef(space, obj):
         debug_refcount("DECREF", obj, obj.c_ob_refcnt, frame_stackdepth=3)
     if obj.c_ob_refcnt == 0:
         state = space.fromcache(RefcountState)
-        ptr = rffi.cast(ADDR, obj)
-        if ptr not in state.py_objects_r2w:
+        w_obj = state.get_linked(obj)
+        if w_obj is None:
             # this is a half-allocated object, lets call the deallocator
-            # without modifying the r2w/w2r dicts
+            # without modifying the w2r dict
             _Py_Dealloc(space, obj)
         else:
-            w_obj = state.py_objects_r2w[ptr]
-            del state.py_objects_r2w[ptr]
+            state.unlink(obj)
             w_type = space.type(w_obj)
             if not w_type.is_cpytype():
                 _Py_Dealloc(space, obj)
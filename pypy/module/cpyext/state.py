@@ -73,7 +73,6 @@ class State:
         "This function is called when the program really starts"
 
         from pypy.module.cpyext.typeobject import setup_new_method_def
-        from pypy.module.cpyext.pyobject import RefcountState
         from pypy.module.cpyext.api import INIT_FUNCTIONS
 
         setup_new_method_def(space)
@@ -81,9 +80,6 @@ class State:
             space.setattr(space.wrap(self),
                           space.wrap('api_lib'),
                           space.wrap(self.api_lib))
-        else:
-            refcountstate = space.fromcache(RefcountState)
-            refcountstate.init_r2w_from_w2r()
 
         for func in INIT_FUNCTIONS:
             func(space)
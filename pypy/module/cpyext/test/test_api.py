@@ -109,3 +109,26 @@ def test_copy_header_files(tmpdir):
     check('Python.h')
     check('modsupport.h')
     check('pypy_decl.h')
+
+class TestLink(BaseApiTest):
+    def test_link(self, space, api):
+        from pypy.module.cpyext.pyobject import (
+            make_ref, from_ref, RefcountState)
+        state = space.fromcache(RefcountState)
+        w_obj = space.newlist([space.wrap(1)])
+        ref = make_ref(space, w_obj)
+        assert ref.c_ob_pypy_link > 0
+        assert from_ref(space, ref) is w_obj
+        index = ref.c_ob_pypy_link
+        # a stale or garbage value is not mistaken for a link
+        ref.c_ob_pypy_link = index + 1000000
+        assert state.get_linked(ref) is None
+        ref.c_ob_pypy_link = index
+        api.Py_DecRef(ref)
+        assert w_obj not in state.py_objects_w2r
+        # the slot is reused by the next object
+        w_obj2 = space.newlist([])
+        ref2 = make_ref(space, w_obj2)
+        assert ref2.c_ob_pypy_link == index
+        assert from_ref(space, ref2) is w_obj2
+        api.Py_DecRef(ref2)
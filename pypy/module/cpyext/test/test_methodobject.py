@@ -78,6 +78,36 @@ class AppTestMethodObject(AppTestCpythonExtensionBase):
         assert mod.isSameFunction(mod.getarg_O)
         raises(TypeError, mod.isSameFunction, 1)
 
+    def test_call_keywords(self):
+        mod = self.import_extension('foo', [
+            ('getarg_O', 'METH_O',
+             '''
+             Py_INCREF(args);
+             return args;
+             '''
+             ),
+            ('getarg_NO', 'METH_NOARGS',
+             '''
+             Py_INCREF(Py_None);
+             return Py_None;
+             '''
+             ),
+            ('getarg_VA', 'METH_VARARGS',
+             '''
+             Py_INCREF(args);
+             return args;
+             '''
+             ),
+            ])
+        assert mod.getarg_O(*[5]) == 5
+        assert mod.getarg_O(*[5], **{}) == 5
+        raises(TypeError, mod.getarg_O, x=1)
+        assert mod.getarg_NO(**{}) is None
+        raises(TypeError, mod.getarg_NO, x=1)
+        assert mod.getarg_VA(1, 2) == (1, 2)
+        assert mod.getarg_VA(*[1], **{}) == (1,)
+        raises(TypeError, mod.getarg_VA, x=1)
+
 class TestPyCMethodObject(BaseApiTest):
     def test_repr(self, space):
         """
@@ -0,0 +1,24 @@
+"""
+Mixed-module definition for the datetime module.
+Note that there is also a pure Python implementation in lib_pypy/datetime.py;
+the present mixed-module version of datetime takes precedence if it is enabled.
+"""
+
+from pypy.interpreter.mixedmodule import MixedModule
+
+
+class Module(MixedModule):
+    """Fast implementation of the datetime type."""
+
+    interpleveldefs = {
+        'timedelta': 'interp_datetime.W_TimeDelta',
+        'date':      'interp_datetime.W_Date',
+        'time':      'interp_datetime.W_Time',
+        'datetime':  'interp_datetime.W_DateTime',
+        'tzinfo':    'interp_datetime.W_TZInfo',
+        'MINYEAR':   'space.wrap(interp_datetime.MINYEAR)',
+        'MAXYEAR':   'space.wrap(interp_datetime.MAXYEAR)',
+        }
+
+    appleveldefs = {
+        }
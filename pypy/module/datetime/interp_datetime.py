@@ -0,0 +1,1811 @@
+import sys
+from pypy.interpreter.baseobjspace import Wrappable
+from pypy.interpreter.error import OperationError, operationerrfmt
+from pypy.interpreter.gateway import interp2app, unwrap_spec, applevel
+from pypy.interpreter.gateway import NoneNotWrapped
+from pypy.interpreter.typedef import TypeDef
+from pypy.interpreter.typedef import interp_attrproperty, interp_attrproperty_w
+from pypy.rlib.objectmodel import specialize
+from pypy.rlib.rarithmetic import ovfcheck, intmask
+from pypy.rlib.rstring import StringBuilder
+
+
+MINYEAR = 1
+MAXYEAR = 9999
+MAXORDINAL = 3652059          # date.max.toordinal()
+MAX_DELTA_DAYS = 999999999
+
+# the result of utcoffset() and dst() when they return None
+NO_OFFSET = -sys.maxint - 1
+
+_DAYS_IN_MONTH = [-1, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+_DAYS_BEFORE_MONTH = [-1, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304,
+                      334]
+_MONTHNAMES = ["", "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+               "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+_DAYNAMES = ["", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# ____________________________________________________________
+# Calendar computations, on the proleptic Gregorian calendar where
+# January 1 of year 1 is day number 1 (see lib_pypy/datetime.py)
+
+def is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+def days_before_year(year):
+    y = year - 1
+    return y * 365 + y // 4 - y // 100 + y // 400
+
+def days_in_month(year, month):
+    if month == 2 and is_leap(year):
+        return 29
+    return _DAYS_IN_MONTH[month]
+
+def days_before_month(year, month):
+    if month > 2 and is_leap(year):
+        return _DAYS_BEFORE_MONTH[month] + 1
+    return _DAYS_BEFORE_MONTH[month]
+
+def ymd_to_ord(year, month, day):
+    return days_before_year(year) + days_before_month(year, month) + day
+
+_DI400Y = days_before_year(401)    # number of days in 400 years
+_DI100Y = days_before_year(101)    #    "    "   "   " 100   "
+_DI4Y   = days_before_year(5)      #    "    "   "   "   4   "
+
+def ord_to_ymd(n):
+    n -= 1
+    n400 = n // _DI400Y
+    n = n % _DI400Y
+    year = n400 * 400 + 1
+    n100 = n // _DI100Y
+    n = n % _DI100Y
+    n4 = n // _DI4Y
+    n = n % _DI4Y
+    n1 = n // 365
+    n = n % 365
+    year += n100 * 100 + n4 * 4 + n1
+    if n1 == 4 or n100 == 4:
+        return year - 1, 12, 31
+    # the month is either exact or one too large
+    leapyear = n1 == 3 and (n4 != 24 or n100 == 3)
+    month = (n + 50) >> 5
+    preceding = _DAYS_BEFORE_MONTH[month]
+    if month > 2 and leapyear:
+        preceding += 1
+    if preceding > n:
+        month -= 1
+        preceding -= _DAYS_IN_MONTH[month]
+        if month == 2 and leapyear:
+            preceding -= 1
+    return year, month, n - preceding + 1
+
+def isoweek1monday(year):
+    # the day number of the Monday starting week 1 of the ISO year
+    THURSDAY = 3
+    firstday = ymd_to_ord(year, 1, 1)
+    firstweekday = (firstday + 6) % 7
+    week1monday = firstday - firstweekday
+    if firstweekday > THURSDAY:
+        week1monday += 7
+    return week1monday
+
+def hash_ints(values):
+    # the same algorithm as the hash of a tuple of ints
+    mult = 1000003
+    x = 0x345678
+    z = len(values)
+    for y in values:
+        x = (x ^ y) * mult
+        z -= 1
+        mult += 82520 + z + z
+    x += 97531
+    return intmask(x)
+
+@specialize.arg(2)
+def compare_result(space, c, op):
+    if op == 'eq':
+        return space.newbool(c == 0)
+    elif op == 'ne':
+        return space.newbool(c != 0)
+    elif op == 'lt':
+        return space.newbool(c < 0)
+    elif op == 'le':
+        return space.newbool(c <= 0)
+    elif op == 'gt':
+        return space.newbool(c > 0)
+    else:
+        return space.newbool(c >= 0)
+
+def compare_ints(a, b):
+    if a < b:
+        return -1
+    elif a > b:
+        return 1
+    return 0
+
+@specialize.arg(3)
+def compare_other(space, w_self, w_other, op):
+    # 'w_other' is not of a type that 'w_self' knows how to compare with
+    if op == 'eq':
+        return space.w_False
+    elif op == 'ne':
+        return space.w_True
+    raise operationerrfmt(space.w_TypeError, "can't compare '%s' to '%s'",
+                          space.type(w_self).getname(space),
+                          space.type(w_other).getname(space))
+
+def append_int(builder, value, width):
+    s = str(value)
+    for i in range(width - len(s)):
+        builder.append('0')
+    builder.append(s)
+
+def append_time(builder, hour, minute, second, microsecond):
+    append_int(builder, hour, 2)
+    builder.append(':')
+    append_int(builder, minute, 2)
+    builder.append(':')
+    append_int(builder, second, 2)
+    if microsecond:
+        builder.append('.')
+        append_int(builder, microsecond, 6)
+
+def append_offset(builder, offset):
+    if offset != NO_OFFSET:
+        if offset < 0:
+            builder.append('-')
+            offset = -offset
+        else:
+            builder.append('+')
+        append_int(builder, offset // 60, 2)
+        builder.append(':')
+        append_int(builder, offset % 60, 2)
+
+def format_ctime(year, month, day, hour, minute, second):
+    builder = StringBuilder(24)
+    weekday = ymd_to_ord(year, month, day) % 7 or 7
+    builder.append(_DAYNAMES[weekday])
+    builder.append(' ')
+    builder.append(_MONTHNAMES[month])
+    builder.append(' ')
+    if day < 10:
+        builder.append(' ')
+    builder.append(str(day))
+    builder.append(' ')
+    append_time(builder, hour, minute, second, 0)
+    builder.append(' ')
+    append_int(builder, year, 4)
+    return builder.build()
+
+def repr_tail(space, builder, w_tzinfo):
+    if w_tzinfo is not None:
+        builder.append(', tzinfo=')
+        builder.append(space.str_w(space.repr(w_tzinfo)))
+    builder.append(')')
+
+# ____________________________________________________________
+# Argument checking
+
+def check_date_fields(space, year, month, day):
+    if not MINYEAR <= year <= MAXYEAR:
+        raise OperationError(space.w_ValueError,
+                             space.wrap("year is out of range"))
+    if not 1 <= month <= 12:
+        raise OperationError(space.w_ValueError,
+                             space.wrap("month must be in 1..12"))
+    if not 1 <= day <= days_in_month(year, month):
+        raise OperationError(space.w_ValueError,
+                             space.wrap("day is out of range for month"))
+
+def check_time_fields(space, hour, minute, second, microsecond):
+    if not 0 <= hour <= 23:
+        raise OperationError(space.w_ValueError,
+                             space.wrap("hour must be in 0..23"))
+    if not 0 <= minute <= 59:
+        raise OperationError(space.w_ValueError,
+                             space.wrap("minute must be in 0..59"))
+    if not 0 <= second <= 59:
+        raise OperationError(space.w_ValueError,
+                             space.wrap("second must be in 0..59"))
+    if not 0 <= microsecond <= 999999:
+        raise OperationError(space.w_ValueError,
+                             space.wrap("microsecond must be in 0..999999"))
+
+def check_tzinfo(space, w_tzinfo):
+    """Returns the tzinfo to store: None or a tzinfo instance."""
+    if w_tzinfo is None or space.is_w(w_tzinfo, space.w_None):
+        return None
+    if not isinstance(space.interpclass_w(w_tzinfo), W_TZInfo):
+        raise operationerrfmt(space.w_TypeError,
+            "tzinfo argument must be None or of a tzinfo subclass, "
+            "not type '%s'", space.type(w_tzinfo).getname(space))
+    return w_tzinfo
+
+def int_or_default(space, w_value, default):
+    if w_value is None or space.is_w(w_value, space.w_None):
+        return default
+    return space.int_w(w_value)
+
+def call_offset(space, w_tzinfo, name, w_arg):
+    """Calls w_tzinfo.utcoffset() or w_tzinfo.dst() and checks the result.
+    Returns the offset in minutes, or NO_OFFSET."""
+    if w_tzinfo is None:
+        return NO_OFFSET
+    w_offset = space.call_method(w_tzinfo, name, w_arg)
+    if space.is_w(w_offset, space.w_None):
+        return NO_OFFSET
+    offset = space.interpclass_w(w_offset)
+    if not isinstance(offset, W_TimeDelta):
+        raise operationerrfmt(space.w_TypeError,
+                              "tzinfo.%s() must return None or timedelta, "
+                              "not '%s'", name,
+                              space.type(w_offset).getname(space))
+    if offset.days < -1 or offset.days > 0:
+        minutes = 1440      # out of range
+    else:
+        seconds = offset.days * 86400 + offset.seconds
+        if seconds % 60 != 0 or offset.microseconds != 0:
+            raise operationerrfmt(space.w_ValueError,
+                                  "tzinfo.%s() must return a whole number "
+                                  "of minutes", name)
+        minutes = seconds // 60
+    if not -1440 < minutes < 1440:
+        raise operationerrfmt(space.w_ValueError,
+                              "%s()=%d, must be in -1439..1439",
+                              name, minutes)
+    return minutes
+
+def call_tzname(space, w_tzinfo, w_arg):
+    if w_tzinfo is None:
+        return space.w_None
+    w_name = space.call_method(w_tzinfo, 'tzname', w_arg)
+    if not (space.is_w(w_name, space.w_None) or
+            space.isinstance_w(w_name, space.w_str)):
+        raise operationerrfmt(space.w_TypeError,
+                              "tzinfo.tzname() must return None or a string, "
+                              "not '%s'", space.type(w_name).getname(space))
+    return w_name
+
+def wrap_offset(space, offset):
+    if offset == NO_OFFSET:
+        return space.w_None
+    return space.wrap(make_timedelta(space, 0, offset * 60, 0))
+
+# ____________________________________________________________
+# The less common operations are written at app-level
+
+app = applevel(r'''
+    def normalize_timedelta(days, seconds, microseconds, milliseconds,
+                            minutes, hours, weeks):
+        "The general case of timedelta(), see lib_pypy/datetime.py."
+        import math
+        for name, value in [('days', days), ('seconds', seconds),
+                            ('microseconds', microseconds),
+                            ('milliseconds', milliseconds),
+                            ('minutes', minutes), ('hours', hours),
+                            ('weeks', weeks)]:
+            if not isinstance(value, (int, long, float)):
+                raise TypeError("unsupported type for timedelta %s "
+                                "component: %s" % (name,
+                                                   type(value).__name__))
+        d = s = 0
+        days += weeks*7
+        seconds += minutes*60 + hours*3600
+        microseconds += milliseconds*1000
+        if isinstance(days, float):
+            dayfrac, days = math.modf(days)
+            daysecondsfrac, daysecondswhole = math.modf(dayfrac * (24.*3600.))
+            s = int(daysecondswhole)
+            d = long(days)
+        else:
+            daysecondsfrac = 0.0
+            d = days
+        if isinstance(seconds, float):
+            secondsfrac, seconds = math.modf(seconds)
+            seconds = long(seconds)
+            secondsfrac += daysecondsfrac
+        else:
+            secondsfrac = daysecondsfrac
+        days, seconds = divmod(seconds, 24*3600)
+        d += days
+        s += int(seconds)
+        usdouble = secondsfrac * 1e6
+        if isinstance(microseconds, float):
+            microseconds += usdouble
+            microseconds = round(microseconds)
+            seconds, microseconds = divmod(microseconds, 1e6)
+            days, seconds = divmod(seconds, 24.*3600.)
+            d += long(days)
+            s += int(seconds)
+        else:
+            seconds, microseconds = divmod(microseconds, 1000000)
+            days, seconds = divmod(seconds, 24*3600)
+            d += days
+            s += int(seconds)
+            microseconds = float(microseconds)
+            microseconds += usdouble
+            microseconds = round(microseconds)
+        us = int(microseconds)
+        seconds, us = divmod(us, 1000000)
+        s += seconds
+        days, s = divmod(s, 24*3600)
+        d += days
+        if abs(d) > 999999999:
+            raise OverflowError("days=%d; must have magnitude <= 999999999"
+                                % d)
+        return int(d), s, us
+
+    def build_struct_time(timetuple):
+        import time
+        return time.struct_time(timetuple)
+
+    def wrap_strftime(object, format, timetuple):
+        "Substitutes the %z, %Z and %f escapes and calls time.strftime()."
+        import time
+        year = timetuple[0]
+        if year < 1900:
+            raise ValueError("year=%d is before 1900; the datetime strftime() "
+                             "methods require year >= 1900" % year)
+        zreplace = None # the string to use for %z
+        Zreplace = None # the string to use for %Z
+        newformat = []
+        push = newformat.append
+        i, n = 0, len(format)
+        while i < n:
+            ch = format[i]
+            i += 1
+            if ch == '%':
+                if i < n:
+                    ch = format[i]
+                    i += 1
+                    if ch == 'z':
+                        if zreplace is None:
+                            zreplace = ""
+                            if hasattr(object, "utcoffset"):
+                                offset = object.utcoffset()
+                                if offset is not None:
+                                    offset = (offset.days * 1440 +
+                                              offset.seconds // 60)
+                                    sign = '+'
+                                    if offset < 0:
+                                        offset = -offset
+                                        sign = '-'
+                                    h, m = divmod(offset, 60)
+                                    zreplace = '%c%02d%02d' % (sign, h, m)
+                        push(zreplace)
+                    elif ch == 'Z':
+                        if Zreplace is None:
+                            Zreplace = ""
+                            if hasattr(object, "tzname"):
+                                s = object.tzname()
+                                if s is not None:
+                                    Zreplace = s.replace('%', '%%')
+                        push(Zreplace)
+                    elif ch == 'f':
+                        push('%06d' % getattr(object, 'microsecond', 0))
+                    else:
+                        push('%')
+                        push(ch)
+                else:
+                    push('%')
+            else:
+                push(ch)
+        return time.strftime("".join(newformat), timetuple)
+
+    def date_fromtimestamp(cls, t):
+        import time
+        y, m, d, hh, mm, ss, weekday, jday, dst = time.localtime(t)
+        return cls(y, m, d)
+
+    def date_today(cls):
+        import time
+        return cls.fromtimestamp(time.time())
+
+    def datetime_fromtimestamp(cls, t, tz):
+        import time
+        if tz is None:
+            converter = time.localtime
+        else:
+            converter = time.gmtime
+        if t < 0.0:
+            us = int(round(((-t) % 1.0) * 1000000))
+            if us > 0:
+                us = 1000000 - us
+                t -= 1.0
+        else:
+            us = int(round((t % 1.0) * 1000000))
+            if us == 1000000:
+                us = 0
+                t += 1.0
+        y, m, d, hh, mm, ss, weekday, jday, dst = converter(t)
+        ss = min(ss, 59)    # clamp out leap seconds if the platform has them
+        result = cls(y, m, d, hh, mm, ss, us, tz)
+        if tz is not None:
+            result = tz.fromutc(result)
+        return result
+
+    def datetime_utcfromtimestamp(cls, t):
+        import time
+        if 1 - (t % 1.0) < 0.0000005:
+            t = float(int(t)) + 1
+        if t < 0:
+            t -= 1
+        y, m, d, hh, mm, ss, weekday, jday, dst = time.gmtime(t)
+        us = int((t % 1.0) * 1000000)
+        ss = min(ss, 59)    # clamp out leap seconds if the platform has them
+        return cls(y, m, d, hh, mm, ss, us)
+
+    def datetime_now(cls, tz):
+        import time
+        return cls.fromtimestamp(time.time(), tz)
+
+    def datetime_utcnow(cls):
+        import time
+        return cls.utcfromtimestamp(time.time())
+
+    def datetime_strptime(cls, date_string, format):
+        from _strptime import _strptime
+        struct, micros = _strptime(date_string, format)
+        return cls(*(struct[0:6] + (micros,)))
+
+    def tzinfo_reduce(self):
+        getinitargs = getattr(self, "__getinitargs__", None)
+        if getinitargs:
+            args = getinitargs()
+        else:
+            args = ()
+        getstate = getattr(self, "__getstate__", None)
+        if getstate:
+            state = getstate()
+        else:
+            state = getattr(self, "__dict__", None) or None
+        if state is None:
+            return (self.__class__, args)
+        else:
+            return (self.__class__, args, state)
+''', filename=__file__)
+
+normalize_timedelta = app.interphook('normalize_timedelta')
+build_struct_time = app.interphook('build_struct_time')
+wrap_strftime = app.interphook('wrap_strftime')
+date_fromtimestamp = app.interphook('date_fromtimestamp')
+date_today = app.interphook('date_today')
+datetime_fromtimestamp = app.interphook('datetime_fromtimestamp')
+datetime_utcfromtimestamp = app.interphook('datetime_utcfromtimestamp')
+datetime_now = app.interphook('datetime_now')
+datetime_utcnow = app.interphook('datetime_utcnow')
+datetime_strptime = app.interphook('datetime_strptime')
+tzinfo_reduce = app.interphook('tzinfo_reduce')
+
+def timetuple(space, year, month, day, hour, minute, second, dstflag):
+    wday = (ymd_to_ord(year, month, day) + 6) % 7
+    dnum = days_before_month(year, month) + day
+    w_tuple = space.newtuple([space.wrap(year), space.wrap(month),
+                              space.wrap(day), space.wrap(hour),
+                              space.wrap(minute), space.wrap(second),
+                              space.wrap(wday), space.wrap(dnum),
+                              space.wrap(dstflag)])
+    return build_struct_time(space, w_tuple)
+
+def descr_format(space, w_self, w_format):
+    if not (space.isinstance_w(w_format, space.w_str) or
+            space.isinstance_w(w_format, space.w_unicode)):
+        raise operationerrfmt(space.w_ValueError,
+                              "__format__ expects str or unicode, not %s",
+                              space.type(w_format).getname(space))
+    if not space.is_true(w_format):
+        return space.str(w_self)
+    return space.call_method(w_self, 'strftime', w_format)
+
+# ____________________________________________________________
+
+class W_TimeDelta(Wrappable):
+    """Difference between two datetime values."""
+    _immutable_fields_ = ['days', 'seconds', 'microseconds']
+
+    def __init__(self, days, seconds, microseconds):
+        # normalized: 0 <= seconds < 24*3600 and 0 <= microseconds < 10**6
+        self.days = days
+        self.seconds = seconds
+        self.microseconds = microseconds
+
+    def to_microseconds(self, space):
+        w_seconds = space.add(space.mul(space.wrap(self.days),
+                                        space.wrap(24 * 3600)),
+                              space.wrap(self.seconds))
+        return space.add(space.mul(w_seconds, space.wrap(1000000)),
+                         space.wrap(self.microseconds))
+
+    def _compare(self, other):
+        c = compare_ints(self.days, other.days)
+        if c == 0:
+            c = compare_ints(self.seconds, other.seconds)
+            if c == 0:
+                c = compare_ints(self.microseconds, other.microseconds)
+        return c
+
+    @specialize.arg(3)
+    def _richcompare(self, space, w_other, op):
+        other = space.interpclass_w(w_other)
+        if isinstance(other, W_TimeDelta):
+            return compare_result(space, self._compare(other), op)
+        return compare_other(space, self, w_other, op)
+
+    def descr_eq(self, space, w_other):
+        return self._richcompare(space, w_other, 'eq')
+
+    def descr_ne(self, space, w_other):
+        return self._richcompare(space, w_other, 'ne')
+
+    def descr_lt(self, space, w_other):
+        return self._richcompare(space, w_other, 'lt')
+
+    def descr_le(self, space, w_other):
+        return self._richcompare(space, w_other, 'le')
+
+    def descr_gt(self, space, w_other):
+        return self._richcompare(space, w_other, 'gt')
+
+    def descr_ge(self, space, w_other):
+        return self._richcompare(space, w_other, 'ge')
+
+    def descr_hash(self, space):
+        return space.wrap(hash_ints([self.days, self.seconds,
+                                     self.microseconds]))
+
+    def descr_nonzero(self, space):
+        return space.newbool(self.days != 0 or self.seconds != 0 or
+                             self.microseconds != 0)
+
+    def descr_repr(self, space):
+        name = space.type(self).getname(space)
+        if self.microseconds:
+            return space.wrap("datetime.%s(%d, %d, %d)" % (
+                name, self.days, self.seconds, self.microseconds))
+        if self.seconds:
+            return space.wrap("datetime.%s(%d, %d)" % (
+                name, self.days, self.seconds))
+        return space.wrap("datetime.%s(%d)" % (name, self.days))
+
+    def descr_str(self, space):
+        builder = StringBuilder()
+        if self.days:
+            builder.append(str(self.days))
+            if self.days == 1 or self.days == -1:
+                builder.append(' day, ')
+            else:
+                builder.append(' days, ')
+        builder.append(str(self.seconds // 3600))
+        builder.append(':')
+        append_int(builder, self.seconds // 60 % 60, 2)
+        builder.append(':')
+        append_int(builder, self.seconds % 60, 2)
+        if self.microseconds:
+            builder.append('.')
+            append_int(builder, self.microseconds, 6)
+        return space.wrap(builder.build())
+
+    def descr_total_seconds(self, space):
+        return space.truediv(self.to_microseconds(space), space.wrap(1e6))
+
+    def descr_add(self, space, w_other):
+        other = space.interpclass_w(w_other)
+        if not isinstance(other, W_TimeDelta):
+            return space.w_NotImplemented
+        return space.wrap(make_timedelta(
+            space, self.days + other.days, self.seconds + other.seconds,
+            self.microseconds + other.microseconds))
+
+    def descr_sub(self, space, w_other):
+        other = space.interpclass_w(w_other)
+        if not isinstance(other, W_TimeDelta):
+            return space.w_NotImplemented
+        return space.wrap(make_timedelta(
+            space, self.days - other.days, self.seconds - other.seconds,
+            self.microseconds - other.microseconds))
+
+    def descr_rsub(self, space, w_other):
+        other = space.interpclass_w(w_other)
+        if not isinstance(other, W_TimeDelta):
+            return space.w_NotImplemented
+        return space.wrap(make_timedelta(
+            space, other.days - self.days, other.seconds - self.seconds,
+            other.microseconds - self.microseconds))
+
+    def descr_neg(self, space):
+        return space.wrap(make_timedelta(space, -self.days, -self.seconds,
+                                         -self.microseconds))
+
+    def descr_pos(self, space):
+        return space.wrap(self)
+
+    def descr_abs(self, space):
+        if self.days < 0:
+            return self.descr_neg(space)
+        return space.wrap(self)
+
+    def descr_mul(self, space, w_other):
+        if space.isinstance_w(w_other, space.w_int):
+            n = space.int_w(w_other)
+            try:
+                d, s, us = normalize_ovf(ovfcheck(self.days * n),
+                                         ovfcheck(self.seconds * n),
+                                         ovfcheck(self.microseconds * n))
+            except OverflowError:
+                pass
+            else:
+                return space.wrap(make_timedelta(space, d, s, us))
+        elif not space.isinstance_w(w_other, space.w_long):
+            return space.w_NotImplemented
+        # the general case, with longs
+        w_timedelta = space.gettypeobject(W_TimeDelta.typedef)
+        return space.call_function(w_timedelta,
+            space.mul(space.wrap(self.days), w_other),
+            space.mul(space.wrap(self.seconds), w_other),
+            space.mul(space.wrap(self.microseconds), w_other))
+
+    def descr_div(self, space, w_other):
+        if not (space.isinstance_w(w_other, space.w_int) or
+                space.isinstance_w(w_other, space.w_long)):
+            return space.w_NotImplemented
+        w_microseconds = space.floordiv(self.to_microseconds(space), w_other)
+        w_timedelta = space.gettypeobject(W_TimeDelta.typedef)
+        return space.call_function(w_timedelta, space.wrap(0), space.wrap(0),
+                                   w_microseconds)
+
+    def descr_reduce(self, space):
+        return space.newtuple([space.type(self), space.newtuple([
+            space.wrap(self.days), space.wrap(self.seconds),
+            space.wrap(self.microseconds)])])
+
+
+def normalize_ovf(d, s, us):
+    """Carries the microseconds and the seconds over.  May raise an
+    interp-level OverflowError."""
+    s = ovfcheck(s + us // 1000000)
+    us = us % 1000000
+    d = ovfcheck(d + s // (24 * 3600))
+    s = s % (24 * 3600)
+    return d, s, us
+
+def normalize(d, s, us):
+    # the same without the overflow checks, for values that are known
+    # to be small enough
+    s += us // 1000000
+    us = us % 1000000
+    d += s // (24 * 3600)
+    s = s % (24 * 3600)
+    return d, s, us
+
+def make_timedelta(space, d, s, us):
+    d, s, us = normalize(d, s, us)
+    if not -MAX_DELTA_DAYS <= d <= MAX_DELTA_DAYS:
+        raise operationerrfmt(space.w_OverflowError,
+                              "days=%d; must have magnitude <= %d",
+                              d, MAX_DELTA_DAYS)
+    return W_TimeDelta(d, s, us)
+
+class SlowPath(Exception):
+    pass
+
+def exact_int_w(space, w_value):
+    if w_value is None:
+        return 0
+    if not space.is_w(space.type(w_value), space.w_int):
+        raise SlowPath
+    return space.int_w(w_value)
+
+def zero_if_none(space, w_value):
+    if w_value is None:
+        return space.wrap(0)
+    return w_value
+
+def descr_new_timedelta(space, w_subtype, w_days=NoneNotWrapped,
+                        w_seconds=NoneNotWrapped,
+                        w_microseconds=NoneNotWrapped,
+                        w_milliseconds=NoneNotWrapped,
+                        w_minutes=NoneNotWrapped, w_hours=NoneNotWrapped,
+                        w_weeks=NoneNotWrapped):
+    try:
+        # fast path: all the arguments are ints
+        days = exact_int_w(space, w_days)
+        seconds = exact_int_w(space, w_seconds)
+        microseconds = exact_int_w(space, w_microseconds)
+        milliseconds = exact_int_w(space, w_milliseconds)
+        minutes = exact_int_w(space, w_minutes)
+        hours = exact_int_w(space, w_hours)
+        weeks = exact_int_w(space, w_weeks)
+        d, s, us = normalize_ovf(
+            ovfcheck(days + ovfcheck(weeks * 7)),
+            ovfcheck(ovfcheck(seconds + ovfcheck(minutes * 60)) +
+                     ovfcheck(hours * 3600)),
+            ovfcheck(microseconds + ovfcheck(milliseconds * 1000)))
+    except (SlowPath, OverflowError):
+        w_result = normalize_timedelta(space,
+            zero_if_none(space, w_days), zero_if_none(space, w_seconds),
+            zero_if_none(space, w_microseconds),
+            zero_if_none(space, w_milliseconds),
+            zero_if_none(space, w_minutes), zero_if_none(space, w_hours),
+            zero_if_none(space, w_weeks))
+        w_d, w_s, w_us = space.fixedview(w_result, 3)
+        d = space.int_w(w_d)
+        s = space.int_w(w_s)
+        us = space.int_w(w_us)
+    delta = make_timedelta(space, d, s, us)
+    w_result = space.allocate_instance(W_TimeDelta, w_subtype)
+    W_TimeDelta.__init__(w_result, delta.days, delta.seconds,
+                         delta.microseconds)
+    return w_result
+
+W_TimeDelta.typedef = TypeDef(
+    'timedelta',
+    __module__ = 'datetime',
+    __doc__ = W_TimeDelta.__doc__,
+    __new__ = interp2app(descr_new_timedelta),
+    days = interp_attrproperty('days', W_TimeDelta,
+                               doc="Number of days."),
+    seconds = interp_attrproperty('seconds', W_TimeDelta,
+        doc="Number of seconds (>= 0 and less than 1 day)."),
+    microseconds = interp_attrproperty('microseconds', W_TimeDelta,
+        doc="Number of microseconds (>= 0 and less than 1 second)."),
+    total_seconds = interp2app(W_TimeDelta.descr_total_seconds),
+    __eq__ = interp2app(W_TimeDelta.descr_eq),
+    __ne__ = interp2app(W_TimeDelta.descr_ne),
+    __lt__ = interp2app(W_TimeDelta.descr_lt),
+    __le__ = interp2app(W_TimeDelta.descr_le),
+    __gt__ = interp2app(W_TimeDelta.descr_gt),
+    __ge__ = interp2app(W_TimeDelta.descr_ge),
+    __hash__ = interp2app(W_TimeDelta.descr_hash),
+    __nonzero__ = interp2app(W_TimeDelta.descr_nonzero),
+    __repr__ = interp2app(W_TimeDelta.descr_repr),
+    __str__ = interp2app(W_TimeDelta.descr_str),
+    __add__ = interp2app(W_TimeDelta.descr_add),
+    __radd__ = interp2app(W_TimeDelta.descr_add),
+    __sub__ = interp2app(W_TimeDelta.descr_sub),
+    __rsub__ = interp2app(W_TimeDelta.descr_rsub),
+    __neg__ = interp2app(W_TimeDelta.descr_neg),
+    __pos__ = interp2app(W_TimeDelta.descr_pos),
+    __abs__ = interp2app(W_TimeDelta.descr_abs),
+    __mul__ = interp2app(W_TimeDelta.descr_mul),
+    __rmul__ = interp2app(W_TimeDelta.descr_mul),
+    __div__ = interp2app(W_TimeDelta.descr_div),
+    __floordiv__ = interp2app(W_TimeDelta.descr_div),
+    __reduce__ = interp2app(W_TimeDelta.descr_reduce),
+    min = W_TimeDelta(-MAX_DELTA_DAYS, 0, 0),
+    max = W_TimeDelta(MAX_DELTA_DAYS, 24 * 3600 - 1, 999999),
+    resolution = W_TimeDelta(0, 0, 1),
+    )
+
+# ____________________________________________________________
+
+class W_Date(Wrappable):
+    """date(year, month, day) --> date object"""
+    _immutable_fields_ = ['year', 'month', 'day']
+
+    def __init__(self, year, month, day):
+        self.year = year
+        self.month = month
+        self.day = day
+
+    def toordinal(self):
+        return ymd_to_ord(self.year, self.month, self.day)
+
+    def _compare_date(self, other):
+        c = compare_ints(self.year, other.year)
+        if c == 0:
+            c = compare_ints(self.month, other.month)
+            if c == 0:
+                c = compare_ints(self.day, other.day)
+        return c
+
+    @specialize.arg(3)
+    def _richcompare(self, space, w_other, op):
+        other = space.interpclass_w(w_other)
+        if isinstance(other, W_Date):
+            return compare_result(space, self._compare_date(other), op)
+        if space.findattr(w_other, space.wrap('timetuple')) is not None:
+            return space.w_NotImplemented
+        return compare_other(space, self, w_other, op)
+
+    def descr_eq(self, space, w_other):
+        return self._richcompare(space, w_other, 'eq')
+
+    def descr_ne(self, space, w_other):
+        return self._richcompare(space, w_other, 'ne')
+
+    def descr_lt(self, space, w_other):
+        return self._richcompare(space, w_other, 'lt')
+
+    def descr_le(self, space, w_other):
+        return self._richcompare(space, w_other, 'le')
+
+    def descr_gt(self, space, w_other):
+        return self._richcompare(space, w_other, 'gt')
+
+    def descr_ge(self, space, w_other):
+        return self._richcompare(space, w_other, 'ge')
+
+    def descr_hash(self, space):
+        return space.wrap(hash_ints([self.year, self.month, self.day]))
+
+    def descr_repr(self, space):
+        return space.wrap("datetime.%s(%d, %d, %d)" % (
+            space.type(self).getname(space), self.year, self.month, self.day))
+
+    def append_date(self, builder):
+        append_int(builder, self.year, 4)
+        builder.append('-')
+        append_int(builder, self.month, 2)
+        builder.append('-')
+        append_int(builder, self.day, 2)
+
+    def descr_isoformat(self, space):
+        builder = StringBuilder(10)
+        self.append_date(builder)
+        return space.wrap(builder.build())
+
+    def descr_ctime(self, space):
+        return space.wrap(format_ctime(self.year, self.month, self.day,
+                                       0, 0, 0))
+
+    def descr_strftime(self, space, w_format):
+        w_timetuple = space.call_method(self, 'timetuple')
+        return wrap_strftime(space, self, w_format, w_timetuple)
+
+    def descr_timetuple(self, space):
+        return timetuple(space, self.year, self.month, self.day, 0, 0, 0, -1)
+
+    def descr_toordinal(self, space):
+        return space.wrap(self.toordinal())
+
+    def descr_weekday(self, space):
+        return space.wrap((self.toordinal() + 6) % 7)
+
+    def descr_isoweekday(self, space):
+        return space.wrap(self.toordinal() % 7 or 7)
+
+    def descr_isocalendar(self, space):
+        year = self.year
+        week1monday = isoweek1monday(year)
+        today = self.toordinal()
+        # internally, week and day have origin 0
+        week = (today - week1monday) // 7
+        day = (today - week1monday) % 7
+        if week < 0:
+            year -= 1
+            week1monday = isoweek1monday(year)
+            week = (today - week1monday) // 7
+            day = (today - week1monday) % 7
+        elif week >= 52:
+            if today >= isoweek1monday(year + 1):
+                year += 1
+                week = 0
+        return space.newtuple([space.wrap(year), space.wrap(week + 1),
+                               space.wrap(day + 1)])
+
+    def descr_replace(self, space, w_year=None, w_month=None, w_day=None):
+        year = int_or_default(space, w_year, self.year)
+        month = int_or_default(space, w_month, self.month)
+        day = int_or_default(space, w_day, self.day)
+        check_date_fields(space, year, month, day)
+        return space.wrap(W_Date(year, month, day))
+
+    def descr_add(self, space, w_other):
+        other = space.interpclass_w(w_other)
+        if not isinstance(other, W_TimeDelta):
+            return space.w_NotImplemented
+        return space.wrap(date_from_ordinal(space,
+                                            self.toordinal() + other.days))
+
+    def descr_sub(self, space, w_other):
+        other = space.interpclass_w(w_other)
+        if isinstance(other, W_TimeDelta):
+            return space.wrap(date_from_ordinal(space,
+                                                self.toordinal() - other.days))
+        if isinstance(other, W_Date):
+            return space.wrap(make_timedelta(
+                space, self.toordinal() - other.toordinal(), 0, 0))
+        return space.w_NotImplemented
+
+    def getstate(self):
+        builder = StringBuilder(4)
+        builder.append(chr(self.year // 256))
+        builder.append(chr(self.year % 256))
+        builder.append(chr(self.month))
+        builder.append(chr(self.day))
+        return builder.build()
+
+    def descr_reduce(self, space):
+        return space.newtuple([space.type(self), space.newtuple([
+            space.wrap(self.getstate())])])
+
+
+def date_from_ordinal(space, ordinal):
+    if not 1 <= ordinal <= MAXORDINAL:
+        raise OperationError(space.w_OverflowError,
+                             space.wrap("date value out of range"))
+    year, month, day = ord_to_ymd(ordinal)
+    return W_Date(year, month, day)
+
+def is_state(space, w_state, length):
+    # the single argument given by unpickling to __new__()
+    if not space.is_w(space.type(w_state), space.w_str):
+        return False
+    state = space.str_w(w_state)
+    return len(state) == length and 1 <= ord(state[2]) <= 12
+
+def descr_new_date(space, w_subtype, w_year, w_month=NoneNotWrapped,
+                   w_day=NoneNotWrapped):
+    if w_month is None and w_day is None and is_state(space, w_year, 4):
+        state = space.str_w(w_year)
+        year = ord(state[0]) * 256 + ord(state[1])
+        month = ord(state[2])
+        day = ord(state[3])
+    else:
+        if w_month is None or w_day is None:
+            raise OperationError(space.w_TypeError, space.wrap(
+                "date() takes exactly 3 arguments"))
+        year = space.int_w(w_year)
+        month = space.int_w(w_month)
+        day = space.int_w(w_day)
+        check_date_fields(space, year, month, day)
+    w_result = space.allocate_instance(W_Date, w_subtype)
+    W_Date.__init__(w_result, year, month, day)
+    return w_result
+
+def descr_fromtimestamp_date(space, w_type, w_timestamp):
+    """timestamp -> local date from a POSIX timestamp (like time.time())."""
+    return date_fromtimestamp(space, w_type, w_timestamp)
+
+def descr_today(space, w_type):
+    """Current date or datetime:  same as self.__class__.fromtimestamp(time.time())."""
+    return date_today(space, w_type)
+
+@unwrap_spec(ordinal=int)
+def descr_fromordinal(space, w_type, ordinal):
+    """int -> date corresponding to a proleptic Gregorian ordinal."""
+    if ordinal < 1:
+        raise OperationError(space.w_ValueError,
+                             space.wrap("ordinal must be >= 1"))
+    if ordinal > MAXORDINAL:
+        raise OperationError(space.w_ValueError,
+                             space.wrap("year is out of range"))
+    date = date_from_ordinal(space, ordinal)
+    if space.is_w(w_type, space.gettypeobject(W_Date.typedef)):
+        return space.wrap(date)
+    return space.call_function(w_type, space.wrap(date.year),
+                               space.wrap(date.month), space.wrap(date.day))
+
+W_Date.typedef = TypeDef(
+    'date',
+    __module__ = 'datetime',
+    __doc__ = W_Date.__doc__,
+    __new__ = interp2app(descr_new_date),
+    year = interp_attrproperty('year', W_Date),
+    month = interp_attrproperty('month', W_Date),
+    day = interp_attrproperty('day', W_Date),
+    fromtimestamp = interp2app(descr_fromtimestamp_date, as_classmethod=True),
+    today = interp2app(descr_today, as_classmethod=True),
+    fromordinal = interp2app(descr_fromordinal, as_classmethod=True),
+    ctime = interp2app(W_Date.descr_ctime),
+    strftime = interp2app(W_Date.descr_strftime),
+    __format__ = interp2app(descr_format),
+    timetuple = interp2app(W_Date.descr_timetuple),
+    isocalendar = interp2app(W_Date.descr_isocalendar),
+    isoformat = interp2app(W_Date.descr_isoformat),
+    isoweekday = interp2app(W_Date.descr_isoweekday),
+    toordinal = interp2app(W_Date.descr_toordinal),
+    weekday = interp2app(W_Date.descr_weekday),
+    replace = interp2app(W_Date.descr_replace),
+    __eq__ = interp2app(W_Date.descr_eq),
+    __ne__ = interp2app(W_Date.descr_ne),
+    __lt__ = interp2app(W_Date.descr_lt),
+    __le__ = interp2app(W_Date.descr_le),
+    __gt__ = interp2app(W_Date.descr_gt),
+    __ge__ = interp2app(W_Date.descr_ge),
+    __hash__ = interp2app(W_Date.descr_hash),
+    __repr__ = interp2app(W_Date.descr_repr),
+    __str__ = interp2app(W_Date.descr_isoformat),
+    __add__ = interp2app(W_Date.descr_add),
+    __radd__ = interp2app(W_Date.descr_add),
+    __sub__ = interp2app(W_Date.descr_sub),
+    __reduce__ = interp2app(W_Date.descr_reduce),
+    min = W_Date(1, 1, 1),
+    max = W_Date(MAXYEAR, 12, 31),
+    resolution = W_TimeDelta(1, 0, 0),
+    )
+
+# ____________________________________________________________
+
+class W_TZInfo(Wrappable):
+    """Abstract base class for time zone info objects."""
+
+    def descr_tzname(self, space, w_dt):
+        """datetime -> string name of time zone."""
+        raise OperationError(space.w_NotImplementedError, space.wrap(
+            "a tzinfo subclass must implement tzname()"))
+
+    def descr_utcoffset(self, space, w_dt):
+        """datetime -> minutes east of UTC (negative for west of UTC)."""
+        raise OperationError(space.w_NotImplementedError, space.wrap(
+            "a tzinfo subclass must implement utcoffset()"))
+
+    def descr_dst(self, space, w_dt):
+        """datetime -> DST offset in minutes east of UTC."""
+        raise OperationError(space.w_NotImplementedError, space.wrap(
+            "a tzinfo subclass must implement dst()"))
+
+    def descr_fromutc(self, space, w_dt):
+        """datetime in UTC -> datetime in local time."""
+        dt = space.interpclass_w(w_dt)
+        if not isinstance(dt, W_DateTime):
+            raise OperationError(space.w_TypeError, space.wrap(
+                "fromutc: argument must be a datetime"))
+        if dt.w_tzinfo is None or not space.is_w(dt.w_tzinfo, self):
+            raise OperationError(space.w_ValueError, space.wrap(
+                "fromutc: dt.tzinfo is not self"))
+        # see the explanation at the end of lib_pypy/datetime.py
+        dtoff = call_offset(space, self, 'utcoffset', w_dt)
+        if dtoff == NO_OFFSET:
+            raise OperationError(space.w_ValueError, space.wrap(
+                "fromutc: non-None utcoffset() result required"))
+        dtdst = call_offset(space, self, 'dst', w_dt)
+        if dtdst == NO_OFFSET:
+            raise OperationError(space.w_ValueError, space.wrap(
+                "fromutc: non-None dst() result required"))
+        delta = dtoff - dtdst
+        if delta:
+            dt = dt.add_delta(space, 0, delta * 60, 0)
+            dtdst = call_offset(space, self, 'dst', dt)
+            if dtdst == NO_OFFSET:
+                raise OperationError(space.w_ValueError, space.wrap(
+                    "fromutc: tz.dst() gave inconsistent results; "
+                    "cannot convert"))
+        if dtdst:
+            dt = dt.add_delta(space, 0, dtdst * 60, 0)
+        return space.wrap(dt)
+
+    def descr_reduce(self, space):
+        return tzinfo_reduce(space, self)
+
+
+def descr_new_tzinfo(space, w_subtype, __args__):
+    return space.allocate_instance(W_TZInfo, w_subtype)
+
+W_TZInfo.typedef = TypeDef(
+    'tzinfo',
+    __module__ = 'datetime',
+    __doc__ = W_TZInfo.__doc__,
+    __new__ = interp2app(descr_new_tzinfo),
+    tzname = interp2app(W_TZInfo.descr_tzname),
+    utcoffset = interp2app(W_TZInfo.descr_utcoffset),
+    dst = interp2app(W_TZInfo.descr_dst),
+    fromutc = interp2app(W_TZInfo.descr_fromutc),
+    __reduce__ = interp2app(W_TZInfo.descr_reduce),
+    )
+
+# ____________________________________________________________
+
+class W_Time(Wrappable):
+    """time([hour[, minute[, second[, microsecond[, tzinfo]]]]]) --> a time object
+
+All arguments are optional. tzinfo may be None, or an instance of
+a tzinfo subclass. The remaining arguments may be ints or longs."""
+    _immutable_fields_ = ['hour', 'minute', 'second', 'microsecond',
+                          'w_tzinfo']
+
+    def __init__(self, hour, minute, second, microsecond, w_tzinfo):
+        self.hour = hour
+        self.minute = minute
+        self.second = second
+        self.microsecond = microsecond
+        self.w_tzinfo = w_tzinfo
+
+    def utcoffset(self, space):
+        return call_offset(space, self.w_tzinfo, 'utcoffset', space.w_None)
+
+    def _compare(self, space, other):
+        if self.w_tzinfo is other.w_tzinfo:
+            myoff = otoff = 0
+        else:
+            myoff = self.utcoffset(space)
+            otoff = other.utcoffset(space)
+            if myoff != otoff and (myoff == NO_OFFSET or otoff == NO_OFFSET):
+                raise OperationError(space.w_TypeError, space.wrap(
+                    "can't compare offset-naive and offset-aware times"))
+        c = compare_ints(self.hour * 60 + self.minute - myoff,
+                         other.hour * 60 + other.minute - otoff)
+        if c == 0:
+            c = compare_ints(self.second, other.second)
+            if c == 0:
+                c = compare_ints(self.microsecond, other.microsecond)
+        return c
+
+    @specialize.arg(3)
+    def _richcompare(self, space, w_other, op):
+        other = space.interpclass_w(w_other)
+        if isinstance(other, W_Time):
+            return compare_result(space, self._compare(space, other), op)
+        return compare_other(space, self, w_other, op)
+
+    def descr_eq(self, space, w_other):
+        return self._richcompare(space, w_other, 'eq')
+
+    def descr_ne(self, space, w_other):
+        return self._richcompare(space, w_other, 'ne')
+
+    def descr_lt(self, space, w_other):
+        return self._richcompare(space, w_other, 'lt')
+
+    def descr_le(self, space, w_other):
+        return self._richcompare(space, w_other, 'le')
+
+    def descr_gt(self, space, w_other):
+        return self._richcompare(space, w_other, 'gt')
+
+    def descr_ge(self, space, w_other):
+        return self._richcompare(space, w_other, 'ge')
+
+    def descr_hash(self, space):
+        offset = self.utcoffset(space)
+        if offset == NO_OFFSET:
+            offset = 0
+        minutes = self.hour * 60 + self.minute - offset
+        return space.wrap(hash_ints([minutes // 60, minutes % 60,
+                                     self.second, self.microsecond]))
+
+    def descr_nonzero(self, space):
+        if self.second or self.microsecond:
+            return space.w_True
+        offset = self.utcoffset(space)
+        if offset == NO_OFFSET:
+            offset = 0
+        return space.newbool(self.hour * 60 + self.minute - offset != 0)
+
+    def descr_repr(self, space):
+        builder = StringBuilder()
+        builder.append('datetime.')
+        builder.append(space.type(self).getname(space))
+        builder.append('(%d, %d' % (self.hour, self.minute))
+        if self.microsecond:
+            builder.append(', %d, %d' % (self.second, self.microsecond))
+        elif self.second:
+            builder.append(', %d' % (self.second,))
+        repr_tail(space, builder, self.w_tzinfo)
+        return space.wrap(builder.build())
+
+    def descr_isoformat(self, space):
+        builder = StringBuilder(21)
+        append_time(builder, self.hour, self.minute, self.second,
+                    self.microsecond)
+        append_offset(builder, self.utcoffset(space))
+        return space.wrap(builder.build())
+
+    def descr_strftime(self, space, w_format):
+        # the year must be >= 1900 for the underlying strftime()
+        w_timetuple = space.newtuple([
+            space.wrap(1900), space.wrap(1), space.wrap(1),
+            space.wrap(self.hour), space.wrap(self.minute),
+            space.wrap(self.second), space.wrap(0), space.wrap(1),
+            space.wrap(-1)])
+        return wrap_strftime(space, self, w_format, w_timetuple)
+
+    def descr_utcoffset(self, space):
+        return wrap_offset(space, self.utcoffset(space))
+
+    def descr_dst(self, space):
+        return wrap_offset(space,
+                           call_offset(space, self.w_tzinfo, 'dst',
+                                       space.w_None))
+
+    def descr_tzname(self, space):
+        return call_tzname(space, self.w_tzinfo, space.w_None)
+
+    def descr_replace(self, space, w_hour=None, w_minute=None,
+                      w_second=None, w_microsecond=None,
+                      w_tzinfo=NoneNotWrapped):
+        hour = int_or_default(space, w_hour, self.hour)
+        minute = int_or_default(space, w_minute, self.minute)
+        second = int_or_default(space, w_second, self.second)
+        microsecond = int_or_default(space, w_microsecond, self.microsecond)
+        if w_tzinfo is None:
+            w_tzinfo = self.w_tzinfo
+        else:
+            w_tzinfo = check_tzinfo(space, w_tzinfo)
+        check_time_fields(space, hour, minute, second, microsecond)
+        return space.wrap(W_Time(hour, minute, second, microsecond,
+                                 w_tzinfo))
+
+    def getstate(self):
+        builder = StringBuilder(6)
+        builder.append(chr(self.hour))
+        builder.append(chr(self.minute))
+        builder.append(chr(self.second))
+        builder.append(chr(self.microsecond >> 16))
+        builder.append(chr((self.microsecond >> 8) & 0xff))
+        builder.append(chr(self.microsecond & 0xff))
+        return builder.build()
+
+    def descr_reduce(self, space):
+        w_state = space.wrap(self.getstate())
+        if self.w_tzinfo is None:
+            w_args = space.newtuple([w_state])
+        else:
+            w_args = space.newtuple([w_state, self.w_tzinfo])
+        return space.newtuple([space.type(self), w_args])
+
+
+def descr_new_time(space, w_subtype, w_hour=NoneNotWrapped,
+                   w_minute=NoneNotWrapped, w_second=NoneNotWrapped,
+                   w_microsecond=NoneNotWrapped, w_tzinfo=NoneNotWrapped):
+    if (w_hour is not None and w_second is None and w_microsecond is None
+            and w_tzinfo is None and
+            space.is_w(space.type(w_hour), space.w_str) and
+            len(space.str_w(w_hour)) == 6 and
+            ord(space.str_w(w_hour)[0]) < 24):
+        # unpickling: the state, and the tzinfo as second argument
+        state = space.str_w(w_hour)
+        hour = ord(state[0])
+        minute = ord(state[1])
+        second = ord(state[2])
+        microsecond = ((ord(state[3]) << 16) | (ord(state[4]) << 8) |
+                       ord(state[5]))
+        w_tzinfo = check_tzinfo(space, w_minute)
+    else:
+        hour = int_or_default(space, w_hour, 0)
+        minute = int_or_default(space, w_minute, 0)
+        second = int_or_default(space, w_second, 0)
+        microsecond = int_or_default(space, w_microsecond, 0)
+        check_time_fields(space, hour, minute, second, microsecond)
+        w_tzinfo = check_tzinfo(space, w_tzinfo)
+    w_result = space.allocate_instance(W_Time, w_subtype)
+    W_Time.__init__(w_result, hour, minute, second, microsecond, w_tzinfo)
+    return w_result
+
+W_Time.typedef = TypeDef(
+    'time',
+    __module__ = 'datetime',
+    __doc__ = W_Time.__doc__,
+    __new__ = interp2app(descr_new_time),
+    hour = interp_attrproperty('hour', W_Time),
+    minute = interp_attrproperty('minute', W_Time),
+    second = interp_attrproperty('second', W_Time),
+    microsecond = interp_attrproperty('microsecond', W_Time),
+    tzinfo = interp_attrproperty_w('w_tzinfo', W_Time),
+    isoformat = interp2app(W_Time.descr_isoformat),
+    strftime = interp2app(W_Time.descr_strftime),
+    __format__ = interp2app(descr_format),
+    utcoffset = interp2app(W_Time.descr_utcoffset),
+    tzname = interp2app(W_Time.descr_tzname),
+    dst = interp2app(W_Time.descr_dst),
+    replace = interp2app(W_Time.descr_replace),
+    __eq__ = interp2app(W_Time.descr_eq),
+    __ne__ = interp2app(W_Time.descr_ne),
+    __lt__ = interp2app(W_Time.descr_lt),
+    __le__ = interp2app(W_Time.descr_le),
+    __gt__ = interp2app(W_Time.descr_gt),
+    __ge__ = interp2app(W_Time.descr_ge),
+    __hash__ = interp2app(W_Time.descr_hash),
+    __nonzero__ = interp2app(W_Time.descr_nonzero),
+    __repr__ = interp2app(W_Time.descr_repr),
+    __str__ = interp2app(W_Time.descr_isoformat),
+    __reduce__ = interp2app(W_Time.descr_reduce),
+    min = W_Time(0, 0, 0, 0, None),
+    max = W_Time(23, 59, 59, 999999, None),
+    resolution = W_TimeDelta(0, 0, 1),
+    )
+
+# ____________________________________________________________
+
+class W_DateTime(W_Date):
+    """datetime(year, month, day[, hour[, minute[, second[, microsecond[,tzinfo]]]]])
+
+The year, month and day arguments are required. tzinfo may be None, or an
+instance of a tzinfo subclass. The remaining arguments may be ints or longs."""
+    _immutable_fields_ = ['hour', 'minute', 'second', 'microsecond',
+                          'w_tzinfo']
+
+    def __init__(self, year, month, day, hour, minute, second, microsecond,
+                 w_tzinfo):
+        W_Date.__init__(self, year, month, day)
+        self.hour = hour
+        self.minute = minute
+        self.second = second
+        self.microsecond = microsecond
+        self.w_tzinfo = w_tzinfo
+
+    def seconds_of_day(self):
+        return self.hour * 3600 + self.minute * 60 + self.second
+
+    def utcoffset(self, space):
+        return call_offset(space, self.w_tzinfo, 'utcoffset', self)
+
+    def dst(self, space):
+        return call_offset(space, self.w_tzinfo, 'dst', self)
+
+    def add_delta(self, space, days, seconds, microseconds):
+        """Returns self + timedelta(days, seconds, microseconds), with the
+        same tzinfo."""
+        return self.add_delta_tz(space, days, seconds, microseconds,
+                                 self.w_tzinfo)
+
+    def add_delta_tz(self, space, days, seconds, microseconds, w_tzinfo):
+        microseconds += self.microsecond
+        seconds += self.seconds_of_day() + microseconds // 1000000
+        microseconds = microseconds % 1000000
+        days += self.toordinal() + seconds // (24 * 3600)
+        seconds = seconds % (24 * 3600)
+        date = date_from_ordinal(space, days)
+        return W_DateTime(date.year, date.month, date.day,
+                          seconds // 3600, seconds // 60 % 60, seconds % 60,
+                          microseconds, w_tzinfo)
+
+    def difference(self, space, other):
+        """Returns self - other, as (days, seconds, microseconds)."""
+        days = self.toordinal() - other.toordinal()
+        seconds = self.seconds_of_day() - other.seconds_of_day()
+        microseconds = self.microsecond - other.microsecond
+        if self.w_tzinfo is not other.w_tzinfo:
+            myoff = self.utcoffset(space)
+            otoff = other.utcoffset(space)
+            if myoff != otoff:
+                if myoff == NO_OFFSET or otoff == NO_OFFSET:
+                    raise OperationError(space.w_TypeError, space.wrap(
+                        "can't subtract offset-naive and offset-aware "
+                        "datetimes"))
+                seconds += (otoff - myoff) * 60
+        return days, seconds, microseconds
+
+    def _compare(self, space, other):
+        if self.w_tzinfo is not other.w_tzinfo:
+            myoff = self.utcoffset(space)
+            otoff = other.utcoffset(space)
+            if myoff != otoff:
+                if myoff == NO_OFFSET or otoff == NO_OFFSET:
+                    raise OperationError(space.w_TypeError, space.wrap(
+                        "can't compare offset-naive and offset-aware "
+                        "datetimes"))
+                days, seconds, microseconds = self.difference(space, other)
+                d, s, us = normalize(days, seconds, microseconds)
+                if d < 0:
+                    return -1
+                return int(d != 0 or s != 0 or us != 0)
+        c = self._compare_date(other)
+        if c == 0:
+            c = compare_ints(self.seconds_of_day(), other.seconds_of_day())
+            if c == 0:
+                c = compare_ints(self.microsecond, other.microsecond)
+        return c
+
+    @specialize.arg(3)
+    def _richcompare(self, space, w_other, op):
+        other = space.interpclass_w(w_other)
+        if isinstance(other, W_DateTime):
+            return compare_result(space, self._compare(space, other), op)
+        if (not isinstance(other, W_Date) and
+                space.findattr(w_other, space.wrap('timetuple')) is not None):
+            return space.w_NotImplemented
+        return compare_other(space, self, w_other, op)
+
+    def descr_eq(self, space, w_other):
+        return self._richcompare(space, w_other, 'eq')
+
+    def descr_ne(self, space, w_other):
+        return self._richcompare(space, w_other, 'ne')
+
+    def descr_lt(self, space, w_other):
+        return self._richcompare(space, w_other, 'lt')
+
+    def descr_le(self, space, w_other):
+        return self._richcompare(space, w_other, 'le')
+
+    def descr_gt(self, space, w_other):
+        return self._richcompare(space, w_other, 'gt')
+
+    def descr_ge(self, space, w_other):
+        return self._richcompare(space, w_other, 'ge')
+
+    def descr_hash(self, space):
+        offset = self.utcoffset(space)
+        if offset == NO_OFFSET:
+            return space.wrap(hash_ints([self.year, self.month, self.day,
+                                         self.hour, self.minute, self.second,
+                                         self.microsecond]))
+        # aware datetimes that are equal have the same UTC time
+        d, s, us = normalize(self.toordinal(),
+                                 self.seconds_of_day() - offset * 60,
+                                 self.microsecond)
+        return space.wrap(hash_ints([d, s, us]))
+
+    def descr_repr(self, space):
+        builder = StringBuilder()
+        builder.append('datetime.')
+        builder.append(space.type(self).getname(space))
+        builder.append('(%d, %d, %d, %d, %d' % (self.year, self.month,
+                                                 self.day, self.hour,
+                                                 self.minute))
+        if self.microsecond:
+            builder.append(', %d, %d' % (self.second, self.microsecond))
+        elif self.second:
+            builder.append(', %d' % (self.second,))
+        repr_tail(space, builder, self.w_tzinfo)
+        return space.wrap(builder.build())
+
+    def isoformat(self, space, sep):
+        builder = StringBuilder(32)
+        self.append_date(builder)
+        builder.append(sep)
+        append_time(builder, self.hour, self.minute, self.second,
+                    self.microsecond)
+        append_offset(builder, self.utcoffset(space))
+        return space.wrap(builder.build())
+
+    @unwrap_spec(sep=str)
+    def descr_isoformat(self, space, sep='T'):
+        """[sep] -> string in ISO 8601 format, YYYY-MM-DDTHH:MM:SS[.mmmmmm][+HH:MM].
+
+sep is used to separate the year from the time, and defaults to 'T'."""
+        if len(sep) != 1:
+            raise OperationError(space.w_TypeError, space.wrap(
+                "isoformat() argument 1 must be char"))
+        return self.isoformat(space, sep)
+
+    def descr_str(self, space):
+        return self.isoformat(space, ' ')
+
+    def descr_ctime(self, space):
+        return space.wrap(format_ctime(self.year, self.month, self.day,
+                                       self.hour, self.minute, self.second))
+
+    def descr_timetuple(self, space):
+        dst = self.dst(space)
+        if dst == NO_OFFSET:
+            dstflag = -1
+        elif dst:
+            dstflag = 1
+        else:
+            dstflag = 0
+        return timetuple(space, self.year, self.month, self.day, self.hour,
+                         self.minute, self.second, dstflag)
+
+    def descr_utctimetuple(self, space):
+        offset = self.utcoffset(space)
+        if offset == NO_OFFSET or offset == 0:
+            return timetuple(space, self.year, self.month, self.day,
+                             self.hour, self.minute, self.second, 0)
+        # the result may be one day outside the range of a datetime
+        minutes = self.hour * 60 + self.minute - offset
+        year, month, day = ord_to_ymd(self.toordinal() + minutes // 1440)
+        minutes = minutes % 1440
+        return timetuple(space, year, month, day, minutes // 60,
+                         minutes % 60, self.second, 0)
+
+    def descr_date(self, space):
+        return space.wrap(W_Date(self.year, self.month, self.day))
+
+    def descr_time(self, space):
+        return space.wrap(W_Time(self.hour, self.minute, self.second,
+                                 self.microsecond, None))
+
+    def descr_timetz(self, space):
+        return space.wrap(W_Time(self.hour, self.minute, self.second,
+                                 self.microsecond, self.w_tzinfo))
+
+    def descr_utcoffset(self, space):
+        return wrap_offset(space, self.utcoffset(space))
+
+    def descr_dst(self, space):
+        return wrap_offset(space, self.dst(space))
+
+    def descr_tzname(self, space):
+        return call_tzname(space, self.w_tzinfo, self)
+
+    def descr_replace(self, space, w_year=None, w_month=None, w_day=None,
+                      w_hour=None, w_minute=None, w_second=None,
+                      w_microsecond=None, w_tzinfo=NoneNotWrapped):
+        year = int_or_default(space, w_year, self.year)
+        month = int_or_default(space, w_month, self.month)
+        day = int_or_default(space, w_day, self.day)
+        hour = int_or_default(space, w_hour, self.hour)
+        minute = int_or_default(space, w_minute, self.minute)
+        second = int_or_default(space, w_second, self.second)
+        microsecond = int_or_default(space, w_microsecond, self.microsecond)
+        if w_tzinfo is None:
+            w_tzinfo = self.w_tzinfo
+        else:
+            w_tzinfo = check_tzinfo(space, w_tzinfo)
+        check_date_fields(space, year, month, day)
+        check_time_fields(space, hour, minute, second, microsecond)
+        return space.wrap(W_DateTime(year, month, day, hour, minute, second,
+                                     microsecond, w_tzinfo))
+
+    def descr_astimezone(self, space, w_tz):
+        """tz -> convert to local time in new timezone tz"""
+        if not isinstance(space.interpclass_w(w_tz), W_TZInfo):
+            raise operationerrfmt(space.w_TypeError,
+                "astimezone() argument 1 must be datetime.tzinfo, not %s",
+                space.type(w_tz).getname(space))
+        if self.w_tzinfo is None:
+            raise OperationError(space.w_ValueError, space.wrap(
+                "astimezone() cannot be applied to a naive datetime"))
+        if space.is_w(self.w_tzinfo, w_tz):
+            return space.wrap(self)
+        offset = self.utcoffset(space)
+        if offset == NO_OFFSET:
+            raise OperationError(space.w_ValueError, space.wrap(
+                "astimezone() cannot be applied to a naive datetime"))
+        # convert self to UTC, and attach the new time zone object
+        utc = self.add_delta_tz(space, 0, -offset * 60, 0, w_tz)
+        return space.call_method(w_tz, 'fromutc', utc)
+
+    def descr_add(self, space, w_other):
+        other = space.interpclass_w(w_other)
+        if not isinstance(other, W_TimeDelta):
+            return space.w_NotImplemented
+        return space.wrap(self.add_delta(space, other.days, other.seconds,
+                                         other.microseconds))
+
+    def descr_sub(self, space, w_other):
+        other = space.interpclass_w(w_other)
+        if isinstance(other, W_TimeDelta):
+            return space.wrap(self.add_delta(space, -other.days,
+                                             -other.seconds,
+                                             -other.microseconds))
+        if isinstance(other, W_DateTime):
+            days, seconds, microseconds = self.difference(space, other)
+            return space.wrap(make_timedelta(space, days, seconds,
+                                             microseconds))
+        return space.w_NotImplemented
+
+    def getstate(self):
+        builder = StringBuilder(10)
+        builder.append(W_Date.getstate(self))
+        builder.append(chr(self.hour))
+        builder.append(chr(self.minute))
+        builder.append(chr(self.second))
+        builder.append(chr(self.microsecond >> 16))
+        builder.append(chr((self.microsecond >> 8) & 0xff))
+        builder.append(chr(self.microsecond & 0xff))
+        return builder.build()
+
+    def descr_reduce(self, space):
+        w_state = space.wrap(self.getstate())
+        if self.w_tzinfo is None:
+            w_args = space.newtuple([w_state])
+        else:
+            w_args = space.newtuple([w_state, self.w_tzinfo])
+        return space.newtuple([space.type(self), w_args])
+
+
+@unwrap_spec(hour=int, minute=int, second=int, microsecond=int)
+def descr_new_datetime(space, w_subtype, w_year, w_month=NoneNotWrapped,
+                       w_day=NoneNotWrapped, hour=0, minute=0, second=0,
+                       microsecond=0, w_tzinfo=None):
+    if w_day is None and is_state(space, w_year, 10):
+        # unpickling: the state, and the tzinfo as second argument
+        state = space.str_w(w_year)
+        year = ord(state[0]) * 256 + ord(state[1])
+        month = ord(state[2])
+        day = ord(state[3])
+        hour = ord(state[4])
+        minute = ord(state[5])
+        second = ord(state[6])
+        microsecond = ((ord(state[7]) << 16) | (ord(state[8]) << 8) |
+                       ord(state[9]))
+        w_tzinfo = check_tzinfo(space, w_month)
+    else:
+        if w_month is None or w_day is None:
+            raise OperationError(space.w_TypeError, space.wrap(
+                "datetime() requires the year, month and day arguments"))
+        year = space.int_w(w_year)
+        month = space.int_w(w_month)
+        day = space.int_w(w_day)
+        check_date_fields(space, year, month, day)
+        check_time_fields(space, hour, minute, second, microsecond)
+        w_tzinfo = check_tzinfo(space, w_tzinfo)
+    w_result = space.allocate_instance(W_DateTime, w_subtype)
+    W_DateTime.__init__(w_result, year, month, day, hour, minute, second,
+                        microsecond, w_tzinfo)
+    return w_result
+
+def new_datetime(space, w_type, year, month, day, hour, minute, second,
+                 microsecond, w_tzinfo):
+    if space.is_w(w_type, space.gettypeobject(W_DateTime.typedef)):
+        check_date_fields(space, year, month, day)
+        check_time_fields(space, hour, minute, second, microsecond)
+        return space.wrap(W_DateTime(year, month, day, hour, minute, second,
+                                     microsecond, w_tzinfo))
+    if w_tzinfo is None:
+        w_tzinfo = space.w_None
+    return space.call_function(w_type, space.wrap(year), space.wrap(month),
+                               space.wrap(day), space.wrap(hour),
+                               space.wrap(minute), space.wrap(second),
+                               space.wrap(microsecond), w_tzinfo)
+
+def descr_fromtimestamp_datetime(space, w_type, w_timestamp, w_tz=None):
+    """timestamp[, tz] -> tz's local time from POSIX timestamp."""
+    check_tzinfo(space, w_tz)
+    return datetime_fromtimestamp(space, w_type, w_timestamp, w_tz)
+
+def descr_utcfromtimestamp(space, w_type, w_timestamp):
+    """timestamp -> UTC datetime from a POSIX timestamp (like time.time())."""
+    return datetime_utcfromtimestamp(space, w_type, w_timestamp)
+
+def descr_now(space, w_type, w_tz=None):
+    """[tz] -> new datetime with tz's local day and time."""
+    check_tzinfo(space, w_tz)
+    return datetime_now(space, w_type, w_tz)
+
+def descr_utcnow(space, w_type):
+    """Return a new datetime representing UTC day and time."""
+    return datetime_utcnow(space, w_type)
+
+def descr_combine(space, w_type, w_date, w_time):
+    """date, time -> datetime with same date and time fields"""
+    date = space.interpclass_w(w_date)
+    if not isinstance(date, W_Date):
+        raise OperationError(space.w_TypeError, space.wrap(
+            "combine() argument 1 must be datetime.date"))
+    time = space.interpclass_w(w_time)
+    if not isinstance(time, W_Time):
+        raise OperationError(space.w_TypeError, space.wrap(
+            "combine() argument 2 must be datetime.time"))
+    return new_datetime(space, w_type, date.year, date.month, date.day,
+                        time.hour, time.minute, time.second,
+                        time.microsecond, time.w_tzinfo)
+
+def parse_number(string, pos, min_width, max_width):
+    """Parses the digits at string[pos:].  Returns the position after them
+    and their value, or -1 if there are too few or too many of them."""
+    end = pos
+    value = 0
+    while end < len(string) and '0' <= string[end] <= '9':
+        if end - pos == max_width:
+            return -1, 0
+        value = value * 10 + (ord(string[end]) - ord('0'))
+        end += 1
+    if end - pos < min_width:
+        return -1, 0
+    return end, value
+
+def strptime_fields(string, format):
+    """Parses the common formats made of numeric directives and separators,
+    e.g. '%Y-%m-%d %H:%M:%S.%f', as _strptime() would.  Returns the seven
+    fields of the datetime, or None if the full _strptime() is needed."""
+    fields = [1900, 1, 1, 0, 0, 0, 0]
+    i = 0
+    pos = 0
+    while i < len(format):
+        c = format[i]
+        i += 1
+        if c != '%':
+            # literal characters: whitespace and case-insensitivity are
+            # left to _strptime()
+            if c.isspace() or pos == len(string) or string[pos] != c:
+                return None
+            pos += 1
+            continue
+        if i == len(format):
+            return None
+        directive = format[i]
+        i += 1
+        if directive == '%':
+            if pos == len(string) or string[pos] != '%':
+                return None
+            pos += 1
+            continue
+        # a numeric directive cannot be followed by another one, the
+        # greedy parsing below would not give the same result
+        if i < len(format) and format[i] == '%' and (
+                i + 1 == len(format) or format[i + 1] != '%'):
+            return None
+        if directive == 'Y':
+            pos, value = parse_number(string, pos, 4, 4)
+            field = 0
+        elif directive == 'y':
+            pos, value = parse_number(string, pos, 2, 2)
+            if value <= 68:
+                value += 2000
+            else:
+                value += 1900
+            field = 0
+        elif directive == 'm':
+            pos, value = parse_number(string, pos, 1, 2)
+            if not 1 <= value <= 12:
+                return None
+            field = 1
+        elif directive == 'd':
+            pos, value = parse_number(string, pos, 1, 2)
+            if not 1 <= value <= 31:
+                return None
+            field = 2
+        elif directive == 'H':
+            pos, value = parse_number(string, pos, 1, 2)
+            if value > 23:
+                return None
+            field = 3
+        elif directive == 'M':
+            pos, value = parse_number(string, pos, 1, 2)
+            if value > 59:
+                return None
+            field = 4
+        elif directive == 'S':
+            pos, value = parse_number(string, pos, 1, 2)
+            if value > 61:
+                return None
+            field = 5
+        elif directive == 'f':
+            start = pos
+            pos, value = parse_number(string, pos, 1, 6)
+            for j in range(6 - (pos - start)):
+                value *= 10
+            field = 6
+        else:
+            return None
+        if pos < 0:
+            return None
+        fields[field] = value
+    if pos != len(string):
+        return None
+    return fields
+
+def descr_strptime(space, w_type, w_string, w_format):
+    """string, format -> new datetime parsed from a string (like time.strptime())."""
+    if (space.is_w(space.type(w_string), space.w_str) and
+            space.is_w(space.type(w_format), space.w_str)):
+        fields = strptime_fields(space.str_w(w_string),
+                                 space.str_w(w_format))
+        if fields is not None:
+            return new_datetime(space, w_type, fields[0], fields[1],
+                                fields[2], fields[3], fields[4], fields[5],
+                                fields[6], None)
+    return datetime_strptime(space, w_type, w_string, w_format)
+
+W_DateTime.typedef = TypeDef(
+    'datetime', W_Date.typedef,
+    __module__ = 'datetime',
+    __doc__ = W_DateTime.__doc__,
+    __new__ = interp2app(descr_new_datetime),
+    hour = interp_attrproperty('hour', W_DateTime),
+    minute = interp_attrproperty('minute', W_DateTime),
+    second = interp_attrproperty('second', W_DateTime),
+    microsecond = interp_attrproperty('microsecond', W_DateTime),
+    tzinfo = interp_attrproperty_w('w_tzinfo', W_DateTime),
+    fromtimestamp = interp2app(descr_fromtimestamp_datetime,
+                               as_classmethod=True),
+    utcfromtimestamp = interp2app(descr_utcfromtimestamp,
+                                  as_classmethod=True),
+    now = interp2app(descr_now, as_classmethod=True),
+    utcnow = interp2app(descr_utcnow, as_classmethod=True),
+    combine = interp2app(descr_combine, as_classmethod=True),
+    strptime = interp2app(descr_strptime, as_classmethod=True),
+    date = interp2app(W_DateTime.descr_date),
+    time = interp2app(W_DateTime.descr_time),
+    timetz = interp2app(W_DateTime.descr_timetz),
+    ctime = interp2app(W_DateTime.descr_ctime),
+    timetuple = interp2app(W_DateTime.descr_timetuple),
+    utctimetuple = interp2app(W_DateTime.descr_utctimetuple),
+    isoformat = interp2app(W_DateTime.descr_isoformat),
+    utcoffset = interp2app(W_DateTime.descr_utcoffset),
+    tzname = interp2app(W_DateTime.descr_tzname),
+    dst = interp2app(W_DateTime.descr_dst),
+    replace = interp2app(W_DateTime.descr_replace),
+    astimezone = interp2app(W_DateTime.descr_astimezone),
+    __eq__ = interp2app(W_DateTime.descr_eq),
+    __ne__ = interp2app(W_DateTime.descr_ne),
+    __lt__ = interp2app(W_DateTime.descr_lt),
+    __le__ = interp2app(W_DateTime.descr_le),
+    __gt__ = interp2app(W_DateTime.descr_gt),
+    __ge__ = interp2app(W_DateTime.descr_ge),
+    __hash__ = interp2app(W_DateTime.descr_hash),
+    __repr__ = interp2app(W_DateTime.descr_repr),
+    __str__ = interp2app(W_DateTime.descr_str),
+    __add__ = interp2app(W_DateTime.descr_add),
+    __radd__ = interp2app(W_DateTime.descr_add),
+    __sub__ = interp2app(W_DateTime.descr_sub),
+    __reduce__ = interp2app(W_DateTime.descr_reduce),
+    min = W_DateTime(1, 1, 1, 0, 0, 0, 0, None),
+    max = W_DateTime(MAXYEAR, 12, 31, 23, 59, 59, 999999, None),
+    resolution = W_TimeDelta(0, 0, 1),
+    )
@@ -0,0 +1,338 @@
+from pypy.conftest import gettestobjspace
+
+
+class AppTestDatetime:
+    def setup_class(cls):
+        cls.space = gettestobjspace(usemodules=['datetime', 'rctime',
+                                                'struct'])
+
+    def test_is_builtin(self):
+        import datetime
+        assert 'built-in' in repr(datetime)
+        assert datetime.MINYEAR == 1
+        assert datetime.MAXYEAR == 9999
+        assert datetime.datetime.__module__ == 'datetime'
+        assert issubclass(datetime.datetime, datetime.date)
+
+    def test_timedelta(self):
+        from datetime import timedelta
+        td = timedelta(1, 2, 3)
+        assert (td.days, td.seconds, td.microseconds) == (1, 2, 3)
+        td = timedelta(weeks=1, hours=-1, minutes=2, milliseconds=-1)
+        assert (td.days, td.seconds, td.microseconds) == (6, 82919, 999000)
+        td = timedelta(microseconds=-1)
+        assert (td.days, td.seconds, td.microseconds) == (-1, 86399, 999999)
+        td = timedelta(days=1.5, seconds=0.25)
+        assert (td.days, td.seconds, td.microseconds) == (1, 43200, 250000)
+        td = timedelta(seconds=2L**40)
+        assert td.days == 2**40 // 86400
+        assert timedelta(0.5) == timedelta(hours=12)
+        assert timedelta(999999999, 86399, 999999) == timedelta.max
+        raises(OverflowError, timedelta, 1000000000)
+        raises(OverflowError, timedelta, hours=24 * 10**9)
+        raises(TypeError, timedelta, '1')
+        assert repr(timedelta(1, 2)) == 'datetime.timedelta(1, 2)'
+        assert repr(timedelta(0, 0, 3)) == 'datetime.timedelta(0, 0, 3)'
+        assert str(timedelta(-1, 3600, 5)) == '-1 day, 1:00:00.000005'
+        assert str(timedelta(2, 62)) == '2 days, 0:01:02'
+        assert timedelta(1, 1).total_seconds() == 86401.0
+        assert timedelta.resolution == timedelta(microseconds=1)
+
+    def test_timedelta_arithmetic(self):
+        from datetime import timedelta
+        a = timedelta(1, 2, 3)
+        b = timedelta(0, 86399, 999999)
+        assert a + b == timedelta(2, 2, 2)
+        assert a - b == timedelta(0, 2, 4)
+        assert -a == timedelta(-2, 86397, 999997)
+        assert abs(-a) == a
+        assert +a is a
+        assert a * 2 == 2 * a == timedelta(2, 4, 6)
+        assert a * 2L == timedelta(2, 4, 6)
+        assert timedelta(0, 0, 1) * 2**64 == timedelta(microseconds=2**64)
+        assert a // 2 == a / 2 == timedelta(0, 43201, 1)
+        raises(ZeroDivisionError, "a // 0")
+        raises(OverflowError, "timedelta.max + a")
+        raises(TypeError, "a + 1")
+        raises(TypeError, "a * 1.5")
+        assert not timedelta(0)
+        assert timedelta(0, 0, 1)
+
+    def test_timedelta_compare_hash(self):
+        from datetime import timedelta
+        a = timedelta(1, 2, 3)
+        assert a == timedelta(1, 2, 3)
+        assert a < timedelta(1, 2, 4) <= timedelta(1, 3) < timedelta(2)
+        assert a != 42
+        assert not (a == 42)
+        raises(TypeError, "a < 42")
+        assert hash(a) == hash(timedelta(0, 86402, 3))
+        assert len(set([timedelta(1), timedelta(0, 86400),
+                        timedelta(hours=24)])) == 1
+
+    def test_date(self):
+        from datetime import date, timedelta
+        d = date(2002, 3, 1)
+        assert (d.year, d.month, d.day) == (2002, 3, 1)
+        raises(ValueError, date, 0, 1, 1)
+        raises(ValueError, date, 2002, 13, 1)
+        raises(ValueError, date, 2002, 2, 29)
+        assert date(2004, 2, 29).day == 29
+        assert repr(d) == 'datetime.date(2002, 3, 1)'
+        assert str(d) == d.isoformat() == '2002-03-01'
+        assert d.ctime() == 'Fri Mar  1 00:00:00 2002'
+        assert d.toordinal() == 730910
+        assert date.fromordinal(730910) == d
+        for ordinal in [1, 59, 60, 365, 366, 730910, 3652059]:
+            assert date.fromordinal(ordinal).toordinal() == ordinal
+        assert d.weekday() == 4
+        assert d.isoweekday() == 5
+        assert date(2003, 12, 29).isocalendar() == (2004, 1, 1)
+        assert date(2005, 1, 2).isocalendar() == (2004, 53, 7)
+        assert d.replace(day=31) == date(2002, 3, 31)
+        raises(ValueError, d.replace, month=2, day=30)
+        tt = d.timetuple()
+        assert tuple(tt) == (2002, 3, 1, 0, 0, 0, 4, 60, -1)
+        assert tt.tm_yday == 60
+        assert d.strftime('%Y/%m/%d') == '2002/03/01'
+        assert format(d, '%d') == '01'
+        assert format(d, '') == '2002-03-01'
+        assert date.min == date(1, 1, 1)
+        assert date.max == date(9999, 12, 31)
+        assert date.resolution == timedelta(1)
+
+    def test_date_arithmetic(self):
+        from datetime import date, timedelta
+        d = date(2002, 3, 1)
+        assert d + timedelta(1) == timedelta(1) + d == date(2002, 3, 2)
+        assert d - timedelta(1) == date(2002, 2, 28)
+        assert d + timedelta(0, 86399) == d
+        assert d - date(2001, 3, 1) == timedelta(365)
+        raises(OverflowError, "date.max + timedelta(1)")
+        raises(OverflowError, "date.min - timedelta(1)")
+        raises(TypeError, "d + 1")
+        raises(TypeError, "d - 1")
+
+    def test_date_compare_hash(self):
+        from datetime import date, datetime
+        d = date(2002, 3, 1)
+        assert d == date(2002, 3, 1)
+        assert d < date(2002, 3, 2) < date(2002, 4, 1) < date(2003, 1, 1)
+        assert hash(d) == hash(date(2002, 3, 1))
+        assert d != 'x'
+        raises(TypeError, "d < 'x'")
+        dt = datetime(2002, 3, 1)
+        assert d != dt
+        assert dt != d
+        raises(TypeError, "d < dt")
+        raises(TypeError, "dt < d")
+        class Comparable(object):
+            def timetuple(self):
+                pass
+            def __eq__(self, other):
+                return 'eq'
+        assert (d == Comparable()) == 'eq'
+
+    def test_date_fromtimestamp(self):
+        import time
+        from datetime import date
+        t = time.time()
+        d = date.fromtimestamp(t)
+        assert d.timetuple()[:3] == time.localtime(t)[:3]
+        assert date.today() >= d
+
+    def test_time(self):
+        from datetime import time
+        t = time(12, 30, 5, 7)
+        assert (t.hour, t.minute, t.second, t.microsecond) == (12, 30, 5, 7)
+        assert t.tzinfo is None
+        assert time() == time(0, 0, 0, 0)
+        raises(ValueError, time, 24)
+        raises(ValueError, time, 0, 60)
+        raises(ValueError, time, 0, 0, 0, 1000000)
+        assert repr(t) == 'datetime.time(12, 30, 5, 7)'
+        assert repr(time(1, 2)) == 'datetime.time(1, 2)'
+        assert str(t) == t.isoformat() == '12:30:05.000007'
+        assert str(time(1, 2)) == '01:02:00'
+        assert t.strftime('%H-%M-%S %f') == '12-30-05 000007'
+        assert t < time(12, 30, 6)
+        assert t.replace(hour=1) == time(1, 30, 5, 7)
+        assert hash(t) == hash(time(12, 30, 5, 7))
+        assert not time(0)
+        assert time(0, 0, 1)
+        assert t.utcoffset() is None
+        assert t.tzname() is None
+        raises(TypeError, "t < 1")
+
+    def test_datetime(self):
+        from datetime import datetime, date, time, timedelta
+        dt = datetime(2002, 3, 1, 12, 30, 5, 7)
+        assert (dt.year, dt.month, dt.day) == (2002, 3, 1)
+        assert (dt.hour, dt.minute, dt.second, dt.microsecond) == (
+            12, 30, 5, 7)
+        raises(ValueError, datetime, 2002, 3, 1, 24)
+        raises(TypeError, datetime, 2002, 3)
+        assert repr(dt) == 'datetime.datetime(2002, 3, 1, 12, 30, 5, 7)'
+        assert repr(datetime(2002, 3, 1)) == 'datetime.datetime(2002, 3, 1, 0, 0)'
+        assert str(dt) == '2002-03-01 12:30:05.000007'
+        assert dt.isoformat() == '2002-03-01T12:30:05.000007'
+        assert datetime(2002, 3, 1).isoformat('x') == '2002-03-01x00:00:00'
+        raises(TypeError, dt.isoformat, 'xx')
+        assert dt.ctime() == 'Fri Mar  1 12:30:05 2002'
+        assert dt.date() == date(2002, 3, 1)
+        assert type(dt.date()) is date
+        assert dt.time() == time(12, 30, 5, 7)
+        assert datetime.combine(dt.date(), dt.time()) == dt
+        assert dt.replace(minute=0, microsecond=0) == datetime(2002, 3, 1, 12,
+                                                               0, 5)
+        assert tuple(dt.timetuple()) == (2002, 3, 1, 12, 30, 5, 4, 60, -1)
+        assert tuple(dt.utctimetuple()) == (2002, 3, 1, 12, 30, 5, 4, 60, 0)
+        assert dt.strftime('%Y %f') == '2002 000007'
+        assert format(dt, '%H') == '12'
+        assert dt.toordinal() == 730910
+        assert datetime.min == datetime(1, 1, 1)
+        assert datetime.max == datetime(9999, 12, 31, 23, 59, 59, 999999)
+        assert datetime.resolution == timedelta(microseconds=1)
+
+    def test_datetime_arithmetic(self):
+        from datetime import datetime, timedelta
+        dt = datetime(2002, 3, 1, 23, 59, 59, 999999)
+        assert dt + timedelta(microseconds=1) == datetime(2002, 3, 2)
+        assert timedelta(1) + dt == datetime(2002, 3, 2, 23, 59, 59, 999999)
+        assert dt - timedelta(days=1, hours=24) == datetime(2002, 2, 27, 23,
+                                                            59, 59, 999999)
+        assert dt - datetime(2002, 3, 1) == timedelta(0, 86399, 999999)
+        assert datetime(2002, 3, 1) - dt == timedelta(-1, 0, 1)
+        raises(OverflowError, "datetime.max + timedelta(microseconds=1)")
+        raises(TypeError, "dt + 1")
+        raises(TypeError, "dt - dt.date()")
+
+    def test_datetime_compare_hash(self):
+        from datetime import datetime
+        a = datetime(2002, 3, 1, 12, 30)
+        assert a == datetime(2002, 3, 1, 12, 30)
+        assert a < datetime(2002, 3, 1, 12, 30, 0, 1) < datetime(2002, 3, 2)
+        assert hash(a) == hash(datetime(2002, 3, 1, 12, 30))
+        assert a != 1
+        raises(TypeError, "a < 1")
+
+    def test_tzinfo(self):
+        from datetime import tzinfo, timedelta, datetime, time
+        class FixedOffset(tzinfo):
+            def __init__(self, minutes, name):
+                self.offset = timedelta(minutes=minutes)
+                self.name = name
+            def utcoffset(self, dt):
+                return self.offset
+            def tzname(self, dt):
+                return self.name
+            def dst(self, dt):
+                return timedelta(0)
+        utc = FixedOffset(0, 'UTC')
+        est = FixedOffset(-300, 'EST')
+        a = datetime(2002, 3, 1, 12, 0, tzinfo=utc)
+        b = datetime(2002, 3, 1, 7, 0, tzinfo=est)
+        assert a.tzinfo is utc
+        assert a == b
+        assert hash(a) == hash(b)
+        assert a - b == timedelta(0)
+        assert b.utcoffset() == timedelta(hours=-5)
+        assert b.tzname() == 'EST'
+        assert b.dst() == timedelta(0)
+        assert b.isoformat() == '2002-03-01T07:00:00-05:00'
+        assert b.strftime('%z %Z') == '-0500 EST'
+        assert a.astimezone(est) == b
+        assert a.astimezone(est).hour == 7
+        assert a.astimezone(est).tzinfo is est
+        assert tuple(b.utctimetuple())[:6] == (2002, 3, 1, 12, 0, 0)
+        assert b.replace(tzinfo=None).tzinfo is None
+        assert b.replace(hour=8).tzinfo is est
+        naive = datetime(2002, 3, 1, 12)
+        raises(TypeError, "a < naive")
+        raises(TypeError, "a - naive")
+        raises(ValueError, naive.astimezone, utc)
+        raises(TypeError, datetime, 2002, 3, 1, tzinfo=42)
+        assert datetime.now(utc).tzinfo is utc
+        t = datetime.fromtimestamp(0, utc)
+        assert t == datetime(1970, 1, 1, tzinfo=utc)
+        t1 = time(12, 0, tzinfo=utc)
+        t2 = time(7, 0, tzinfo=est)
+        assert t1 == t2
+        assert hash(t1) == hash(t2)
+        assert t2.isoformat() == '07:00:00-05:00'
+        assert repr(t2).startswith('datetime.time(7, 0, tzinfo=<')
+        raises(TypeError, "t1 < time(12)")
+        class Bad(tzinfo):
+            def utcoffset(self, dt):
+                return timedelta(seconds=30)
+        raises(ValueError, datetime(2002, 3, 1, tzinfo=Bad()).utcoffset)
+        raises(NotImplementedError, tzinfo().utcoffset, None)
+
+    def test_timestamps(self):
+        import time
+        from datetime import datetime
+        assert datetime.utcfromtimestamp(0) == datetime(1970, 1, 1)
+        assert datetime.utcfromtimestamp(1.5) == datetime(1970, 1, 1, 0, 0,
+                                                           1, 500000)
+        t = time.time()
+        dt = datetime.fromtimestamp(t)
+        assert dt.timetuple()[:6] == time.localtime(t)[:6]
+        assert datetime.now() >= dt
+        assert datetime.utcnow() > datetime(2000, 1, 1)
+
+    def test_strptime(self):
+        from datetime import datetime
+        strptime = datetime.strptime
+        assert strptime('2002-03-01', '%Y-%m-%d') == datetime(2002, 3, 1)
+        assert strptime('2002-03-01T12:30:05.25', '%Y-%m-%dT%H:%M:%S.%f') == (
+            datetime(2002, 3, 1, 12, 30, 5, 250000))
+        assert strptime('1/2/03', '%m/%d/%y') == datetime(2003, 1, 2)
+        assert strptime('1/2/99', '%m/%d/%y') == datetime(1999, 1, 2)
+        assert strptime('12:30', '%H:%M') == datetime(1900, 1, 1, 12, 30)
+        assert strptime('10%', '%d%%') == datetime(1900, 1, 10)
+        # formats handled by _strptime
+        assert strptime('2002 Mar 1', '%Y %b %d') == datetime(2002, 3, 1)
+        assert strptime('20020301', '%Y%m%d') == datetime(2002, 3, 1)
+        assert strptime(u'2002-03-01', u'%Y-%m-%d') == datetime(2002, 3, 1)
+        raises(ValueError, strptime, '2002-13-01', '%Y-%m-%d')
+        raises(ValueError, strptime, '2002-02-30', '%Y-%m-%d')
+        raises(ValueError, strptime, '2002-03-01x', '%Y-%m-%d')
+        raises(ValueError, strptime, '02-03-01', '%Y-%m-%d')
+        class MyDatetime(datetime):
+            pass
+        res = MyDatetime.strptime('2002-03-01', '%Y-%m-%d')
+        assert type(res) is MyDatetime
+
+    def test_pickle(self):
+        import pickle
+        from datetime import timedelta, date, time, datetime, tzinfo
+        for obj in [timedelta(1, 2, 3), timedelta(-5), date(2002, 3, 1),
+                    date(9999, 12, 31), time(12, 30, 5, 123456),
+                    datetime(2002, 3, 1, 12, 30, 5, 123456), datetime.max]:
+            for proto in range(3):
+                res = pickle.loads(pickle.dumps(obj, proto))
+                assert res == obj
+                assert type(res) is type(obj)
+        assert datetime(2002, 3, 1, 12).__reduce__() == (
+            datetime, ('\x07\xd2\x03\x01\x0c\x00\x00\x00\x00\x00',))
+        assert date('\x07\xd2\x03\x01') == date(2002, 3, 1)
+
+    def test_subclass(self):
+        from datetime import date, datetime, timedelta
+        class MyDate(date):
+            def double_year(self):
+                return self.year * 2
+        d = MyDate(2002, 3, 1)
+        assert d.double_year() == 4004
+        assert d == date(2002, 3, 1)
+        assert repr(d) == 'datetime.MyDate(2002, 3, 1)'
+        assert type(MyDate.fromordinal(730910)) is MyDate
+        class MyDatetime(datetime):
+            pass
+        dt = MyDatetime.combine(d, datetime(1, 1, 1, 12).time())
+        assert type(dt) is MyDatetime
+        assert dt == datetime(2002, 3, 1, 12)
+        class MyTimedelta(timedelta):
+            pass
+        assert MyTimedelta(1) == timedelta(1)
+        assert type(MyTimedelta(1)) is MyTimedelta
@@ -0,0 +1,27 @@
+from pypy.interpreter.mixedmodule import MixedModule
+
+
+class Module(MixedModule):
+    """This module implements greenlets on top of continulets.
+
+A 'greenlet' is a micro-thread: a callable that runs on its own stack,
+and that can be suspended and resumed explicitly by calling switch() on
+another greenlet.  Greenlets are arranged in a tree: when a greenlet
+finishes, execution continues in its parent.
+
+This is the same interface as the 'greenlet' module of CPython, which
+used to be provided on PyPy by the pure Python lib_pypy/greenlet.py.
+Here the switching logic is written at interp-level, directly on top of
+the primitives of the '_continuation' module.
+"""
+
+    appleveldefs = {
+        'greenlet': 'app_greenlet.greenlet',
+        'GreenletExit': 'app_greenlet.GreenletExit',
+        'error': 'app_greenlet.error',
+    }
+
+    interpleveldefs = {
+        '_greenlet': 'interp_greenlet.W_Greenlet',
+        'getcurrent': 'interp_greenlet.descr_getcurrent',
+    }
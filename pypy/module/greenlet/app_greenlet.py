@@ -0,0 +1,15 @@
+class GreenletExit(Exception):
+    """This special exception does not propagate to the parent greenlet; it
+can be used to kill a single greenlet."""
+
+
+import _continuation
+error = _continuation.error
+
+from greenlet import _greenlet, getcurrent
+
+
+class greenlet(_greenlet):
+    getcurrent = staticmethod(getcurrent)
+    error = error
+    GreenletExit = GreenletExit
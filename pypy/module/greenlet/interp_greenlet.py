@@ -0,0 +1,223 @@
+from pypy.interpreter.error import OperationError
+from pypy.interpreter.executioncontext import ExecutionContext
+from pypy.interpreter.argument import Arguments
+from pypy.interpreter.typedef import TypeDef, GetSetProperty
+from pypy.interpreter.gateway import interp2app
+from pypy.module._continuation.interp_continuation import W_Continulet
+from pypy.module._continuation.interp_continuation import global_state
+from pypy.module._continuation.interp_continuation import permute
+
+
+class W_Greenlet(W_Continulet):
+    """The interp-level part of the 'greenlet' class.  The switch logic
+    lives here, directly on top of the continulet primitives, so that a
+    switch() doesn't run any app-level code besides the target greenlet.
+    """
+    is_main = False
+    started = False
+
+    def __init__(self, space):
+        W_Continulet.__init__(self, space)
+        self.parent = None
+
+    def is_alive(self):
+        return self.is_main or (self.sthread is not None and
+                                not self.sthread.is_empty_handle(self.h))
+
+    def descr_greenlet_init(self, w_run=None, w_parent=None):
+        space = self.space
+        if not space.is_w(w_run, space.w_None):
+            space.setattr(space.wrap(self), space.wrap('run'), w_run)
+        if not space.is_w(w_parent, space.w_None):
+            self.descr_set_parent(space, w_parent)
+
+    def descr_greenlet_switch(self, args_w):
+        """Switch execution to this greenlet, optionally passing the values
+        given as argument(s).  Returns the value passed when switching back."""
+        space = self.space
+        return self.greenlet_switch(space.newtuple(args_w), None)
+
+    def descr_greenlet_throw(self, w_type=None, w_val=None, w_tb=None):
+        """Raise an exception in this greenlet, and return the value
+        passed when switching back."""
+        from pypy.interpreter.pytraceback import check_traceback
+        space = self.space
+        if space.is_w(w_type, space.w_None):
+            w_type = space.fromcache(State).w_GreenletExit
+        if space.is_w(w_tb, space.w_None):
+            tb = None
+        else:
+            msg = "throw() third argument must be a traceback object"
+            tb = check_traceback(space, w_tb, msg)
+        operr = OperationError(w_type, w_val, tb)
+        operr.normalize_exception(space)
+        return self.greenlet_switch(space.newtuple([w_type, w_val, w_tb]),
+                                    operr)
+
+    def greenlet_switch(self, w_args, operr):
+        # 'w_args' is the tuple of arguments, and if 'operr' is not None,
+        # it is the exception to raise in the target instead
+        space = self.space
+        current = getcurrent(space)
+        target = self
+        while not target.is_alive():
+            if not target.started:
+                cs = space.fromcache(State)
+                if operr is None:
+                    w_start = cs.w_greenlet_start
+                    args_w = [w_args]
+                else:
+                    w_start = cs.w_greenlet_throw
+                    args_w = space.fixedview(w_args)
+                W_Continulet.descr_init(target, w_start,
+                                        Arguments(space, args_w))
+                target.started = True
+                w_args = space.w_None
+                operr = None
+                break
+            # already done, go to the parent instead
+            target = target.parent
+            assert target is not None
+        #
+        try:
+            global_state.w_value = w_args
+            if operr is not None:
+                global_state.w_value = None
+                global_state.propagate_exception = operr
+            w_result = current.switch_to(target)
+        except OperationError, e:
+            if not e.match(space, space.fromcache(State).w_GreenletExit):
+                raise
+            w_result = space.newtuple([e.get_w_value(space)])
+        finally:
+            space.getexecutioncontext().current_greenlet = current
+        #
+        if w_result is None:
+            return space.w_None
+        result_w = space.fixedview(w_result)
+        if len(result_w) == 1:
+            return result_w[0]
+        return w_result
+
+    def descr__nonzero__(self):
+        return self.space.newbool(self.is_alive())
+
+    def descr_get_dead(self, space):
+        return space.newbool(self.started and not self.is_alive())
+
+    def descr_get_parent(self, space):
+        return space.wrap(self.parent)
+
+    def descr_set_parent(self, space, w_parent):
+        parent = space.interp_w(W_Greenlet, w_parent)
+        p = parent
+        while p is not None:
+            if p is self:
+                raise OperationError(space.w_ValueError,
+                                     space.wrap("cyclic parent chain"))
+            p = p.parent
+        self.parent = parent
+
+    def descr_get_gr_frame(self, space):
+        current = getcurrent(space)
+        if self is current:
+            return space.w_None
+        if self.is_main:
+            # the main greenlet's stack is stored in the current greenlet
+            holder = current
+        else:
+            holder = self
+        if not holder.is_alive() or holder.is_main:
+            return space.w_None
+        # the f_back of the bottom frame of a suspended continulet is the
+        # frame that was running when it was suspended
+        frame = holder.bottomframe.f_backref()
+        if frame is None or frame is holder.bottomframe:
+            return space.w_None
+        return space.wrap(frame)
+
+
+def W_Greenlet___new__(space, w_subtype, __args__):
+    r = space.allocate_instance(W_Greenlet, w_subtype)
+    r.__init__(space)
+    r.parent = getcurrent(space)
+    return space.wrap(r)
+
+W_Greenlet.typedef = TypeDef(
+    '_greenlet',
+    W_Continulet.typedef,
+    __module__ = 'greenlet',
+    __new__     = interp2app(W_Greenlet___new__),
+    __init__    = interp2app(W_Greenlet.descr_greenlet_init),
+    switch      = interp2app(W_Greenlet.descr_greenlet_switch),
+    throw       = interp2app(W_Greenlet.descr_greenlet_throw),
+    __nonzero__ = interp2app(W_Greenlet.descr__nonzero__),
+    dead        = GetSetProperty(W_Greenlet.descr_get_dead),
+    parent      = GetSetProperty(W_Greenlet.descr_get_parent,
+                                 W_Greenlet.descr_set_parent),
+    gr_frame    = GetSetProperty(W_Greenlet.descr_get_gr_frame),
+    )
+
+# ____________________________________________________________
+
+ExecutionContext.current_greenlet = None
+
+def getcurrent(space):
+    "Returns the current greenlet (i.e. the one which called this function)."
+    ec = space.getexecutioncontext()
+    current = ec.current_greenlet
+    if current is None:
+        # first call in this thread: current == main
+        cs = space.fromcache(State)
+        current = space.allocate_instance(W_Greenlet, cs.w_greenlet)
+        current.__init__(space)
+        current.is_main = True
+        current.started = True
+        ec.current_greenlet = current
+    return current
+
+def descr_getcurrent(space):
+    "Returns the current greenlet (i.e. the one which called this function)."
+    return space.wrap(getcurrent(space))
+
+def switch_to_parent(space, greenlet):
+    # when 'greenlet' finishes, return to its first parent that is alive
+    parent = greenlet.parent
+    while not parent.is_alive():
+        parent = parent.parent
+    permute(space, [space.wrap(greenlet), space.wrap(parent)])
+
+def greenlet_start(space, w_greenlet, w_args):
+    greenlet = space.interp_w(W_Greenlet, w_greenlet)
+    space.getexecutioncontext().current_greenlet = greenlet
+    try:
+        w_run = space.getattr(w_greenlet, space.wrap('run'))
+        w_result = space.call(w_run, w_args)
+    finally:
+        switch_to_parent(space, greenlet)
+    return space.newtuple([w_result])
+
+def greenlet_throw(space, w_greenlet, w_type, w_val, w_tb):
+    from pypy.interpreter.pytraceback import check_traceback
+    greenlet = space.interp_w(W_Greenlet, w_greenlet)
+    space.getexecutioncontext().current_greenlet = greenlet
+    try:
+        if space.is_w(w_tb, space.w_None):
+            tb = None
+        else:
+            tb = check_traceback(space, w_tb, "bad traceback")
+        operr = OperationError(w_type, w_val, tb)
+        operr.normalize_exception(space)
+        raise operr
+    finally:
+        switch_to_parent(space, greenlet)
+
+
+class State:
+    def __init__(self, space):
+        w_module = space.getbuiltinmodule('greenlet')
+        self.w_greenlet = space.getattr(w_module, space.wrap('greenlet'))
+        self.w_GreenletExit = space.getattr(w_module,
+                                            space.wrap('GreenletExit'))
+        self.w_greenlet_start = space.wrap(interp2app(greenlet_start))
+        self.w_greenlet_throw = space.wrap(interp2app(greenlet_throw))
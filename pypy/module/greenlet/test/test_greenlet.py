@@ -0,0 +1,42 @@
+from pypy.conftest import gettestobjspace
+from pypy.module.test_lib_pypy.test_greenlet import AppTestGreenlet as _Base
+
+
+class AppTestGreenlet(_Base):
+    # run all the tests of lib_pypy/greenlet.py against the builtin module
+    def setup_class(cls):
+        cls.space = gettestobjspace(usemodules=['_continuation', 'greenlet'],
+                                    continuation=True)
+
+    def test_is_builtin(self):
+        import greenlet
+        assert 'built-in' in repr(greenlet)
+        assert greenlet.greenlet.__module__ == 'greenlet'
+        assert issubclass(greenlet.greenlet, greenlet._greenlet)
+
+    def test_getcurrent(self):
+        from greenlet import greenlet, getcurrent
+        gmain = getcurrent()
+        assert type(gmain) is greenlet
+        assert greenlet.getcurrent() is gmain
+        assert gmain
+        assert not gmain.dead
+
+    def test_cyclic_parent(self):
+        from greenlet import greenlet
+        g1 = greenlet(lambda: None)
+        g2 = greenlet(lambda: None, g1)
+        assert g2.parent is g1
+        raises(ValueError, "g1.parent = g2")
+        raises(TypeError, "g1.parent = 42")
+        assert g1.parent is greenlet.getcurrent()
+
+    def test_subclass_run(self):
+        from greenlet import greenlet
+        class MyGreenlet(greenlet):
+            def run(self, x):
+                return self.parent.switch(x + 1) * 2
+        g = MyGreenlet()
+        assert g.switch(5) == 6
+        assert g.switch(21) == 42
+        assert g.dead
@@ -22,6 +22,7 @@ class Module(MixedModule):
         'load_dynamic':    'interp_imp.load_dynamic',
         '_run_compiled_module': 'interp_imp._run_compiled_module',   # pypy
         '_getimporter':    'importing._getimporter',                 # pypy
+        '_reinit_preimported': 'interp_imp._reinit_preimported',     # pypy
         #'run_module':      'interp_imp.run_module',
         'new_module':      'interp_imp.new_module',
         'init_builtin':    'interp_imp.init_builtin',
@@ -30,6 +31,7 @@ class Module(MixedModule):
         'is_frozen':       'interp_imp.is_frozen',
         'reload':          'importing.reload',
         'NullImporter':    'importing.W_NullImporter',
+        'invalidate_caches': 'interp_imp.invalidate_caches',
 
         'lock_held':       'interp_imp.lock_held',
         'acquire_lock':    'interp_imp.acquire_lock',
@@ -5,7 +5,7 @@ Implementation of the interpreter-level default import logic.
 import sys, os, stat
 
 from pypy.interpreter.module import Module
-from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.interpreter.gateway import interp2app, unwrap_spec, applevel
 from pypy.interpreter.typedef import TypeDef, generic_new_descr
 from pypy.interpreter.error import OperationError, operationerrfmt
 from pypy.interpreter.baseobjspace import Wrappable
@@ -49,20 +49,21 @@ def get_so_extension(space):
 
     return '.' + soabi + SO
 
-def find_modtype(space, filepart):
+def find_modtype(space, filepart, names=None):
     """Check which kind of module to import for the given filepart,
     which is a path without extension.  Returns PY_SOURCE, PY_COMPILED or
-    SEARCH_ERROR.
+    SEARCH_ERROR.  'names' is the listing of the directory as returned by
+    DirectoryCache.get_names(), or None to stat each candidate file.
     """
     # check the .py file
     pyfile = filepart + ".py"
-    if os.path.exists(pyfile) and case_ok(pyfile):
+    if file_exists(pyfile, names):
         return PY_SOURCE, ".py", "U"
 
     # on Windows, also check for a .pyw file
     if CHECK_FOR_PYW:
         pyfile = filepart + ".pyw"
-        if os.path.exists(pyfile) and case_ok(pyfile):
+        if file_exists(pyfile, names):
             return PY_SOURCE, ".pyw", "U"
 
     # The .py file does not exist.  By default on PyPy, lonepycfiles
@@ -73,18 +74,24 @@ def find_modtype(space, filepart):
     # check the .pyc file
     if space.config.objspace.usepycfiles and space.config.objspace.lonepycfiles:
         pycfile = filepart + ".pyc"
-        if os.path.exists(pycfile) and case_ok(pycfile):
+        if file_exists(pycfile, names):
             # existing .pyc file
             return PY_COMPILED, ".pyc", "rb"
 
     if space.config.objspace.usemodules.cpyext:
         so_extension = get_so_extension(space)
         pydfile = filepart + so_extension
-        if os.path.exists(pydfile) and case_ok(pydfile):
+        if file_exists(pydfile, names):
             return C_EXTENSION, so_extension, "rb"
 
     return SEARCH_ERROR, None, None
 
+def file_exists(filename, names):
+    if names is None:
+        return os.path.exists(filename) and case_ok(filename)
+    # the listing has the exact case of the file names
+    return filename in names
+
 if sys.platform.startswith('linux') or 'freebsd' in sys.platform:
     def case_ok(filename):
         return True
@@ -105,6 +112,75 @@ else:
         except OSError:
             return False
 
+class DirectoryListing:
+    def __init__(self, mtime, names):
+        self.mtime = mtime
+        self.names = names
+
+class DirectoryCache:
+    """Caches the content of the directories searched by find_module(),
+    so that looking for a module costs one stat() of the directory
+    instead of one per candidate file.  A listing is reloaded when the
+    modification time of its directory changes; imp.invalidate_caches()
+    drops all of them.
+    """
+    def __init__(self, space):
+        self.listings = {}     # {directory: DirectoryListing}
+
+    def _freeze_(self):
+        self.listings.clear()  # don't keep the directories of the host
+        return False
+
+    def clear(self):
+        self.listings.clear()
+
+    def get_names(self, directory):
+        """Returns a dict whose keys are the os.path.join() of 'directory'
+        and of each of its entries, or None if the directory exists but
+        cannot be listed."""
+        if directory:
+            dirname = directory
+        else:
+            dirname = os.curdir
+        try:
+            st = os.stat(dirname)
+        except OSError:
+            return {}
+        if not stat.S_ISDIR(st.st_mode):
+            return {}
+        mtime = st.st_mtime
+        listing = self.listings.get(directory, None)
+        if listing is not None and listing.mtime == mtime:
+            return listing.names
+        try:
+            entries = os.listdir(dirname)
+        except OSError:
+            if directory in self.listings:
+                del self.listings[directory]
+            return None
+        names = {}
+        for name in entries:
+            names[os.path.join(directory, name)] = None
+        self.listings[directory] = DirectoryListing(mtime, names)
+        return names
+
+    def may_exist(self, filename):
+        """Returns False if a cached listing shows that 'filename' does
+        not exist, True otherwise.  The listing is not revalidated."""
+        index = filename.rfind(os.sep)
+        if index < 0:
+            directory = ""
+        else:
+            directory = filename[:index]
+        listing = self.listings.get(directory, None)
+        if listing is None:
+            return True
+        start = index + 1
+        assert start >= 0
+        if os.path.join(directory, filename[start:]) != filename:
+            return True     # not the key used by get_names()
+        return filename in listing.names
+
 def try_getattr(space, w_obj, w_name):
     try:
         return space.getattr(w_obj, w_name)
@@ -493,6 +569,7 @@ def find_module(space, modulename, w_modulename, partname, w_path,
     #     when w_path is null
 
     if w_path is not None:
+        dircache = space.fromcache(DirectoryCache)
         for w_pathitem in space.unpackiterable(w_path):
             # sys.path_hooks import hook
             if use_loader:
@@ -501,17 +578,23 @@ def find_module(space, modulename, w_modulename, partname, w_path,
                     return FindInfo.fromLoader(w_loader)
 
             path = space.str_w(w_pathitem)
+            names = dircache.get_names(path)
             filepart = os.path.join(path, partname)
-            if os.path.isdir(filepart) and case_ok(filepart):
+            if names is None:
+                is_package = os.path.isdir(filepart) and case_ok(filepart)
+            else:
+                is_package = filepart in names and os.path.isdir(filepart)
+            if is_package:
                 initfile = os.path.join(filepart, '__init__')
-                modtype, _, _ = find_modtype(space, initfile)
+                modtype, _, _ = find_modtype(space, initfile,
+                                             dircache.get_names(filepart))
                 if modtype in (PY_SOURCE, PY_COMPILED):
                     return FindInfo(PKG_DIRECTORY, filepart, None)
                 else:
                     msg = "Not importing directory " +\
                             "'%s' missing __init__.py" % (filepart,)
                     space.warn(msg, space.w_ImportWarning)
-            modtype, suffix, filemode = find_modtype(space, filepart)
+            modtype, suffix, filemode = find_modtype(space, filepart, names)
             try:
                 if modtype in (PY_SOURCE, PY_COMPILED):
                     assert suffix is not None
@@ -867,7 +950,10 @@ def load_source_module(space, w_modulename, w_mod, pathname, source,
         src_stat = os.stat(pathname)
         mtime = int(src_stat[stat.ST_MTIME])
         mode = src_stat[stat.ST_MODE]
-        stream = check_compiled_module(space, cpathname, mtime)
+        if space.fromcache(DirectoryCache).may_exist(cpathname):
+            stream = check_compiled_module(space, cpathname, mtime)
+        else:
+            stream = None
     else:
         cpathname = None
         mtime = 0
@@ -897,14 +983,8 @@ def update_code_filenames(space, code_w, pathname, oldname=None):
     assert isinstance(code_w, PyCode)
     if oldname is None:
         oldname = code_w.co_filename
-    elif code_w.co_filename != oldname:
-        return
-
-    code_w.co_filename = pathname
-    constants = code_w.co_consts_w
-    for const in constants:
-        if const is not None and isinstance(const, PyCode):
-            update_code_filenames(space, const, pathname, oldname)
+    if oldname != pathname:
+        code_w.update_filename(pathname, oldname)
 
 def _get_long(s):
     a = ord(s[0])
@@ -963,8 +1043,12 @@ def check_compiled_module(space, pycfilename, expected_mtime):
 def read_compiled_module(space, cpathname, strbuf):
     """ Read a code object from a file and check it for validity """
 
-    w_marshal = space.getbuiltinmodule('marshal')
-    w_code = space.call_method(w_marshal, 'loads', space.wrap(strbuf))
+    if space.config.objspace.lazycodeobjects:
+        from pypy.module.marshal.interp_marshal import loads_lazy_code
+        w_code = loads_lazy_code(space, space.wrap(strbuf))
+    else:
+        w_marshal = space.getbuiltinmodule('marshal')
+        w_code = space.call_method(w_marshal, 'loads', space.wrap(strbuf))
     pycode = space.interpclass_w(w_code)
     if pycode is None or not isinstance(pycode, Code):
         raise operationerrfmt(space.w_ImportError,
@@ -1049,3 +1133,150 @@ def write_compiled_module(space, co, cpathname, src_mode, src_mtime):
             os.unlink(cpathname)
         except OSError:
             pass
+
+# ____________________________________________________________
+# Modules imported at translation time (--preimport)
+
+# These modules depend too much on the command line, on the environment
+# or on the running threads to be imported before the program starts.
+NO_PREIMPORT = ['__main__', 'site', 'sitecustomize', 'usercustomize',
+                'threading']
+
+class PreimportedModule:
+    def __init__(self, name, w_module, libindex):
+        self.name = name
+        self.w_module = w_module
+        self.libindex = libindex    # in the list given by sys.pypy_initial_path
+
+class PreimportState:
+    """The pure-Python modules imported at translation time, whose
+    module objects are part of the prebuilt heap."""
+    def __init__(self, space):
+        self.modules = []       # list of PreimportedModule
+        self.libpath = []       # the library directories at translation time
+
+def preimport_modules(space, modulenames):
+    """NOT_RPYTHON: import the given pure-Python modules, and the modules
+    they import, into sys.modules.  The translated interpreter then starts
+    with them already imported."""
+    state = space.fromcache(PreimportState)
+    state.libpath = space.unwrap(space.sys.get('path'))
+    w_modules = space.sys.get('modules')
+    before = space.unwrap(space.call_method(w_modules, 'keys'))
+    for name in modulenames:
+        name = name.strip()
+        if name in NO_PREIMPORT:
+            raise ValueError("module %r cannot be preimported" % (name,))
+        space.call_function(space.builtin.get('__import__'), space.wrap(name))
+    for name in space.unwrap(space.call_method(w_modules, 'keys')):
+        if name in before:
+            continue
+        if name in NO_PREIMPORT:
+            raise ValueError("module %r is imported by the preimported "
+                             "modules, but it cannot be preimported" % (name,))
+        if name in space.builtin_modules:
+            continue    # builtin modules are always part of the binary
+        w_module = space.getitem(w_modules, space.wrap(name))
+        if space.is_w(w_module, space.w_None):
+            continue    # negative entry of an implicit relative import
+        if space.interpclass_w(w_module) is None:
+            raise ValueError("sys.modules[%r] is not a module" % (name,))
+        w_file = space.findattr(w_module, space.wrap('__file__'))
+        if w_file is None:
+            raise ValueError("module %r is not a pure-Python module" % (name,))
+        filename = space.str_w(w_file)
+        if filename.endswith(SO):
+            raise ValueError("module %r is an extension module" % (name,))
+        libindex = -1
+        for i in range(len(state.libpath)):
+            if filename.startswith(state.libpath[i] + os.sep):
+                libindex = i
+                break
+        state.modules.append(PreimportedModule(name, w_module, libindex))
+
+def reinit_preimported(space, libpath):
+    """Called at startup, once the library directories are known: update
+    the file names of the preimported modules if the library is not where
+    it was at translation time, and reinitialise the modules whose state
+    depends on the environment."""
+    state = space.fromcache(PreimportState)
+    if not state.modules:
+        return
+    for module in state.modules:
+        i = module.libindex
+        if i >= 0 and i < len(libpath) and i < len(state.libpath):
+            if libpath[i] != state.libpath[i]:
+                relocate_module(space, module.w_module,
+                                state.libpath[i], libpath[i])
+    w_names = space.newlist([space.wrap(module.name)
+                             for module in state.modules])
+    reinit_environment(space, w_names)
+
+def _relocate_name(name, olddir, newdir):
+    if name.startswith(olddir + os.sep):
+        return newdir + name[len(olddir):]
+    return name
+
+def relocate_module(space, w_module, olddir, newdir):
+    w_file = space.findattr(w_module, space.wrap('__file__'))
+    if w_file is not None:
+        filename = _relocate_name(space.str_w(w_file), olddir, newdir)
+        space.setattr(w_module, space.wrap('__file__'), space.wrap(filename))
+    w_path = space.findattr(w_module, space.wrap('__path__'))
+    if w_path is not None:
+        paths_w = [space.wrap(_relocate_name(space.str_w(w_dir),
+                                             olddir, newdir))
+                   for w_dir in space.unpackiterable(w_path)]
+        space.setattr(w_module, space.wrap('__path__'), space.newlist(paths_w))
+    w_dict = space.getattr(w_module, space.wrap('__dict__'))
+    _relocate_values(space, w_dict, olddir, newdir, {})
+
+def _relocate_values(space, w_dict, olddir, newdir, seen):
+    # update the co_filename of the functions and of the methods of the
+    # classes found in 'w_dict', so that tracebacks show the right file
+    from pypy.interpreter.function import Function
+    from pypy.module.__builtin__.interp_classobj import W_ClassObject
+    for w_value in space.unpackiterable(space.call_method(w_dict, 'values')):
+        func = space.interpclass_w(w_value)
+        if isinstance(func, Function):
+            code = func.code
+            if isinstance(code, PyCode):
+                filename = _relocate_name(code.co_filename, olddir, newdir)
+                if filename != code.co_filename:
+                    update_code_filenames(space, code, filename)
+        elif (isinstance(func, W_ClassObject) or
+              space.isinstance_w(w_value, space.w_type)):
+            if w_value in seen:
+                continue
+            seen[w_value] = None
+            w_classdict = space.getattr(w_value, space.wrap('__dict__'))
+            _relocate_values(space, w_classdict, olddir, newdir, seen)
+
+app = applevel(r'''
+def reinit_random(random):
+    # don't start every process with the same seed
+    random.seed()
+
+def reinit_warnings(warnings):
+    # the default filters depend on the -3 and -b command line options
+    reload(warnings)
+
+def reinit_os(os):
+    # on Windows, os.environ is a copy of the environment made by 'import os'
+    if os.name in ('nt', 'os2'):
+        import sys
+        os.environ = os._Environ(sys.modules[os.name].environ)
+
+reinit_functions = {'random': reinit_random,
+                    'warnings': reinit_warnings,
+                    'os': reinit_os}
+
+def reinit_environment(names):
+    import sys
+    for name in names:
+        reinit = reinit_functions.get(name)
+        if reinit is not None:
+            reinit(sys.modules[name])
+''', filename=__file__)
+
+reinit_environment = app.interphook('reinit_environment')
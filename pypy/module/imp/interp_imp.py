@@ -161,6 +161,15 @@ def is_builtin(space, w_name):
 def is_frozen(space, w_name):
     return space.w_False
 
+def invalidate_caches(space):
+    """Forget the directory listings cached by the import machinery."""
+    space.fromcache(importing.DirectoryCache).clear()
+
+def _reinit_preimported(space, w_libpath):
+    """Called by app_main once the library directories are known."""
+    libpath = [space.str_w(w_dir) for w_dir in space.listview(w_libpath)]
+    importing.reinit_preimported(space, libpath)
+
 #__________________________________________________________________
 
 def lock_held(space):
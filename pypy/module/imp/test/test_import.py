@@ -571,6 +571,105 @@ class AppTestImport:
         else:
             assert False, 'should not work'
 
+    def test_invalidate_caches(self):
+        import sys, os, imp
+        import a    # the directory is now listed in the cache
+        filename = os.path.join(sys.path[0], 'created_later.py')
+        f = open(filename, 'w')
+        f.write('x = 42\n')
+        f.close()
+        try:
+            imp.invalidate_caches()
+            import created_later
+            assert created_later.x == 42
+        finally:
+            os.unlink(filename)
+
+class TestDirectoryCache:
+    def test_get_names(self):
+        d = udir.ensure('dircache', dir=1)
+        d.join('x.py').write('')
+        cache = importing.DirectoryCache(None)
+        names = cache.get_names(str(d))
+        assert names == {str(d.join('x.py')): None}
+        assert cache.get_names(str(d)) is names
+        d.join('y.py').write('')
+        # pretend that the directory was listed a while ago
+        cache.listings[str(d)].mtime -= 10
+        names = cache.get_names(str(d))
+        assert str(d.join('y.py')) in names
+        assert cache.may_exist(str(d.join('y.py')))
+        assert not cache.may_exist(str(d.join('z.pyc')))
+        assert cache.may_exist(str(udir.join('z.pyc')))
+        assert cache.get_names(str(d.join('x.py'))) == {}
+        assert cache.get_names(str(d.join('missing'))) == {}
+        cache.clear()
+        assert cache.may_exist(str(d.join('z.pyc')))
+
+class TestPreimport:
+    def setup_method(self, meth):
+        space = self.space
+        d = udir.ensure('preimport', dir=1)
+        d.join('preimp_a.py').write('import preimp_b\n'
+                                    'def f(): pass\n'
+                                    'class C:\n'
+                                    '    def m(self): pass\n')
+        d.join('preimp_b.py').write('x = 42\n')
+        self.dir = str(d)
+        self.w_saved_path = space.appexec([space.wrap(self.dir)], """(dir):
+            import sys
+            saved = sys.path[:]
+            sys.path[:] = [dir]
+            return saved
+        """)
+
+    def teardown_method(self, meth):
+        space = self.space
+        space.appexec([self.w_saved_path], """(saved):
+            import sys
+            sys.path[:] = saved
+            for name in ['preimp_a', 'preimp_b']:
+                sys.modules.pop(name, None)
+        """)
+        del space.fromcache(importing.PreimportState).modules[:]
+
+    def test_preimport(self):
+        space = self.space
+        importing.preimport_modules(space, ['preimp_a'])
+        state = space.fromcache(importing.PreimportState)
+        assert sorted([(m.name, m.libindex) for m in state.modules]) == [
+            ('preimp_a', 0), ('preimp_b', 0)]
+        # the library was not moved
+        importing.reinit_preimported(space, [self.dir])
+        w_res = space.appexec([], """():
+            import sys, preimp_a
+            return (sys.modules['preimp_b'].x, preimp_a.__file__,
+                    preimp_a.C.m.im_func.func_code.co_filename)
+        """)
+        x, filename, co_filename = space.unwrap(w_res)
+        assert x == 42
+        assert filename.startswith(self.dir + os.sep)
+        assert co_filename == self.dir + os.sep + 'preimp_a.py'
+
+    def test_relocate(self):
+        space = self.space
+        importing.preimport_modules(space, ['preimp_a'])
+        newdir = str(udir.join('moved'))
+        importing.reinit_preimported(space, [newdir])
+        w_res = space.appexec([], """():
+            import preimp_a
+            return (preimp_a.__file__, preimp_a.f.func_code.co_filename,
+                    preimp_a.C.m.im_func.func_code.co_filename)
+        """)
+        filename, co_filename1, co_filename2 = space.unwrap(w_res)
+        assert filename.startswith(newdir + os.sep + 'preimp_a.py')
+        assert co_filename1 == newdir + os.sep + 'preimp_a.py'
+        assert co_filename2 == newdir + os.sep + 'preimp_a.py'
+
+    def test_no_preimport(self):
+        py.test.raises(ValueError, importing.preimport_modules,
+                       self.space, ['site'])
+
 class TestAbi:
     def test_abi_tag(self):
         space1 = gettestobjspace(soabi='TEST')
@@ -1160,3 +1259,45 @@ class AppTestLonePycFile(AppTestNoPycFile):
         "objspace.usepycfiles": True,
         "objspace.lonepycfiles": True
     }
+
+class AppTestLazyCodeObjects(object):
+    spaceconfig = {
+        "objspace.lazycodeobjects": True,
+    }
+    def setup_class(cls):
+        d = udir.ensure('lazycode', dir=1)
+        d.join('lazymod.py').write('def f(x):\n'
+                                   '    "doc of f"\n'
+                                   '    def g():\n'
+                                   '        return x * 2\n'
+                                   '    return g\n'
+                                   'def fail():\n'
+                                   '    raise ValueError\n'
+                                   'class C(object):\n'
+                                   '    def m(self):\n'
+                                   '        return 42\n')
+        cls.w_dir = cls.space.wrap(str(d))
+        cls.saved_modules = _setup(cls.space)
+
+    def teardown_class(cls):
+        _teardown(cls.space, cls.saved_modules)
+
+    def test_lazy_code(self):
+        import sys
+        sys.path.insert(0, self.dir)
+        import lazymod
+        assert lazymod.__file__.endswith('lazymod.py')
+        del sys.modules['lazymod']
+        import lazymod
+        assert lazymod.__file__.endswith('lazymod.pyc')
+        assert lazymod.f.__doc__ == 'doc of f'
+        assert lazymod.f(21)() == 42
+        assert lazymod.C().m() == 42
+        code = lazymod.fail.func_code
+        assert code.co_filename.endswith('lazymod.py')
+        assert code.co_consts == (None,)
+        try:
+            lazymod.fail()
+        except ValueError:
+            tb = sys.exc_info()[2]
+            assert tb.tb_next.tb_lineno == 7
@@ -53,6 +53,13 @@ ignored."""
     space.timer.stop("marshal loads")
     return obj
 
+def loads_lazy_code(space, w_str):
+    """Like loads(), but the body of the code objects nested in other code
+    objects is only unmarshalled when they are first used."""
+    u = StringUnmarshaller(space, w_str)
+    u.lazy_code = True
+    return u.load_w_obj()
+
 
 class AbstractReaderWriter(object):
     def __init__(self, space):
@@ -351,6 +358,9 @@ class Unmarshaller(_Base):
         self.space = space
         self.reader = reader
         self.stringtable_w = []
+        self.stringtable_frozen = False
+        self.lazy_code = False      # only supported by StringUnmarshaller
+        self.code_depth = 0
 
     def get(self, n):
         assert n >= 0
@@ -494,6 +504,13 @@ class StringUnmarshaller(Unmarshaller):
         self.bufpos = newpos
         return self.bufstr[pos : newpos]
 
+    def skip(self, n):
+        assert n >= 0
+        newpos = self.bufpos + n
+        if newpos > self.limit:
+            self.raise_eof()
+        self.bufpos = newpos
+
     def get1(self):
         pos = self.bufpos
         if pos >= self.limit:
@@ -531,3 +548,18 @@ class StringUnmarshaller(Unmarshaller):
             return x
         else:
             self.raise_exc('bad marshal data')
+
+
+class CodeBodyUnmarshaller(StringUnmarshaller):
+    """Unmarshaller for the body of a code object which was skipped by
+    a lazy StringUnmarshaller.  The string table was completed by the
+    original unmarshaller, which already saw every interned string."""
+    def __init__(self, space, bufstr, pos, stringtable_w):
+        Unmarshaller.__init__(self, space, None)
+        self.bufstr = bufstr
+        self.bufpos = pos
+        self.limit = len(bufstr)
+        self.stringtable_w = stringtable_w
+        self.stringtable_frozen = True
+        self.lazy_code = True
+        self.code_depth = 1
@@ -1,4 +1,5 @@
 from pypy.module.marshal import interp_marshal
+from pypy.interpreter.pycode import PyCode
 from pypy.interpreter.error import OperationError
 from pypy.conftest import gettestobjspace
 import sys
@@ -61,3 +62,51 @@ class AppTestMarshalSmallLong(AppTestMarshalMore):
         space = gettestobjspace(usemodules=('array',),
                                 **{"objspace.std.withsmalllong": True})
         cls.space = space
+
+
+def test_loads_lazy_code():
+    space = gettestobjspace()
+    w_code = space.appexec([], """():
+        import marshal
+        src = '''
+def f(x, y=1.5):
+    "doc"
+    def g():
+        return [x, 10L, (None, u'u'), {'a': -2}, 2+3j]
+    return g()
+class C:
+    def m(self):
+        return 42
+'''
+        return marshal.dumps(compile(src, 'lazy.py', 'exec'))
+    """)
+    w_code = interp_marshal.loads_lazy_code(space, w_code)
+    code = space.interpclass_w(w_code)
+    assert code.lazy_body is None        # the module body is not lazy
+    f_code, c_code = [const for const in code.co_consts_w
+                      if isinstance(const, PyCode)]
+    assert f_code.co_name == 'f'
+    assert f_code.co_varnames == ['x', 'y', 'g']
+    assert f_code.lazy_body is not None
+    assert f_code.co_code == ''
+    assert c_code.lazy_body is not None
+    f_code.co_filename = 'lazy.py'
+    f_code.update_filename('renamed.py', 'lazy.py')
+    w_res = space.appexec([w_code], """(code):
+        d = {}
+        exec code in d
+        f = d['f']
+        assert f.__doc__ == 'doc'
+        assert d['C']().m() == 42
+        code_type = type(f.func_code)
+        [g_code] = [c for c in f.func_code.co_consts if type(c) is code_type]
+        assert g_code.co_filename == 'renamed.py'
+        return f(5)
+    """)
+    assert space.unwrap(w_res) == [5, 10L, (None, u'u'), {'a': -2}, 2+3j]
+    assert f_code.lazy_body is None
+    assert len(f_code.co_code) > 0
+    # loading it again, as a trace could do, is harmless
+    co_code = f_code.co_code
+    f_code._load_lazy_body()
+    assert f_code.co_code is co_code
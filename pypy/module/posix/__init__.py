@@ -1,6 +1,7 @@
 # Package initialisation
 from pypy.interpreter.mixedmodule import MixedModule
 from pypy.rpython.module.ll_os import RegisterOs
+from pypy.rlib import rspawn
 
 import os, sys
 exec 'import %s as posix' % os.name
@@ -17,7 +18,7 @@ lltype_only_defs = [
     'pipe', 'readlink', 'setegid', 'seteuid', 'setgid', 'setgroups', 'setpgid', 'setpgrp',
     'setregid', 'setreuid', 'setsid', 'setuid', 'stat_float_times', 'statvfs',
     'statvfs_result', 'symlink', 'sysconf', 'sysconf_names', 'tcgetpgrp', 'tcsetpgrp',
-    'ttyname', 'uname', 'wait', 'wait3', 'wait4'
+    'ttyname', 'uname', 'wait', 'wait3', 'wait4', 'posix_spawn'
     ]
 
 # the Win32 urandom implementation isn't going to translate on JVM or CLI so
@@ -125,6 +126,12 @@ corresponding Unix manual entries for more information on calls."""
         interpleveldefs['readlink'] = 'interp_posix.readlink'
     if hasattr(os, 'fork'):
         interpleveldefs['fork'] = 'interp_posix.fork'
+        if sys.platform != 'win32':
+            interpleveldefs['posix_spawn'] = 'interp_posix.posix_spawn'
+            interpleveldefs['POSIX_SPAWN_CLOSE'] = (
+                'space.wrap(%d)' % rspawn.SPAWN_CLOSE)
+            interpleveldefs['POSIX_SPAWN_DUP2'] = (
+                'space.wrap(%d)' % rspawn.SPAWN_DUP2)
     if hasattr(os, 'openpty'):
         interpleveldefs['openpty'] = 'interp_posix.openpty'
     if hasattr(os, 'forkpty'):
@@ -781,6 +781,68 @@ Execute a path with arguments and environment, replacing current process.
     except OSError, e:
         raise wrap_oserror(space, e)
 
+@unwrap_spec(close_fds=bool)
+def posix_spawn(space, w_path, w_args, w_env, w_file_actions=None,
+                w_cwd=None, close_fds=False):
+    """ posix_spawn(path, args, env, file_actions=None, cwd=None,
+                close_fds=False) -> pid
+
+Start the executable 'path' in a new child process, without fork()ing
+the interpreter.  'env' is a dictionary, or None to inherit the current
+environment.  'file_actions' is a sequence of tuples
+(POSIX_SPAWN_CLOSE, fd) or (POSIX_SPAWN_DUP2, fd, new_fd) applied in
+order in the child.  If 'close_fds' is true, all the other file
+descriptors above 2 are then closed.  If 'cwd' is not None, the child
+changes to this directory before executing 'path'.
+"""
+    from pypy.rlib import rspawn
+    path = fsencode_w(space, w_path)
+    args = [fsencode_w(space, w_arg) for w_arg in space.unpackiterable(w_args)]
+    if len(args) < 1:
+        raise OperationError(space.w_ValueError, space.wrap(
+            "posix_spawn() must have at least one argument"))
+    if space.is_w(w_env, space.w_None):
+        env = None
+    else:
+        env = []
+        w_keys = space.call_method(w_env, 'keys')
+        for w_key in space.unpackiterable(w_keys):
+            w_value = space.getitem(w_env, w_key)
+            env.append('%s=%s' % (space.str_w(w_key), space.str_w(w_value)))
+    file_actions = []
+    if w_file_actions is not None and not space.is_w(w_file_actions,
+                                                     space.w_None):
+        for w_action in space.unpackiterable(w_file_actions):
+            items_w = space.fixedview(w_action)
+            if len(items_w) == 0:
+                action = -1
+            else:
+                action = space.int_w(items_w[0])
+            if action == rspawn.SPAWN_CLOSE and len(items_w) == 2:
+                file_actions.append((action, space.int_w(items_w[1]), 0))
+            elif action == rspawn.SPAWN_DUP2 and len(items_w) == 3:
+                file_actions.append((action, space.int_w(items_w[1]),
+                                     space.int_w(items_w[2])))
+            else:
+                raise OperationError(space.w_ValueError, space.wrap(
+                    "invalid file action"))
+    if w_cwd is None or space.is_w(w_cwd, space.w_None):
+        cwd = None
+    else:
+        cwd = fsencode_w(space, w_cwd)
+    try:
+        pid = rspawn.spawn(path, args, env, file_actions, cwd, close_fds)
+    except rspawn.SpawnError, e:
+        if e.step == rspawn.STEP_CHDIR:
+            filename = cwd
+        elif e.step == rspawn.STEP_EXEC:
+            filename = path
+        else:
+            filename = None
+        raise wrap_oserror(space, OSError(e.errno, "posix_spawn failed"),
+                           filename)
+    return space.wrap(pid)
+
 @unwrap_spec(mode=int, path=str)
 def spawnv(space, mode, path, w_args):
     args = [space.str_w(w_arg) for w_arg in space.unpackiterable(w_args)]
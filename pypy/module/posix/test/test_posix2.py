@@ -471,6 +471,33 @@ class AppTestPosix:
                             ['python', '-c', 'raise(SystemExit(42))'])
             assert ret == 42
 
+    if hasattr(__import__(os.name), "fork") and sys.platform != 'win32':
+        def test_posix_spawn(self):
+            os = self.posix
+            r, w = os.pipe()
+            pid = os.posix_spawn('/bin/sh', ['sh', '-c', 'pwd; echo $FOO'],
+                                 {'FOO': 'bar'},
+                                 [(os.POSIX_SPAWN_DUP2, w, 1),
+                                  (os.POSIX_SPAWN_CLOSE, w)],
+                                 cwd=self.pdir, close_fds=True)
+            os.close(w)
+            pid1, status = os.waitpid(pid, 0)
+            assert pid1 == pid and status == 0
+            assert os.read(r, 1000) == self.pdir + '\nbar\n'
+            os.close(r)
+
+        def test_posix_spawn_errors(self):
+            os = self.posix
+            missing = self.pdir + '/does_not_exist'
+            e = raises(OSError, os.posix_spawn, missing, ['x'], None)
+            assert e.value.filename == missing
+            e = raises(OSError, os.posix_spawn, '/bin/sh', ['sh'], None,
+                       cwd=missing)
+            assert e.value.filename == missing
+            raises(ValueError, os.posix_spawn, '/bin/sh', [], None)
+            raises(ValueError, os.posix_spawn, '/bin/sh', ['sh'], None,
+                   [(os.POSIX_SPAWN_DUP2, 0)])
+
     def test_popen(self):
         os = self.posix
         for i in range(5):
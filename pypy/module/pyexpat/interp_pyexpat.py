@@ -391,6 +391,28 @@ def get_expat_version_info(space):
         space.wrap(XML_MINOR_VERSION),
         space.wrap(XML_MICRO_VERSION)])
 
+all_chars = ''.join(chr(i) for i in range(256))
+
+def fill_encoding_map(space, name, info):
+    """Describes the encoding 'name' to expat, which only knows about a few
+    encodings by itself.  Also used by the _elementtree module."""
+    # Yes, supports only 8bit encodings
+    translationmap = space.unicode_w(
+        space.call_method(
+            space.wrap(all_chars), "decode",
+            space.wrap(name), space.wrap("replace")))
+
+    for i in range(256):
+        c = translationmap[i]
+        if c == u'\ufffd':
+            info.c_map[i] = rffi.cast(rffi.INT, -1)
+        else:
+            info.c_map[i] = rffi.cast(rffi.INT, c)
+    info.c_data = lltype.nullptr(rffi.VOIDP.TO)
+    info.c_convert = lltype.nullptr(rffi.VOIDP.TO)
+    info.c_release = lltype.nullptr(rffi.VOIDP.TO)
+    return True
+
 class Cache:
     def __init__(self, space):
         self.w_error = space.new_exception_class("pyexpat.ExpatError")
@@ -546,25 +568,8 @@ getting the advantage of providing document type information to the parser.
 
     sethandler._annspecialcase_ = 'specialize:arg(2)'
 
-    all_chars = ''.join(chr(i) for i in range(256))
-
     def UnknownEncodingHandler(self, space, name, info):
-        # Yes, supports only 8bit encodings
-        translationmap = space.unicode_w(
-            space.call_method(
-                space.wrap(self.all_chars), "decode",
-                space.wrap(name), space.wrap("replace")))
-
-        for i in range(256):
-            c = translationmap[i]
-            if c == u'\ufffd':
-                info.c_map[i] = rffi.cast(rffi.INT, -1)
-            else:
-                info.c_map[i] = rffi.cast(rffi.INT, c)
-        info.c_data = lltype.nullptr(rffi.VOIDP.TO)
-        info.c_convert = lltype.nullptr(rffi.VOIDP.TO)
-        info.c_release = lltype.nullptr(rffi.VOIDP.TO)
-        return True
+        return fill_encoding_map(space, name, info)
 
 
     @unwrap_spec(name=str)
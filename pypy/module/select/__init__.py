@@ -18,6 +18,7 @@ class Module(MixedModule):
     # TODO: this doesn't feel right...
     if hasattr(select, "epoll"):
         interpleveldefs['epoll'] = 'interp_epoll.W_Epoll'
+        interpleveldefs['reactor'] = 'interp_reactor.W_Reactor'
         symbols = [
             "EPOLLIN", "EPOLLOUT", "EPOLLPRI", "EPOLLERR", "EPOLLHUP",
             "EPOLLET", "EPOLLONESHOT", "EPOLLRDNORM", "EPOLLRDBAND",
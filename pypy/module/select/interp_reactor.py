@@ -0,0 +1,391 @@
+"""
+An event loop core built on epoll: handlers of file descriptors, a heap
+of timers and a queue of ready callbacks, all dispatched at interp-level
+so that app-level event loops only have to supply the callbacks.
+"""
+
+from __future__ import with_statement
+
+import errno
+import math
+import time
+
+from pypy.interpreter.baseobjspace import Wrappable
+from pypy.interpreter.gateway import interp2app, unwrap_spec, NoneNotWrapped
+from pypy.interpreter.gateway import applevel
+from pypy.interpreter.error import operationerrfmt
+from pypy.interpreter.error import exception_from_errno
+from pypy.interpreter.typedef import TypeDef, GetSetProperty
+from pypy.rpython.lltypesystem import lltype, rffi
+from pypy.rlib.rposix import get_errno
+from pypy.rlib._rsocket_rffi import FD_SETSIZE
+from pypy.module.select.interp_epoll import W_Epoll, epoll_event, epoll_create
+from pypy.module.select.interp_epoll import epoll_wait
+from pypy.module.select.interp_epoll import EPOLL_CTL_ADD, EPOLL_CTL_MOD
+from pypy.module.select.interp_epoll import EPOLL_CTL_DEL
+
+# number of events fetched by each call to epoll_wait()
+MAXEVENTS = 256
+
+
+class W_Handle(Wrappable):
+    """A callback scheduled with call_soon(), call_later() or call_at()."""
+
+    def __init__(self, reactor, when, seq, w_callback, args_w):
+        self.reactor = reactor
+        self.when = when
+        self.seq = seq
+        self.w_callback = w_callback
+        self.args_w = args_w
+        self.cancelled = False
+        self.in_heap = False
+
+    def lt(self, other):
+        if self.when != other.when:
+            return self.when < other.when
+        return self.seq < other.seq
+
+    def call(self, space):
+        space.call(self.w_callback, space.newtuple(self.args_w))
+
+    def descr_cancel(self, space):
+        if not self.cancelled:
+            self.cancelled = True
+            if self.in_heap:
+                self.reactor.timer_cancelled()
+
+    def descr_get_cancelled(self, space):
+        return space.wrap(self.cancelled)
+
+    def descr_get_when(self, space):
+        return space.wrap(self.when)
+
+W_Handle.typedef = TypeDef("select.reactorhandle",
+    cancel = interp2app(W_Handle.descr_cancel),
+    cancelled = GetSetProperty(W_Handle.descr_get_cancelled),
+    when = GetSetProperty(W_Handle.descr_get_when),
+)
+W_Handle.typedef.acceptable_as_base_class = False
+
+# ____________________________________________________________
+# the timer heap, ordered by (when, seq)
+
+def heap_siftdown(heap, i, handle):
+    # put 'handle' at position 'i' or below, moving smaller children up
+    n = len(heap)
+    while True:
+        child = 2 * i + 1
+        if child >= n:
+            break
+        if child + 1 < n and heap[child + 1].lt(heap[child]):
+            child += 1
+        if not heap[child].lt(handle):
+            break
+        heap[i] = heap[child]
+        i = child
+    heap[i] = handle
+
+def heap_push(heap, handle):
+    heap.append(handle)
+    i = len(heap) - 1
+    while i > 0:
+        parent = (i - 1) >> 1
+        if not handle.lt(heap[parent]):
+            break
+        heap[i] = heap[parent]
+        i = parent
+    heap[i] = handle
+
+def heap_pop(heap):
+    last = heap.pop()
+    if not heap:
+        return last
+    top = heap[0]
+    heap_siftdown(heap, 0, last)
+    return top
+
+def heapify(heap):
+    for i in range(len(heap) // 2 - 1, -1, -1):
+        heap_siftdown(heap, i, heap[i])
+
+# ____________________________________________________________
+
+class W_Reactor(Wrappable):
+    def __init__(self, space, epfd):
+        self.space = space
+        self.epoll = W_Epoll(space, epfd)
+        self.handlers_w = {}
+        self.timers = []
+        self.ready = []
+        self.cancelled_timers = 0
+        self.seq = 0
+        self.stopping = False
+        self.w_hub = space.w_None
+
+    @unwrap_spec(sizehint=int)
+    def descr__new__(space, w_subtype, sizehint=-1):
+        if sizehint == -1:
+            sizehint = FD_SETSIZE - 1
+        elif sizehint < 0:
+            raise operationerrfmt(space.w_ValueError,
+                "sizehint must be greater than zero, got %d", sizehint
+            )
+        epfd = epoll_create(sizehint)
+        if epfd < 0:
+            raise exception_from_errno(space, space.w_IOError)
+        return space.wrap(W_Reactor(space, epfd))
+
+    def timer_cancelled(self):
+        # cancelled timers are left in the heap until they expire, unless
+        # they are more than half of it
+        self.cancelled_timers += 1
+        if (self.cancelled_timers > 64 and
+                self.cancelled_timers * 2 > len(self.timers)):
+            self.timers = [handle for handle in self.timers
+                           if not handle.cancelled]
+            heapify(self.timers)
+            self.cancelled_timers = 0
+
+    def schedule(self, when, w_callback, args_w):
+        self.seq += 1
+        handle = W_Handle(self, when, self.seq, w_callback, args_w)
+        handle.in_heap = True
+        heap_push(self.timers, handle)
+        return handle
+
+    def compute_timeout(self, timeout):
+        # returns the timeout in milliseconds for epoll_wait()
+        if self.ready:
+            return 0
+        if timeout < 0.0:
+            ms = -1
+        else:
+            ms = int(math.ceil(timeout * 1000.0))
+        if self.timers:
+            delay = self.timers[0].when - time.time()
+            if delay <= 0.0:
+                return 0
+            timer_ms = int(math.ceil(delay * 1000.0))
+            if ms < 0 or timer_ms < ms:
+                ms = timer_ms
+        return ms
+
+    def poll(self, space, ms):
+        # returns the list of (fd, events) that are ready
+        with lltype.scoped_alloc(rffi.CArray(epoll_event), MAXEVENTS) as evs:
+            nfds = epoll_wait(self.epoll.epfd, evs, MAXEVENTS, ms)
+            if nfds < 0:
+                if get_errno() != errno.EINTR:
+                    raise exception_from_errno(space, space.w_IOError)
+                nfds = 0
+            fds = [0] * nfds
+            events = [0] * nfds
+            for i in range(nfds):
+                fds[i] = rffi.getintfield(evs[i].c_data, 'c_fd')
+                events[i] = rffi.cast(lltype.Signed, evs[i].c_events)
+        space.getexecutioncontext().checksignals()
+        return fds, events
+
+    def run_once(self, space, timeout):
+        self.epoll.check_closed(space)
+        count = 0
+        fds, events = self.poll(space, self.compute_timeout(timeout))
+        for i in range(len(fds)):
+            # the handler may have been unregistered by a previous callback
+            w_callback = self.handlers_w.get(fds[i], None)
+            if w_callback is not None:
+                space.call_function(w_callback, space.wrap(fds[i]),
+                                    space.wrap(events[i]))
+                count += 1
+        if self.timers:
+            now = time.time()
+            while self.timers and self.timers[0].when <= now:
+                handle = heap_pop(self.timers)
+                handle.in_heap = False
+                if handle.cancelled:
+                    self.cancelled_timers -= 1
+                else:
+                    self.ready.append(handle)
+        # callbacks scheduled by the ones below run on the next iteration
+        ready = self.ready
+        self.ready = []
+        i = 0
+        try:
+            while i < len(ready):
+                handle = ready[i]
+                i += 1
+                if not handle.cancelled:
+                    handle.call(space)
+                    count += 1
+        finally:
+            if i < len(ready):
+                self.ready = ready[i:] + self.ready
+        return count
+
+    def has_work(self):
+        return (len(self.ready) > 0 or len(self.timers) > 0 or
+                len(self.handlers_w) > 0)
+
+    def descr_fileno(self, space):
+        return self.epoll.descr_fileno(space)
+
+    def descr_close(self, space):
+        self.epoll.descr_close(space)
+
+    def descr_get_closed(self, space):
+        return self.epoll.descr_get_closed(space)
+
+    @unwrap_spec(eventmask=int)
+    def descr_register(self, space, w_fd, eventmask, w_callback):
+        self.epoll.check_closed(space)
+        fd = space.c_filedescriptor_w(w_fd)
+        self.epoll.epoll_ctl(space, EPOLL_CTL_ADD, w_fd, eventmask)
+        self.handlers_w[fd] = w_callback
+
+    @unwrap_spec(eventmask=int)
+    def descr_modify(self, space, w_fd, eventmask,
+                     w_callback=NoneNotWrapped):
+        self.epoll.check_closed(space)
+        fd = space.c_filedescriptor_w(w_fd)
+        if fd not in self.handlers_w:
+            raise operationerrfmt(space.w_KeyError,
+                                  "%d is not registered", fd)
+        self.epoll.epoll_ctl(space, EPOLL_CTL_MOD, w_fd, eventmask)
+        if w_callback is not None:
+            self.handlers_w[fd] = w_callback
+
+    def descr_unregister(self, space, w_fd):
+        self.epoll.check_closed(space)
+        fd = space.c_filedescriptor_w(w_fd)
+        if fd not in self.handlers_w:
+            raise operationerrfmt(space.w_KeyError,
+                                  "%d is not registered", fd)
+        del self.handlers_w[fd]
+        self.epoll.epoll_ctl(space, EPOLL_CTL_DEL, w_fd, 0,
+                             ignore_ebadf=True)
+
+    def descr_call_soon(self, space, w_callback, args_w):
+        handle = W_Handle(self, 0.0, 0, w_callback, args_w)
+        self.ready.append(handle)
+        return space.wrap(handle)
+
+    @unwrap_spec(delay=float)
+    def descr_call_later(self, space, delay, w_callback, args_w):
+        return space.wrap(self.schedule(time.time() + delay, w_callback,
+                                        args_w))
+
+    @unwrap_spec(when=float)
+    def descr_call_at(self, space, when, w_callback, args_w):
+        return space.wrap(self.schedule(when, w_callback, args_w))
+
+    def descr_time(self, space):
+        return space.wrap(time.time())
+
+    @unwrap_spec(timeout=float)
+    def descr_run_once(self, space, timeout=-1.0):
+        return space.wrap(self.run_once(space, timeout))
+
+    def descr_run(self, space):
+        self.stopping = False
+        while self.has_work() and not self.stopping:
+            self.run_once(space, -1.0)
+
+    def descr_stop(self, space):
+        self.stopping = True
+
+    def descr_get_hub(self, space):
+        return self.w_hub
+
+    def descr_set_hub(self, space, w_hub):
+        self.w_hub = w_hub
+
+    def descr_spawn(self, space, w_function, args_w):
+        return app_spawn(space, space.wrap(self), w_function,
+                         space.newtuple(args_w))
+
+    @unwrap_spec(eventmask=int)
+    def descr_wait(self, space, w_fd, eventmask):
+        return app_wait(space, space.wrap(self), w_fd, space.wrap(eventmask))
+
+    def descr_sleep(self, space, w_seconds):
+        return app_sleep(space, space.wrap(self), w_seconds)
+
+
+app = applevel(r'''
+def get_hub(reactor):
+    from greenlet import greenlet, getcurrent
+    hub = reactor.hub
+    if hub is None or hub.dead:
+        main = getcurrent()
+        while main.parent is not None:
+            main = main.parent
+        hub = reactor.hub = greenlet(reactor.run, main)
+    return hub
+
+def switch_to_hub(reactor):
+    from greenlet import getcurrent
+    hub = get_hub(reactor)
+    if hub is getcurrent():
+        raise RuntimeError("cannot block in the greenlet of the reactor")
+    return hub.switch()
+
+def spawn(reactor, function, args):
+    from greenlet import greenlet
+    g = greenlet(function, get_hub(reactor))
+    reactor.call_soon(g.switch, *args)
+    return g
+
+def wait(reactor, fd, eventmask):
+    from greenlet import getcurrent
+    reactor.register(fd, eventmask, getcurrent().switch)
+    try:
+        result = switch_to_hub(reactor)
+    finally:
+        reactor.unregister(fd)
+    if not isinstance(result, tuple):
+        raise RuntimeError("the reactor stopped")
+    return result[1]
+
+def sleep(reactor, seconds):
+    from greenlet import getcurrent
+    handle = reactor.call_later(seconds, getcurrent().switch)
+    try:
+        switch_to_hub(reactor)
+    finally:
+        handle.cancel()
+''', filename=__file__)
+
+app_spawn = app.interphook('spawn')
+app_wait = app.interphook('wait')
+app_sleep = app.interphook('sleep')
+
+
+W_Reactor.typedef = TypeDef("select.reactor",
+    __new__ = interp2app(W_Reactor.descr__new__.im_func),
+    __doc__ = """reactor([sizehint=-1]) -> event loop based on epoll
+
+Calls callback(fd, events) for the file descriptors that are registered
+and ready, then the callbacks of the timers that expired, and the ones
+given to call_soon().  With greenlets, spawn() starts a greenlet from
+the loop, and wait() and sleep() switch to the greenlet 'hub' that runs
+the loop until the event happens.""",
+
+    closed = GetSetProperty(W_Reactor.descr_get_closed),
+    fileno = interp2app(W_Reactor.descr_fileno),
+    close = interp2app(W_Reactor.descr_close),
+    register = interp2app(W_Reactor.descr_register),
+    modify = interp2app(W_Reactor.descr_modify),
+    unregister = interp2app(W_Reactor.descr_unregister),
+    call_soon = interp2app(W_Reactor.descr_call_soon),
+    call_later = interp2app(W_Reactor.descr_call_later),
+    call_at = interp2app(W_Reactor.descr_call_at),
+    time = interp2app(W_Reactor.descr_time),
+    run_once = interp2app(W_Reactor.descr_run_once),
+    run = interp2app(W_Reactor.descr_run),
+    stop = interp2app(W_Reactor.descr_stop),
+    hub = GetSetProperty(W_Reactor.descr_get_hub, W_Reactor.descr_set_hub),
+    spawn = interp2app(W_Reactor.descr_spawn),
+    wait = interp2app(W_Reactor.descr_wait),
+    sleep = interp2app(W_Reactor.descr_sleep),
+)
+W_Reactor.typedef.acceptable_as_base_class = False
@@ -0,0 +1,182 @@
+import py
+
+from pypy.conftest import gettestobjspace
+
+
+class BaseReactorTest(object):
+    usemodules = ["select", "_socket", "posix"]
+    continuation = False
+
+    def setup_class(cls):
+        import select
+
+        if not hasattr(select, "epoll"):
+            py.test.skip("test requires linux 2.6")
+        cls.space = gettestobjspace(usemodules=cls.usemodules,
+                                    continuation=cls.continuation)
+
+    def setup_method(self, meth):
+        self.w_sockets = self.space.wrap([])
+
+    def teardown_method(self, meth):
+        for socket in self.space.unpackiterable(self.w_sockets):
+            self.space.call_method(socket, "close")
+
+    def w_socket_pair(self):
+        import socket
+
+        server_socket = socket.socket()
+        server_socket.bind(('127.0.0.1', 0))
+        server_socket.listen(1)
+        client = socket.socket()
+        client.connect(('127.0.0.1', server_socket.getsockname()[1]))
+        server, addr = server_socket.accept()
+        client.setblocking(False)
+        server.setblocking(False)
+
+        self.sockets.extend([server_socket, client, server])
+        return client, server
+
+
+class AppTestReactor(BaseReactorTest):
+
+    def test_create(self):
+        import select
+
+        r = select.reactor()
+        assert r.fileno() > 0
+        assert not r.closed
+        assert r.hub is None
+        r.close()
+        assert r.closed
+        raises(ValueError, r.fileno)
+        raises(ValueError, r.run_once, 0)
+        raises(ValueError, select.reactor, -2)
+
+    def test_callbacks(self):
+        import select
+
+        r = select.reactor()
+        calls = []
+        r.call_soon(calls.append, 1)
+        h = r.call_soon(calls.append, 2)
+        r.call_soon(calls.append, 3)
+        h.cancel()
+        assert h.cancelled
+        def reschedule():
+            calls.append('first')
+            r.call_soon(calls.append, 'next')
+        r.call_soon(reschedule)
+        assert r.run_once(0) == 3
+        assert calls == [1, 3, 'first']
+        assert r.run_once(0) == 1
+        assert calls == [1, 3, 'first', 'next']
+        assert r.run_once(0) == 0
+
+    def test_callback_error(self):
+        import select
+
+        r = select.reactor()
+        calls = []
+        r.call_soon(calls.append, 1)
+        r.call_soon(int, 'x')
+        r.call_soon(calls.append, 2)
+        raises(ValueError, r.run_once, 0)
+        assert calls == [1]
+        r.run_once(0)
+        assert calls == [1, 2]
+
+    def test_timers(self):
+        import select
+
+        r = select.reactor()
+        calls = []
+        # all the timers are relative to the same base time, so that
+        # their order does not depend on how slow the calls below are
+        base = r.time()
+        r.call_at(base + 0.1, calls.append, 'b')
+        r.call_at(base + 0.05, calls.append, 'a')
+        r.call_at(base + 0.05, calls.append, 'a2')
+        h = r.call_at(base + 0.02, calls.append, 'cancelled')
+        assert h.when == base + 0.02
+        h.cancel()
+        r.call_later(10, calls.append, 'never').cancel()
+        def stop():
+            r.stop()
+            r.call_later(0.01, calls.append, 'after stop')
+        r.call_at(base + 0.15, stop)
+        r.run()
+        assert r.time() >= base + 0.15
+        assert calls == ['a', 'a2', 'b']
+        r.run()
+        assert calls == ['a', 'a2', 'b', 'after stop']
+
+    def test_many_cancelled_timers(self):
+        import select
+
+        r = select.reactor()
+        calls = []
+        for i in range(1000):
+            h = r.call_later(1000 + i, calls.append, i)
+            if i != 500:
+                h.cancel()
+        r.call_later(0, calls.append, 'now')
+        r.run_once(0)
+        assert calls == ['now']
+
+    def test_fds(self):
+        import select
+
+        client, server = self.socket_pair()
+        r = select.reactor()
+        events = []
+        def on_event(fd, ev):
+            events.append((fd, ev))
+            if ev & select.EPOLLIN:
+                assert server.recv(100) == 'hello'
+                r.unregister(server)
+        r.register(server, select.EPOLLIN, on_event)
+        raises(IOError, r.register, server, select.EPOLLIN, on_event)
+        assert r.run_once(0) == 0
+        client.send('hello')
+        assert r.run_once(1) == 1
+        assert events == [(server.fileno(), select.EPOLLIN)]
+        raises(KeyError, r.unregister, server)
+        raises(KeyError, r.modify, server, select.EPOLLOUT)
+
+        r.register(client.fileno(), select.EPOLLIN, on_event)
+        r.modify(client, select.EPOLLOUT, lambda fd, ev: events.append(ev))
+        assert r.run_once(1) == 1
+        assert events[-1] == select.EPOLLOUT
+        r.unregister(client)
+        r.run()      # nothing registered any more: returns immediately
+
+
+class AppTestReactorGreenlets(BaseReactorTest):
+    usemodules = BaseReactorTest.usemodules + ["_continuation"]
+    continuation = True
+
+    def test_greenlets(self):
+        import select
+        from greenlet import getcurrent
+
+        client, server = self.socket_pair()
+        r = select.reactor()
+        log = []
+        def reader(tag):
+            log.append(tag)
+            events = r.wait(server, select.EPOLLIN)
+            assert events == select.EPOLLIN
+            log.append(server.recv(100))
+        def writer():
+            r.sleep(0.02)
+            log.append('sending')
+            client.send('data')
+        g1 = r.spawn(reader, 'waiting')
+        g2 = r.spawn(writer)
+        assert r.hub.parent is getcurrent()
+        assert g1.parent is r.hub
+        # the hub runs the loop until there is nothing left to do
+        r.hub.switch()
+        assert log == ['waiting', 'sending', 'data']
+        assert g1.dead and g2.dead and r.hub.dead
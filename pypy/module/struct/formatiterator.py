@@ -164,3 +164,34 @@ class UnpackFormatIterator(FormatIterator):
     @specialize.argtype(1)
     def appendobj(self, value):
         self.result_w.append(self.space.wrap(value))
+
+
+class UnpackBufferFormatIterator(UnpackFormatIterator):
+    """Unpacks directly from a Buffer, starting at 'offset', without first
+    copying the bytes of the whole record into an intermediate string.
+    The format table still reads each field as a string of its size."""
+
+    def __init__(self, space, buf, offset):
+        assert offset >= 0
+        self.space = space
+        self.buf = buf
+        self.start = offset
+        self.inputpos = offset
+        self.result_w = []     # list of wrapped objects
+
+    def align(self, mask):
+        # the alignment is relative to the start of the record
+        pos = self.inputpos - self.start
+        assert pos >= 0
+        self.inputpos = self.start + ((pos + mask) & ~mask)
+
+    def finished(self):
+        pass
+
+    def read(self, count):
+        end = self.inputpos + count
+        if end > self.buf.getlength():
+            raise StructError("unpack str size too short for format")
+        s = self.buf.getslice(self.inputpos, end, 1, count)
+        self.inputpos = end
+        return s
@@ -1,35 +1,243 @@
-from pypy.interpreter.gateway import unwrap_spec
+from pypy.interpreter.baseobjspace import Wrappable
+from pypy.interpreter.error import OperationError
+from pypy.interpreter.gateway import interp2app, unwrap_spec
+from pypy.interpreter.typedef import TypeDef, GetSetProperty
+from pypy.interpreter.typedef import interp_attrproperty
 from pypy.module.struct.formatiterator import PackFormatIterator, UnpackFormatIterator
+from pypy.module.struct.formatiterator import UnpackBufferFormatIterator
+from pypy.rlib import jit
 from pypy.rlib.rstruct.error import StructError
-from pypy.rlib.rstruct.formatiterator import CalcSizeFormatIterator
+from pypy.rlib.rstruct.formatiterator import compile_format
 
 
-@unwrap_spec(format=str)
-def calcsize(space, format):
-    fmtiter = CalcSizeFormatIterator()
+# Like CPython, keep the compiled form of the most recently used format
+# strings, and flush the whole cache when it reaches this number of entries.
+MAX_CACHED_PLANS = 100
+
+class PlanCache(object):
+    def __init__(self, space):
+        self.plans = {}
+
+@jit.elidable
+def get_plan(space, format):
+    cache = space.fromcache(PlanCache)
     try:
-        fmtiter.interpret(format)
+        return cache.plans[format]
+    except KeyError:
+        pass
+    plan = compile_format(format)     # may raise StructError
+    if len(cache.plans) >= MAX_CACHED_PLANS:
+        cache.plans.clear()
+    cache.plans[format] = plan
+    return plan
+
+def _get_plan(space, format):
+    try:
+        return get_plan(space, format)
     except StructError, e:
         raise e.at_applevel(space)
-    return space.wrap(fmtiter.totalsize)
 
+# ____________________________________________________________
 
-@unwrap_spec(format=str)
-def pack(space, format, args_w):
+def _pack(space, plan, args_w):
     fmtiter = PackFormatIterator(space, args_w)
     try:
-        fmtiter.interpret(format)
+        fmtiter.interpret_plan(plan)
     except StructError, e:
         raise e.at_applevel(space)
-    result = ''.join(fmtiter.result)
-    return space.wrap(result)
+    return fmtiter.result
 
+def _pack_into(space, plan, w_buffer, offset, args_w):
+    buf = space.rwbuffer_w(w_buffer)
+    buflen = buf.getlength()
+    if offset < 0:
+        offset += buflen
+    if offset < 0 or buflen - offset < plan.size:
+        raise StructError("pack_into requires a buffer of at least %d bytes"
+                          % (plan.size,)).at_applevel(space)
+    # the format table appends the packed characters to a list, which
+    # is copied into the buffer in one setslice()
+    result = _pack(space, plan, args_w)
+    buf.setslice(offset, ''.join(result))
 
-@unwrap_spec(format=str, input='bufferstr')
-def unpack(space, format, input):
+def _unpack(space, plan, input):
     fmtiter = UnpackFormatIterator(space, input)
     try:
-        fmtiter.interpret(format)
+        fmtiter.interpret_plan(plan)
+    except StructError, e:
+        raise e.at_applevel(space)
+    return space.newtuple(fmtiter.result_w[:])
+
+def _unpack_buffer(space, plan, buf, offset):
+    fmtiter = UnpackBufferFormatIterator(space, buf, offset)
+    try:
+        fmtiter.interpret_plan(plan)
     except StructError, e:
         raise e.at_applevel(space)
     return space.newtuple(fmtiter.result_w[:])
+
+def _unpack_from(space, plan, w_buffer, offset):
+    buf = space.buffer_w(w_buffer)
+    buflen = buf.getlength()
+    if offset < 0:
+        offset += buflen
+    if offset < 0 or buflen - offset < plan.size:
+        raise StructError("unpack_from requires a buffer of at least %d bytes"
+                          % (plan.size,)).at_applevel(space)
+    return _unpack_buffer(space, plan, buf, offset)
+
+def _iter_unpack(space, plan, w_buffer):
+    buf = space.buffer_w(w_buffer)
+    if plan.size == 0:
+        raise StructError("cannot iteratively unpack with a struct of "
+                          "length 0").at_applevel(space)
+    if buf.getlength() % plan.size != 0:
+        raise StructError("iterative unpacking requires a buffer of a "
+                          "multiple of %d bytes" % (plan.size,)
+                          ).at_applevel(space)
+    return space.wrap(W_UnpackIter(space, plan, buf))
+
+# ____________________________________________________________
+
+@unwrap_spec(format=str)
+def calcsize(space, format):
+    return space.wrap(_get_plan(space, format).size)
+
+
+@unwrap_spec(format=str)
+def pack(space, format, args_w):
+    result = _pack(space, _get_plan(space, format), args_w)
+    return space.wrap(''.join(result))
+
+
+@unwrap_spec(format=str, input='bufferstr')
+def unpack(space, format, input):
+    return _unpack(space, _get_plan(space, format), input)
+
+
+@unwrap_spec(format=str, offset=int)
+def pack_into(space, format, w_buffer, offset, args_w):
+    """Pack the values v1, v2, ... according to format, write the packed
+bytes into the writable buffer buf starting at offset."""
+    _pack_into(space, _get_plan(space, format), w_buffer, offset, args_w)
+
+
+@unwrap_spec(format=str, offset=int)
+def unpack_from(space, format, w_buffer, offset=0):
+    """Unpack the buffer, containing packed C structure data, according to
+format, starting at offset. Requires len(buffer[offset:]) >= calcsize(fmt)."""
+    return _unpack_from(space, _get_plan(space, format), w_buffer, offset)
+
+
+@unwrap_spec(format=str)
+def iter_unpack(space, format, w_buffer):
+    """Return an iterator yielding tuples unpacked from the given bytes
+source according to the format string, like a repeated invocation of
+unpack_from().  Requires that the bytes length be a multiple of the
+format struct size."""
+    return _iter_unpack(space, _get_plan(space, format), w_buffer)
+
+# ____________________________________________________________
+
+class W_Struct(Wrappable):
+    _immutable_fields_ = ['format', 'plan']
+
+    def __init__(self, space, format, plan):
+        self.space = space
+        self.format = format
+        self.plan = plan
+
+    def descr_get_size(self, space):
+        return space.wrap(self.plan.size)
+
+    def descr_pack(self, space, args_w):
+        """Return a string containing values v1, v2, ... packed according
+to this Struct's format. See struct.__doc__ for more on format strings."""
+        return space.wrap(''.join(_pack(space, self.plan, args_w)))
+
+    @unwrap_spec(offset=int)
+    def descr_pack_into(self, space, w_buffer, offset, args_w):
+        """Pack the values v1, v2, ... according to this Struct's format, write
+the packed bytes into the writable buffer buf starting at offset."""
+        _pack_into(space, self.plan, w_buffer, offset, args_w)
+
+    @unwrap_spec(input='bufferstr')
+    def descr_unpack(self, space, input):
+        """Return tuple containing values unpacked according to this Struct's
+format. Requires len(str) == self.size."""
+        if len(input) != self.plan.size:
+            raise StructError("unpack requires a string argument of "
+                              "length %d" % (self.plan.size,)
+                              ).at_applevel(space)
+        return _unpack(space, self.plan, input)
+
+    @unwrap_spec(offset=int)
+    def descr_unpack_from(self, space, w_buffer, offset=0):
+        """Return tuple containing values unpacked according to this Struct's
+format. Unlike unpack, unpack_from can unpack values from any object
+supporting the buffer API, not just str. Requires
+len(buffer[offset:]) >= self.size."""
+        return _unpack_from(space, self.plan, w_buffer, offset)
+
+    def descr_iter_unpack(self, space, w_buffer):
+        """Return an iterator yielding tuples unpacked from the given bytes
+source, like a repeated invocation of unpack_from().  Requires that the
+bytes length be a multiple of the struct size."""
+        return _iter_unpack(space, self.plan, w_buffer)
+
+
+@unwrap_spec(format=str)
+def W_Struct___new__(space, w_subtype, format):
+    plan = _get_plan(space, format)
+    w_struct = space.allocate_instance(W_Struct, w_subtype)
+    W_Struct.__init__(w_struct, space, format, plan)
+    return space.wrap(w_struct)
+
+W_Struct.typedef = TypeDef(
+    'Struct',
+    __module__ = 'struct',
+    __doc__ = """Struct(fmt) --> compiled struct object
+
+Return a new Struct object which writes and reads binary data according to
+the format string fmt.  See help(struct) for more on format strings.""",
+    __new__ = interp2app(W_Struct___new__),
+    format = interp_attrproperty('format', cls=W_Struct),
+    size = GetSetProperty(W_Struct.descr_get_size),
+    pack = interp2app(W_Struct.descr_pack),
+    pack_into = interp2app(W_Struct.descr_pack_into),
+    unpack = interp2app(W_Struct.descr_unpack),
+    unpack_from = interp2app(W_Struct.descr_unpack_from),
+    iter_unpack = interp2app(W_Struct.descr_iter_unpack),
+    )
+
+# ____________________________________________________________
+
+class W_UnpackIter(Wrappable):
+    def __init__(self, space, plan, buf):
+        self.space = space
+        self.plan = plan
+        self.buf = buf
+        self.index = 0
+
+    def descr_iter(self, space):
+        return space.wrap(self)
+
+    def descr_next(self, space):
+        if self.index >= self.buf.getlength():
+            raise OperationError(space.w_StopIteration, space.w_None)
+        w_result = _unpack_buffer(space, self.plan, self.buf, self.index)
+        self.index += self.plan.size
+        return w_result
+
+    def descr_length_hint(self, space):
+        remaining = self.buf.getlength() - self.index
+        return space.wrap(remaining // self.plan.size)
+
+W_UnpackIter.typedef = TypeDef(
+    'unpack_iterator',
+    __module__ = 'struct',
+    __iter__ = interp2app(W_UnpackIter.descr_iter),
+    next = interp2app(W_UnpackIter.descr_next),
+    __length_hint__ = interp2app(W_UnpackIter.descr_length_hint),
+    )
+W_UnpackIter.typedef.acceptable_as_base_class = False
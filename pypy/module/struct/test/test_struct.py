@@ -386,6 +386,46 @@ class AppTestStruct(object):
         raises(self.struct.error, self.struct.unpack, "i", b)
 
 
+    def test_Struct(self):
+        """
+        Struct objects parse their format once and keep it.
+        """
+        s = self.struct.Struct("<ihc")
+        assert s.format == "<ihc"
+        assert s.size == 7
+        data = s.pack(1, -2, 'x')
+        assert data == self.struct.pack("<ihc", 1, -2, 'x')
+        assert s.unpack(data) == (1, -2, 'x')
+        raises(self.struct.error, s.unpack, data + 'y')
+        raises(self.struct.error, s.pack, 1, 2)
+        raises(self.struct.error, self.struct.Struct, "3")
+        raises(TypeError, self.struct.Struct)
+        class MyStruct(self.struct.Struct):
+            pass
+        assert MyStruct("i").unpack_from("\x00" * 8, 4) == (0,)
+
+
+    def test_unpack_from_str(self):
+        """
+        unpack_from() and iter_unpack() accept strings, and the alignment
+        of native formats is relative to the offset.
+        """
+        unpack_from = self.struct.unpack_from
+        data = self.struct.pack("ci", 'a', 42)
+        assert unpack_from("ci", "xyz" + data, 3) == ('a', 42)
+        assert unpack_from("ci", data + "xyz", -len(data) - 3) == ('a', 42)
+        raises(self.struct.error, unpack_from, "ci", data, 1)
+        raises(self.struct.error, unpack_from, "ci", data, -len(data) - 1)
+        s = self.struct.Struct("<hc")
+        it = s.iter_unpack("\x01\x00a\x02\x00b")
+        assert it.__length_hint__() == 2
+        assert list(it) == [(1, 'a'), (2, 'b')]
+        assert list(it) == []
+        assert list(self.struct.iter_unpack("<h", "")) == []
+        raises(self.struct.error, s.iter_unpack, "\x01\x00")
+        raises(self.struct.error, self.struct.iter_unpack, "", "")
+
+
 class AppTestStructBuffer(object):
 
     def setup_class(cls):
@@ -417,3 +457,15 @@ class AppTestStructBuffer(object):
         assert self.struct.unpack_from("ii", b, 2) == (17, 42)
         b[:sz] = self.struct.pack("ii", 18, 43)
         assert self.struct.unpack_from("ii", b) == (18, 43)
+
+    def test_pack_into_Struct(self):
+        b = self.bytebuffer(10)
+        s = self.struct.Struct("<hh")
+        s.pack_into(b, 1, 1, 2)
+        s.pack_into(b, -4, 3, 4)
+        assert b[:] == '\x00\x01\x00\x02\x00\x00\x03\x00\x04\x00'
+        raises(self.struct.error, s.pack_into, b, 7, 1, 2)
+        raises(self.struct.error, s.pack_into, b, -11, 1, 2)
+        raises(TypeError, s.pack_into, "abcdefghij", 0, 1, 2)
+        assert s.unpack_from(b, 6) == (3, 4)
+        assert list(s.iter_unpack(b[:8])) == [(256, 512), (0, 3)]
@@ -15,6 +15,7 @@ class Module(MixedModule):
             del self.__class__.interpleveldefs['pypy_getudir']
         super(Module, self).__init__(space, w_name) 
         self.recursionlimit = 100
+        self.switchinterval = 0.005
         self.w_default_encoder = None
         self.defaultencoding = "ascii"
         self.filesystemencoding = None
@@ -52,6 +53,8 @@ class Module(MixedModule):
         'getrecursionlimit'     : 'vm.getrecursionlimit', 
         'setcheckinterval'      : 'vm.setcheckinterval', 
         'getcheckinterval'      : 'vm.getcheckinterval', 
+        'setswitchinterval'     : 'vm.setswitchinterval',
+        'getswitchinterval'     : 'vm.getswitchinterval',
         'exc_info'              : 'vm.exc_info', 
         'exc_clear'             : 'vm.exc_clear', 
         'settrace'              : 'vm.settrace',
@@ -350,6 +350,18 @@ class AppTestSysModulePortedFromCPython:
             sys.setcheckinterval(n)
             assert sys.getcheckinterval() == n
 
+    def test_switchinterval(self):
+        import sys
+        orig = sys.getswitchinterval()
+        assert orig == 0.005
+        raises(ValueError, sys.setswitchinterval, 0.0)
+        raises(ValueError, sys.setswitchinterval, -1.0)
+        try:
+            sys.setswitchinterval(0.02)
+            assert sys.getswitchinterval() == 0.02
+        finally:
+            sys.setswitchinterval(orig)
+
     def test_recursionlimit(self):
         import sys
         raises(TypeError, sys.getrecursionlimit, 42)
@@ -15,6 +15,7 @@ class Module(MixedModule):
         'interrupt_main':         'os_thread.interrupt_main',
         'stack_size':             'os_thread.stack_size',
         '_count':                 'os_thread._count',
+        '_gil_wait_stats':        'os_thread._gil_wait_stats',
         'allocate_lock':          'os_lock.allocate_lock',
         'allocate':               'os_lock.allocate_lock',  # obsolete synonym
         'LockType':               'os_lock.Lock',
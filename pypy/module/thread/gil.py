@@ -55,12 +55,14 @@ class GILThreadLocals(OSThreadLocals):
         do_yield_thread()
 
 class GILReleaseAction(PeriodicAsyncAction):
-    """An action called every sys.checkinterval bytecodes.  It releases
-    the GIL to give some other thread a chance to run.
+    """An action called every sys.checkinterval bytecodes.  If another
+    thread has been waiting for the GIL for longer than the switch
+    interval (see sys.setswitchinterval()), it hands the GIL over to it.
     """
 
     def perform(self, executioncontext, frame):
-        do_yield_thread()
+        if thread.gil_drop_requested():
+            do_yield_thread()
 
 
 class SpaceState:
@@ -19,6 +19,9 @@ eci = ExternalCompilationInfo(
                       'RPyThreadAcquireLock', 'RPyThreadReleaseLock',
                       'RPyGilAllocate', 'RPyGilYieldThread',
                       'RPyGilRelease', 'RPyGilAcquire',
+                      'RPyGilDropRequested', 'RPyGilSetSwitchInterval',
+                      'RPyGilGetSwitchInterval', 'RPyGilGetWaitCount',
+                      'RPyGilGetWaitTime',
                       'RPyThreadGetStackSize', 'RPyThreadSetStackSize',
                       'RPyOpaqueDealloc_ThreadLock',
                       'RPyThreadAfterFork']
@@ -80,6 +83,19 @@ gil_release      = llexternal('RPyGilRelease', [], lltype.Void,
                               _nowrapper=True)
 gil_acquire      = llexternal('RPyGilAcquire', [], lltype.Void,
                               _nowrapper=True)
+gil_drop_requested = llexternal('RPyGilDropRequested', [], lltype.Signed,
+                                _nowrapper=True)
+gil_set_switch_interval = llexternal('RPyGilSetSwitchInterval',
+                                     [lltype.Signed], lltype.Void,
+                                     _nowrapper=True)
+gil_get_switch_interval = llexternal('RPyGilGetSwitchInterval', [],
+                                     lltype.Signed, _nowrapper=True)
+# statistics of the current thread: number of times and total number of
+# seconds it had to wait for the GIL
+gil_get_wait_count = llexternal('RPyGilGetWaitCount', [], lltype.Signed,
+                                _nowrapper=True)
+gil_get_wait_time = llexternal('RPyGilGetWaitTime', [], rffi.DOUBLE,
+                               _nowrapper=True)
 
 def allocate_lock():
     return Lock(allocate_ll_lock())
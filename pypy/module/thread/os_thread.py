@@ -239,6 +239,13 @@ This function is meant for internal and specialized purposes only.
 In most applications `threading.enumerate()` should be used instead."""
     return space.wrap(bootstrapper.nbthreads)
 
+def _gil_wait_stats(space):
+    """_gil_wait_stats() -> (waits, seconds)
+Return how many times the current thread had to wait for the global
+interpreter lock, and the total time in seconds it spent waiting."""
+    return space.newtuple([space.wrap(thread.gil_get_wait_count()),
+                           space.wrap(thread.gil_get_wait_time())])
+
 def exit(space):
     """This is synonymous to ``raise SystemExit''.  It will cause the current
 thread to exit silently unless the exception is caught."""
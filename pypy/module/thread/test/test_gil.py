@@ -104,6 +104,47 @@ class GILTests(test_ll_thread.AbstractGCTestClass):
     def test_one_thread_rev(self):
         self.test_one_thread(skew=-1)
 
+    def test_drop_request(self):
+        # a thread waiting for the GIL asks the holder to drop it after
+        # the switch interval, and yield_thread() then hands it over
+        space = FakeSpace()
+        class State:
+            pass
+        state = State()
+        def bootstrap():
+            try:
+                state.switched = True
+                state.waits = thread.gil_get_wait_count()
+                state.wait_time = thread.gil_get_wait_time()
+            finally:
+                thread.gc_thread_die()
+        def f():
+            state.switched = False
+            state.waits = 0
+            state.wait_time = 0.0
+            state.threadlocals = gil.GILThreadLocals()
+            state.threadlocals.setup_threads(space)
+            thread.gil_set_switch_interval(20000)
+            assert thread.gil_get_switch_interval() == 20000
+            thread.gc_thread_prepare()
+            thread.start_new_thread(bootstrap, ())
+            start = time.time()
+            while not thread.gil_drop_requested():
+                if time.time() - start > 30.0:
+                    raise ValueError("time out")
+            requested = time.time() - start
+            state.threadlocals.yield_thread()
+            assert not thread.gil_drop_requested()
+            assert state.switched
+            assert state.waits >= 1
+            assert state.wait_time >= 0.015
+            thread.gil_set_switch_interval(5000)
+            return int(requested >= 0.015)
+
+        fn = self.getcompiled(f, [])
+        res = fn()
+        assert res == 1
+
 
 class TestRunDirectly(GILTests):
     def getcompiled(self, f, argtypes):
@@ -53,6 +53,23 @@ class AppTestThread(GenericTestThread):
         please_start.append(1)  # trigger
         # XXX joining a thread seems difficult at applevel.
 
+    def test_gil_wait_stats(self):
+        import thread, time
+        feedback = []
+        def f():
+            end = time.time() + 0.1
+            while time.time() < end:
+                pass
+            feedback.append(thread._gil_wait_stats())
+        waits, seconds = thread._gil_wait_stats()
+        assert isinstance(waits, int) and isinstance(seconds, float)
+        thread.start_new_thread(f, ())
+        self.waitfor(lambda: feedback)
+        waits2, seconds2 = thread._gil_wait_stats()
+        assert waits2 >= waits and seconds2 >= seconds
+        waits, seconds = feedback[0]
+        assert waits >= 0 and seconds >= 0.0
+
     def test_start_new_thread_args(self):
         import thread
         def f():
@@ -6,7 +6,7 @@ from pypy.interpreter.typedef import TypeDef, GetSetProperty
 from pypy.interpreter.module import Module
 from pypy.module.imp import importing
 from pypy.rlib.unroll import unrolling_iterable
-from pypy.rlib.rzipfile import RZipFile, BadZipfile
+from pypy.rlib.rzipfile import RMMapZipFile, BadZipfile
 import os
 import stat
 
@@ -52,10 +52,14 @@ class W_ZipCache(Wrappable):
             raise OperationError(space.w_KeyError, space.wrap(name))
         assert isinstance(w_zipimporter, W_ZipImporter)
         w = space.wrap
-        values = {}
         w_d = space.newdict()
-        for key, info in w_zipimporter.zip_file.NameToInfo.iteritems():
-            w_values = space.newdict()
+        zip_file = w_zipimporter.zip_file
+        for key in zip_file.namelist():
+            try:
+                info = zip_file.getinfo(key)
+            except BadZipfile:
+                raise operationerrfmt(get_error(space),
+                    "%s seems not to be a zipfile", zip_file.filename)
             space.setitem(w_d, w(key), space.newtuple([
                 w(info.filename), w(info.compress_type), w(info.compress_size),
                 w(info.file_size), w(info.file_offset), w(info.dostime),
@@ -154,9 +158,9 @@ class W_ZipImporter(Wrappable):
     def _parse_mtime(self, space, filename):
         w = space.wrap
         try:
-            info = self.zip_file.NameToInfo[filename]
+            info = self.zip_file.getinfo(filename)
             t = info.date_time
-        except KeyError:
+        except (KeyError, BadZipfile):
             return 0
         else:
             w_mktime = space.getattr(space.getbuiltinmodule('time'),
@@ -190,14 +194,21 @@ class W_ZipImporter(Wrappable):
             return False
         return True
 
-    def import_pyc_file(self, space, modname, filename, buf, pkgpath):
+    def read_pyc_header(self, filename):
+        header = self.zip_file.read_header(filename, 8)
+        if len(header) < 8:
+            raise BadZipfile, "Truncated .pyc file %s" % filename
+        return importing._get_long(header[:4]), importing._get_long(header[4:8])
+
+    def import_pyc_file(self, space, modname, filename, pkgpath):
         w = space.wrap
-        magic = importing._get_long(buf[:4])
-        timestamp = importing._get_long(buf[4:8])
+        magic, timestamp = self.read_pyc_header(filename)
         if not self.can_use_pyc(space, filename, magic, timestamp):
+            buf = self.zip_file.read(filename)
             return self.import_py_file(space, modname, filename[:-1], buf,
                                        pkgpath)
-        buf = buf[8:] # XXX ugly copy, should use sequential read instead
+        # read the code after the header directly from the file
+        buf = self.zip_file.read(filename, 8)
         w_mod = w(Module(space, w(modname)))
         real_name = self.filename + os.path.sep + self.corr_zname(filename)
         space.setattr(w_mod, w('__loader__'), space.wrap(self))
@@ -210,11 +221,7 @@ class W_ZipImporter(Wrappable):
     def have_modulefile(self, space, filename):
         if ZIPSEP != os.path.sep:
             filename = filename.replace(os.path.sep, ZIPSEP)
-        try:
-            self.zip_file.NameToInfo[filename]
-            return True
-        except KeyError:
-            return False
+        return self.zip_file.contains(filename)
 
     @unwrap_spec(fullname=str)
     def find_module(self, space, fullname, w_path=None):
@@ -244,58 +251,62 @@ class W_ZipImporter(Wrappable):
         last_exc = None
         for compiled, is_package, ext in ENUMERATE_EXTS:
             fname = filename + ext
+            if not self.zip_file.contains(fname):
+                continue
+            if is_package:
+                pkgpath = (self.filename + os.path.sep +
+                           self.corr_zname(filename))
+            else:
+                pkgpath = None
             try:
-                buf = self.zip_file.read(fname)
+                if compiled:
+                    return self.import_pyc_file(space, fullname, fname,
+                                                pkgpath)
+                else:
+                    buf = self.zip_file.read(fname)
+                    return self.import_py_file(space, fullname, fname,
+                                               buf, pkgpath)
             except (KeyError, OSError, BadZipfile):
                 pass
-            else:
-                if is_package:
-                    pkgpath = (self.filename + os.path.sep +
-                               self.corr_zname(filename))
-                else:
-                    pkgpath = None
-                try:
-                    if compiled:
-                        return self.import_pyc_file(space, fullname, fname,
-                                                    buf, pkgpath)
-                    else:
-                        return self.import_py_file(space, fullname, fname,
-                                                   buf, pkgpath)
-                except OperationError, e:
-                    last_exc = e
-                    w_mods = space.sys.get('modules')
+            except OperationError, e:
+                last_exc = e
+                w_mods = space.sys.get('modules')
                 space.call_method(w_mods, 'pop', w(fullname), space.w_None)
         if last_exc:
             raise OperationError(get_error(space), last_exc.get_w_value(space))
         # should never happen I think
         return space.w_None
 
-    @unwrap_spec(filename=str)
-    def get_data(self, space, filename):
-        filename = self._find_relative_path(filename)
-        w = space.wrap
+    def read_data(self, space, filename, start=0):
         try:
-            data = self.zip_file.read(filename)
-            return w(data)
+            return self.zip_file.read(filename, start)
         except (KeyError, OSError, BadZipfile):
             raise OperationError(space.w_IOError, space.wrap("Error reading file"))
 
+    @unwrap_spec(filename=str)
+    def get_data(self, space, filename):
+        filename = self._find_relative_path(filename)
+        return space.wrap(self.read_data(space, filename))
+
     @unwrap_spec(fullname=str)
     def get_code(self, space, fullname):
         filename = self.make_filename(fullname)
         for compiled, _, ext in ENUMERATE_EXTS:
             if self.have_modulefile(space, filename + ext):
-                w_source = self.get_data(space, filename + ext)
-                source = space.str_w(w_source)
                 if compiled:
-                    magic = importing._get_long(source[:4])
-                    timestamp = importing._get_long(source[4:8])
+                    try:
+                        magic, timestamp = self.read_pyc_header(filename + ext)
+                    except (KeyError, BadZipfile):
+                        raise OperationError(space.w_IOError,
+                                             space.wrap("Error reading file"))
                     if not self.can_use_pyc(space, filename + ext,
                                             magic, timestamp):
                         continue
                     code_w = importing.read_compiled_module(
-                        space, filename + ext, source[8:])
+                        space, filename + ext,
+                        self.read_data(space, filename + ext, 8))
                 else:
+                    source = self.read_data(space, filename + ext)
                     co_filename = self.make_co_filename(filename+ext)
                     code_w = importing.parse_source_module(
                         space, co_filename, source)
@@ -374,7 +385,7 @@ def descr_new_zipimporter(space, w_type, name):
     except KeyError:
         zip_cache.cache[filename] = None
     try:
-        zip_file = RZipFile(filename, 'r')
+        zip_file = RMMapZipFile(filename)
     except (BadZipfile, OSError):
         raise operationerrfmt(get_error(space),
             "%s seems not to be a zipfile", filename)
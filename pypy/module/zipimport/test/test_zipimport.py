@@ -151,6 +151,18 @@ class AppTestZipimport:
         # this should work as well :-/
         zipimporter(os.path.join(self.zipfile, 'x'))
 
+    def test_corrupt_local_header(self):
+        from zipimport import zipimporter, ZipImportError
+        self.writefile("x.py", "y")
+        f = open(self.zipfile, "rb")
+        data = f.read()
+        f.close()
+        assert data.startswith("PK\x03\x04")
+        f = open(self.zipfile, "wb")
+        f.write("XX" + data[2:])
+        f.close()
+        raises(ZipImportError, zipimporter, self.zipfile)
+
     def test_py(self):
         import sys, os
         self.writefile("uuu.py", "def f(x): return x")
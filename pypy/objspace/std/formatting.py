@@ -263,14 +263,23 @@ def make_formatter_subclass(do_unicode):
                 self.forward()
 
         # Same as getmappingkey
-        @jit.unroll_safe
         def peel_num(self):
-            space = self.space
             c = self.peekchr()
             if c == '*':
                 self.forward()
-                w_value = self.nextinputvalue()
-                return space.int_w(maybe_int(space, w_value))
+                return self.nextstarvalue()
+            return self.peel_digits()
+
+        def nextstarvalue(self):
+            space = self.space
+            w_value = self.nextinputvalue()
+            return space.int_w(maybe_int(space, w_value))
+
+        # Same as getmappingkey
+        @jit.unroll_safe
+        def peel_digits(self):
+            space = self.space
+            c = self.peekchr()
             result = 0
             while True:
                 n = ord(c) - ord('0')
@@ -285,14 +294,148 @@ def make_formatter_subclass(do_unicode):
                 c = self.peekchr()
             return result
 
-        @jit.look_inside_iff(lambda self: jit.isconstant(self.fmt))
         def format(self):
+            plan = get_format_plan(self.space, self.fmt)
+            if plan is None:
+                return self.format_unplanned()
+            return self.format_plan(plan)
+
+        def new_result_builder(self):
             lgt = len(self.fmt) + 4 * len(self.values_w) + 10
             if do_unicode:
                 result = UnicodeBuilder(lgt)
             else:
                 result = StringBuilder(lgt)
             self.result = result
+            return result
+
+        # the plan comes from the elidable get_format_plan(), so it is a
+        # constant when self.fmt is
+        @jit.look_inside_iff(lambda self, plan: jit.isconstant(self.fmt))
+        def format_plan(self, plan):
+            result = self.new_result_builder()
+            specs = plan.specs
+            for i in range(len(specs)):
+                literal = plan.literals[i]
+                if literal:
+                    result.append(literal)
+                spec = specs[i]
+                if spec.key is not None:
+                    w_value = self.getmappingvalue(spec.key)
+                else:
+                    w_value = None
+                self.f_ljust = spec.f_ljust
+                self.f_sign  = spec.f_sign
+                self.f_blank = spec.f_blank
+                self.f_alt   = spec.f_alt
+                self.f_zero  = spec.f_zero
+                if spec.width_star:
+                    self.width = self.nextstarvalue()
+                    if self.width < 0:
+                        self.f_ljust = True
+                        self.width = -self.width
+                else:
+                    self.width = spec.width
+                if spec.prec_star:
+                    self.prec = self.nextstarvalue()
+                    if self.prec < 0:
+                        self.prec = 0
+                else:
+                    self.prec = spec.prec
+                c = spec.char
+                if c == '%':
+                    self.std_wp(const('%'))
+                    continue
+                if w_value is None:
+                    w_value = self.nextinputvalue()
+                for c1 in FORMATTER_CHARS:
+                    if c == c1:
+                        do_fmt = getattr(self, 'fmt_' + c1)
+                        do_fmt(w_value)
+                        break
+                else:
+                    self.fmtpos = spec.fmtpos
+                    self.unknown_fmtchar()
+            literal = plan.literals[len(specs)]
+            if literal:
+                result.append(literal)
+            self.checkconsumed()
+            return result.build()
+
+        def compile_plan(self):
+            """Parse the whole format string into a FormatPlan.  Returns
+            None if the format string is malformed: in this case the
+            error must be reported by format_unplanned(), at the point
+            where it is reached."""
+            fmt = self.fmt
+            literals = []
+            specs = []
+            if do_unicode:
+                literal = UnicodeBuilder()
+            else:
+                literal = StringBuilder()
+            try:
+                while True:
+                    i = i0 = self.fmtpos
+                    while i < len(fmt):
+                        if fmt[i] == '%':
+                            break
+                        i += 1
+                    else:
+                        literal.append_slice(fmt, i0, len(fmt))
+                        break
+                    literal.append_slice(fmt, i0, i)
+                    self.fmtpos = i + 1
+                    if self.peekchr() == '%':
+                        self.forward()       # '%%' is just a literal '%'
+                        literal.append(const('%'))
+                        continue
+                    spec = self.compile_spec()
+                    literals.append(literal.build())
+                    specs.append(spec)
+                    if do_unicode:
+                        literal = UnicodeBuilder()
+                    else:
+                        literal = StringBuilder()
+            except OperationError:
+                return None
+            literals.append(literal.build())
+            return FormatPlan(literals[:], specs[:])
+
+        def compile_spec(self):
+            # like parse_fmt(), but without fetching any value
+            if self.peekchr() == '(':
+                key = self.getmappingkey()
+            else:
+                key = None
+            self.peel_flags()
+            width_star = self.peekchr() == '*'
+            if width_star:
+                self.forward()
+                width = 0
+            else:
+                width = self.peel_digits()
+            prec_star = False
+            prec = -1
+            if self.peekchr() == '.':
+                self.forward()
+                prec_star = self.peekchr() == '*'
+                if prec_star:
+                    self.forward()
+                else:
+                    prec = self.peel_digits()
+            c = self.peekchr()
+            if c == 'h' or c == 'l' or c == 'L':
+                self.forward()
+            c = self.peekchr()
+            self.forward()
+            return FormatSpec(key, self.f_ljust, self.f_sign, self.f_blank,
+                              self.f_alt, self.f_zero, width, width_star,
+                              prec, prec_star, c, self.fmtpos)
+
+        @jit.look_inside_iff(lambda self: jit.isconstant(self.fmt))
+        def format_unplanned(self):
+            result = self.new_result_builder()
             while True:
                 # fast path: consume as many characters as possible
                 fmt = self.fmt
@@ -483,8 +626,60 @@ def make_formatter_subclass(do_unicode):
                             space.wrap("character code not in range(256)"))
                     self.std_wp(s)
 
+    class FormatSpec(object):
+        "One conversion specifier of a compiled format string."
+        _immutable_ = True
+
+        def __init__(self, key, f_ljust, f_sign, f_blank, f_alt, f_zero,
+                     width, width_star, prec, prec_star, char, fmtpos):
+            self.key = key            # the '(key)', or None
+            self.f_ljust = f_ljust
+            self.f_sign = f_sign
+            self.f_blank = f_blank
+            self.f_alt = f_alt
+            self.f_zero = f_zero
+            self.width = width
+            self.width_star = width_star
+            self.prec = prec
+            self.prec_star = prec_star
+            self.char = char
+            self.fmtpos = fmtpos      # position after the conversion char
+
+    class FormatPlan(object):
+        """A format string parsed once: literals[i] comes before specs[i],
+        and literals[-1] after the last conversion."""
+        _immutable_fields_ = ['literals[*]', 'specs[*]']
+
+        def __init__(self, literals, specs):
+            self.literals = literals
+            self.specs = specs
+
+    class FormatPlanCache(object):
+        def __init__(self, space):
+            self.plans = {}
+
+    @jit.elidable
+    def get_format_plan(space, fmt):
+        if len(fmt) > MAX_PLAN_FMT_LENGTH:
+            return None
+        cache = space.fromcache(FormatPlanCache)
+        try:
+            return cache.plans[fmt]
+        except KeyError:
+            pass
+        plan = StringFormatter(space, fmt, [], None).compile_plan()
+        if len(cache.plans) >= MAX_CACHED_PLANS:
+            cache.plans.clear()
+        cache.plans[fmt] = plan
+        return plan
+
     return StringFormatter
 
+# Compiled plans are only kept for the format strings up to this length,
+# and the whole cache is flushed when it reaches this number of entries.
+MAX_PLAN_FMT_LENGTH = 4096
+MAX_CACHED_PLANS = 512
+
 
 class NeedUnicodeFormattingError(Exception):
     pass
@@ -3,6 +3,8 @@ from pypy.objspace.std.register_all import register_all
 from pypy.objspace.std.multimethod import FailedToImplement
 from pypy.interpreter.error import OperationError, operationerrfmt
 from pypy.objspace.std.inttype import wrapint
+from pypy.objspace.std.intobject import W_IntObject
+from pypy.objspace.std.floatobject import W_FloatObject
 from pypy.objspace.std.listtype import get_list_index
 from pypy.objspace.std.sliceobject import W_SliceObject, normalize_simple_slice
 
@@ -441,14 +443,6 @@ def list_reverse__List(space, w_list):
 # ____________________________________________________________
 # Sorting
 
-# Reverse a slice of a list in place, from lo up to (exclusive) hi.
-# (used in sort)
-
-class KeyContainer(baseobjspace.W_Root):
-    def __init__(self, w_key, w_item):
-        self.w_key = w_key
-        self.w_item = w_item
-
 TimSort = make_timsort_class()
 # NOTE: all the subclasses of TimSort should inherit from a common subclass,
 #       so make sure that only SimpleSort inherits directly from TimSort.
@@ -459,93 +453,185 @@ class SimpleSort(TimSort):
         space = self.space
         return space.is_true(space.lt(a, b))
 
+def cmp_lt(space, w_cmp, w_a, w_b):
+    w_result = space.call_function(w_cmp, w_a, w_b)
+    try:
+        result = space.int_w(w_result)
+    except OperationError, e:
+        if e.match(space, space.w_TypeError):
+            raise OperationError(space.w_TypeError,
+                space.wrap("comparison function must return int"))
+        raise
+    return result < 0
+
 class CustomCompareSort(SimpleSort):
     def lt(self, a, b):
-        space = self.space
-        w_cmp = self.w_cmp
-        w_result = space.call_function(w_cmp, a, b)
-        try:
-            result = space.int_w(w_result)
-        except OperationError, e:
-            if e.match(space, space.w_TypeError):
-                raise OperationError(space.w_TypeError,
-                    space.wrap("comparison function must return int"))
-            raise
-        return result < 0
+        return cmp_lt(self.space, self.w_cmp, a, b)
 
-class CustomKeySort(SimpleSort):
+# Sorting by key (or by unwrapped values) does not wrap the items.  Instead
+# the keys are kept in a list parallel to the items, and what is sorted is a
+# list of indices into both.  The comparison looks up the keys by index, so
+# no extra W_Root is allocated per item; when all the keys are ints, floats
+# or strs, they are unwrapped once and compared directly.
+
+IndexTimSort = make_timsort_class()
+# same NOTE as above: only KeySort inherits directly from IndexTimSort.
+class KeySort(IndexTimSort):
     def lt(self, a, b):
-        assert isinstance(a, KeyContainer)
-        assert isinstance(b, KeyContainer)
         space = self.space
-        return space.is_true(space.lt(a.w_key, b.w_key))
+        return space.is_true(space.lt(self.keys_w[a], self.keys_w[b]))
 
-class CustomKeyCompareSort(CustomCompareSort):
+class CustomKeyCompareSort(KeySort):
     def lt(self, a, b):
-        assert isinstance(a, KeyContainer)
-        assert isinstance(b, KeyContainer)
-        return CustomCompareSort.lt(self, a.w_key, b.w_key)
+        return cmp_lt(self.space, self.w_cmp, self.keys_w[a], self.keys_w[b])
 
-def list_sort__List_ANY_ANY_ANY(space, w_list, w_cmp, w_keyfunc, w_reverse):
+class IntKeySort(KeySort):
+    def lt(self, a, b):
+        return self.intkeys[a] < self.intkeys[b]
+
+class FloatKeySort(KeySort):
+    def lt(self, a, b):
+        return self.floatkeys[a] < self.floatkeys[b]
+
+class StrKeySort(KeySort):
+    def lt(self, a, b):
+        return self.strkeys[a] < self.strkeys[b]
+
+def make_unwrapped_key_sorter(keys_w):
+    """Return a KeySort comparing the unwrapped keys if they are all exact
+    ints, all exact floats or all exact strs, and None otherwise."""
+    from pypy.objspace.std.stringobject import W_StringObject
+    length = len(keys_w)
+    w_first = keys_w[0]
+    if type(w_first) is W_IntObject:
+        intkeys = [0] * length
+        for i in range(length):
+            w_key = keys_w[i]
+            if type(w_key) is not W_IntObject:
+                return None
+            intkeys[i] = w_key.intval
+        sorter = IntKeySort(None, length)
+        sorter.intkeys = intkeys
+        return sorter
+    if type(w_first) is W_FloatObject:
+        floatkeys = [0.0] * length
+        for i in range(length):
+            w_key = keys_w[i]
+            if type(w_key) is not W_FloatObject:
+                return None
+            floatkeys[i] = w_key.floatval
+        sorter = FloatKeySort(None, length)
+        sorter.floatkeys = floatkeys
+        return sorter
+    if type(w_first) is W_StringObject:
+        strkeys = [''] * length
+        for i in range(length):
+            w_key = keys_w[i]
+            if type(w_key) is not W_StringObject:
+                return None
+            strkeys[i] = w_key._value
+        sorter = StrKeySort(None, length)
+        sorter.strkeys = strkeys
+        return sorter
+    return None
+
+def is_sorted_by_index(sorter, reverse):
+    """Check if the keys of 'sorter' are already in their final order.
+    Equal keys never move, because the sort is stable in both directions."""
+    for i in range(1, sorter.listlength):
+        if reverse:
+            if sorter.lt(i - 1, i):
+                return False
+        else:
+            if sorter.lt(i, i - 1):
+                return False
+    return True
+
+def sort_in_place(sorter, items, has_reverse):
+    sorter.list = items
+    # Reverse sort stability achieved by initially reversing the list,
+    # applying a stable forward sort, then reversing the final result.
+    if has_reverse:
+        items.reverse()
+    sorter.sort()
+    if has_reverse:
+        items.reverse()
+    return items
+
+def sort_by_index(sorter, items, has_reverse):
+    indices = range(len(items))
+    sorter.list = indices
+    if has_reverse:
+        indices.reverse()
+    sorter.sort()
+    if has_reverse:
+        indices.reverse()
+    sorted_items = [None] * len(items)
+    for i in range(len(items)):
+        sorted_items[i] = items[indices[i]]
+    return sorted_items
+
+def sort_wrappeditems(space, items, w_cmp, w_keyfunc, has_reverse):
+    """Return the sorted list of items, which is either 'items' itself
+    sorted in-place or a new list.  On exceptions, 'items' is left in
+    some permutation of its original order."""
     has_cmp = not space.is_w(w_cmp, space.w_None)
     has_key = not space.is_w(w_keyfunc, space.w_None)
-    has_reverse = space.is_true(w_reverse)
-
-    # create and setup a TimSort instance
+    length = len(items)
+    if length < 2:
+        return items
+    if has_cmp and not has_key:
+        sorter = CustomCompareSort(None, length)
+        sorter.space = space
+        sorter.w_cmp = w_cmp
+        return sort_in_place(sorter, items, has_reverse)
+
+    # compute the keys, or use the items themselves as keys
+    if has_key:
+        keys_w = [None] * length
+        for i in range(length):
+            keys_w[i] = space.call_function(w_keyfunc, items[i])
+    else:
+        keys_w = items
     if has_cmp:
-        if has_key:
-            sorterclass = CustomKeyCompareSort
-        else:
-            sorterclass = CustomCompareSort
+        keysorter = CustomKeyCompareSort(None, length)
     else:
-        if has_key:
-            sorterclass = CustomKeySort
+        keysorter = make_unwrapped_key_sorter(keys_w)
+        if keysorter is not None:
+            # the keys are cheap to compare: skip all the work if they
+            # are already in order
+            if is_sorted_by_index(keysorter, has_reverse):
+                return items
+        elif has_key:
+            keysorter = KeySort(None, length)
         else:
-            sorterclass = SimpleSort
-    items = w_list.wrappeditems
-    sorter = sorterclass(items, len(items))
-    sorter.space = space
-    sorter.w_cmp = w_cmp
+            # plain sort of objects that cannot be unwrapped: there is
+            # nothing to gain from sorting indices
+            sorter = SimpleSort(None, length)
+            sorter.space = space
+            return sort_in_place(sorter, items, has_reverse)
+    keysorter.space = space
+    keysorter.w_cmp = w_cmp
+    keysorter.keys_w = keys_w
+    return sort_by_index(keysorter, items, has_reverse)
 
+def list_sort__List_ANY_ANY_ANY(space, w_list, w_cmp, w_keyfunc, w_reverse):
+    has_reverse = space.is_true(w_reverse)
+    items = w_list.wrappeditems
     try:
         # The list is temporarily made empty, so that mutations performed
-        # by comparison functions can't affect the slice of memory we're
-        # sorting (allowing mutations during sorting is an IndexError or
-        # core-dump factory, since wrappeditems may change).
+        # by key or comparison functions can't affect the slice of memory
+        # we're sorting (allowing mutations during sorting is an IndexError
+        # or core-dump factory, since wrappeditems may change).
         w_list.wrappeditems = []
-
-        # wrap each item in a KeyContainer if needed
-        if has_key:
-            for i in range(sorter.listlength):
-                w_item = sorter.list[i]
-                w_key = space.call_function(w_keyfunc, w_item)
-                sorter.list[i] = KeyContainer(w_key, w_item)
-
-        # Reverse sort stability achieved by initially reversing the list,
-        # applying a stable forward sort, then reversing the final result.
-        if has_reverse:
-            sorter.list.reverse()
-
-        # perform the sort
-        sorter.sort()
-
-        # reverse again
-        if has_reverse:
-            sorter.list.reverse()
-
+        items = sort_wrappeditems(space, items, w_cmp, w_keyfunc,
+                                  has_reverse)
     finally:
-        # unwrap each item if needed
-        if has_key:
-            for i in range(sorter.listlength):
-                w_obj = sorter.list[i]
-                if isinstance(w_obj, KeyContainer):
-                    sorter.list[i] = w_obj.w_item
-
         # check if the user mucked with the list during the sort
         mucked = len(w_list.wrappeditems) > 0
 
         # put the items back into the list
-        w_list.wrappeditems = sorter.list
+        w_list.wrappeditems = items
 
     if mucked:
         raise OperationError(space.w_ValueError,
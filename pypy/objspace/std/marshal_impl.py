@@ -13,7 +13,7 @@ from pypy.objspace.std.register_all import register_all
 from pypy.rlib.rarithmetic import LONG_BIT, r_longlong, r_uint, intmask
 from pypy.objspace.std import model
 from pypy.interpreter.special import Ellipsis
-from pypy.interpreter.pycode import PyCode
+from pypy.interpreter.pycode import PyCode, LazyCodeBody
 from pypy.interpreter import gateway, unicodehelper
 from pypy.rlib.rstruct import ieee
 
@@ -31,7 +31,9 @@ from pypy.objspace.std.longobject    import W_LongObject, newlong
 from pypy.objspace.std.noneobject    import W_NoneObject
 from pypy.objspace.std.unicodeobject import W_UnicodeObject
 
-from pypy.module.marshal.interp_marshal import register
+from pypy.module.marshal.interp_marshal import register, invalid_typecode
+from pypy.module.marshal.interp_marshal import StringUnmarshaller
+from pypy.module.marshal.interp_marshal import CodeBodyUnmarshaller
 
 TYPE_NULL      = '0'
 TYPE_NONE      = 'N'
@@ -276,7 +278,8 @@ register(TYPE_STRING, unmarshal_String)
 
 def unmarshal_interned(space, u, tc):
     w_ret = space.wrap(u.get_str())
-    u.stringtable_w.append(w_ret)
+    if not u.stringtable_frozen:
+        u.stringtable_w.append(w_ret)
     w_intern = space.builtin.get('intern')
     space.call_function(w_intern, w_ret)
     return w_ret
@@ -342,6 +345,7 @@ def marshal_w_pycode(space, w_pycode, m):
     m.start(TYPE_CODE)
     # see pypy.interpreter.pycode for the layout
     x = space.interp_w(PyCode, w_pycode)
+    x.ensure_loaded()
     m.put_int(x.co_argcount)
     m.put_int(x.co_nlocals)
     m.put_int(x.co_stacksize)
@@ -388,9 +392,23 @@ def unmarshal_pycode(space, u, tc):
     nlocals     = u.get_int()
     stacksize   = u.get_int()
     flags       = u.get_int()
-    code        = unmarshal_str(u)
-    u.start(TYPE_TUPLE)
-    consts_w    = u.get_tuple_w()
+    body_start  = -1
+    if u.lazy_code and u.code_depth > 0:
+        # a nested code object: skip its code string and its constants,
+        # they are unmarshalled by MarshalledCodeBody when needed
+        assert isinstance(u, StringUnmarshaller)
+        body_start = u.bufpos
+        skip_w_obj(space, u)
+        u.start(TYPE_TUPLE)
+        skip_items(space, u, u.get_lng())
+        code = ''
+        consts_w = []
+    else:
+        u.code_depth += 1
+        code = unmarshal_str(u)
+        u.start(TYPE_TUPLE)
+        consts_w = u.get_tuple_w()
+        u.code_depth -= 1
     # copy in order not to merge it with anything else
     names       = unmarshal_strlist(u, TYPE_TUPLE)
     varnames    = unmarshal_strlist(u, TYPE_TUPLE)
@@ -403,9 +421,81 @@ def unmarshal_pycode(space, u, tc):
     code = PyCode(space, argcount, nlocals, stacksize, flags,
                   code, consts_w[:], names, varnames, filename,
                   name, firstlineno, lnotab, freevars, cellvars)
+    if body_start >= 0:
+        code.set_lazy_body(MarshalledCodeBody(space, u.bufstr, body_start,
+                                              u.stringtable_w))
     return space.wrap(code)
 register(TYPE_CODE, unmarshal_pycode)
 
+class MarshalledCodeBody(LazyCodeBody):
+    """The code string and the constants of a code object, still in
+    marshal format.  Keeps the whole marshalled data alive."""
+    def __init__(self, space, bufstr, pos, stringtable_w):
+        self.space = space
+        self.bufstr = bufstr
+        self.pos = pos
+        self.stringtable_w = stringtable_w
+
+    def load(self, code):
+        u = CodeBodyUnmarshaller(self.space, self.bufstr, self.pos,
+                                 self.stringtable_w)
+        code.co_code = unmarshal_str(u)
+        u.start(TYPE_TUPLE)
+        code.co_consts_w = u.get_tuple_w()[:]
+
+# skipping marshalled objects without building them, for the lazily
+# unmarshalled code objects.  Interned strings are still recorded, as
+# the following objects can refer to them.
+
+def skip_w_obj(space, u, allow_null=False):
+    tc = u.get1()
+    if tc == TYPE_NULL:
+        if not allow_null:
+            raise OperationError(space.w_TypeError, space.wrap(
+                'NULL object in marshal data'))
+        return False
+    elif (tc == TYPE_NONE or tc == TYPE_FALSE or tc == TYPE_TRUE or
+          tc == TYPE_STOPITER or tc == TYPE_ELLIPSIS):
+        pass
+    elif tc == TYPE_INT or tc == TYPE_STRINGREF:
+        u.skip(4)
+    elif tc == TYPE_INT64 or tc == TYPE_BINARY_FLOAT:
+        u.skip(8)
+    elif tc == TYPE_BINARY_COMPLEX:
+        u.skip(16)
+    elif tc == TYPE_FLOAT:
+        u.skip(ord(u.get1()))
+    elif tc == TYPE_COMPLEX:
+        u.skip(ord(u.get1()))
+        u.skip(ord(u.get1()))
+    elif tc == TYPE_LONG:
+        lng = u.get_int()
+        if lng < 0:
+            lng = -lng
+        u.skip(lng * 2)
+    elif tc == TYPE_STRING or tc == TYPE_UNICODE:
+        u.skip(u.get_lng())
+    elif tc == TYPE_INTERNED:
+        unmarshal_interned(space, u, tc)
+    elif (tc == TYPE_TUPLE or tc == TYPE_LIST or tc == TYPE_SET or
+          tc == TYPE_FROZENSET):
+        skip_items(space, u, u.get_lng())
+    elif tc == TYPE_DICT:
+        while skip_w_obj(space, u, allow_null=True):
+            skip_w_obj(space, u)
+    elif tc == TYPE_CODE:
+        u.skip(16)                  # argcount, nlocals, stacksize, flags
+        skip_items(space, u, 8)     # code ... name
+        u.skip(4)                   # firstlineno
+        skip_w_obj(space, u)        # lnotab
+    else:
+        invalid_typecode(space, u, tc)
+    return True
+
+def skip_items(space, u, count):
+    for i in range(count):
+        skip_w_obj(space, u)
+
 def marshal_w__Unicode(space, w_unicode, m):
     s = unicodehelper.PyUnicode_EncodeUTF8(space, space.unicode_w(w_unicode))
     m.atom_str(TYPE_UNICODE, s)
@@ -6,6 +6,7 @@ from pypy.interpreter.error import OperationError
 from pypy.rlib import rstring, runicode, rlocale, rarithmetic, rfloat, jit
 from pypy.rlib.objectmodel import specialize
 from pypy.rlib.rfloat import copysign, formatd
+from pypy.objspace.std.formatting import MAX_PLAN_FMT_LENGTH, MAX_CACHED_PLANS
 from pypy.tool import sourcetools
 
 
@@ -37,7 +38,43 @@ ANS_AUTO = 2
 ANS_MANUAL = 3
 
 
+class TemplateError(Exception):
+    """Raised while compiling a malformed template; the ValueError is
+    only raised when the compiled template is used."""
+
+    def __init__(self, msg):
+        self.msg = msg
+
+
 def make_template_formatting_class():
+    class TemplateField(object):
+        "A replacement field of a compiled template."
+        _immutable_ = True
+
+        def __init__(self, start, end, name, conversion, spec_start,
+                     recursive):
+            self.start = start              # just after the "{"
+            self.end = end                  # at the closing "}"
+            self.name = name
+            self.conversion = conversion
+            self.spec_start = spec_start
+            self.recursive = recursive
+
+    class TemplatePlan(object):
+        """A template parsed once: literals[i] comes before fields[i], and
+        literals[-1] after the last field.  If 'error' is not None, the
+        template is malformed after the last field."""
+        _immutable_fields_ = ['literals[*]', 'fields[*]', 'error']
+
+        def __init__(self, literals, fields, error):
+            self.literals = literals
+            self.fields = fields
+            self.error = error
+
+    class TemplatePlanCache(object):
+        def __init__(self, space):
+            self.plans = {}
+
     class TemplateFormatter(object):
 
         parser_list_w = None
@@ -56,71 +93,105 @@ def make_template_formatting_class():
 
         def _build_string(self, start, end, level):
             space = self.space
-            if self.is_unicode:
-                out = rstring.UnicodeBuilder()
-            else:
-                out = rstring.StringBuilder()
             if not level:
                 raise OperationError(space.w_ValueError,
                                      space.wrap("Recursion depth exceeded"))
             level -= 1
-            s = self.template
-            return self._do_build_string(start, end, level, out, s)
+            if start == 0 and end == len(self.template):
+                plan = get_template_plan(space, self.is_unicode, self.template)
+            else:
+                plan = self._compile(start, end)
+            return self._do_build_string(plan, level)
+
+        # the plan is cached by the elidable get_template_plan(), or
+        # compiled from a part of self.template: unroll it when the
+        # template is a constant
+        @jit.look_inside_iff(lambda self, plan, level:
+                             jit.isconstant(self.template))
+        def _do_build_string(self, plan, level):
+            if self.is_unicode:
+                out = rstring.UnicodeBuilder()
+            else:
+                out = rstring.StringBuilder()
+            fields = plan.fields
+            for i in range(len(fields)):
+                out.append(plan.literals[i])
+                out.append(self._render_field(fields[i], level))
+            if plan.error is not None:
+                raise OperationError(self.space.w_ValueError,
+                                     self.space.wrap(plan.error))
+            out.append(plan.literals[len(fields)])
+            return out.build()
 
-        @jit.look_inside_iff(lambda self, start, end, level, out, s: jit.isconstant(s))
-        def _do_build_string(self, start, end, level, out, s):
-            space = self.space
+        def _compile(self, start, end):
+            """Parse the template between 'start' and 'end' into a
+            TemplatePlan."""
+            s = self.template
+            literals = []
+            fields = []
+            error = None
+            if self.is_unicode:
+                out = rstring.UnicodeBuilder()
+            else:
+                out = rstring.StringBuilder()
             last_literal = i = start
-            while i < end:
-                c = s[i]
-                i += 1
-                if c == "{" or c == "}":
-                    at_end = i == end
-                    # Find escaped "{" and "}"
-                    markup_follows = True
-                    if c == "}":
-                        if at_end or s[i] != "}":
-                            raise OperationError(space.w_ValueError,
-                                                 space.wrap("Single '}'"))
-                        i += 1
-                        markup_follows = False
-                    if c == "{":
-                        if at_end:
-                            raise OperationError(space.w_ValueError,
-                                                 space.wrap("Single '{'"))
-                        if s[i] == "{":
+            try:
+                while i < end:
+                    c = s[i]
+                    i += 1
+                    if c == "{" or c == "}":
+                        at_end = i == end
+                        # Find escaped "{" and "}"
+                        markup_follows = True
+                        if c == "}":
+                            if at_end or s[i] != "}":
+                                raise TemplateError("Single '}'")
                             i += 1
                             markup_follows = False
-                    # Attach literal data
-                    out.append_slice(s, last_literal, i - 1)
-                    if not markup_follows:
-                        last_literal = i
-                        continue
-                    nested = 1
-                    field_start = i
-                    recursive = False
-                    while i < end:
-                        c = s[i]
                         if c == "{":
-                            recursive = True
-                            nested += 1
-                        elif c == "}":
-                            nested -= 1
-                            if not nested:
-                                break
+                            if at_end:
+                                raise TemplateError("Single '{'")
+                            if s[i] == "{":
+                                i += 1
+                                markup_follows = False
+                        # Attach literal data
+                        out.append_slice(s, last_literal, i - 1)
+                        if not markup_follows:
+                            last_literal = i
+                            continue
+                        nested = 1
+                        field_start = i
+                        recursive = False
+                        while i < end:
+                            c = s[i]
+                            if c == "{":
+                                recursive = True
+                                nested += 1
+                            elif c == "}":
+                                nested -= 1
+                                if not nested:
+                                    break
+                            i += 1
+                        if nested:
+                            raise TemplateError("Unmatched '{'")
+                        name, conversion, spec_start = self._parse_field(
+                            field_start, i)
+                        literals.append(out.build())
+                        fields.append(TemplateField(field_start, i, name,
+                                                    conversion, spec_start,
+                                                    recursive))
+                        if self.is_unicode:
+                            out = rstring.UnicodeBuilder()
+                        else:
+                            out = rstring.StringBuilder()
                         i += 1
-                    if nested:
-                        raise OperationError(space.w_ValueError,
-                                             space.wrap("Unmatched '{'"))
-                    rendered = self._render_field(field_start, i, recursive, level)
-                    out.append(rendered)
-                    i += 1
-                    last_literal = i
-
-            out.append_slice(s, last_literal, end)
-            return out.build()
+                        last_literal = i
+                out.append_slice(s, last_literal, end)
+            except TemplateError, e:
+                error = e.msg
+            literals.append(out.build())
+            return TemplatePlan(literals[:], fields[:], error)
 
-        # This is only ever called if we're already unrolling _do_build_string
         @jit.unroll_safe
         def _parse_field(self, start, end):
             s = self.template
@@ -133,16 +204,13 @@ def make_template_formatting_class():
                     if c == "!":
                         i += 1
                         if i == end:
-                            w_msg = self.space.wrap("expected conversion")
-                            raise OperationError(self.space.w_ValueError, w_msg)
+                            raise TemplateError("expected conversion")
                         conversion = s[i]
                         i += 1
                         if i < end:
                             if s[i] != ':':
-                                w_msg = self.space.wrap("expected ':' after"
-                                                        " format specifier")
-                                raise OperationError(self.space.w_ValueError,
-                                                     w_msg)
+                                raise TemplateError("expected ':' after"
+                                                    " format specifier")
                             i += 1
                     else:
                         conversion = None
@@ -303,30 +371,29 @@ def make_template_formatting_class():
                 raise OperationError(self.space.w_ValueError,
                                      self.space.wrap("invalid conversion"))
 
-        def _render_field(self, start, end, recursive, level):
-            name, conversion, spec_start = self._parse_field(start, end)
-            spec = self.template[spec_start:end]
-            #
+        def _render_field(self, field, level):
             if self.parser_list_w is not None:
                 # used from formatter_parser()
                 if level == 1:    # ignore recursive calls
                     space = self.space
-                    startm1 = start - 1
+                    startm1 = field.start - 1
                     assert startm1 >= self.last_end
                     w_entry = space.newtuple([
                         space.wrap(self.template[self.last_end:startm1]),
-                        space.wrap(name),
-                        space.wrap(spec),
-                        space.wrap(conversion)])
+                        space.wrap(field.name),
+                        space.wrap(self.template[field.spec_start:field.end]),
+                        space.wrap(field.conversion)])
                     self.parser_list_w.append(w_entry)
-                    self.last_end = end + 1
+                    self.last_end = field.end + 1
                 return self.empty
             #
-            w_obj = self._get_argument(name)
-            if conversion is not None:
-                w_obj = self._convert(w_obj, conversion)
-            if recursive:
-                spec = self._build_string(spec_start, end, level)
+            w_obj = self._get_argument(field.name)
+            if field.conversion is not None:
+                w_obj = self._convert(w_obj, field.conversion)
+            if field.recursive:
+                spec = self._build_string(field.spec_start, field.end, level)
+            else:
+                spec = self.template[field.spec_start:field.end]
             w_rendered = self.space.format(w_obj, self.space.wrap(spec))
             unwrapper = "unicode_w" if self.is_unicode else "str_w"
             to_interp = getattr(self.space, unwrapper)
@@ -346,6 +413,23 @@ def make_template_formatting_class():
                     space.w_None])
                 self.parser_list_w.append(w_lastentry)
             return space.iter(space.newlist(self.parser_list_w))
+
+    @jit.elidable
+    def get_template_plan(space, is_unicode, template):
+        formatter = TemplateFormatter(space, is_unicode, template)
+        if len(template) > MAX_PLAN_FMT_LENGTH:
+            return formatter._compile(0, len(template))
+        cache = space.fromcache(TemplatePlanCache)
+        try:
+            return cache.plans[template]
+        except KeyError:
+            pass
+        plan = formatter._compile(0, len(template))
+        if len(cache.plans) >= MAX_CACHED_PLANS:
+            cache.plans.clear()
+        cache.plans[template] = plan
+        return plan
+
     return TemplateFormatter
 
 StrTemplateFormatter = make_template_formatting_class()
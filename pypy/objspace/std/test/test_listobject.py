@@ -453,6 +453,75 @@ class AppTestW_ListObject(object):
         l.sort(reverse = True, key = lower)
         assert l == ['C', 'b', 'a']
 
+    def test_sort_key_unwrapped(self):
+        l = [(3, 'a'), (1, 'b'), (2, 'c'), (1, 'd')]
+        l.sort(key=lambda x: x[0])
+        assert l == [(1, 'b'), (1, 'd'), (2, 'c'), (3, 'a')]
+        l.sort(key=lambda x: -x[0], reverse=True)
+        assert l == [(1, 'b'), (1, 'd'), (2, 'c'), (3, 'a')]
+        l.sort(key=lambda x: float(x[0]), reverse=True)
+        assert l == [(3, 'a'), (2, 'c'), (1, 'b'), (1, 'd')]
+        l.sort(key=lambda x: x[1])
+        assert l == [(3, 'a'), (1, 'b'), (2, 'c'), (1, 'd')]
+        # mixed types of keys
+        l.sort(key=lambda x: [x[0], 2.5, 'x', 0][ord(x[1]) - ord('a')])
+        assert l == [(1, 'd'), (1, 'b'), (3, 'a'), (2, 'c')]
+
+    def test_sort_unwrapped(self):
+        l = [5, 2, 7, 2, 0, -3]
+        l.sort()
+        assert l == [-3, 0, 2, 2, 5, 7]
+        l.sort(reverse=True)
+        assert l == [7, 5, 2, 2, 0, -3]
+        l = [2.5, -1.0, 1e10]
+        l.sort()
+        assert l == [-1.0, 2.5, 1e10]
+        l = ['b', 'ab', 'a', '']
+        l.sort()
+        assert l == ['', 'a', 'ab', 'b']
+        class myint(int):
+            def __lt__(self, other):
+                return int(self) > int(other)
+        l = [myint(1), myint(3), myint(2)]
+        l.sort()
+        assert l == [3, 2, 1]
+
+    def test_sort_preserves_identity(self):
+        a = 100000
+        b = 100000
+        l = [a, 5, b]
+        l.sort()
+        assert l[1] is a and l[2] is b
+        l = [a, b]
+        l.sort(key=lambda x: 0)
+        assert l[0] is a and l[1] is b
+
+    def test_sort_key_mutates(self):
+        l = [3, 1, 2]
+        def key(x):
+            l.append(x)
+            return x
+        raises(ValueError, l.sort, key=key)
+        assert l == [1, 2, 3]
+        l = [1, 2, 3]
+        raises(ValueError, l.sort, key=key)
+        assert l == [1, 2, 3]
+
+    def test_sort_key_raises(self):
+        l = [3, 1, 2]
+        def key(x):
+            if x == 2:
+                raise KeyError(x)
+            return x
+        raises(KeyError, l.sort, key=key)
+        assert sorted(l) == [1, 2, 3]
+        class Bad(object):
+            def __lt__(self, other):
+                raise ZeroDivisionError
+        l = [Bad(), Bad(), Bad()]
+        raises(ZeroDivisionError, l.sort, key=lambda x: x)
+        assert len(l) == 3
+
     def test_getitem(self):
         l = [1, 2, 3, 4, 5, 6, 9]
         assert l[0] == 1
@@ -169,6 +169,21 @@ class BaseStringFormatTests:
         raises(ValueError, '{0!r'.format, 5)
         raises(ValueError, '{0!rs}'.format, 5)
 
+    def test_repeated(self):
+        # the second time, the compiled template is used
+        for i in range(3):
+            res = self.s("a{0}b{{c}}{1!r:>4}d{x:{y}}")
+            assert res.format(1, 'q', x=5, y='03') == self.s("a1b{c} 'q'd005")
+        # a malformed template still renders the fields before the error
+        seen = []
+        class A(object):
+            def __format__(self, spec):
+                seen.append(spec)
+                return 'a'
+        for i in range(2):
+            raises(ValueError, self.s("{0:x}{1} }").format, A(), 2)
+        assert seen == ['x', 'x']
+
 
 class AppTestUnicodeFormat(BaseStringFormatTests):
 
@@ -186,6 +186,32 @@ class AppTestStringObject:
     def test_broken_unicode(self):
         raises(UnicodeDecodeError, 'Názov: %s'.__mod__, u'Jerry')
 
+    def test_format_repeated(self):
+        # the second time, the precompiled plan of the format is used
+        for i in range(3):
+            assert 'a%sb%%c%5dd%.2fe' % ('x', 42, 1.5) == 'axb%c   42d1.50e'
+            assert '%*.*s|' % (5, 2, 'abcd') == '   ab|'
+            assert '%*d|' % (-4, 7) == '7   |'
+            assert '%5%|%-3%|' % () == '    %|%  |'
+            assert '%(a)s%(b)03d' % {'a': 'x', 'b': 5} == 'x005'
+            assert '%ld %hd %Ld' % (1, 2, 3) == '1 2 3'
+            raises(TypeError, '%s %s'.__mod__, ('x',))
+            raises(TypeError, '%s'.__mod__, ('x', 'y'))
+            raises(ValueError, '%s%'.__mod__, ('x',))
+            exc = raises(ValueError, 'ab%sc%Zd'.__mod__, ('x', 5))
+            assert 'at index 6' in str(exc.value)
+
+    def test_incomplete_format_side_effects(self):
+        # the conversions before a malformed part still happen
+        seen = []
+        class A(object):
+            def __str__(self):
+                seen.append(1)
+                return 'a'
+        for i in range(2):
+            raises(ValueError, '%s %'.__mod__, (A(),))
+        assert seen == [1, 1]
+
 class AppTestWidthPrec:
     def test_width(self):
         a = 'a'
@@ -306,3 +332,10 @@ class AppTestUnicodeObject:
     def test_invalid_char(self):
         f = 4
         raises(ValueError, 'u"%\u1234" % (f,)')
+
+    def test_format_repeated(self):
+        for i in range(3):
+            assert u'%s\u1234%%%3d' % (u'\xe9', 5) == u'\xe9\u1234%  5'
+            assert u'%(a)s' % {u'a': u'x'} == u'x'
+            assert '%s|%s' % ('a', u'b') == u'a|b'
+
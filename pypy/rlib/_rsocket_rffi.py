@@ -17,11 +17,13 @@ _MINGW = target_platform.name == "mingw32"
 _SOLARIS = sys.platform == "sunos5"
 _MACOSX = sys.platform == "darwin"
 _HAS_AF_PACKET = sys.platform.startswith('linux')   # only Linux for now
+_HAS_SENDFILE = sys.platform.startswith('linux')    # only Linux for now
 
 if _POSIX:
     includes = ('sys/types.h',
                 'sys/socket.h',
                 'sys/un.h',
+                'sys/uio.h',
                 'sys/poll.h',
                 'sys/select.h',
                 'sys/types.h',
@@ -39,6 +41,8 @@ if _POSIX:
         includes += ('netpacket/packet.h',
                      'sys/ioctl.h',
                      'net/if.h')
+    if _HAS_SENDFILE:
+        includes += ('sys/sendfile.h',)
 
     cond_includes = [('AF_NETLINK', 'linux/netlink.h')]
     
@@ -252,6 +256,8 @@ CConfig.uint32_t = platform.SimpleType('uint32_t', rffi.UINT)
 CConfig.size_t = platform.SimpleType('size_t', rffi.INT)
 CConfig.ssize_t = platform.SimpleType('ssize_t', rffi.INT)
 CConfig.socklen_t = platform.SimpleType('socklen_t', rffi.INT)
+if _POSIX:
+    CConfig.off_t = platform.SimpleType('off_t', rffi.LONGLONG)
 sockaddr_ptr = lltype.Ptr(lltype.ForwardReference())
 addrinfo_ptr = lltype.Ptr(lltype.ForwardReference())
 
@@ -343,6 +349,19 @@ if _WIN32:
          ('iErrorCode', rffi.CFixedArray(rffi.INT, 10)), #FD_MAX_EVENTS
          ])
 
+if _POSIX:
+    CConfig.iovec = platform.Struct('struct iovec',
+                                    [('iov_base', rffi.VOIDP),
+                                     ('iov_len', rffi.SIZE_T)])
+    CConfig.msghdr = platform.Struct('struct msghdr',
+                                     [('msg_name', rffi.VOIDP),
+                                      ('msg_namelen', rffi.UINT),
+                                      ('msg_iov', rffi.VOIDP),
+                                      ('msg_iovlen', rffi.SIZE_T),
+                                      ('msg_control', rffi.VOIDP),
+                                      ('msg_controllen', rffi.SIZE_T),
+                                      ('msg_flags', rffi.INT)])
+
 CConfig.timeval = platform.Struct('struct timeval',
                                          [('tv_sec', rffi.LONG),
                                           ('tv_usec', rffi.LONG)])
@@ -443,6 +462,10 @@ addrinfo = cConfig.addrinfo
 if _POSIX:
     nfds_t = cConfig.nfds_t
     pollfd = cConfig.pollfd
+    off_t = cConfig.off_t
+    iovec = cConfig.iovec
+    iovecarray = rffi.CArray(iovec)
+    msghdr = cConfig.msghdr
     if _HAS_AF_PACKET:
         sockaddr_ll = cConfig.sockaddr_ll
         ifreq = cConfig.ifreq
@@ -536,6 +559,16 @@ getservbyname = external('getservbyname', [rffi.CCHARP, rffi.CCHARP], lltype.Ptr
 getservbyport = external('getservbyport', [rffi.INT, rffi.CCHARP], lltype.Ptr(cConfig.servent))
 getprotobyname = external('getprotobyname', [rffi.CCHARP], lltype.Ptr(cConfig.protoent))
 
+if _POSIX:
+    sendmsg = external('sendmsg', [socketfd_type, lltype.Ptr(msghdr),
+                                   rffi.INT], ssize_t)
+    recvmsg = external('recvmsg', [socketfd_type, lltype.Ptr(msghdr),
+                                   rffi.INT], ssize_t)
+    if _HAS_SENDFILE:
+        off_t_ptr = lltype.Ptr(rffi.CFixedArray(off_t, 1))
+        sendfile = external('sendfile', [socketfd_type, rffi.INT, off_t_ptr,
+                                         size_t], ssize_t)
+
 if _POSIX:
     fcntl = external('fcntl', [socketfd_type, rffi.INT, rffi.INT], rffi.INT)
     socketpair_t = rffi.CArray(socketfd_type)
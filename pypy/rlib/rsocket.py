@@ -595,6 +595,9 @@ def ipaddr_from_object(space, w_sockaddr):
 
 # ____________________________________________________________
 
+# number of bytes asked to each sendfile() call when sending a whole file
+SENDFILE_CHUNK = 0x40000000
+
 class RSocket(object):
     """RPython-level socket object.
     """
@@ -1007,21 +1010,164 @@ class RSocket(object):
         to tell how much data has been sent."""
         dataptr = rffi.get_nonmovingbuffer(data)
         try:
-            remaining = len(data)
-            p = dataptr
-            while remaining > 0:
-                try:
-                    res = self.send_raw(p, remaining, flags)
-                    p = rffi.ptradd(p, res)
-                    remaining -= res
-                except CSocketError, e:
-                    if e.errno != _c.EINTR:
-                        raise
-                if signal_checker:
-                    signal_checker.check()
+            self.sendall_raw(dataptr, len(data), flags, signal_checker)
         finally:
             rffi.free_nonmovingbuffer(data, dataptr)
 
+    def sendall_raw(self, dataptr, length, flags=0, signal_checker=None):
+        """Like sendall(), but send 'length' bytes from a CCHARP buffer."""
+        remaining = length
+        p = dataptr
+        while remaining > 0:
+            try:
+                res = self.send_raw(p, remaining, flags)
+                p = rffi.ptradd(p, res)
+                remaining -= res
+            except CSocketError, e:
+                if e.errno != _c.EINTR:
+                    raise
+            if signal_checker:
+                signal_checker.check()
+
+    if hasattr(_c, 'sendmsg'):
+        def sendmsg(self, messages, flags=0, address=None):
+            """Send the list of strings 'messages' as a single message,
+            gathered by the system without concatenating them first.
+            If 'address' is not None, send it to this address.  Return
+            the number of bytes sent."""
+            dataptrs = []
+            try:
+                for data in messages:
+                    dataptrs.append(rffi.get_nonmovingbuffer(data))
+                lengths = [len(data) for data in messages]
+                return self.sendmsg_raw(dataptrs, lengths, flags, address)
+            finally:
+                for i in range(len(dataptrs)):
+                    rffi.free_nonmovingbuffer(messages[i], dataptrs[i])
+
+        def sendmsg_raw(self, dataptrs, lengths, flags=0, address=None):
+            """Like sendmsg(), but the messages are given as the list of
+            CCHARPs 'dataptrs' to raw memory, of the given 'lengths'."""
+            res = -1
+            timeout = self._select(True)
+            if timeout == 1:
+                raise SocketTimeout
+            elif timeout == 0:
+                count = len(dataptrs)
+                iov = lltype.malloc(_c.iovecarray, count, flavor='raw')
+                msg = lltype.malloc(_c.msghdr, flavor='raw', zero=True)
+                try:
+                    for i in range(count):
+                        iov[i].c_iov_base = rffi.cast(rffi.VOIDP, dataptrs[i])
+                        rffi.setintfield(iov[i], 'c_iov_len', lengths[i])
+                    msg.c_msg_iov = rffi.cast(rffi.VOIDP, iov)
+                    rffi.setintfield(msg, 'c_msg_iovlen', count)
+                    if address is not None:
+                        addr = address.lock()
+                        msg.c_msg_name = rffi.cast(rffi.VOIDP, addr)
+                        rffi.setintfield(msg, 'c_msg_namelen',
+                                         address.addrlen)
+                    try:
+                        res = _c.sendmsg(self.fd, msg, flags)
+                    finally:
+                        if address is not None:
+                            address.unlock()
+                finally:
+                    lltype.free(msg, flavor='raw')
+                    lltype.free(iov, flavor='raw')
+            if res < 0:
+                raise self.error_handler()
+            return res
+
+        def recvmsg(self, sizes, flags=0):
+            """Receive a single message, scattered by the system into
+            buffers of the given 'sizes'.  Return a tuple (strings,
+            msg_flags, address), where 'strings' holds the data received
+            in each buffer and 'address' is None if unknown."""
+            read_bytes = -1
+            timeout = self._select(False)
+            if timeout == 1:
+                raise SocketTimeout
+            elif timeout == 0:
+                count = len(sizes)
+                bufs = []
+                iov = lltype.malloc(_c.iovecarray, count, flavor='raw')
+                msg = lltype.malloc(_c.msghdr, flavor='raw', zero=True)
+                address, addr_p, addrlen_p = self._addrbuf()
+                try:
+                    for i in range(count):
+                        buf = lltype.malloc(rffi.CCHARP.TO, sizes[i],
+                                            flavor='raw')
+                        bufs.append(buf)
+                        iov[i].c_iov_base = rffi.cast(rffi.VOIDP, buf)
+                        rffi.setintfield(iov[i], 'c_iov_len', sizes[i])
+                    msg.c_msg_iov = rffi.cast(rffi.VOIDP, iov)
+                    rffi.setintfield(msg, 'c_msg_iovlen', count)
+                    msg.c_msg_name = rffi.cast(rffi.VOIDP, addr_p)
+                    rffi.setintfield(msg, 'c_msg_namelen',
+                                     rffi.cast(lltype.Signed, addrlen_p[0]))
+                    read_bytes = rffi.cast(lltype.Signed,
+                                           _c.recvmsg(self.fd, msg, flags))
+                    if read_bytes >= 0:
+                        strings = []
+                        remaining = read_bytes
+                        for i in range(count):
+                            size = min(remaining, sizes[i])
+                            strings.append(rffi.charpsize2str(bufs[i], size))
+                            remaining -= size
+                        msg_flags = rffi.getintfield(msg, 'c_msg_flags')
+                        addrlen = rffi.getintfield(msg, 'c_msg_namelen')
+                        if addrlen:
+                            address.addrlen = addrlen
+                            return (strings, msg_flags, address)
+                        return (strings, msg_flags, None)
+                finally:
+                    for buf in bufs:
+                        lltype.free(buf, flavor='raw')
+                    lltype.free(addrlen_p, flavor='raw')
+                    address.unlock()
+                    lltype.free(msg, flavor='raw')
+                    lltype.free(iov, flavor='raw')
+            raise self.error_handler()
+
+    if hasattr(_c, 'sendfile'):
+        def sendfile(self, in_fd, offset, count, signal_checker=None):
+            """Send 'count' bytes of the file descriptor 'in_fd', starting
+            at 'offset', directly from the kernel without copying them to
+            user space.  A 'count' of 0 means up to the end of the file.
+            This calls sendfile() repeatedly, and returns the total number
+            of bytes sent; it is less than 'count' only if the end of the
+            file was reached."""
+            offset_p = lltype.malloc(_c.off_t_ptr.TO, flavor='raw')
+            offset_p[0] = rffi.cast(_c.off_t, offset)
+            total = 0
+            try:
+                while count <= 0 or total < count:
+                    if count > 0:
+                        chunk = count - total
+                    else:
+                        chunk = SENDFILE_CHUNK
+                    res = -1
+                    timeout = self._select(True)
+                    if timeout == 1:
+                        raise SocketTimeout
+                    elif timeout == 0:
+                        res = rffi.cast(lltype.Signed, _c.sendfile(
+                            self.fd, in_fd, offset_p, chunk))
+                    if res < 0:
+                        error = self.error_handler()
+                        if error.errno != _c.EINTR:
+                            raise error
+                    elif res == 0:
+                        break     # end of file
+                    else:
+                        total += res
+                    if signal_checker:
+                        signal_checker.check()
+            finally:
+                lltype.free(offset_p, flavor='raw')
+            return total
+
     def sendto(self, data, flags, address):
         """Like send(data, flags) but allows specifying the destination
         address.  (Note that 'flags' is mandatory here.)"""
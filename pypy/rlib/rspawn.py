@@ -0,0 +1,179 @@
+"""
+Starting a child process with vfork() and exec(), without fork()ing the
+whole interpreter: the child borrows the memory of the parent until it
+calls exec(), so that no page table is copied and no copy-on-write fault
+is triggered, whatever the size of the heap.
+
+The child only runs the C function pypy_spawn() below, which performs
+the file actions, changes the directory and calls execv().  If any of
+these steps fails, the errno is stored into a variable of the parent
+(the memory is shared) and spawn() raises SpawnError.
+"""
+
+from pypy.rpython.lltypesystem import lltype, rffi
+from pypy.rlib import rposix
+from pypy.translator.tool.cbuild import ExternalCompilationInfo
+
+# the file actions, as in posix_spawn()
+SPAWN_CLOSE = 1
+SPAWN_DUP2 = 2
+
+# the step in which the child failed
+STEP_EXEC = 0
+STEP_FILE_ACTION = 1
+STEP_CHDIR = 2
+
+source = """
+#include <unistd.h>
+#include <fcntl.h>
+#include <signal.h>
+#include <errno.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+
+extern char **environ;
+
+long pypy_spawn(char *path, char **argv, char **envp, char *cwd,
+                long *actions, long nactions, long close_fds, int *step)
+{
+    volatile int child_errno = 0;
+    volatile int child_step = 0;
+    sigset_t all_signals, old_mask;
+    pid_t pid;
+    int saved_errno, status;
+
+    /* no signal handler of the parent must run in the child, which
+       shares its memory */
+    sigfillset(&all_signals);
+    sigprocmask(SIG_BLOCK, &all_signals, &old_mask);
+
+    pid = vfork();
+    if (pid == 0) {
+        long i, fd, maxfd;
+        int sig;
+        for (sig = 1; sig < NSIG; sig++) {
+            struct sigaction sa;
+            if (sigaction(sig, NULL, &sa) == 0 &&
+                sa.sa_handler != SIG_IGN && sa.sa_handler != SIG_DFL) {
+                sa.sa_handler = SIG_DFL;
+                sigemptyset(&sa.sa_mask);
+                sa.sa_flags = 0;
+                sigaction(sig, &sa, NULL);
+            }
+        }
+        sigprocmask(SIG_SETMASK, &old_mask, NULL);
+
+        child_step = 1;
+        for (i = 0; i < nactions; i++) {
+            long action = actions[3 * i];
+            long fd1 = actions[3 * i + 1];
+            long fd2 = actions[3 * i + 2];
+            if (action == 1) {
+                close(fd1);
+            }
+            else if (fd1 == fd2) {
+                /* dup2() would be a no-op: only clear FD_CLOEXEC */
+                int flags = fcntl(fd1, F_GETFD);
+                if (flags < 0 || fcntl(fd1, F_SETFD, flags & ~FD_CLOEXEC) < 0)
+                    goto error;
+            }
+            else if (dup2(fd1, fd2) < 0)
+                goto error;
+        }
+        if (close_fds) {
+            maxfd = sysconf(_SC_OPEN_MAX);
+            for (fd = 3; fd < maxfd; fd++)
+                close(fd);
+        }
+        child_step = 2;
+        if (cwd != NULL && chdir(cwd) < 0)
+            goto error;
+        child_step = 0;
+        execve(path, argv, envp != NULL ? envp : environ);
+     error:
+        child_errno = errno;
+        _exit(127);
+    }
+    saved_errno = errno;
+    sigprocmask(SIG_SETMASK, &old_mask, NULL);
+    if (pid < 0) {
+        *step = -1;
+        errno = saved_errno;
+        return -1;
+    }
+    if (child_errno != 0) {
+        while (waitpid(pid, &status, 0) < 0 && errno == EINTR)
+            ;
+        *step = child_step;
+        errno = child_errno;
+        return -1;
+    }
+    return pid;
+}
+"""
+
+eci = ExternalCompilationInfo(
+    post_include_bits = ['long pypy_spawn(char *, char **, char **, char *, '
+                         'long *, long, long, int *);'],
+    separate_module_sources = [source],
+    export_symbols = ['pypy_spawn'],
+)
+
+c_spawn = rffi.llexternal('pypy_spawn',
+                          [rffi.CCHARP, rffi.CCHARPP, rffi.CCHARPP,
+                           rffi.CCHARP, rffi.LONGP, rffi.LONG, rffi.LONG,
+                           rffi.INTP],
+                          rffi.LONG, compilation_info=eci)
+
+
+class SpawnError(Exception):
+    """Raised by spawn() if the child could not be started, with the
+    errno and the step which failed (-1 if vfork() itself failed)."""
+    def __init__(self, errno, step):
+        self.errno = errno
+        self.step = step
+
+
+def spawn(path, args, env, file_actions, cwd, close_fds):
+    """Start 'path' with the list of arguments 'args' in a child process
+    and return its pid.  'env' is a list of 'key=value' strings, or None
+    to inherit the environment.  'file_actions' is a list of tuples
+    (SPAWN_CLOSE, fd, 0) or (SPAWN_DUP2, fd, newfd) applied in order in
+    the child, before all the other file descriptors above 2 are closed
+    if 'close_fds' is true, and before changing to the directory 'cwd'
+    unless it is None."""
+    l_path = rffi.str2charp(path)
+    l_args = rffi.liststr2charpp(args)
+    if env is not None:
+        l_env = rffi.liststr2charpp(env)
+    else:
+        l_env = lltype.nullptr(rffi.CCHARPP.TO)
+    if cwd is not None:
+        l_cwd = rffi.str2charp(cwd)
+    else:
+        l_cwd = lltype.nullptr(rffi.CCHARP.TO)
+    n = len(file_actions)
+    l_actions = lltype.malloc(rffi.LONGP.TO, 3 * n + 1, flavor='raw')
+    l_step = lltype.malloc(rffi.INTP.TO, 1, flavor='raw')
+    try:
+        for i in range(n):
+            action, fd1, fd2 = file_actions[i]
+            l_actions[3 * i] = action
+            l_actions[3 * i + 1] = fd1
+            l_actions[3 * i + 2] = fd2
+        l_step[0] = rffi.cast(rffi.INT, 0)
+        pid = c_spawn(l_path, l_args, l_env, l_cwd, l_actions, n,
+                      int(close_fds), l_step)
+        if pid < 0:
+            raise SpawnError(rposix.get_errno(),
+                             rffi.cast(lltype.Signed, l_step[0]))
+        return pid
+    finally:
+        lltype.free(l_step, flavor='raw')
+        lltype.free(l_actions, flavor='raw')
+        if cwd is not None:
+            rffi.free_charp(l_cwd)
+        if env is not None:
+            rffi.free_charpp(l_env)
+        rffi.free_charpp(l_args)
+        rffi.free_charp(l_path)
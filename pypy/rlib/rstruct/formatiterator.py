@@ -79,6 +79,35 @@ class FormatIterator(object):
                 self.operate(fmtdesc, repetitions)
         self.finished()
 
+    # not jit.isconstant(plan): it cannot be annotated for instances of
+    # several classes.  The immutable 'size' of a constant plan is constant.
+    @jit.look_inside_iff(lambda self, plan: jit.isconstant(plan.size))
+    def interpret_plan(self, plan):
+        # same as interpret(), for a format string that was already
+        # parsed by compile_format()
+        self.bigendian = plan.bigendian
+        if plan.standard:
+            table = unroll_standard_fmtdescs
+        else:
+            table = unroll_native_fmtdescs
+        for i in range(len(plan.fmtchars)):
+            c = plan.fmtchars[i]
+            repetitions = plan.repetitions[i]
+            for fmtdesc in table:
+                if c == fmtdesc.fmtchar:
+                    if self._operate_is_specialized_:
+                        if fmtdesc.alignment > 1:
+                            self.align(fmtdesc.mask)
+                        self.operate(fmtdesc, repetitions)
+                    break
+            else:
+                raise StructError("bad char in struct format")
+            if not self._operate_is_specialized_:
+                if fmtdesc.alignment > 1:
+                    self.align(fmtdesc.mask)
+                self.operate(fmtdesc, repetitions)
+        self.finished()
+
     def finished(self):
         pass
 
@@ -100,6 +129,41 @@ class CalcSizeFormatIterator(FormatIterator):
             raise StructError("total struct size too long")
 
 
+class PlanFormatIterator(CalcSizeFormatIterator):
+
+    def __init__(self):
+        self.fmtchars = []
+        self.repetitions = []
+
+    def operate(self, fmtdesc, repetitions):
+        CalcSizeFormatIterator.operate(self, fmtdesc, repetitions)
+        self.fmtchars.append(fmtdesc.fmtchar)
+        self.repetitions.append(repetitions)
+
+
+class FormatPlan(object):
+    """A format string parsed once and for all: the format characters
+    with their repetition counts, in order, and the total size."""
+    _immutable_fields_ = ['fmtchars[*]', 'repetitions[*]', 'standard',
+                          'bigendian', 'size']
+
+    def __init__(self, fmtchars, repetitions, standard, bigendian, size):
+        self.fmtchars = fmtchars
+        self.repetitions = repetitions
+        self.standard = standard
+        self.bigendian = bigendian
+        self.size = size
+
+def compile_format(fmt):
+    """Parse 'fmt' into a FormatPlan, to be passed to interpret_plan().
+    Raises StructError if the format is invalid."""
+    fmtiter = PlanFormatIterator()
+    fmtiter.interpret(fmt)
+    standard = len(fmt) > 0 and fmt[0] in '=<>!'
+    return FormatPlan(fmtiter.fmtchars[:], fmtiter.repetitions[:], standard,
+                      fmtiter.bigendian, fmtiter.totalsize)
+
+
 class FmtDesc(object):
     def __init__(self, fmtchar, attrs):
         self.fmtchar = fmtchar
@@ -1,8 +1,10 @@
 
 from zipfile import ZIP_STORED, ZIP_DEFLATED
-from pypy.rlib.streamio import open_file_as_stream
+from pypy.rlib.streamio import open_file_as_stream, O_BINARY
 from pypy.rlib.rstruct.runpack import runpack
 from pypy.rlib.rarithmetic import r_uint, intmask
+from pypy.rlib import rmmap
+from pypy.rpython.lltypesystem import rffi, lltype
 from pypy.rpython.tool.rffi_platform import CompilationError
 import os
 
@@ -144,6 +146,31 @@ class RZipInfo(object):
         # compress_size         Size of the compressed file
         # file_size             Size of the uncompressed file
 
+def _decompress(bytes):
+    if rzlib is None:
+        raise BadZipfile, "Cannot decompress file, zlib not installed"
+    stream = rzlib.inflateInit(wbits=-15)
+    try:
+        bytes, _, _ = rzlib.decompress(stream, bytes)
+        # need to feed in unused pad byte so that zlib won't choke
+        ex, _, _ = rzlib.decompress(stream, 'Z')
+        if ex:
+            bytes = bytes + ex
+    finally:
+        rzlib.inflateEnd(stream)
+    return bytes
+
+def _crc32_raw(ptr, length):
+    if rzlib is not None:
+        crc = rzlib._crc32(0, rffi.cast(rzlib.Bytefp, ptr), length)
+        return r_uint(crc) & r_uint(0xffffffff)
+    return crc32(rffi.charpsize2str(ptr, length))
+
+def _crc32_str(bytes):
+    if rzlib is not None:
+        return r_uint(rzlib.crc32(bytes)) & r_uint(0xffffffff)
+    return crc32(bytes)
+
 class RZipFile(object):
     def __init__(self, zipname, mode='r', compression=ZIP_STORED):
         if mode != 'r':
@@ -238,19 +265,8 @@ class RZipFile(object):
             fp.seek(filepos, 0)
             if zinfo.compress_type == ZIP_STORED:
                 pass
-            elif zinfo.compress_type == ZIP_DEFLATED and rzlib is not None:
-                stream = rzlib.inflateInit(wbits=-15)
-                try:
-                    bytes, _, _ = rzlib.decompress(stream, bytes)
-                    # need to feed in unused pad byte so that zlib won't choke
-                    ex, _, _ = rzlib.decompress(stream, 'Z')
-                    if ex:
-                        bytes = bytes + ex
-                finally:
-                    rzlib.inflateEnd(stream)
             elif zinfo.compress_type == ZIP_DEFLATED:
-                raise BadZipfile, \
-                      "Cannot decompress file, zlib not installed"
+                bytes = _decompress(bytes)
             else:
                 raise BadZipfile, \
                       "Unsupported compression method %d for file %s" % \
@@ -261,3 +277,197 @@ class RZipFile(object):
             return bytes
         finally:
             fp.close()
+
+
+class RMMapZipFile(object):
+    """Read-only zip file, mapped in memory.
+
+    Instead of RZipInfo objects, only the position of the central
+    directory record of each member is kept, in a dict indexed by name;
+    the other fields are decoded from the mapping when needed.  Stored
+    members are copied directly out of the mapping.
+
+    The mapping is released by close(), or by the __del__ of the rmmap
+    object when the RMMapZipFile is garbage collected.  If the archive is
+    truncated by someone else while it is mapped, accessing the missing
+    part of the mapping raises SIGBUS instead of an IOError.
+    """
+
+    def __init__(self, zipname):
+        self.filename = zipname
+        self.index = {}     # {filename: offset of its central dir record}
+        fd = os.open(zipname, os.O_RDONLY | O_BINARY, 0)
+        try:
+            try:
+                self.mmap = rmmap.mmap(fd, 0, access=rmmap.ACCESS_READ)
+            except (OSError, rmmap.RValueError, rmmap.RTypeError,
+                    rmmap.ROverflowError):
+                raise BadZipfile, "Cannot map file"
+        finally:
+            os.close(fd)
+        try:
+            self._build_index()
+        except BadZipfile:
+            self.close()
+            raise
+
+    def close(self):
+        self.mmap.close()
+        self.index = {}
+
+    def _check(self, pos, length):
+        if pos < 0 or length < 0 or pos > self.mmap.size - length:
+            raise BadZipfile, "Truncated zip file"
+
+    def _ptr(self, pos, length):
+        self._check(pos, length)
+        return rffi.ptradd(self.mmap.data, pos)
+
+    def _u16(self, pos):
+        p = self._ptr(pos, 2)
+        return ord(p[0]) | (ord(p[1]) << 8)
+
+    def _u32(self, pos):
+        p = self._ptr(pos, 4)
+        return (ord(p[0]) | (ord(p[1]) << 8) | (ord(p[2]) << 16) |
+                (ord(p[3]) << 24))
+
+    def _str(self, pos, length):
+        return rffi.charpsize2str(self._ptr(pos, length), length)
+
+    def _has_magic(self, pos, magic):
+        p = self._ptr(pos, 4)
+        for i in range(4):
+            if p[i] != magic[i]:
+                return False
+        return True
+
+    def _find_endrec(self):
+        # the end of central directory record is followed by a comment
+        # of at most 64K
+        size = self.mmap.size
+        pos = size - 22
+        stop = max(size - 22 - 65535, 0)
+        while pos >= stop:
+            if (self._has_magic(pos, stringEndArchive) and
+                    pos + 22 + self._u16(pos + 20) == size):
+                return pos
+            pos -= 1
+        raise BadZipfile, "File is not a zip file"
+
+    def _build_index(self):
+        endpos = self._find_endrec()
+        size_cd = self._u32(endpos + 12)
+        offset_cd = self._u32(endpos + 16)
+        # 'concat' is non-zero if data was prepended to the zip file
+        self.concat = endpos - size_cd - offset_cd
+        pos = endpos - size_cd
+        while pos < endpos:
+            if not self._has_magic(pos, stringCentralDir):
+                raise BadZipfile, "Bad magic number for central directory"
+            namelength = self._u16(pos + 28)
+            filename = self._str(pos + 46, namelength)
+            null_byte = filename.find(chr(0))
+            if null_byte >= 0:
+                filename = filename[0:null_byte]
+            if os.sep != "/":
+                filename = filename.replace(os.sep, "/")
+            # check the local header and the extent of the data now, so
+            # that a corrupt archive is rejected when it is opened, like
+            # RZipFile does
+            self._check(self._file_offset(pos), self._u32(pos + 20))
+            self.index[filename] = pos
+            pos += (46 + namelength + self._u16(pos + 30) +
+                    self._u16(pos + 32))
+
+    def namelist(self):
+        return self.index.keys()
+
+    def contains(self, filename):
+        return filename in self.index
+
+    def getinfo(self, filename):
+        """Return a RZipInfo for 'filename'; raises KeyError."""
+        pos = self.index[filename]
+        x = RZipInfo(self._str(pos + 46, self._u16(pos + 28)))
+        x.create_version = ord(self._ptr(pos + 4, 1)[0])
+        x.create_system = ord(self._ptr(pos + 5, 1)[0])
+        x.extract_version = ord(self._ptr(pos + 6, 1)[0])
+        x.reserved = ord(self._ptr(pos + 7, 1)[0])
+        x.flag_bits = self._u16(pos + 8)
+        x.compress_type = self._u16(pos + 10)
+        t = self._u16(pos + 12)
+        d = self._u16(pos + 14)
+        x.dostime = t
+        x.dosdate = d
+        x.date_time = ( (d>>9)+1980, (d>>5)&0xF, d&0x1F,
+                                 t>>11, (t>>5)&0x3F, (t&0x1F) * 2 )
+        x.CRC = r_uint(self._u32(pos + 16))
+        x.compress_size = self._u32(pos + 20)
+        x.file_size = self._u32(pos + 24)
+        x.volume = self._u16(pos + 34)
+        x.internal_attr = self._u16(pos + 36)
+        x.external_attr = self._u32(pos + 38)
+        x.header_offset = self._u32(pos + 42) + self.concat
+        x.file_offset = self._file_offset(pos)
+        return x
+
+    def _file_offset(self, pos):
+        header_offset = self._u32(pos + 42) + self.concat
+        if not self._has_magic(header_offset, stringFileHeader):
+            raise BadZipfile, "Bad magic number for file header"
+        # the extra fields of the local header and of the central
+        # directory can have different lengths
+        return (header_offset + 30 + self._u16(header_offset + 26) +
+                self._u16(header_offset + 28))
+
+    def read_header(self, filename, length):
+        """Return the first 'length' bytes of 'filename', or less if it is
+        shorter, without checking the CRC.  Raises KeyError if there is no
+        such member."""
+        pos = self.index[filename]
+        compress_type = self._u16(pos + 10)
+        compress_size = self._u32(pos + 20)
+        ptr = self._ptr(self._file_offset(pos), compress_size)
+        if compress_type == ZIP_STORED:
+            return rffi.charpsize2str(ptr, min(length, compress_size))
+        elif compress_type == ZIP_DEFLATED and rzlib is not None:
+            # decompress only the beginning of the member
+            chunk = min(compress_size, 4096)
+            stream = rzlib.inflateInit(wbits=-15)
+            try:
+                bytes, _, _ = rzlib.decompress(
+                    stream, rffi.charpsize2str(ptr, chunk),
+                    max_length=length)
+            finally:
+                rzlib.inflateEnd(stream)
+            if len(bytes) == length or chunk == compress_size:
+                return bytes
+        bytes = self.read(filename)
+        return bytes[:min(length, len(bytes))]
+
+    def read(self, filename, start=0):
+        """Return the content of 'filename' from the offset 'start'.
+        Raises KeyError if there is no such member."""
+        pos = self.index[filename]
+        compress_type = self._u16(pos + 10)
+        compress_size = self._u32(pos + 20)
+        expected_crc = r_uint(self._u32(pos + 16))
+        ptr = self._ptr(self._file_offset(pos), compress_size)
+        if compress_type == ZIP_STORED:
+            crc = _crc32_raw(ptr, compress_size)
+            start = min(max(start, 0), compress_size)
+            bytes = rffi.charpsize2str(rffi.ptradd(ptr, start),
+                                       compress_size - start)
+        elif compress_type == ZIP_DEFLATED:
+            bytes = _decompress(rffi.charpsize2str(ptr, compress_size))
+            crc = _crc32_str(bytes)
+            if start > 0:
+                bytes = bytes[start:]
+        else:
+            raise BadZipfile, \
+                  "Unsupported compression method %d for file %s" % \
+            (compress_type, filename)
+        if crc != expected_crc:
+            raise BadZipfile, "Bad CRC-32 for file %s" % filename
+        return bytes
@@ -139,6 +139,39 @@ def test_socketpair_recvinto():
     s1.close()
     s2.close()
 
+def test_socketpair_sendmsg_recvmsg():
+    if not hasattr(RSocket, 'sendmsg'):
+        py.test.skip('no sendmsg() on this platform')
+    s1, s2 = socketpair()
+    count = s1.sendmsg(['abc', '', 'defgh'])
+    assert count == 8
+    strings, msg_flags, address = s2.recvmsg([2, 4, 10])
+    assert strings == ['ab', 'cdef', 'gh']
+    assert msg_flags == 0
+    s1.close()
+    s2.close()
+
+def test_socketpair_sendfile():
+    if not hasattr(RSocket, 'sendfile'):
+        py.test.skip('no sendfile() on this platform')
+    from pypy.tool.udir import udir
+    import os
+    path = udir.join('test_rsocket_sendfile')
+    path.write('0123456789' * 100)
+    fd = os.open(str(path), os.O_RDONLY)
+    s1, s2 = socketpair()
+    try:
+        assert s1.sendfile(fd, 10, 5) == 5
+        assert s2.recv(100) == '01234'
+        assert s1.sendfile(fd, 990, 0) == 10
+        assert s2.recv(100) == '0123456789'
+        assert s1.sendfile(fd, 1000, 0) == 0
+        assert os.lseek(fd, 0, 1) == 0
+    finally:
+        os.close(fd)
+        s1.close()
+        s2.close()
+
 
 def test_simple_tcp():
     import thread
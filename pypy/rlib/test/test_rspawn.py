@@ -0,0 +1,49 @@
+import os, sys, py
+if sys.platform == 'win32':
+    py.test.skip("no vfork() on Windows")
+
+from pypy.rlib import rspawn
+from pypy.tool.udir import udir
+from pypy.rpython.test.tool import BaseRtypingTest, LLRtypeMixin
+
+
+def waitstatus(pid):
+    pid1, status = os.waitpid(pid, 0)
+    assert pid1 == pid
+    assert os.WIFEXITED(status)
+    return os.WEXITSTATUS(status)
+
+class TestSpawn(BaseRtypingTest, LLRtypeMixin):
+
+    def test_spawn(self):
+        d = str(udir.ensure('test_rspawn', dir=1))
+        result = d + '/result'
+        def f():
+            fd = os.open(result, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0666)
+            pid = rspawn.spawn('/bin/sh', ['sh', '-c', 'pwd; echo $FOO'],
+                               ['FOO=bar'], [(rspawn.SPAWN_DUP2, fd, 1),
+                                             (rspawn.SPAWN_CLOSE, fd, 0)],
+                               d, True)
+            os.close(fd)
+            return pid
+        pid = self.interpret(f, [])
+        assert waitstatus(pid) == 0
+        assert open(result).read() == '%s\nbar\n' % (d,)
+
+    def test_errors(self):
+        missing = str(udir.join('does_not_exist'))
+        def f(n):
+            cwd = None
+            path = '/bin/true'
+            if n == 1:
+                path = missing
+            elif n == 2:
+                cwd = missing
+            try:
+                rspawn.spawn(path, ['x'], None, [], cwd, False)
+            except rspawn.SpawnError, e:
+                return e.errno * 10 + e.step
+            return -1
+        import errno
+        assert self.interpret(f, [1]) == errno.ENOENT * 10 + rspawn.STEP_EXEC
+        assert self.interpret(f, [2]) == errno.ENOENT * 10 + rspawn.STEP_CHDIR
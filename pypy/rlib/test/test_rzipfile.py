@@ -1,6 +1,6 @@
 import py
 
-from pypy.rlib.rzipfile import RZipFile
+from pypy.rlib.rzipfile import RZipFile, RMMapZipFile
 from pypy.tool.udir import udir
 from zipfile import ZIP_STORED, ZIP_DEFLATED, ZipInfo, ZipFile
 from pypy.rpython.test.tool import BaseRtypingTest, LLRtypeMixin, OORtypeMixin
@@ -42,6 +42,37 @@ class BaseTestRZipFile(BaseRtypingTest):
         assert one()
         assert self.interpret(one, [])
 
+    def test_rmmapzipfile(self):
+        zipname = self.zipname
+        year = self.year
+        def one():
+            rzip = RMMapZipFile(zipname)
+            try:
+                info = rzip.getinfo('one')
+                return (info.date_time[0] == year and
+                        rzip.contains('three') and
+                        not rzip.contains('four') and
+                        len(rzip.namelist()) == 3 and
+                        rzip.read('one') == 'stuff\n' and
+                        rzip.read('three', 7) == 'world' and
+                        rzip.read_header('three', 5) == 'hello' and
+                        rzip.read_header('one', 100) == 'stuff\n')
+            finally:
+                rzip.close()
+
+        assert one()
+        assert self.interpret(one, [])
+
+    def test_rmmapzipfile_corrupt_local_header(self):
+        from pypy.rlib.rzipfile import BadZipfile
+        data = open(self.zipname, 'rb').read()
+        assert data.startswith('PK\x03\x04')
+        badname = self.zipname + '.bad'
+        f = open(badname, 'wb')
+        f.write('XX' + data[2:])
+        f.close()
+        py.test.raises(BadZipfile, RMMapZipFile, badname)
+
 class TestRZipFile(BaseTestRZipFile, LLRtypeMixin):
     compression = ZIP_STORED
 
@@ -34,6 +34,14 @@ Environment variables can be used to fine-tune the following parameters:
                         the GC in very small programs.  Defaults to 8
                         times the nursery.
 
+ PYPY_GC_RELEASE        Give back to the OS the memory of the free pages
+                        of an arena at the end of a major collection, if
+                        at least this fraction of the arena is free.
+                        Default is '0', which means never (the memory
+                        of entirely free arenas is always given back).
+                        Try values like '0.25' to reduce the RSS of
+                        processes after a peak in memory usage.
+
  PYPY_GC_DEBUG          Enable extra checks around collections that are
                         too slow for normal use.  Values are 0 (off),
                         1 (on major collections) or 2 (also on minor
@@ -359,6 +367,10 @@ class MiniMarkGC(MovingGCBase):
             else:
                 self.max_delta = 0.125 * env.get_total_memory()
             #
+            release = env.read_float_from_env('PYPY_GC_RELEASE')
+            if release > 0.0:
+                self.ac.set_release_fraction(release)
+            #
             self.minor_collection()    # to empty the nursery
             llarena.arena_free(self.nursery)
             self.nursery_size = newsize
@@ -1724,7 +1736,15 @@ class MiniMarkGC(MovingGCBase):
         self.objects_to_trace.append(obj)
 
     def _collect_ref_rec(self, root, ignored):
-        self.objects_to_trace.append(root.address[0])
+        # Don't push on the stack the objects that are already visited
+        # or that cannot point to heap objects: see visit().  This keeps
+        # 'objects_to_trace' much smaller and avoids a pop() and a call
+        # to visit() for most of the references of a typical heap, which
+        # point to objects seen earlier.
+        obj = root.address[0]
+        if self.header(obj).tid & (GCFLAG_VISITED | GCFLAG_NO_HEAP_PTRS):
+            return
+        self.objects_to_trace.append(obj)
 
     def visit_all_objects(self):
         pending = self.objects_to_trace
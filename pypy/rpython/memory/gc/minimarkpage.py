@@ -24,6 +24,11 @@ ARENA = lltype.Struct('ArenaReference',
     ('totalpages', lltype.Signed),
     # -- A chained list of free pages in the arena.  Ends with NULL.
     ('freepages', llmemory.Address),
+    # -- For each page, PAGE_RELEASED if it is a free page whose memory
+    #    was returned to the OS.  Such pages are counted in 'nfreepages'
+    #    but not chained in 'freepages'.  Allocated lazily; NULL if no
+    #    page of the arena was ever released.
+    ('released', rffi.CArrayPtr(lltype.Char)),
     # -- A linked list of arenas.  See below.
     ('nextarena', ARENA_PTR),
     )
@@ -52,6 +57,11 @@ ARENA_NULL = lltype.nullptr(ARENA)
 #
 # - free: used to be partially full, and is now free again.  The page is
 #   on the chained list of free pages 'freepages' from its arena.
+#
+# - released: a free page whose memory was given back to the OS with
+#   madvise() at the end of a major collection.  Not on any chained list,
+#   but marked in the 'released' array of its arena.  It is only reused
+#   when the arena has no other free page left.
 
 # Each allocated page contains blocks of a given size, which can again be in
 # one of three states: allocated, free, or uninitialized.  The uninitialized
@@ -81,6 +91,11 @@ PAGE_HEADER = lltype.Struct('PageHeader',
 PAGE_PTR.TO.become(PAGE_HEADER)
 PAGE_NULL = lltype.nullptr(PAGE_HEADER)
 
+# values in the 'released' array of the arenas
+PAGE_IN_USE = '\x00'
+PAGE_FREE = '\x01'        # temporarily, in release_free_pages()
+PAGE_RELEASED = '\x02'
+
 # ----------
 
 
@@ -141,6 +156,27 @@ class ArenaCollection(object):
         # the total memory used, counting every block in use, without
         # the additional bookkeeping stuff.
         self.total_memory_used = r_uint(0)
+        #
+        # after a major collection, the free pages of every arena that
+        # has at least 'release_min_free_pages' of them are given back
+        # to the OS.  Zero means never; see PYPY_GC_RELEASE in minimark.py.
+        self.release_min_free_pages = 0
+        #
+        # only runs of at least that many contiguous free pages are given
+        # back: arena_reset() calls madvise() only on chunks larger than
+        # two OS pages, and just clears the smaller ones.  Like in
+        # minimark.py, we assume that the OS pages are 4K.
+        self.release_min_run = (2 * 4096) // page_size + 1
+        self.total_released_pages = 0
+
+
+    def set_release_fraction(self, fraction):
+        """Give back to the OS the free pages of the arenas that are at
+        least 'fraction' free after a major collection."""
+        n = int(fraction * self.max_pages_per_arena)
+        if n < 1:
+            n = 1
+        self.release_min_free_pages = n
 
 
     def malloc(self, size):
@@ -198,12 +234,17 @@ class ArenaCollection(object):
         result = arena.freepages
         if arena.nfreepages > 0:
             #
-            # The 'result' was part of the chained list; read the next.
             arena.nfreepages -= 1
-            freepages = result.address[0]
-            llarena.arena_reset(result,
-                                llmemory.sizeof(llmemory.Address),
-                                0)
+            if result == NULL:
+                # No more chained free page, but some released ones.
+                result = self.take_released_page(arena)
+                freepages = NULL
+            else:
+                # The 'result' was part of the chained list; read the next.
+                freepages = result.address[0]
+                llarena.arena_reset(result,
+                                    llmemory.sizeof(llmemory.Address),
+                                    0)
             #
         else:
             # The 'result' is part of the uninitialized pages.
@@ -216,11 +257,9 @@ class ArenaCollection(object):
                 freepages = NULL
         #
         arena.freepages = freepages
-        if freepages == NULL:
+        if freepages == NULL and arena.nfreepages == 0:
             # This was the last page, so put the arena away into
             # arenas_lists[0].
-            ll_assert(arena.nfreepages == 0, 
-                      "freepages == NULL but nfreepages > 0")
             arena.nextarena = self.arenas_lists[0]
             self.arenas_lists[0] = arena
             self.current_arena = ARENA_NULL
@@ -291,6 +330,7 @@ class ArenaCollection(object):
         arena.nfreepages = 0        # they are all uninitialized pages
         arena.totalpages = npages
         arena.freepages = firstpage
+        arena.released = lltype.nullptr(ARENA.released.TO)
         self.num_uninitialized_pages = npages
         self.current_arena = arena
         #
@@ -336,6 +376,11 @@ class ArenaCollection(object):
                 if arena.nfreepages == arena.totalpages:
                     #
                     # The whole arena is empty.  Free it.
+                    if arena.released:
+                        self.total_released_pages -= self.count_released(
+                            arena)
+                        lltype.free(arena.released, flavor='raw',
+                                    track_allocation=False)
                     llarena.arena_free(arena.base)
                     lltype.free(arena, flavor='raw', track_allocation=False)
                     #
@@ -346,6 +391,11 @@ class ArenaCollection(object):
                              "totalpages != nfreepages >= max_pages_per_arena")
                     arena.nextarena = self.arenas_lists[n]
                     self.arenas_lists[n] = arena
+                    #
+                    if (self.release_min_free_pages > 0 and
+                            n >= self.release_min_free_pages and
+                            arena.freepages != NULL):
+                        self.release_free_pages(arena)
                 #
                 arena = nextarena
             i += 1
@@ -353,10 +403,87 @@ class ArenaCollection(object):
         self.min_empty_nfreepages = 1
 
 
+    def release_free_pages(self, arena):
+        """Give back to the OS the memory of the chained free pages of
+        'arena', if they form runs of at least 'release_min_run' pages.
+        Not used on 'current_arena', whose chained list of free pages
+        may continue into its uninitialized pages."""
+        npages = arena.totalpages
+        if not arena.released:
+            arena.released = lltype.malloc(ARENA.released.TO, npages,
+                                           flavor='raw', zero=True,
+                                           track_allocation=False)
+        firstpage = self._first_page(arena)
+        #
+        # Mark all the chained free pages.
+        pageaddr = arena.freepages
+        while pageaddr != NULL:
+            i = (pageaddr - firstpage) // self.page_size
+            arena.released[i] = PAGE_FREE
+            pageaddr = pageaddr.address[0]
+        #
+        # Release the long enough runs of free or already-released pages,
+        # and chain again the other free pages, in order of address.
+        arena.freepages = NULL
+        i = npages - 1
+        while i >= 0:
+            if arena.released[i] == PAGE_IN_USE:
+                i -= 1
+                continue
+            end = i + 1
+            while i >= 0 and arena.released[i] != PAGE_IN_USE:
+                i -= 1
+            start = i + 1
+            j = end - 1
+            if end - start >= self.release_min_run:
+                llarena.arena_reset(firstpage + start * self.page_size,
+                                    (end - start) * self.page_size, 1)
+                while j >= start:
+                    if arena.released[j] == PAGE_FREE:
+                        arena.released[j] = PAGE_RELEASED
+                        self.total_released_pages += 1
+                    j -= 1
+            else:
+                while j >= start:
+                    if arena.released[j] == PAGE_FREE:
+                        arena.released[j] = PAGE_IN_USE
+                        pageaddr = firstpage + j * self.page_size
+                        pageaddr.address[0] = arena.freepages
+                        arena.freepages = pageaddr
+                    j -= 1
+
+
+    def take_released_page(self, arena):
+        """Return one of the released pages of 'arena'."""
+        i = 0
+        while arena.released[i] != PAGE_RELEASED:
+            i += 1
+            ll_assert(i < arena.totalpages, "no released page found")
+        arena.released[i] = PAGE_IN_USE
+        self.total_released_pages -= 1
+        return self._first_page(arena) + i * self.page_size
+
+
+    def count_released(self, arena):
+        result = 0
+        i = 0
+        while i < arena.totalpages:
+            if arena.released[i] == PAGE_RELEASED:
+                result += 1
+            i += 1
+        return result
+
+
+    def _first_page(self, arena):
+        return start_of_page(arena.base + self.page_size - 1, self.page_size)
+
+
     def mass_free_in_pages(self, size_class, ok_to_free_func):
         nblocks = self.nblocks_for_size[size_class]
         block_size = size_class * WORD
         remaining_partial_pages = PAGE_NULL
+        remaining_sparse_pages = PAGE_NULL
+        last_partial_page = PAGE_NULL
         remaining_full_pages = PAGE_NULL
         #
         step = 0
@@ -381,13 +508,25 @@ class ArenaCollection(object):
                     page.nextpage = remaining_full_pages
                     remaining_full_pages = page
                     #
-                elif surviving > 0:
+                elif surviving * 2 >= nblocks:
                     #
-                    # There is at least 1 object surviving.  Re-insert
+                    # At least half of the objects survive.  Re-insert
                     # the page in the 'remaining_partial_pages' chained list.
+                    if remaining_partial_pages == PAGE_NULL:
+                        last_partial_page = page
                     page.nextpage = remaining_partial_pages
                     remaining_partial_pages = page
                     #
+                elif surviving > 0:
+                    #
+                    # Less than half of the objects survive.  Re-insert
+                    # the page in the 'remaining_sparse_pages' chained list,
+                    # which comes after the other partial pages: malloc()
+                    # fills the dense pages first, which leaves the sparse
+                    # ones a chance to become entirely free.
+                    page.nextpage = remaining_sparse_pages
+                    remaining_sparse_pages = page
+                    #
                 else:
                     # No object survives; free the page.
                     self.free_page(page)
@@ -396,6 +535,10 @@ class ArenaCollection(object):
             #
             step += 1
         #
+        if remaining_partial_pages == PAGE_NULL:
+            remaining_partial_pages = remaining_sparse_pages
+        else:
+            last_partial_page.nextpage = remaining_sparse_pages
         self.page_for_size[size_class] = remaining_partial_pages
         self.full_page_for_size[size_class] = remaining_full_pages
 
@@ -522,6 +522,33 @@ class TestMiniMarkGCSimple(DirectGCTest):
             self.stackroots.pop()
     test_card_marker.GC_PARAMS = {"card_page_indices": 4}
 
+    def test_major_collection_pushes_visited_objects_once(self):
+        # 'shared' is visited first, so the 50 references to it from the
+        # array items must not push it again on 'objects_to_trace'
+        a = self.malloc(VAR, 50)
+        self.stackroots.append(a)
+        shared = self.malloc(S)
+        shared.x = 42
+        self.stackroots.append(shared)
+        for i in range(50):
+            p = self.malloc(S)
+            self.write(p, 'next', self.stackroots[1])
+            self.writearray(self.stackroots[0], i, p)
+        self.gc.collect()
+        #
+        visited = []
+        def visit(obj):
+            visited.append(obj)
+            original_visit(obj)
+        original_visit = self.gc.visit
+        self.gc.visit = visit
+        self.gc.collect()
+        assert len(visited) == 52
+        assert len(dict.fromkeys(visited)) == 52
+        a = self.stackroots[0]
+        for i in range(50):
+            assert a[i].next.x == 42
+
     def test_writebarrier_before_copy(self):
         from pypy.rpython.memory.gc import minimark
         largeobj_size =  self.gc.nonlarge_max + 1
@@ -2,7 +2,8 @@ import py
 from pypy.rpython.memory.gc.minimarkpage import ArenaCollection
 from pypy.rpython.memory.gc.minimarkpage import PAGE_HEADER, PAGE_PTR
 from pypy.rpython.memory.gc.minimarkpage import PAGE_NULL, WORD
-from pypy.rpython.memory.gc.minimarkpage import _dummy_size
+from pypy.rpython.memory.gc.minimarkpage import _dummy_size, ARENA_NULL
+from pypy.rpython.memory.gc.minimarkpage import PAGE_IN_USE, PAGE_RELEASED
 from pypy.rpython.lltypesystem import lltype, llmemory, llarena
 from pypy.rpython.lltypesystem.llmemory import cast_ptr_to_adr
 
@@ -400,13 +401,110 @@ def test_mass_free_half_page_becomes_more_free():
     assert freepages(ac) == NULL
     assert ac.full_page_for_size[2] == PAGE_NULL
 
+def test_mass_free_dense_pages_first():
+    pagesize = hdrsize + 16*WORD
+    ac = arena_collection_for_test(pagesize, "##", fill_with_objects=2)
+    # page 0 keeps 6 objects out of 8, page 1 keeps only 2 of them
+    def answer(obj):
+        ofs = obj - ac._startpageaddr
+        if ofs < pagesize:
+            return ofs >= hdrsize + 12*WORD
+        return ofs - pagesize >= hdrsize + 4*WORD
+    ac.mass_free(OkToFree(ac, answer))
+    assert ac.full_page_for_size[2] == PAGE_NULL
+    page = ac.page_for_size[2]
+    checkpage(ac, page, 0)
+    assert page.nfree == 2
+    checkpage(ac, page.nextpage, 1)
+    assert page.nextpage.nfree == 6
+    assert page.nextpage.nextpage == PAGE_NULL
+
+def arena_collection_for_release_test(pagelayout):
+    pagesize = hdrsize + 16*WORD
+    ac = arena_collection_for_test(pagesize, pagelayout, fill_with_objects=2)
+    # move the arena out of 'current_arena', whose pages are never released
+    arena = ac.current_arena
+    ac.current_arena = ARENA_NULL
+    arena.nextarena = ARENA_NULL
+    ac.arenas_lists[arena.nfreepages] = arena
+    ac.release_min_free_pages = 1
+    return ac, arena
+
+def test_release_free_pages():
+    ac, arena = arena_collection_for_release_test("#..#...")
+    ac.release_min_run = 2
+    ac.mass_free(OkToFree(ac, False))
+    assert arena.freepages == NULL
+    assert arena.nfreepages == 5
+    assert [arena.released[i] for i in range(7)] == [
+        PAGE_IN_USE, PAGE_RELEASED, PAGE_RELEASED, PAGE_IN_USE,
+        PAGE_RELEASED, PAGE_RELEASED, PAGE_RELEASED]
+    assert ac.total_released_pages == 5
+    assert ac.arenas_lists[5] == arena
+    #
+    # the released pages are reused in order
+    del ac.allocate_new_arena
+    for i in [1, 2, 4, 5, 6]:
+        ac.page_for_size[1] = PAGE_NULL
+        page = ac.allocate_new_page(1)
+        checkpage(ac, page, i)
+        assert page.arena == arena
+        assert page.nfree == 0
+    assert ac.total_released_pages == 0
+    assert ac.current_arena == ARENA_NULL
+    assert ac.arenas_lists[0] == arena
+
+def test_release_free_pages_only_long_runs():
+    ac, arena = arena_collection_for_release_test("#..#...")
+    ac.release_min_run = 3
+    ac.mass_free(OkToFree(ac, False))
+    assert arena.nfreepages == 5
+    assert ac.total_released_pages == 3
+    assert arena.released[4] == arena.released[6] == PAGE_RELEASED
+    # the two other free pages are still chained
+    assert arena.freepages == pagenum(ac, 1)
+    assert arena.freepages.address[0] == pagenum(ac, 2)
+    assert arena.freepages.address[0].address[0] == NULL
+    #
+    del ac.allocate_new_arena
+    for i in [1, 2, 4]:
+        ac.page_for_size[1] = PAGE_NULL
+        page = ac.allocate_new_page(1)
+        checkpage(ac, page, i)
+    assert ac.current_arena == arena
+    assert arena.nfreepages == 2
+
+def test_release_free_pages_then_free_arena():
+    ac, arena = arena_collection_for_release_test("#..#...")
+    ac.release_min_run = 2
+    ac.mass_free(OkToFree(ac, False))
+    assert ac.total_released_pages == 5
+    freed = []
+    arena.base.arena.mark_freed = lambda: freed.append(True)
+    ac.mass_free(OkToFree(ac, True))
+    assert freed == [True]
+    assert ac.total_released_pages == 0
+    assert ac.arenas_lists[5] == ARENA_NULL
+
+def test_release_free_pages_disabled():
+    ac, arena = arena_collection_for_release_test("#..#...")
+    ac.release_min_free_pages = 0
+    ac.release_min_run = 2
+    ac.mass_free(OkToFree(ac, False))
+    assert not arena.released
+    assert arena.freepages != NULL
+    assert ac.total_released_pages == 0
+
 # ____________________________________________________________
 
-def test_random():
+def test_random(release=False):
     import random
     pagesize = hdrsize + 24*WORD
     num_pages = 3
     ac = arena_collection_for_test(pagesize, " " * num_pages)
+    if release:
+        ac.release_min_free_pages = 1
+        ac.release_min_run = 1
     live_objects = {}
     #
     # Run the test until three arenas are freed.  This is a quick test
@@ -455,3 +553,6 @@ def test_random():
             assert ac.total_memory_used == surviving_total_size
     except DoneTesting:
         pass
+
+def test_random_release():
+    test_random(release=True)
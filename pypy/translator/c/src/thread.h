@@ -41,5 +41,10 @@ long RPyGilAllocate(void);
 long RPyGilYieldThread(void);
 void RPyGilRelease(void);
 void RPyGilAcquire(void);
+long RPyGilDropRequested(void);
+void RPyGilSetSwitchInterval(long microseconds);
+long RPyGilGetSwitchInterval(void);
+long RPyGilGetWaitCount(void);
+double RPyGilGetWaitTime(void);
 
 #endif
@@ -226,12 +226,45 @@ char *RPyThreadTLS_Create(RPyThreadTLS *result)
 /************************************************************/
 
 static volatile LONG pending_acquires = -1;
+static volatile long gil_drop_request = 0;
+static volatile LONG gil_switch_number = 0;
+static long gil_interval = 5000;     /* in microseconds */
 static CRITICAL_SECTION mutex_gil;
 static HANDLE cond_gil;
 
+/* per-thread statistics about the time spent waiting for the GIL */
+static __thread long gil_waits = 0;
+static __thread double gil_wait_time = 0.0;
+
+static void gil_take(void)
+{
+    /* a simplified version of the logic in thread_pthread.h: the thread
+       waits on 'cond_gil' for at most a switch interval at a time, and
+       asks the holder to drop the GIL if no switch occurred meanwhile */
+    DWORD start;
+    if (TryEnterCriticalSection(&mutex_gil))
+        goto done;
+    start = GetTickCount();
+    while (1) {
+        LONG switch_number = gil_switch_number;
+        DWORD timeout = (DWORD)((gil_interval + 999) / 1000);
+        if (WaitForSingleObject(cond_gil, timeout) == WAIT_TIMEOUT &&
+                switch_number == gil_switch_number)
+            gil_drop_request = 1;
+        if (TryEnterCriticalSection(&mutex_gil))
+            break;
+    }
+    gil_waits++;
+    gil_wait_time += (GetTickCount() - start) * 0.001;
+ done:
+    InterlockedIncrement(&gil_switch_number);
+    gil_drop_request = 0;
+}
+
 long RPyGilAllocate(void)
 {
     pending_acquires = 0;
+    gil_drop_request = 0;
     InitializeCriticalSection(&mutex_gil);
     EnterCriticalSection(&mutex_gil);
     cond_gil = CreateEvent (NULL, FALSE, FALSE, NULL);
@@ -254,7 +287,7 @@ long RPyGilYieldThread(void)
        In this case the process will just sleep a few milliseconds. */
     LeaveCriticalSection(&mutex_gil);
     WaitForSingleObject(cond_gil, 15);
-    EnterCriticalSection(&mutex_gil);
+    gil_take();
 
     InterlockedDecrement(&pending_acquires);
     return 1;
@@ -269,9 +302,36 @@ void RPyGilRelease(void)
 void RPyGilAcquire(void)
 {
     InterlockedIncrement(&pending_acquires);
-    EnterCriticalSection(&mutex_gil);
+    gil_take();
     InterlockedDecrement(&pending_acquires);
 }
 
+long RPyGilDropRequested(void)
+{
+    return gil_drop_request;
+}
+
+void RPyGilSetSwitchInterval(long microseconds)
+{
+    if (microseconds < 1)
+        microseconds = 1;
+    gil_interval = microseconds;
+}
+
+long RPyGilGetSwitchInterval(void)
+{
+    return gil_interval;
+}
+
+long RPyGilGetWaitCount(void)
+{
+    return gil_waits;
+}
+
+double RPyGilGetWaitTime(void)
+{
+    return gil_wait_time;
+}
+
 
 #endif /* PYPY_NOT_MAIN_FILE */
@@ -13,6 +13,7 @@
 #include <stdio.h>
 #include <errno.h>
 #include <assert.h>
+#include <sys/time.h>
 
 /* The following is hopefully equivalent to what CPython does
    (which is trying to compile a snippet of code using it) */
@@ -503,29 +504,136 @@ static void _debug_print(const char *msg)
 #endif
 }
 
+/* The GIL is the flag 'gil_locked', protected by 'mutex_gil'.  A thread
+   waiting for it does timed waits on 'cond_gil'; if a whole switch
+   interval passes without any thread switch, it sets 'gil_drop_request',
+   which the thread holding the GIL polls (see GILReleaseAction in
+   pypy/module/thread/gil.py) before calling RPyGilYieldThread().  This
+   one releases the GIL and waits on 'cond_gil_switch' until another
+   thread actually took it, so that the GIL is really handed off instead
+   of being taken back at once by the same thread. */
+
 static volatile long pending_acquires = -1;
+static volatile long gil_drop_request = 0;
+static long gil_locked = 0;
+static unsigned long gil_switch_number = 0;
+static long gil_interval = 5000;     /* in microseconds */
 static pthread_mutex_t mutex_gil = PTHREAD_MUTEX_INITIALIZER;
 static pthread_cond_t cond_gil = PTHREAD_COND_INITIALIZER;
+static pthread_cond_t cond_gil_switch = PTHREAD_COND_INITIALIZER;
+static int gil_initialized = 0;
+
+/* per-thread statistics about the time spent waiting for the GIL */
+struct RPyGilStats {
+    long waits;
+    double wait_time;
+};
+static pthread_key_t gil_stats_key;
+static int gil_stats_key_ready = 0;
 
 static void assert_has_the_gil(void)
 {
 #ifdef RPY_ASSERT
-    assert(pthread_mutex_trylock(&mutex_gil) != 0);
+    assert(gil_locked);
     assert(pending_acquires >= 0);
 #endif
 }
 
+static double gil_current_time(void)
+{
+    struct timeval tv;
+    gettimeofday(&tv, NULL);
+    return tv.tv_sec + tv.tv_usec * 0.000001;
+}
+
+static void gil_record_wait(double wait_time)
+{
+    struct RPyGilStats *stats;
+    if (!gil_stats_key_ready)
+        return;
+    stats = pthread_getspecific(gil_stats_key);
+    if (stats == NULL) {
+        stats = calloc(1, sizeof(struct RPyGilStats));
+        if (stats == NULL)
+            return;
+        pthread_setspecific(gil_stats_key, stats);
+    }
+    stats->waits++;
+    stats->wait_time += wait_time;
+}
+
+static void gil_take(void)
+{
+    /* must be called with 'mutex_gil' held */
+    double start = 0.0;
+    while (gil_locked) {
+        unsigned long switch_number = gil_switch_number;
+        struct timespec deadline;
+        double now = gil_current_time();
+        int res;
+        if (start == 0.0)
+            start = now;
+        now += gil_interval * 0.000001;
+        deadline.tv_sec = (time_t)now;
+        deadline.tv_nsec = (long)((now - deadline.tv_sec) * 1000000000.0);
+        if (deadline.tv_nsec >= 1000000000L)
+            deadline.tv_nsec = 999999999L;
+        res = pthread_cond_timedwait(&cond_gil, &mutex_gil, &deadline);
+        if (res == ETIMEDOUT && gil_locked &&
+                switch_number == gil_switch_number) {
+            /* the same thread held the GIL for a whole interval */
+            _debug_print("<drop request>");
+            gil_drop_request = 1;
+        }
+    }
+    gil_locked = 1;
+    gil_switch_number++;
+    gil_drop_request = 0;
+    ASSERT_STATUS(pthread_cond_signal(&cond_gil_switch));
+    if (start != 0.0)
+        gil_record_wait(gil_current_time() - start);
+}
+
+/* 'mutex_gil' is only held for short periods, but it must not be held
+   by another thread when fork() is called, because this thread does not
+   exist in the child */
+static void gil_prepare_fork(void)
+{
+    pthread_mutex_lock(&mutex_gil);
+}
+
+static void gil_after_fork_parent(void)
+{
+    pthread_mutex_unlock(&mutex_gil);
+}
+
+static void gil_after_fork_child(void)
+{
+    pthread_mutex_init(&mutex_gil, NULL);
+    pthread_cond_init(&cond_gil, NULL);
+    pthread_cond_init(&cond_gil_switch, NULL);
+}
+
 long RPyGilAllocate(void)
 {
     _debug_print("RPyGilAllocate\n");
+    if (!gil_initialized) {
+        gil_initialized = 1;
+        if (pthread_key_create(&gil_stats_key, free) == 0)
+            gil_stats_key_ready = 1;
+        ASSERT_STATUS(pthread_atfork(gil_prepare_fork, gil_after_fork_parent,
+                                     gil_after_fork_child));
+    }
+    gil_locked = 1;
+    gil_drop_request = 0;
     pending_acquires = 0;
-    pthread_mutex_trylock(&mutex_gil);
     assert_has_the_gil();
     return 1;
 }
 
 long RPyGilYieldThread(void)
 {
+    unsigned long switch_number;
     /* can be called even before RPyGilAllocate(), but in this case,
        pending_acquires will be -1 */
 #ifdef RPY_ASSERT
@@ -536,8 +644,15 @@ long RPyGilYieldThread(void)
         return 0;
     atomic_add(&pending_acquires, 1L);
     _debug_print("{");
+    ASSERT_STATUS(pthread_mutex_lock(&mutex_gil));
+    gil_locked = 0;
     ASSERT_STATUS(pthread_cond_signal(&cond_gil));
-    ASSERT_STATUS(pthread_cond_wait(&cond_gil, &mutex_gil));
+    /* don't take the GIL back before another thread got it */
+    switch_number = gil_switch_number;
+    while (switch_number == gil_switch_number && pending_acquires > 1)
+        ASSERT_STATUS(pthread_cond_wait(&cond_gil_switch, &mutex_gil));
+    gil_take();
+    ASSERT_STATUS(pthread_mutex_unlock(&mutex_gil));
     _debug_print("}");
     atomic_add(&pending_acquires, -1L);
     assert_has_the_gil();
@@ -551,8 +666,10 @@ void RPyGilRelease(void)
     assert(pending_acquires >= 0);
 #endif
     assert_has_the_gil();
-    ASSERT_STATUS(pthread_mutex_unlock(&mutex_gil));
+    ASSERT_STATUS(pthread_mutex_lock(&mutex_gil));
+    gil_locked = 0;
     ASSERT_STATUS(pthread_cond_signal(&cond_gil));
+    ASSERT_STATUS(pthread_mutex_unlock(&mutex_gil));
 }
 
 void RPyGilAcquire(void)
@@ -563,10 +680,45 @@ void RPyGilAcquire(void)
 #endif
     atomic_add(&pending_acquires, 1L);
     ASSERT_STATUS(pthread_mutex_lock(&mutex_gil));
+    gil_take();
+    ASSERT_STATUS(pthread_mutex_unlock(&mutex_gil));
     atomic_add(&pending_acquires, -1L);
     assert_has_the_gil();
     _debug_print("RPyGilAcquire\n");
 }
 
+long RPyGilDropRequested(void)
+{
+    return gil_drop_request;
+}
+
+void RPyGilSetSwitchInterval(long microseconds)
+{
+    if (microseconds < 1)
+        microseconds = 1;
+    gil_interval = microseconds;
+}
+
+long RPyGilGetSwitchInterval(void)
+{
+    return gil_interval;
+}
+
+long RPyGilGetWaitCount(void)
+{
+    struct RPyGilStats *stats = NULL;
+    if (gil_stats_key_ready)
+        stats = pthread_getspecific(gil_stats_key);
+    return stats != NULL ? stats->waits : 0;
+}
+
+double RPyGilGetWaitTime(void)
+{
+    struct RPyGilStats *stats = NULL;
+    if (gil_stats_key_ready)
+        stats = pthread_getspecific(gil_stats_key);
+    return stats != NULL ? stats->wait_time : 0.0;
+}
+
 
 #endif /* PYPY_NOT_MAIN_FILE */
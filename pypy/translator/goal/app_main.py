@@ -243,7 +243,8 @@ def setup_sys_executable(executable, nanos):
         sys.executable = ''
 
 def setup_initial_paths(ignore_environment=False, **extra):
-    newpath = get_library_path(sys.executable)
+    libpath = get_library_path(sys.executable)
+    newpath = libpath
     readenv = not ignore_environment
     path = readenv and os.getenv('PYTHONPATH')
     if path:
@@ -255,6 +256,10 @@ def setup_initial_paths(ignore_environment=False, **extra):
         if dir not in _seen:
             sys.path.append(dir)
             _seen[dir] = True
+    # fix the modules imported at translation time, if any (--preimport)
+    import imp
+    if hasattr(imp, '_reinit_preimported'):
+        imp._reinit_preimported(libpath)
 
 def set_io_encoding(io_encoding):
     try:
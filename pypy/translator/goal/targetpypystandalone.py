@@ -182,6 +182,8 @@ class PyPyTarget(object):
                 # Same as above: try to auto-disable the _continuation
                 # module if translation.continuation cannot be enabled
                 config.objspace.usemodules._continuation = False
+        if not config.objspace.usemodules._continuation:
+            config.objspace.usemodules.greenlet = False
 
         if not config.translation.rweakref:
             config.objspace.usemodules._weakref = False
@@ -236,6 +238,11 @@ class PyPyTarget(object):
 
         space = make_objspace(config)
 
+        if config.objspace.preimportmodules:
+            from pypy.module.imp.importing import preimport_modules
+            preimport_modules(space,
+                              config.objspace.preimportmodules.split(','))
+
         # manually imports app_main.py
         filename = os.path.join(this_dir, 'app_main.py')
         app = gateway.applevel(open(filename).read(), 'app_main.py', 'app_main')